@@ -0,0 +1,370 @@
+"""
+Assembly Export — Golden Tower
+==============================
+Exports the assembled tower for visualization and clash checks: the
+bottom segment, ``n - 1`` standard segments (each turned
+INTERLOCK_ROTATION_DEG from the one below) and the top cap, stacked as
+in components/sdf_preview.tower_sdf. Every unique part is stored once
+and each placement is an instance transform:
+
+- 3mf   one mesh object per part; a ``tower`` object places them as
+        components
+- glb   binary glTF: one mesh per part, one node per placement
+- step  XCAF assembly of the exported STEP parts, one product per part
+
+File size and memory grow by one transform per segment, not by one
+mesh. A flattened STL with every triangle in place is written only on
+request (``--flat``) and grows with the segment count.
+
+The 3MF and glTF meshes are the exported component STLs, welded
+(mesh_repair.weld); the STEP assembly reads the exported STEP files.
+Segment height, interlock rotation and default segment count come from
+the :class:`~tower_config.TowerConfig` the parts were built with: the
+``config.json`` a variant build records in its exports root, else the
+module constants.
+
+Usage:
+    python assembly.py                             # needs exports/ from a build
+    python assembly.py --segments 20 --formats 3mf glb
+    python assembly.py --flat --json
+    python assembly.py --variant wide-cap          # exports/variants/wide-cap/
+"""
+
+import argparse
+import json
+import math
+import os
+import struct
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PROJECT_ROOT)
+
+from mesh_arrays import read_stl, write_stl
+from mesh_repair import weld
+from tower_config import TowerConfig, coerce
+
+EXPORT_DIR = os.path.join(PROJECT_ROOT, 'exports')
+STL_DIR = os.path.join(EXPORT_DIR, 'stl')
+STEP_DIR = os.path.join(EXPORT_DIR, 'step')
+ASSEMBLY_DIR = os.path.join(EXPORT_DIR, 'assembly')
+
+# Unique parts of the tower, in stacking order
+PARTS = ('bottom_segment', 'segment', 'top_cap')
+
+# Instancing formats, in the order they are written
+FORMATS = ('3mf', 'glb', 'step')
+
+_3MF_NS = 'http://schemas.microsoft.com/3dmanufacturing/core/2015/02'
+_3MF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" '
+    'ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    '</Types>')
+_3MF_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    '</Relationships>')
+
+# glTF is Y-up in metres; the tower is Z-up in millimetres
+_GLTF_ROOT = {'rotation': [-math.sqrt(0.5), 0.0, 0.0, math.sqrt(0.5)],
+              'scale': [0.001, 0.001, 0.001]}
+
+
+def read_config(export_root=EXPORT_DIR):
+    """:class:`~tower_config.TowerConfig` the parts under ``export_root`` were built with.
+
+    Reads the ``config.json`` a variant build writes there
+    (build_tower_build123d.write_variant_config); without one the parts
+    are the module constants.
+    """
+    path = os.path.join(export_root, 'config.json')
+    if not os.path.exists(path):
+        return TowerConfig()
+    with open(path) as fh:
+        overrides = json.load(fh)['overrides']
+    return TowerConfig(**{name: coerce(name, value) for name, value in overrides.items()})
+
+
+def placements(n_segments=None, config=None):
+    """``(instance name, part, angle (deg), z (mm))`` of every part in the tower.
+
+    Args:
+        n_segments: Segments, the bottom one included (default: the
+            config's TARGET_SEGMENT_COUNT).
+        config: :class:`~tower_config.TowerConfig` the parts were built
+            with (default: the module constants).
+
+    Raises:
+        ValueError: ``n_segments`` is below 1 (the bottom segment).
+    """
+    cfg = config or TowerConfig()
+    if n_segments is None:
+        n_segments = cfg.TARGET_SEGMENT_COUNT
+    if n_segments < 1:
+        raise ValueError(f"a tower has at least 1 segment, got {n_segments}")
+    rows = [('bottom_segment', 'bottom_segment', 0.0, 0.0)]
+    rows += [(f'segment_{k}', 'segment', k * cfg.INTERLOCK_ROTATION_DEG,
+              k * cfg.SEGMENT_HEIGHT) for k in range(1, n_segments)]
+    rows.append(('top_cap', 'top_cap', 0.0,
+                 n_segments * cfg.SEGMENT_HEIGHT + cfg.INTERLOCK_HEIGHT))
+    return rows
+
+
+def placement_matrix(angle_deg, dz):
+    """4x4 transform turning a part ``angle_deg`` about Z and raising it ``dz``."""
+    c, s = math.cos(math.radians(angle_deg)), math.sin(math.radians(angle_deg))
+    return np.array([[c, -s, 0.0, 0.0], [s, c, 0.0, 0.0],
+                     [0.0, 0.0, 1.0, dz], [0.0, 0.0, 0.0, 1.0]])
+
+
+def load_meshes(stl_dir=STL_DIR, parts=PARTS):
+    """Welded ``{part: (vertices, faces)}`` of the exported component STLs."""
+    meshes = {}
+    for name in parts:
+        path = os.path.join(stl_dir, f'{name}.stl')
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} missing; build the components first")
+        vertices, index, _ = weld(read_stl(path))
+        meshes[name] = (vertices, index.reshape(-1, 3))
+    return meshes
+
+
+def flatten(meshes, rows):
+    """One indexed mesh of every placement in ``rows``, unwelded across parts.
+
+    This is the copy-per-instance mesh that the instancing formats avoid;
+    it grows with the number of placements.
+    """
+    all_vertices, all_faces, offset = [], [], 0
+    for _, part, angle, dz in rows:
+        vertices, faces = meshes[part]
+        matrix = placement_matrix(angle, dz)
+        all_vertices.append(vertices @ matrix[:3, :3].T + matrix[:3, 3])
+        all_faces.append(faces + offset)
+        offset += len(vertices)
+    return np.concatenate(all_vertices), np.concatenate(all_faces)
+
+
+def tower_mesh(stl_dir=STL_DIR, n_segments=None, config=None):
+    """Flattened mesh of a stacked tower built from the exported component STLs.
+
+    ``n_segments`` and ``config`` are as for :func:`placements`.
+
+    Returns:
+        tuple: ``(vertices, faces)`` of all parts, unwelded across parts.
+    """
+    return flatten(load_meshes(stl_dir), placements(n_segments, config))
+
+
+def _mesh_xml(vertices, faces):
+    """3MF ``<mesh>`` element of one part, formatted in two string operations."""
+    vertex = '<vertex x="%.9g" y="%.9g" z="%.9g"/>'
+    triangle = '<triangle v1="%d" v2="%d" v3="%d"/>'
+    return ('<mesh><vertices>' + vertex * len(vertices) % tuple(vertices.ravel())
+            + '</vertices><triangles>' + triangle * len(faces) % tuple(faces.ravel())
+            + '</triangles></mesh>')
+
+
+def write_3mf(path, meshes, rows):
+    """3MF package: each part one mesh object, the tower one components object.
+
+    3MF transforms are row-vector matrices, so each component gets the
+    transposed rotation followed by the translation.
+    """
+    ids = {name: i for i, name in enumerate(meshes, start=1)}
+    objects = [f'<object id="{ids[name]}" type="model" name="{name}">'
+               f'{_mesh_xml(*meshes[name])}</object>' for name in meshes]
+    components = []
+    for _, part, angle, dz in rows:
+        matrix = placement_matrix(angle, dz)
+        values = np.vstack([matrix[:3, :3].T, matrix[:3, 3]]).ravel()
+        components.append(f'<component objectid="{ids[part]}" transform="'
+                          + ' '.join(f'{v:.9g}' for v in values) + '"/>')
+    tower = len(meshes) + 1
+    model = (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+             f'<model unit="millimeter" xml:lang="en-US" xmlns="{_3MF_NS}">'
+             f'<metadata name="Title">golden-tower assembly</metadata><resources>'
+             + ''.join(objects)
+             + f'<object id="{tower}" type="model" name="tower"><components>'
+             + ''.join(components)
+             + f'</components></object></resources><build><item objectid="{tower}"/>'
+             '</build></model>')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('[Content_Types].xml', _3MF_CONTENT_TYPES)
+        package.writestr('_rels/.rels', _3MF_RELS)
+        package.writestr('3D/3dmodel.model', model)
+
+
+def write_glb(path, meshes, rows):
+    """Binary glTF: each part one mesh, each placement one node referencing it."""
+    blob, views, accessors, gltf_meshes = bytearray(), [], [], []
+    for name, (vertices, faces) in meshes.items():
+        positions = vertices.astype('<f4')
+        for data, target, accessor in (
+                (positions, 34962, {'componentType': 5126, 'type': 'VEC3',
+                                    'count': len(positions),
+                                    'min': positions.min(axis=0).tolist(),
+                                    'max': positions.max(axis=0).tolist()}),
+                (faces.astype('<u4'), 34963, {'componentType': 5125, 'type': 'SCALAR',
+                                              'count': faces.size})):
+            views.append({'buffer': 0, 'byteOffset': len(blob),
+                          'byteLength': data.nbytes, 'target': target})
+            accessors.append({'bufferView': len(views) - 1, **accessor})
+            blob += data.tobytes()  # 4-byte types: every view stays aligned
+        gltf_meshes.append({'name': name, 'primitives': [{
+            'attributes': {'POSITION': len(accessors) - 2},
+            'indices': len(accessors) - 1}]})
+    mesh_index = {name: i for i, name in enumerate(meshes)}
+    # glTF matrices are column-major
+    nodes = [{'name': 'tower', 'children': list(range(1, len(rows) + 1)), **_GLTF_ROOT}]
+    nodes += [{'name': instance, 'mesh': mesh_index[part],
+               'matrix': placement_matrix(angle, dz).T.ravel().tolist()}
+              for instance, part, angle, dz in rows]
+    document = {'asset': {'version': '2.0', 'generator': 'golden-tower assembly.py'},
+                'scene': 0, 'scenes': [{'nodes': [0]}], 'nodes': nodes,
+                'meshes': gltf_meshes, 'accessors': accessors, 'bufferViews': views,
+                'buffers': [{'byteLength': len(blob)}]}
+    text = json.dumps(document, separators=(',', ':')).encode()
+    text += b' ' * (-len(text) % 4)
+    blob += b'\0' * (-len(blob) % 4)
+    with open(path, 'wb') as fh:
+        fh.write(struct.pack('<4sII', b'glTF', 2, 12 + 8 + len(text) + 8 + len(blob)))
+        fh.write(struct.pack('<I4s', len(text), b'JSON') + text)
+        fh.write(struct.pack('<I4s', len(blob), b'BIN\0') + blob)
+
+
+def write_step(path, rows, step_dir=STEP_DIR):
+    """STEP assembly of the exported STEP parts, one instance per placement.
+
+    Every instance is the part's shape moved to its placement, so the
+    XCAF document holds each part once and the placements as references.
+    """
+    from build123d import Compound, Location, export_step, import_step
+    shapes = {}
+    for part in dict.fromkeys(part for _, part, _, _ in rows):
+        source = os.path.join(step_dir, f'{part}.step')
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"{source} missing; build the components first")
+        shapes[part] = import_step(source)
+    children = []
+    for instance, part, angle, dz in rows:
+        child = shapes[part].moved(Location((0, 0, dz), (0, 0, angle)))
+        child.label = instance
+        children.append(child)
+    export_step(Compound(label='tower', children=children), path)
+
+
+def _export(write, path):
+    """Run ``write(tmp)`` and move the file into place atomically."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def export_assembly(n_segments=None, formats=FORMATS, flat=False, stl_dir=STL_DIR,
+                    step_dir=STEP_DIR, out_dir=ASSEMBLY_DIR, config=None):
+    """Write the tower assembly to ``out_dir``/tower.<format>.
+
+    Args:
+        n_segments: Segments, the bottom one included (default: the
+            config's TARGET_SEGMENT_COUNT).
+        formats: Instancing formats to write (:data:`FORMATS`).
+        flat: Also write the flattened mesh as tower.stl.
+        config: :class:`~tower_config.TowerConfig` the parts were built
+            with (see :func:`read_config`); sets the stacking height and
+            rotation.
+
+    Returns:
+        list[dict]: Per file the ``format``, ``file``, ``bytes``,
+        ``seconds``, the ``instances`` placed and the ``triangles``
+        stored in the file (each unique part once, except the flat STL).
+    """
+    rows = placements(n_segments, config)
+    meshes = load_meshes(stl_dir) if flat or set(formats) & {'3mf', 'glb'} else {}
+    stored = sum(len(faces) for _, faces in meshes.values())
+    writers = {
+        '3mf': (lambda path: write_3mf(path, meshes, rows), stored),
+        'glb': (lambda path: write_glb(path, meshes, rows), stored),
+        'step': (lambda path: write_step(path, rows, step_dir), None),
+    }
+    if flat:
+        vertices, faces = flatten(meshes, rows)
+        writers['stl'] = (lambda path: write_stl(path, vertices, faces,
+                                                 b'golden-tower flattened assembly'),
+                          len(faces))
+    os.makedirs(out_dir, exist_ok=True)
+    results = []
+    for fmt in [f for f in FORMATS if f in formats] + (['stl'] if flat else []):
+        write, triangles = writers[fmt]
+        path = os.path.join(out_dir, f'tower.{fmt}')
+        t0 = time.perf_counter()
+        _export(write, path)
+        results.append({'format': fmt, 'file': path, 'bytes': os.path.getsize(path),
+                        'seconds': time.perf_counter() - t0, 'instances': len(rows),
+                        'triangles': triangles})
+    return results
+
+
+def print_rows(rows):
+    print(f"{'format':<6} {'size':>10} {'time':>8} {'instances':>9} {'triangles':>9}  file")
+    for row in rows:
+        triangles = '-' if row['triangles'] is None else row['triangles']
+        print(f"{row['format']:<6} {row['bytes'] / 1024:8.1f}KB {row['seconds']:7.2f}s "
+              f"{row['instances']:>9} {triangles:>9}  {os.path.relpath(row['file'])}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--segments', type=int,
+                        help="segments in the tower, the bottom one included "
+                             "(default: the config's TARGET_SEGMENT_COUNT)")
+    parser.add_argument('--variant',
+                        help="assemble the exports/variants/ build of this "
+                             "name, stacked with its config.json")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS),
+                        help="instancing formats to write (default: all)")
+    parser.add_argument('--flat', action='store_true',
+                        help="also write the flattened mesh as tower.stl")
+    parser.add_argument('--stl-dir',
+                        help="exported component STLs (default: exports/stl)")
+    parser.add_argument('--step-dir',
+                        help="exported component STEP files (default: exports/step)")
+    parser.add_argument('--out',
+                        help="output directory (default: exports/assembly)")
+    parser.add_argument('--json', action='store_true',
+                        help="print the rows as JSON")
+    args = parser.parse_args(argv)
+    args.root = EXPORT_DIR
+    if args.variant is not None:
+        from build_tower_build123d import variant_dir
+        try:
+            args.root = variant_dir(args.variant)
+        except ValueError as exc:
+            parser.error(str(exc))
+    args.stl_dir = args.stl_dir or os.path.join(args.root, 'stl')
+    args.step_dir = args.step_dir or os.path.join(args.root, 'step')
+    args.out = args.out or os.path.join(args.root, 'assembly')
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        rows = export_assembly(args.segments, args.formats, args.flat, args.stl_dir,
+                               args.step_dir, args.out, read_config(args.root))
+    except (FileNotFoundError, ValueError) as exc:
+        sys.exit(f"assembly.py: {exc}")
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_rows(rows)
@@ -0,0 +1,143 @@
+"""
+Preview Benchmark — Golden Tower
+================================
+Times each geometry engine on every component and compares volumes with
+the build123d B-rep, the reference geometry:
+
+- brep   build123d builders, uncached (components/*_build123d.py)
+- mesh   manifold3d preview (components/mesh_preview.py)
+- sdf    signed distance fields + marching cubes (components/sdf_preview.py)
+
+Engines whose optional dependency is not installed are left out.
+
+Usage:
+    python bench_preview.py
+    python bench_preview.py --voxel 0.5        # finer SDF grid
+    python bench_preview.py --draft --tower 20  # plus a 20-segment SDF tower
+"""
+
+import argparse
+import importlib
+import importlib.util
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+COMPONENTS = ('segment', 'bottom_segment', 'top_cap')
+
+# (module, function) of each B-rep builder, imported on first use
+BREP_BUILDERS = {
+    'segment': ('components.segment_build123d', 'build_segment'),
+    'bottom_segment': ('components.bottom_segment_build123d', 'build_bottom_segment'),
+    'top_cap': ('components.top_cap_build123d', 'build_top_cap'),
+}
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def bench_brep(name, draft=False):
+    """Build one component with build123d, bypassing the feature store."""
+    from components import feature_tree
+    module, func = BREP_BUILDERS[name]
+    build = getattr(importlib.import_module(module), func)
+    with feature_tree.feature_store(None):
+        part, seconds = _timed(lambda: build(draft=draft))
+    return {'seconds': seconds, 'volume': part.volume}
+
+
+def bench_mesh(name, draft=False):
+    from components.mesh_preview import MESH_BUILDERS
+    mesh, seconds = _timed(lambda: MESH_BUILDERS[name](draft=draft))
+    return {'seconds': seconds, 'volume': mesh.volume,
+            'watertight': mesh.is_watertight}
+
+
+def bench_sdf(name, draft=False, voxel=1.0):
+    from components.sdf_preview import build_sdf
+    mesh, seconds = _timed(lambda: build_sdf(name, voxel, draft))
+    return {'seconds': seconds, 'volume': mesh.volume,
+            'watertight': mesh.is_watertight}
+
+
+ENGINES = {'brep': bench_brep, 'mesh': bench_mesh, 'sdf': bench_sdf}
+
+# Optional dependency of each engine; missing ones are skipped
+ENGINE_DEPENDENCIES = {'brep': 'build123d', 'mesh': 'manifold3d', 'sdf': 'skimage'}
+
+
+def available_engines():
+    return [engine for engine, dep in ENGINE_DEPENDENCIES.items()
+            if importlib.util.find_spec(dep) is not None]
+
+
+def run_benchmark(components=COMPONENTS, engines=None, draft=False, voxel=1.0):
+    """Benchmark ``engines`` (default: all available) on ``components``.
+
+    Returns:
+        list[dict]: One row per (component, engine) with ``seconds``,
+        ``volume`` and, where the B-rep was built too, ``volume_error``
+        (relative to the B-rep volume).
+    """
+    engines = engines or available_engines()
+    rows = []
+    for name in components:
+        reference = None
+        for engine in engines:
+            kwargs = {'voxel': voxel} if engine == 'sdf' else {}
+            row = {'component': name, 'engine': engine, 'draft': draft}
+            row.update(ENGINES[engine](name, draft, **kwargs))
+            if engine == 'brep':
+                reference = row['volume']
+            if reference:
+                row['volume_error'] = row['volume'] / reference - 1.0
+            rows.append(row)
+    return rows
+
+
+def bench_tower(n_segments, voxel=4.0, draft=True):
+    """Time a whole-tower SDF preview mesh."""
+    from components.sdf_preview import build_tower_sdf
+    mesh, seconds = _timed(lambda: build_tower_sdf(n_segments, voxel, draft))
+    return {'segments': n_segments, 'seconds': seconds, 'faces': len(mesh.faces),
+            'watertight': mesh.is_watertight}
+
+
+def print_rows(rows):
+    print(f"{'component':<16} {'engine':<6} {'time':>9} {'volume mm³':>12} "
+          f"{'vs brep':>8}  watertight")
+    for row in rows:
+        error = row.get('volume_error')
+        error = '' if error is None or row['engine'] == 'brep' else f"{error:+.2%}"
+        print(f"{row['component']:<16} {row['engine']:<6} {row['seconds']:8.2f}s "
+              f"{row['volume']:12.1f} {error:>8}  {row.get('watertight', '')}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES),
+                        help="engines to run (default: all installed)")
+    parser.add_argument('--components', nargs='+', choices=COMPONENTS,
+                        default=list(COMPONENTS))
+    parser.add_argument('--draft', action='store_true',
+                        help="skip fine features in every engine")
+    parser.add_argument('--voxel', type=float, default=1.0,
+                        help="SDF voxel size in mm (default: 1.0)")
+    parser.add_argument('--tower', type=int, metavar='N',
+                        help="also mesh an N-segment tower with the SDF engine")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print_rows(run_benchmark(args.components, args.engines, args.draft, args.voxel))
+    if args.tower:
+        result = bench_tower(args.tower)
+        print(f"\n{args.tower}-segment SDF tower: {result['seconds']:.2f}s, "
+              f"{result['faces']} faces, watertight={result['watertight']}")
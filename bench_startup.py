@@ -0,0 +1,112 @@
+"""
+Startup Benchmark — Golden Tower
+================================
+Times the entry points that should start without the CAD kernel, each in
+a fresh interpreter, and reports whether any of them loaded OCC anyway:
+
+- parameter modules (tower_config, components.constraints),
+- the golden_tower.py validate / analyze commands,
+- the parameter-only tests (``pytest -m "not cad"``),
+
+next to ``import build123d`` as the reference cost being avoided. Heavy
+modules are detected from a separate ``python -X importtime`` run, so
+the timed runs carry no tracing overhead.
+
+Usage:
+    python bench_startup.py
+    python bench_startup.py --repeat 10 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Top-level packages that only CAD work should pull in
+HEAVY_MODULES = ('OCP', 'build123d', 'bpy')
+
+# Test modules that exercise parameters and constraints only
+PARAM_TESTS = ('tests/test_geometry.py', 'tests/test_assembly.py',
+               'tests/test_interlock.py', 'tests/test_printability.py',
+               'tests/test_constraints.py', 'tests/test_tower_config.py')
+
+# (label, interpreter arguments) of every timed entry point
+ENTRY_POINTS = [
+    ('import tower_config', ['-c', 'import tower_config']),
+    ('import components.constraints', ['-c', 'import components.constraints']),
+    ('import build_tower_build123d', ['-c', 'import build_tower_build123d']),
+    ('golden_tower.py --help', ['golden_tower.py', '--help']),
+    ('golden_tower.py validate', ['golden_tower.py', 'validate']),
+    ('golden_tower.py analyze --basic', ['golden_tower.py', 'analyze', '--basic']),
+    ('pytest -m "not cad" (param tests)',
+     ['-m', 'pytest', '-q', '-m', 'not cad', '-p', 'no:cacheprovider', *PARAM_TESTS]),
+    ('import build123d (reference)', ['-c', 'import build123d']),
+]
+
+
+def _run(args, trace=False):
+    cmd = [sys.executable, *(['-X', 'importtime'] if trace else []), *args]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=SCRIPT_DIR, capture_output=True, text=True)
+    return proc, time.perf_counter() - t0
+
+
+def heavy_imports(args):
+    """Names in :data:`HEAVY_MODULES` that running ``args`` imports."""
+    proc, _ = _run(args, trace=True)
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            loaded.add(line.rsplit('|', 1)[1].strip().split('.')[0])
+    return sorted(loaded & set(HEAVY_MODULES))
+
+
+def run_benchmark(entry_points=ENTRY_POINTS, repeat=3):
+    """Time every entry point ``repeat`` times in fresh processes.
+
+    Returns:
+        list[dict]: One row per entry point with the median and fastest
+        wall time (s), the exit status and the heavy modules it loaded.
+    """
+    rows = []
+    for label, args in entry_points:
+        times, status = [], 0
+        for _ in range(repeat):
+            proc, seconds = _run(args)
+            times.append(seconds)
+            status = status or proc.returncode
+        rows.append({'entry': label, 'median': statistics.median(times),
+                     'min': min(times), 'status': status,
+                     'heavy': heavy_imports(args)})
+    return rows
+
+
+def print_rows(rows):
+    print(f"{'entry point':<36} {'median':>8} {'min':>8}  loads")
+    for row in rows:
+        status = '' if row['status'] == 0 else f"  (exit {row['status']})"
+        print(f"{row['entry']:<36} {row['median']:7.2f}s {row['min']:7.2f}s  "
+              f"{', '.join(row['heavy']) or '-'}{status}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timed runs per entry point (default: 3)")
+    parser.add_argument('--json', action='store_true',
+                        help="print the rows as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    rows = run_benchmark(repeat=args.repeat)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_rows(rows)
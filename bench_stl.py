@@ -0,0 +1,118 @@
+"""
+STL I/O Benchmark — Golden Tower
+================================
+Times the array STL writer and the memory-mapped reader (mesh_arrays.py)
+on the full-tower assembly mesh: the exported bottom segment,
+``TARGET_SEGMENT_COUNT - 1`` segments (each turned
+INTERLOCK_ROTATION_DEG from the one below) and the top cap, flattened
+by assembly.tower_mesh. When trimesh is installed, its STL export (from
+the same arrays) and load are timed as well: the path STLs took before.
+
+- write   mesh_arrays.write_stl from vertex/face arrays
+- map     mesh_arrays.map_stl, the zero-copy view alone
+- scan    map_stl plus one pass over every vertex (reads each page)
+
+Throughput is file MB and million triangles per second of the fastest
+run. The file is read back from the page cache, as it is right after an
+export.
+
+Usage:
+    python bench_stl.py                      # needs exports/stl from a build
+    python bench_stl.py --segments 40 --repeat 5 --json
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from assembly import tower_mesh
+from mesh_arrays import map_stl, write_stl
+from tower_params import TARGET_SEGMENT_COUNT
+
+STL_DIR = os.path.join(SCRIPT_DIR, 'exports', 'stl')
+
+
+def _best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def _scan(path):
+    corners = map_stl(path)['vertices']
+    return corners.min(), corners.max()
+
+
+def run_benchmark(stl_dir=STL_DIR, n_segments=TARGET_SEGMENT_COUNT, repeat=3):
+    """Time STL writing and reading of the tower mesh.
+
+    Returns:
+        list[dict]: One row per operation with the fastest ``seconds``,
+        file ``mb_per_s`` and ``mtri_per_s`` and the ``triangles`` and
+        file ``bytes`` it moved.
+    """
+    vertices, faces = tower_mesh(stl_dir, n_segments)
+    operations = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tower.stl')
+        operations.append(('write', _best(
+            lambda: write_stl(path, vertices, faces, b'golden-tower assembly'), repeat)))
+        operations.append(('map', _best(lambda: map_stl(path), repeat)))
+        operations.append(('scan', _best(lambda: _scan(path), repeat)))
+        if importlib.util.find_spec('trimesh'):
+            import trimesh
+            trimesh_path = os.path.join(tmp, 'trimesh.stl')
+            # A fresh mesh per run: trimesh caches normals after an export
+            operations.append(('trimesh export', _best(
+                lambda: trimesh.Trimesh(vertices, faces, process=False).export(
+                    trimesh_path), repeat)))
+            operations.append(('trimesh load', _best(
+                lambda: trimesh.load(trimesh_path), repeat)))
+        size = os.path.getsize(path)
+    return [{'operation': label, 'seconds': seconds, 'triangles': len(faces),
+             'bytes': size, 'mb_per_s': size / 1e6 / seconds if seconds else math.inf,
+             'mtri_per_s': len(faces) / 1e6 / seconds if seconds else math.inf}
+            for label, seconds in operations]
+
+
+def print_rows(rows):
+    if rows:
+        print(f"Tower mesh: {rows[0]['triangles']} triangles, "
+              f"{rows[0]['bytes'] / 1e6:.1f} MB binary STL")
+    print(f"{'operation':<16} {'time':>9} {'MB/s':>9} {'Mtri/s':>8}")
+    for row in rows:
+        print(f"{row['operation']:<16} {row['seconds'] * 1e3:7.1f}ms "
+              f"{row['mb_per_s']:9.0f} {row['mtri_per_s']:8.1f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--stl-dir', default=STL_DIR,
+                        help="exported component STLs (default: exports/stl)")
+    parser.add_argument('--segments', type=int, default=TARGET_SEGMENT_COUNT,
+                        help=f"segments in the tower (default: {TARGET_SEGMENT_COUNT})")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timed runs per operation (default: 3)")
+    parser.add_argument('--json', action='store_true',
+                        help="print the rows as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    rows = run_benchmark(args.stl_dir, args.segments, args.repeat)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_rows(rows)
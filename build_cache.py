@@ -0,0 +1,245 @@
+"""
+Build Cache — Golden Tower
+==========================
+Content-addressed on-disk cache for finished component Parts.
+
+Each entry is a native OCC BREP file whose name is derived from:
+- the values of the parameters (tower_config.TowerConfig) the builder
+  actually reads,
+- the source of the builder module and any project-local modules it
+  imports, and
+- the build123d / OCP versions that produced the B-rep.
+
+Changing ``CAP_OVERHANG`` therefore only invalidates the top cap; the two
+segment builders never reference it and keep loading from cache.
+
+Usage:
+    cache = BuildCache()
+    part = cache.get_or_build('top_cap', 'components.top_cap_build123d',
+                              'build_top_cap')
+    print(cache.summary())
+"""
+
+import ast
+import hashlib
+import importlib
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+COMPONENTS_DIR = os.path.join(PROJECT_ROOT, 'components')
+CACHE_DIR = os.path.join(PROJECT_ROOT, 'exports', 'cache')
+
+# Bump to invalidate every entry when the key scheme itself changes
+CACHE_FORMAT = 3
+
+
+def param_values():
+    """Return ``{name: value}`` for every public constant in tower_params."""
+    import tower_params
+    return {
+        name: value for name, value in vars(tower_params).items()
+        if name.isupper() and not name.startswith('_')
+    }
+
+
+def is_project_source(path):
+    """True if ``path`` is one of this project's source files.
+
+    A virtualenv kept inside the checkout (README: ``venv/``) is not
+    project source, nor is any ``site-packages``/``dist-packages`` tree
+    or interpreter prefix below :data:`PROJECT_ROOT`.
+    """
+    path = os.path.abspath(path)
+    if not path.startswith(PROJECT_ROOT + os.sep):
+        return False
+    parts = os.path.relpath(path, PROJECT_ROOT).split(os.sep)
+    if 'site-packages' in parts or 'dist-packages' in parts:
+        return False
+    prefixes = {os.path.abspath(p) for p in (sys.prefix, sys.exec_prefix, sys.base_prefix)}
+    return not any(p.startswith(PROJECT_ROOT + os.sep) and path.startswith(p + os.sep)
+                   for p in prefixes)
+
+
+def _module_path(module_name):
+    """Resolve a project-local module name to its source file, or None."""
+    rel = module_name.replace('.', os.sep) + '.py'
+    for base in (PROJECT_ROOT, COMPONENTS_DIR):
+        path = os.path.join(base, rel)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def source_files(module_name):
+    """Return the builder module's source file plus every project-local
+    module it (transitively) imports, excluding tower_params whose values
+    are hashed instead of its source.
+    """
+    seen = []
+    pending = [module_name]
+    while pending:
+        path = _module_path(pending.pop())
+        if path is None or path in seen:
+            continue
+        seen.append(path)
+        with open(path) as fh:
+            tree = ast.parse(fh.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                pending.append(node.module)
+    return sorted(p for p in seen
+                  if os.path.basename(p) != 'tower_params.py')
+
+
+def _names_in(node):
+    """Bare names and attribute names referenced anywhere under ``node``."""
+    found = set()
+    for sub in ast.walk(node):
+        if isinstance(sub, ast.Name):
+            found.add(sub.id)
+        elif isinstance(sub, ast.Attribute):
+            found.add(sub.attr)
+    return found
+
+
+def params_read(paths, names=None):
+    """Return the sorted parameter names referenced in ``paths``.
+
+    ``names`` defaults to the tower_params constants. Both bare names
+    (``SEGMENT_HEIGHT``) and attribute access (``cfg.SEGMENT_HEIGHT``)
+    count as reads. A module-level constant
+    (``CAP_OUTER_R = SEGMENT_OUTER_RADIUS + CAP_OVERHANG``) only passes its
+    params on if some function or other statement uses it, so a shared
+    dimensions module does not tie every builder to every param.
+    """
+    names = set(param_values()) if names is None else set(names)
+    defs, roots = {}, set()
+    for path in paths:
+        with open(path) as fh:
+            tree = ast.parse(fh.read(), filename=path)
+        for stmt in tree.body:
+            targets = stmt.targets if isinstance(stmt, ast.Assign) else []
+            if targets and all(isinstance(t, ast.Name) for t in targets):
+                for target in targets:
+                    defs.setdefault(target.id, set()).update(_names_in(stmt.value))
+            else:
+                roots |= _names_in(stmt)
+
+    used, pending = set(), list(roots)
+    while pending:
+        name = pending.pop()
+        if name not in used:
+            used.add(name)
+            pending.extend(defs.get(name, ()))
+    return sorted(used & names)
+
+
+def kernel_version():
+    """Version string of the CAD stack that produced a cached B-rep."""
+    from importlib.metadata import PackageNotFoundError, version
+    parts = []
+    for dist in ('build123d', 'cadquery-ocp', 'cadquery-ocp-novtk'):
+        try:
+            parts.append(f"{dist}={version(dist)}")
+        except PackageNotFoundError:
+            pass
+    return ';'.join(parts)
+
+
+def cache_key(module_name, builder_name, extra=None, config=None):
+    """Content hash identifying one builder's output.
+
+    Args:
+        module_name: Import path of the component module.
+        builder_name: Name of the ``build_*`` function in that module.
+        extra: Optional JSON-serialisable builder arguments.
+        config: TowerConfig being built (default: the module constants).
+            Only the values of parameters the sources read are hashed;
+            derived ones carry their inputs.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    from tower_config import PARAMETER_NAMES, TowerConfig
+    config = config or TowerConfig()
+    paths = source_files(module_name)
+    h = hashlib.sha256()
+    h.update(json.dumps({
+        'format': CACHE_FORMAT,
+        'builder': f"{module_name}.{builder_name}",
+        'kernel': kernel_version(),
+        'params': {n: getattr(config, n)
+                   for n in params_read(paths, PARAMETER_NAMES)},
+        'extra': extra,
+    }, sort_keys=True, default=repr).encode())
+    for path in paths:
+        with open(path, 'rb') as fh:
+            h.update(os.path.relpath(path, PROJECT_ROOT).encode())
+            h.update(fh.read())
+    return h.hexdigest()
+
+
+class BuildCache:
+    """On-disk BREP cache with hit/miss bookkeeping."""
+
+    def __init__(self, cache_dir=CACHE_DIR, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.hits = []
+        self.misses = []
+
+    def path_for(self, name, key):
+        return os.path.join(self.cache_dir, f"{name}-{key[:20]}.brep")
+
+    def load(self, path):
+        from build123d import Part, import_brep
+        return Part(import_brep(path).wrapped)
+
+    def store(self, part, path):
+        """Write atomically so concurrent workers never see partial files."""
+        from build123d import export_brep
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        export_brep(part, tmp)
+        os.replace(tmp, path)
+
+    def get_or_build(self, name, module_name, builder_name, **kwargs):
+        """Return the cached Part for this builder, building it on a miss.
+
+        ``kwargs`` go to the builder; a ``config`` among them keys the entry
+        by its parameter values.
+
+        Returns:
+            tuple: ``(part, hit)`` where ``hit`` is True if loaded from disk.
+        """
+        if not self.enabled:
+            builder = getattr(importlib.import_module(module_name), builder_name)
+            self.misses.append(name)
+            return builder(**kwargs), False
+
+        extra = {k: v for k, v in kwargs.items() if k != 'config'}
+        path = self.path_for(name, cache_key(module_name, builder_name,
+                                             extra or None, kwargs.get('config')))
+        if os.path.exists(path):
+            try:
+                part = self.load(path)
+            except Exception as exc:  # corrupt entry — rebuild below
+                print(f"  cache: discarding unreadable {path}: {exc}",
+                      file=sys.stderr)
+            else:
+                self.hits.append(name)
+                return part, True
+
+        builder = getattr(importlib.import_module(module_name), builder_name)
+        part = builder(**kwargs)
+        self.store(part, path)
+        self.misses.append(name)
+        return part, False
+
+    def summary(self):
+        return (f"{len(self.hits)} hit(s) {sorted(self.hits)}, "
+                f"{len(self.misses)} miss(es) {sorted(self.misses)}")
@@ -0,0 +1,511 @@
+"""
+Build Daemon — Golden Tower
+===========================
+A long-running local build server that keeps build123d and OCP loaded.
+Every build runs in a child forked from a warm fork server, so it starts
+in milliseconds instead of paying the multi-second kernel import, yet
+imports the project modules fresh from disk and always sees the current
+source. The fork server (multiprocessing's ``forkserver``, with
+WARM_MODULES preloaded) is single-threaded: children are never forked
+from the threaded socket server, whose handler threads may hold locks
+(logging, imports, the OCC allocator) a child would inherit held.
+
+The server watches the parameter modules (tower_params.py,
+components/dimensions.py) and the source of every component builder
+(components/*_build123d.py and the project modules they import).
+On a change it recomputes each component's BREP cache key
+(build_cache.py) and rebuilds only the components whose key moved. It
+exports their STL/STEP files, checks the meshes and publishes the
+metrics to <out>/metrics.json. The other components are left alone.
+
+Clients talk to it over a Unix socket, one JSON request per line and one
+JSON response per line. Requests queue and run one at a time; the
+components of one request build in up to ``--jobs`` children.
+Everything stays on the local machine.
+
+    {"cmd": "build", "components": ["top_cap"], "overrides": {"CAP_OVERHANG": 12},
+     "draft": false, "batched": false, "force": false, "wait": true}
+    {"cmd": "status"}
+    {"cmd": "stop"}
+
+Usage:
+    python build_daemon.py serve --jobs 2
+    python build_daemon.py build --set CAP_OVERHANG=12 --components top_cap
+    python build_daemon.py status
+    python build_daemon.py stop
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PROJECT_ROOT)
+
+from build_cache import CACHE_DIR, is_project_source, source_files
+
+EXPORT_DIR = os.path.join(PROJECT_ROOT, 'exports')
+SOCKET_PATH = os.path.join(EXPORT_DIR, 'build-daemon.sock')
+
+# Seconds between source polls, and quiet time before acting on a change
+# (editors and git write files in bursts)
+POLL_INTERVAL = 0.5
+DEBOUNCE = 0.3
+
+# Preloaded by the fork server so forked builds start warm
+WARM_MODULES = ('build123d', 'trimesh')
+
+
+# ── Work done in forked children ─────────────────────────────────────
+
+def _forget_project_modules():
+    """Drop project modules inherited from the server so they re-import.
+
+    Installed packages stay loaded, even from a venv inside the checkout:
+    the warm kernel is the point of forking.
+    """
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if path and is_project_source(path) and name not in ('__main__', __name__):
+            del sys.modules[name]
+
+
+def _child_main(conn, fn, args):
+    _forget_project_modules()
+    try:
+        conn.send(fn(*args))
+    except BaseException as exc:
+        conn.send({'error': f"{type(exc).__name__}: {exc}",
+                   'traceback': traceback.format_exc()})
+    finally:
+        conn.close()
+
+
+def _fork_server():
+    """The forkserver context, preloading :data:`WARM_MODULES` when it starts."""
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(list(WARM_MODULES))
+    return context
+
+
+def in_child(fn, *args):
+    """Run ``fn(*args)`` in a child of the warm fork server.
+
+    ``fn`` and ``args`` are pickled, so ``fn`` must be importable.
+
+    Returns:
+        The child's return value, or ``{'error': ..., 'traceback': ...}``
+        if it raised or died.
+    """
+    context = _fork_server()
+    receiver, sender = context.Pipe(duplex=False)
+    child = context.Process(target=_child_main, args=(sender, fn, args))
+    child.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = {'error': 'build process died without a result'}
+    child.join()
+    return result
+
+
+def plan(components, overrides, draft, batched, out_dir):
+    """Cache keys and output directory of one build request (in a child).
+
+    Returns:
+        dict: ``keys`` (component -> BREP cache key), ``out_dir`` and the
+        config ``key``.
+    """
+    from build_cache import cache_key
+    from build_tower_build123d import COMPONENTS, variant_dir
+    from tower_config import TowerConfig, coerce
+    config = TowerConfig(**{name: coerce(name, value)
+                            for name, value in overrides.items()})
+    specs = {name: (module, builder) for name, _, module, builder in COMPONENTS}
+    unknown = sorted(set(components) - set(specs))
+    if unknown:
+        raise ValueError(f"unknown component(s): {', '.join(unknown)}")
+    extra = {'batched': batched, 'draft': draft}
+    if out_dir is None:
+        out_dir = variant_dir(config.key[:12]) if overrides else EXPORT_DIR
+    return {'keys': {name: cache_key(*specs[name], extra, config)
+                     for name in components},
+            'out_dir': out_dir, 'config': config.key}
+
+
+def build_one(name, overrides, draft, batched, out_dir, cache_dir):
+    """Build, export and check one component (in a child).
+
+    Returns:
+        dict: :func:`build_tower_build123d.build_component` metrics plus
+        the mesh check of the exported STL.
+    """
+    from build_tower_build123d import build_component, check_meshes, output_dirs
+    from tower_config import TowerConfig, coerce
+    config = TowerConfig(**{n: coerce(n, v) for n, v in overrides.items()})
+    metrics = build_component(name, cache_dir, batched, draft, config, out_dir)
+    stl_dir, _, draft_stl_dir = output_dirs(out_dir)
+    mesh, = check_meshes(draft_stl_dir if draft else stl_dir, [name])
+    metrics['mesh'] = mesh
+    return metrics
+
+
+# ── Server ───────────────────────────────────────────────────────────
+
+def watched_files():
+    """The parameter modules plus every source file a component builder reads.
+
+    tower_config reads the parameter modules by path, so the import scan
+    of :func:`build_cache.source_files` does not find them all.
+    """
+    from build_tower_build123d import COMPONENTS
+    from tower_config import PARAM_MODULES
+    paths = {os.path.join(PROJECT_ROOT, module.replace('.', os.sep) + '.py')
+             for module in PARAM_MODULES}
+    for _, _, module, _ in COMPONENTS:
+        paths.update(source_files(module))
+    return sorted(paths)
+
+
+def snapshot(paths):
+    """``{path: mtime_ns}``; missing files map to None."""
+    stamps = {}
+    for path in paths:
+        try:
+            stamps[path] = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            stamps[path] = None
+    return stamps
+
+
+class BuildDaemon:
+    """Request queue, source watcher and build bookkeeping of the server.
+
+    Args:
+        out_dir: Exports root for default-parameter builds; override
+            builds go to their variant directory.
+        cache_dir: BREP cache directory, or None to always rebuild.
+        jobs: Components of one request built at once.
+        draft: Build drafts when a source change triggers the rebuild.
+        watch: Poll the sources and rebuild on change.
+    """
+
+    def __init__(self, out_dir=EXPORT_DIR, cache_dir=CACHE_DIR, jobs=1,
+                 draft=False, watch=True):
+        from build_tower_build123d import COMPONENTS
+        self.out_dir = out_dir
+        self.cache_dir = cache_dir
+        self.jobs = max(1, jobs)
+        self.draft = draft
+        self.watch = watch
+        self.components = [name for name, *_ in COMPONENTS]
+        self.queue = queue.Queue()
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.busy = None
+        self.published = {}   # (out_dir, draft, component) -> {key, metrics}
+        self.history = []     # finished request results, newest last
+        self.started = time.time()
+
+    # Requests -----------------------------------------------------------
+
+    def submit(self, request):
+        """Queue a build request; returns its job for :meth:`wait`."""
+        job = {'request': request, 'done': threading.Event(), 'result': None,
+               'queued': time.time()}
+        self.queue.put(job)
+        return job
+
+    def handle(self, request):
+        """Answer one client request (see the module docstring)."""
+        cmd = request.get('cmd')
+        if cmd == 'status':
+            return self.status()
+        if cmd == 'stop':
+            self.stopping.set()
+            return {'ok': True}
+        if cmd == 'build':
+            job = self.submit(request)
+            if not request.get('wait', True):
+                return {'ok': True, 'queued': self.queue.qsize()}
+            job['done'].wait()
+            return job['result']
+        return {'error': f"unknown command {cmd!r}"}
+
+    def status(self):
+        with self.lock:
+            published = {f"{'draft/' if draft else ''}{name} @ {out_dir}": entry
+                         for (out_dir, draft, name), entry in self.published.items()}
+            return {'ok': True, 'pid': os.getpid(),
+                    'uptime': time.time() - self.started,
+                    'queued': self.queue.qsize(), 'busy': self.busy,
+                    'published': published,
+                    'last': self.history[-1] if self.history else None}
+
+    # Building -----------------------------------------------------------
+
+    def run(self, request):
+        """Build the components of ``request`` whose cache key changed.
+
+        Returns:
+            dict: ``built`` (component -> metrics or error), ``unchanged``
+            component names, ``out_dir`` and timing.
+        """
+        t0 = time.time()
+        components = request.get('components') or self.components
+        overrides = request.get('overrides') or {}
+        draft = bool(request.get('draft', False))
+        batched = bool(request.get('batched', False))
+        planned = in_child(plan, components, overrides, draft, batched,
+                           request.get('out') or (None if overrides else self.out_dir))
+        if 'error' in planned:
+            return {'ok': False, 'error': planned['error'], 'seconds': time.time() - t0}
+        out_dir = planned['out_dir']
+
+        with self.lock:
+            stale = [name for name in components if request.get('force')
+                     or self.published.get((out_dir, draft, name), {}).get('key')
+                     != planned['keys'][name]]
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results = dict(zip(stale, pool.map(
+                lambda name: in_child(build_one, name, overrides, draft, batched,
+                                      out_dir, self.cache_dir), stale)))
+
+        with self.lock:
+            for name, metrics in results.items():
+                if 'error' not in metrics:
+                    self.published[(out_dir, draft, name)] = {
+                        'key': planned['keys'][name], 'metrics': metrics,
+                        'overrides': overrides, 'built': time.time()}
+        self._write_metrics(out_dir, draft)
+        ok = all('error' not in m and m['mesh']['watertight'] for m in results.values())
+        return {'ok': ok, 'out_dir': out_dir, 'draft': draft, 'built': results,
+                'unchanged': [n for n in components if n not in results],
+                'reason': request.get('reason', 'request'),
+                'seconds': time.time() - t0}
+
+    def _write_metrics(self, out_dir, draft):
+        """Publish the latest metrics of ``out_dir`` as metrics.json."""
+        with self.lock:
+            entries = {name: entry for (o, d, name), entry in self.published.items()
+                       if o == out_dir and d == draft}
+        if not entries:
+            return
+        os.makedirs(out_dir, exist_ok=True)
+        path = os.path.join(out_dir, 'draft-metrics.json' if draft else 'metrics.json')
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as fh:
+            json.dump(entries, fh, indent=2, sort_keys=True, default=str)
+        os.replace(tmp, path)
+
+    def _work(self):
+        while not self.stopping.is_set():
+            try:
+                job = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            self.busy = job['request']
+            try:
+                result = self.run(job['request'])
+            except Exception as exc:
+                result = {'ok': False, 'error': f"{type(exc).__name__}: {exc}"}
+            result['waited'] = time.time() - job['queued'] - result.get('seconds', 0.0)
+            self.busy = None
+            with self.lock:
+                self.history = (self.history + [result])[-20:]
+            job['result'] = result
+            job['done'].set()
+            _log(summarize(result))
+
+    def _watch(self):
+        paths = watched_files()
+        stamps = snapshot(paths)
+        while not self.stopping.wait(POLL_INTERVAL):
+            current = snapshot(paths)
+            if current == stamps:
+                continue
+            time.sleep(DEBOUNCE)
+            current = snapshot(paths)
+            changed = [os.path.relpath(p, PROJECT_ROOT) for p in paths
+                       if current[p] != stamps.get(p)]
+            _log(f"changed: {', '.join(changed)}")
+            stamps = current
+            self.submit({'cmd': 'build', 'draft': self.draft,
+                         'reason': f"changed {', '.join(changed)}"})
+            # A new import may have added a source file to watch
+            paths = watched_files()
+            stamps = snapshot(paths)
+
+    def serve(self, socket_path=SOCKET_PATH):
+        """Warm up, build once, then serve requests until stopped."""
+        t0 = time.time()
+        # Start the fork server (and its imports) before any thread exists
+        in_child(os.getpid)
+        _log(f"kernel warm in {time.time() - t0:.1f}s; listening on {socket_path}")
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                try:
+                    response = daemon.handle(json.loads(line))
+                except json.JSONDecodeError as exc:
+                    response = {'error': f"bad request: {exc}"}
+                self.wfile.write((json.dumps(response, default=_jsonable) + '\n').encode())
+
+        _claim_socket(socket_path)
+        server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+        server.daemon_threads = True
+        threads = [threading.Thread(target=self._work, daemon=True)]
+        if self.watch:
+            threads.append(threading.Thread(target=self._watch, daemon=True))
+            self.submit({'cmd': 'build', 'draft': self.draft, 'reason': 'startup'})
+        for thread in threads:
+            thread.start()
+        serving = threading.Thread(target=server.serve_forever, daemon=True)
+        serving.start()
+        try:
+            while not self.stopping.wait(0.2):
+                pass
+        except KeyboardInterrupt:
+            self.stopping.set()
+        finally:
+            server.shutdown()
+            server.server_close()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            _log("stopped")
+
+
+def _claim_socket(socket_path):
+    """Remove a stale socket file; refuse if a server still answers on it."""
+    if not os.path.exists(socket_path):
+        os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+        return
+    try:
+        request({'cmd': 'status'}, socket_path, timeout=2.0)
+    except OSError:
+        os.unlink(socket_path)
+    else:
+        raise RuntimeError(f"a build daemon is already running on {socket_path}")
+
+
+def _jsonable(value):
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def _log(message):
+    print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+
+
+def summarize(result):
+    if not result.get('ok') and 'error' in result:
+        return f"build failed: {result['error']}"
+    parts = []
+    for name, metrics in result['built'].items():
+        if 'error' in metrics:
+            parts.append(f"{name} ERROR {metrics['error']}")
+        else:
+            status = 'ok' if metrics['mesh']['watertight'] else 'NOT WATERTIGHT'
+            parts.append(f"{name} {metrics['build_time'] + metrics['export_time']:.1f}s {status}")
+    unchanged = f"; unchanged: {', '.join(result['unchanged'])}" if result['unchanged'] else ''
+    return (f"{result['reason']}: built {', '.join(parts) or 'nothing'}{unchanged} "
+            f"in {result['seconds']:.1f}s")
+
+
+# ── Client ───────────────────────────────────────────────────────────
+
+def request(payload, socket_path=SOCKET_PATH, timeout=None):
+    """Send one request to the daemon and return its response.
+
+    Raises:
+        OSError: no daemon is listening on ``socket_path``.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(payload) + '\n').encode())
+        with sock.makefile('rb') as fh:
+            line = fh.readline()
+    if not line:
+        raise ConnectionError("build daemon closed the connection")
+    return json.loads(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('action', choices=['serve', 'build', 'status', 'stop'])
+    parser.add_argument('--socket', default=SOCKET_PATH,
+                        help=f"Unix socket path (default: {SOCKET_PATH})")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="serve: components built at once (default: 1)")
+    parser.add_argument('--out', help="exports root (default: exports/)")
+    parser.add_argument('--cache', default=CACHE_DIR,
+                        help="serve: BREP build cache (default: exports/cache/)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="serve: ignore the BREP build cache")
+    parser.add_argument('--no-watch', action='store_true',
+                        help="serve: only build on request")
+    parser.add_argument('--draft', action='store_true',
+                        help="build drafts (serve: on source changes)")
+    parser.add_argument('--batched', action='store_true',
+                        help="build: multi-operand booleans")
+    parser.add_argument('--components', nargs='+',
+                        help="build: components to build (default: all)")
+    parser.add_argument('--set', metavar='NAME=VALUE', action='append',
+                        default=[], dest='settings',
+                        help="build: override one parameter (repeatable)")
+    parser.add_argument('--force', action='store_true',
+                        help="build: rebuild even if the cache key is unchanged")
+    parser.add_argument('--no-wait', action='store_true',
+                        help="build: queue the request and return")
+    return parser.parse_args(argv)
+
+
+def build_request(args):
+    """The ``build`` request of parsed :func:`parse_args` options."""
+    overrides = {}
+    for spec in args.settings:
+        name, _, value = spec.partition('=')
+        overrides[name.strip()] = value.strip()
+    payload = {'cmd': 'build', 'overrides': overrides, 'draft': args.draft,
+               'batched': args.batched, 'force': args.force,
+               'wait': not args.no_wait}
+    if args.components:
+        payload['components'] = args.components
+    if args.out:
+        payload['out'] = os.path.abspath(args.out)
+    return payload
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.action == 'serve':
+        BuildDaemon(os.path.abspath(args.out) if args.out else EXPORT_DIR,
+                    None if args.no_cache else args.cache, args.jobs, args.draft,
+                    not args.no_watch).serve(args.socket)
+        sys.exit(0)
+    payload = build_request(args) if args.action == 'build' else {'cmd': args.action}
+    try:
+        response = request(payload, args.socket)
+    except OSError as exc:
+        sys.exit(f"no build daemon on {args.socket} ({exc}); "
+                 f"start one with: python build_daemon.py serve")
+    if args.action == 'build' and 'built' in response:
+        print(summarize(response))
+    else:
+        print(json.dumps(response, indent=2))
+    sys.exit(0 if response.get('ok') else 1)
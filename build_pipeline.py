@@ -0,0 +1,370 @@
+"""
+Build Pipeline — Golden Tower
+=============================
+Streams every component through the build stages independently instead
+of running them phase by phase:
+
+    build ──> tessellate ──> stl
+          │              └─> validate
+          └─> step
+
+Each stage runs in its own worker processes (``jobs`` of them for build,
+one for each other stage), forked after build123d is imported so they
+start warm. A component moves on as soon as its stage finishes. The
+segment's STEP file is written while the top cap builds, and a mesh is
+checked as soon as it is tessellated. Parts travel between processes
+as pickled BREP data. The tessellate stage meshes each Part once into
+NumPy arrays (mesh_arrays.py), and the STL writer and the validator
+both take those arrays, so the checks see exactly the exported
+triangles without reading the STL back.
+
+The builders gate every Part with OCC shape analysis
+(components/brep_check.py), so a broken boolean fails the build stage
+before anything is tessellated or written.
+
+The parent process routes the parts and records, per stage, the busy
+time, how long parts waited in its queue and the queue depth. A stage
+with a deep queue is where the pipeline stalls. A worker that dies
+without reporting (a segfault in OCC, the OOM killer) fails the
+components it was working on instead of hanging the parent.
+
+Usage:
+    python build_tower_build123d.py --pipeline --jobs 2
+    python build_pipeline.py --draft --components segment top_cap
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import time
+import traceback
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PROJECT_ROOT)
+
+from build_cache import CACHE_DIR
+from build_tower_build123d import (
+    COMPONENTS, EXPORT_DIR, _export, output_dirs, stl_header, stl_mesh,
+)
+
+
+# Seconds the parent waits for an event before checking its workers
+POLL_INTERVAL = 1.0
+
+
+# ── Stages ───────────────────────────────────────────────────────────
+# Each takes (name, part, settings) and returns (part for the next
+# stages, metrics to merge into the component's result).
+
+def _build(name, _, settings):
+    from build123d import Part
+    from build_cache import BuildCache
+    from components import feature_tree
+    from components.booleans import PHASE_TIMES
+    _, _, module_name, builder_name = next(c for c in COMPONENTS if c[0] == name)
+    cache_dir = settings['cache_dir']
+    cache = BuildCache(cache_dir or CACHE_DIR, enabled=cache_dir is not None)
+    store = None if cache_dir is None else os.path.join(cache_dir, 'features')
+    with feature_tree.feature_store(store):
+        part, cache_hit = cache.get_or_build(name, module_name, builder_name,
+                                             config=settings['config'],
+                                             batched=settings['batched'],
+                                             draft=settings['draft'])
+    features = [] if cache_hit else [
+        (feature, status, PHASE_TIMES[name][feature])
+        for feature, status in feature_tree.FEATURE_LOG.get(name, [])
+    ]
+    bb = part.bounding_box()
+    # A bare Part drops the boolean history, which does not pickle
+    return Part(part.wrapped), {
+        'volume': part.volume, 'bbox': (tuple(bb.min), tuple(bb.max)),
+        'cache_hit': cache_hit, 'features': features,
+        'brep': None if cache_hit else feature_tree.BREP_LOG.get(name)}
+
+
+def _tessellate(name, part, settings):
+    *mesh, groups = stl_mesh(part, name, settings['draft'], settings['config'],
+                             settings['mesh_settings'])
+    return mesh, {'triangles': len(mesh[1]), 'mesh_groups': groups}
+
+
+def _write_stl(name, mesh, settings):
+    from mesh_arrays import write_stl
+    stl_dir, _, draft_stl_dir = output_dirs(settings['out_dir'])
+    stl_dir = draft_stl_dir if settings['draft'] else stl_dir
+    os.makedirs(stl_dir, exist_ok=True)
+    vertices, faces, _ = mesh
+    header = stl_header(name, settings['draft'])
+    _export(lambda path: write_stl(path, vertices, faces, header),
+            os.path.join(stl_dir, f'{name}.stl'))
+    return None, {}
+
+
+def _write_step(name, part, settings):
+    from build123d import export_step
+    _, step_dir, _ = output_dirs(settings['out_dir'])
+    os.makedirs(step_dir, exist_ok=True)
+    _export(lambda path: export_step(part, path),
+            os.path.join(step_dir, f'{name}.step'))
+    return None, {}
+
+
+def _validate(name, mesh, settings):
+    from mesh_arrays import check_arrays
+    vertices, faces, repaired = mesh
+    return None, {'mesh': {'file': f'{name}.stl', 'draft': settings['draft'],
+                           **check_arrays(vertices, faces), 'repaired': repaired}}
+
+
+# (stage, function, next stages), in pipeline order
+STAGES = [
+    ('build', _build, ('tessellate', 'step')),
+    ('tessellate', _tessellate, ('stl', 'validate')),
+    ('stl', _write_stl, ()),
+    ('step', _write_step, ()),
+    ('validate', _validate, ()),
+]
+
+
+def _worker(stage, function, inbox, events, settings):
+    for name, part in iter(inbox.get, None):
+        events.put(('start', stage, name, time.time(), os.getpid()))
+        try:
+            result = function(name, part, settings)
+            events.put(('done', stage, name, time.time(), result))
+        except Exception:
+            events.put(('error', stage, name, time.time(), traceback.format_exc()))
+
+
+def _dead_workers(workers, in_flight):
+    """Describe every worker that has exited, with what it was running.
+
+    Workers only exit on their shutdown sentinel, so before that an exit
+    code means a crash that :func:`_worker` could not report. A crash
+    can also lose the worker's unsent ``start`` event, so without a
+    component known to be running on it, those its stage never reported
+    started are the lost ones.
+
+    Args:
+        workers: ``(stage, process)`` pairs.
+        in_flight: ``{(stage, component): worker pid}`` of every item sent
+            to a stage and not finished; the pid is None until it starts.
+
+    Returns:
+        list[str]: One line per lost component, or per dead idle worker.
+    """
+    lines = []
+    for stage, worker in workers:
+        if worker.exitcode is None:
+            continue
+        died = f"worker {worker.pid} died (exit code {worker.exitcode})"
+        lost = (sorted(name for (s, name), pid in in_flight.items() if pid == worker.pid)
+                or sorted(name for (s, name), pid in in_flight.items()
+                          if s == stage and pid is None))
+        lines += [f"{stage} failed for {name}: {died}" for name in lost] or [
+            f"{stage} {died}"]
+    return lines
+
+
+class _StageStats:
+    """Queue depth and timing bookkeeping of one stage (parent side)."""
+
+    def __init__(self, workers, t0):
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.wait = 0.0
+        self.depth = 0
+        self.max_depth = 0
+        self.depth_area = 0.0   # queue depth integrated over time
+        self.last = t0
+        self.queued = {}        # component -> time it entered the queue
+        self.started = {}
+
+    def _advance(self, now):
+        self.depth_area += self.depth * (now - self.last)
+        self.last = now
+
+    def put(self, name, now):
+        self._advance(now)
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+        self.queued[name] = now
+
+    def start(self, name, now):
+        self._advance(now)
+        self.depth -= 1
+        self.wait += now - self.queued[name]
+        self.started[name] = now
+
+    def finish(self, name, now):
+        self.items += 1
+        self.busy += now - self.started[name]
+        return now - self.started[name]
+
+    def report(self, end, wall):
+        self._advance(end)
+        return {'workers': self.workers, 'items': self.items,
+                'busy': self.busy, 'wait': self.wait,
+                'max_depth': self.max_depth,
+                'mean_depth': self.depth_area / wall if wall else 0.0,
+                'utilization': self.busy / (wall * self.workers) if wall else 0.0}
+
+
+def run_pipeline(names=None, config=None, out_dir=EXPORT_DIR, jobs=1,
+                 cache_dir=CACHE_DIR, batched=False, draft=False, log=print,
+                 mesh_settings=None):
+    """Build, tessellate, export and check components as a pipeline.
+
+    Args:
+        names: Components to build (default: all of :data:`COMPONENTS`).
+        config: :class:`~tower_config.TowerConfig` to build, or None for
+            the module constants.
+        out_dir: Root of the ``stl``/``step``/``draft/stl`` directories.
+        jobs: Build stage worker processes.
+        cache_dir: BREP cache directory, or None to always rebuild.
+        batched, draft: As for
+            :func:`build_tower_build123d.build_component`; drafts skip
+            the STEP stage.
+        log: Called with one progress line per finished stage.
+        mesh_settings: Per-class tessellation overrides
+            (:func:`build_tower_build123d.stl_mesh`).
+
+    Returns:
+        tuple: ``(results, stages)`` -- per component the
+        :func:`~build_tower_build123d.build_component` metrics plus
+        ``triangles``, ``mesh`` (a :func:`check_meshes`-style row from
+        :func:`mesh_arrays.check_arrays`) and
+        ``stages`` (stage -> seconds); per stage the ``workers``, ``items``,
+        ``busy`` and ``wait`` seconds, ``max_depth``, time-averaged
+        ``mean_depth`` and ``utilization`` of its queue, plus ``wall``.
+
+    Raises:
+        RuntimeError: A stage failed; carries the worker's traceback, or
+            names the components lost with a worker that died.
+    """
+    # Imported once, before forking, so every worker starts warm
+    import build123d  # noqa: F401
+    from tower_config import TowerConfig
+    names = names or [name for name, *_ in COMPONENTS]
+    settings = {'config': config or TowerConfig(), 'out_dir': out_dir,
+                'cache_dir': cache_dir, 'batched': batched, 'draft': draft,
+                'mesh_settings': mesh_settings}
+    context = multiprocessing.get_context('fork')
+    events = context.Queue()
+    inboxes, workers = {}, []
+    t0 = time.time()
+    stats = {}
+    for stage, function, _ in STAGES:
+        if draft and stage == 'step':
+            continue
+        count = max(1, jobs) if stage == 'build' else 1
+        inboxes[stage] = context.Queue()
+        stats[stage] = _StageStats(count, t0)
+        for _ in range(count):
+            workers.append((stage, context.Process(
+                target=_worker, daemon=True,
+                args=(stage, function, inboxes[stage], events, settings))))
+    for _, worker in workers:
+        worker.start()
+
+    successors = {stage: [s for s in after if s in inboxes]
+                  for stage, _, after in STAGES}
+    results = {name: {'name': name, 'stages': {}} for name in names}
+    in_flight = {}
+
+    def send(stage, name, part):
+        stats[stage].put(name, time.time())
+        inboxes[stage].put((name, part))
+        in_flight[stage, name] = None
+
+    for name in names:
+        send('build', name, None)
+    error = None
+    try:
+        while in_flight:
+            try:
+                kind, stage, name, now, payload = events.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                dead = _dead_workers(workers, in_flight)
+                if dead:
+                    error = '\n'.join([error, *dead] if error else dead)
+                    break
+                continue
+            if kind == 'start':
+                stats[stage].start(name, now)
+                in_flight[stage, name] = payload
+                continue
+            del in_flight[stage, name]
+            seconds = stats[stage].finish(name, now)
+            results[name]['stages'][stage] = seconds
+            if kind == 'error':
+                error = error or f"{stage} failed for {name}:\n{payload}"
+                continue
+            part, metrics = payload
+            results[name].update(metrics)
+            log(f"  {stage:<10} {name:<16} {seconds:6.2f}s")
+            for successor in successors[stage]:
+                send(successor, name, part)
+    finally:
+        for stage, inbox in inboxes.items():
+            for _ in range(stats[stage].workers):
+                inbox.put(None)
+        for _, worker in workers:
+            worker.join(timeout=30)
+            if worker.is_alive():
+                worker.terminate()
+    if error:
+        raise RuntimeError(error)
+
+    end = time.time()
+    wall = end - t0
+    for metrics in results.values():
+        times = metrics['stages']
+        metrics['build_time'] = times['build']
+        metrics['export_time'] = sum(times.get(s, 0.0) for s in ('tessellate', 'stl', 'step'))
+    report = {stage: stat.report(end, wall) for stage, stat in stats.items()}
+    report['wall'] = wall
+    return results, report
+
+
+def print_stages(report):
+    """Print the per-stage timing and queue depth table of :func:`run_pipeline`."""
+    print(f"\n{'stage':<10} {'workers':>7} {'items':>5} {'busy':>8} {'wait':>8} "
+          f"{'max q':>5} {'mean q':>6} {'util':>5}")
+    for stage, row in report.items():
+        if stage == 'wall':
+            continue
+        print(f"{stage:<10} {row['workers']:>7} {row['items']:>5} "
+              f"{row['busy']:7.2f}s {row['wait']:7.2f}s {row['max_depth']:>5} "
+              f"{row['mean_depth']:6.2f} {row['utilization']:5.0%}")
+    print(f"Pipeline wall time: {report['wall']:.1f}s")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="build stage worker processes (default: 1)")
+    parser.add_argument('--components', nargs='+',
+                        choices=[name for name, *_ in COMPONENTS],
+                        help="components to build (default: all)")
+    parser.add_argument('--out', default=EXPORT_DIR,
+                        help="exports root (default: exports/)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the BREP build cache")
+    parser.add_argument('--batched', action='store_true',
+                        help="multi-operand booleans")
+    parser.add_argument('--draft', action='store_true',
+                        help="gross shape only, coarse STLs, no STEP")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results, report = run_pipeline(args.components, None, args.out, args.jobs,
+                                   None if args.no_cache else CACHE_DIR,
+                                   args.batched, args.draft)
+    print_stages(report)
+    sys.exit(0 if all(m['mesh']['watertight'] for m in results.values()) else 1)
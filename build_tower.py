@@ -7,7 +7,7 @@ Main build script that generates all tower components, exports STL and
 Usage:
     blender --background --python build_tower.py
 
-For mesh validation only (standalone Python with trimesh):
+For mesh validation only (standalone Python with NumPy):
     source venv/bin/activate
     python build_tower.py --validate-only
 """
@@ -91,14 +91,14 @@ def build_and_export_all():
 
 
 def validate_meshes():
-    """Run basic mesh validation on all exported STLs using trimesh.
+    """Run basic mesh validation on all exported STLs (mesh_repair.py).
 
     This runs in standalone Python (not Blender) — requires the venv.
+    Repaired copies go to exports/repaired/; the exports are not rewritten.
     """
-    import trimesh
-    import numpy as np
+    from mesh_repair import repair_file, repaired_dir
     print("\n" + "=" * 60)
-    print("MESH VALIDATION (trimesh)")
+    print("MESH VALIDATION (NumPy)")
     print("=" * 60)
 
     stl_files = [f for f in os.listdir(STL_DIR) if f.endswith('.stl')]
@@ -108,30 +108,17 @@ def validate_meshes():
 
     all_valid = True
     for f in sorted(stl_files):
-        path = os.path.join(STL_DIR, f)
-        mesh = trimesh.load(path)
-
-        # Auto-repair: remove degenerate faces
-        degen = [fi for fi, face in enumerate(mesh.faces)
-                 if face[0] == face[1] or face[1] == face[2] or face[0] == face[2]]
-        if degen:
-            mask = np.ones(len(mesh.faces), dtype=bool)
-            for fi in degen:
-                mask[fi] = False
-            mesh.update_faces(mask)
-            mesh.remove_unreferenced_vertices()
-            trimesh.repair.fill_holes(mesh)
-            trimesh.repair.fix_normals(mesh)
-            mesh.export(path)
-
-        wt = mesh.is_watertight
-        vol = mesh.volume
-        ext = mesh.bounding_box.extents
-        status = "OK" if wt else "FAIL"
-        repaired = f" (repaired {len(degen)} degen faces)" if degen else ""
-        if not wt:
+        report = repair_file(os.path.join(STL_DIR, f), repaired_dir(STL_DIR))
+        after = report['after']
+        ext = after['extents']
+        status = "OK" if after['watertight'] else "FAIL"
+        degen = report['duplicate_index_faces'] + report['zero_area_faces']
+        repaired = (f" (repaired {degen} degen faces -> "
+                    f"{os.path.relpath(report['repaired_file'])})"
+                    if report['repaired_file'] else "")
+        if not after['watertight']:
             all_valid = False
-        print(f"  {f}: watertight={status}, volume={vol:.0f}mm³, "
+        print(f"  {f}: watertight={status}, volume={after['volume']:.0f}mm³, "
               f"extents=[{ext[0]:.1f} x {ext[1]:.1f} x {ext[2]:.1f}]{repaired}")
 
     return all_valid
@@ -139,11 +126,11 @@ def validate_meshes():
 
 if __name__ == "__main__":
     if '--validate-only' in sys.argv:
-        # Standalone Python mode — just validate existing STLs with trimesh
+        # Standalone Python mode — just validate existing STLs
         valid = validate_meshes()
         sys.exit(0 if valid else 1)
     else:
         # Blender mode — build everything then validate
         results = build_and_export_all()
-        print("\nBuild complete. Run trimesh validation with:")
+        print("\nBuild complete. Run mesh validation with:")
         print("  source venv/bin/activate && python build_tower.py --validate-only")
@@ -6,10 +6,30 @@ files, and validates the geometry.
 
 Usage:
     source venv/bin/activate
-    python build_tower.py
+    python build_tower_build123d.py
+    python build_tower_build123d.py --jobs 3   # build components in parallel
+    python build_tower_build123d.py --no-cache # ignore exports/cache/*.brep
+    python build_tower_build123d.py --batched  # multi-operand booleans
+    python build_tower_build123d.py --draft    # gross shape only, coarse STLs
+    python build_tower_build123d.py --pipeline --jobs 2  # stream build/export/validate
+    python build_tower_build123d.py --mesh body=0.2,0.5   # coarser body tessellation
+    python build_tower_build123d.py --set SEGMENT_OUTER_DIAMETER=180 --set NODES_PER_SEGMENT=4
+    python build_tower_build123d.py --config variants/wide.toml --set POCKET_TILT_ANGLE=25
+
+Overrides (``--config`` first, then ``--set`` in order) are checked
+against the known parameter names, and the derived values are recomputed
+from them (tower_config.TowerConfig). A variant's STL/STEP files go to
+exports/variants/<name>/ instead of exports/, next to a config.json
+recording its parameters, so any number of variants can build at once:
+
+    for f in variants/*.toml; do python build_tower_build123d.py --config $f & done
 """
 
+import argparse
+import importlib
+import json
 import os
+import re
 import sys
 import time
 
@@ -18,129 +38,506 @@ PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 sys.path.insert(0, os.path.join(PROJECT_ROOT, 'components'))
 
-from build123d import export_stl, export_step
+from build_cache import BuildCache, CACHE_DIR
+from tower_config import TowerConfig, load_variant, parse_setting
 from tower_params import *
 
 # Output directories
-STL_DIR = os.path.join(PROJECT_ROOT, 'exports', 'stl')
-STEP_DIR = os.path.join(PROJECT_ROOT, 'exports', 'step')
+EXPORT_DIR = os.path.join(PROJECT_ROOT, 'exports')
+STL_DIR = os.path.join(EXPORT_DIR, 'stl')
+STEP_DIR = os.path.join(EXPORT_DIR, 'step')
+DRAFT_STL_DIR = os.path.join(EXPORT_DIR, 'draft', 'stl')
+VARIANT_DIR = os.path.join(EXPORT_DIR, 'variants')
 
-os.makedirs(STL_DIR, exist_ok=True)
-os.makedirs(STEP_DIR, exist_ok=True)
+# STL tessellation per feature class (feature_tree.MESH_CLASSES):
+# absolute linear (mm) and angular (rad) deflection. The sealing and
+# press-fit surfaces get 0.01 mm, the body stays under a 0.1 mm layer
+MESH_SETTINGS = {
+    'interlock': (0.01, 0.1),
+    'barb': (0.01, 0.1),
+    'pockets': (0.05, 0.2),
+    'body': (0.1, 0.3),
+}
+# Draft deflection, relative to each edge's size, for every face
+DRAFT_TOLERANCE = 0.2
+DRAFT_ANGULAR_TOLERANCE = 0.5
+DRAFT_STL_HEADER = b"golden-tower DRAFT: fine features omitted, coarse tessellation"
 
+# (name, label, module, builder) for every exported component, in build order
+COMPONENTS = [
+    ('segment', 'standard segment', 'components.segment_build123d', 'build_segment'),
+    ('top_cap', 'top cap', 'components.top_cap_build123d', 'build_top_cap'),
+    ('bottom_segment', 'bottom segment', 'components.bottom_segment_build123d',
+     'build_bottom_segment'),
+]
 
-def build_and_export_all():
-    """Build all tower components and export STL/STEP files."""
-    results = {}
 
-    # ── Standard Segment ──
-    print("Building standard segment...")
-    t0 = time.time()
-    from components.segment import build_segment
-    segment = build_segment()
-    dt = time.time() - t0
-    export_stl(segment, os.path.join(STL_DIR, 'segment.stl'))
-    export_step(segment, os.path.join(STEP_DIR, 'segment.step'))
-    bb = segment.bounding_box()
-    print(f"  Volume: {segment.volume:.1f} mm³")
-    print(f"  Bbox: {bb.min} to {bb.max}")
-    print(f"  Build time: {dt:.1f}s")
-    results['segment'] = segment
-
-    # ── Top Cap ──
-    print("\nBuilding top cap...")
+def is_draft(path):
+    """True if ``path`` is a binary STL written by a draft build."""
+    with open(path, 'rb') as fh:
+        return fh.read(80).startswith(DRAFT_STL_HEADER)
+
+
+def stl_mesh(part, name, draft=False, config=None, mesh_settings=None):
+    """Tessellate ``part`` for export (mesh_arrays.py), degenerate faces dropped.
+
+    A draft is meshed at :data:`DRAFT_TOLERANCE` throughout. Otherwise
+    every face is classed by the feature of component ``name`` it came
+    from (feature_tree.face_classes) and meshed at its class's deflection.
+
+    Args:
+        config: :class:`~tower_config.TowerConfig` the part was built with.
+        mesh_settings: ``{class: (linear, angular)}`` overriding
+            :data:`MESH_SETTINGS`.
+
+    Returns:
+        tuple: ``(vertices, faces, dropped face count, groups)``;
+        ``groups`` is the per-class report of
+        :func:`mesh_arrays.tessellate_groups` (None for a draft).
+    """
+    from mesh_arrays import drop_degenerate, tessellate, tessellate_groups
+    if draft:
+        vertices, faces = tessellate(part, DRAFT_TOLERANCE, DRAFT_ANGULAR_TOLERANCE)
+        return (vertices, *drop_degenerate(faces), None)
+    from components.feature_tree import face_classes
+    settings = {**MESH_SETTINGS, **(mesh_settings or {})}
+    _, _, module_name, _ = next(c for c in COMPONENTS if c[0] == name)
+    features = getattr(importlib.import_module(module_name), f'{name.upper()}_FEATURES')
+    # A face on two features' tools takes the finer setting
+    classes = face_classes(part, features, config, sorted(settings, key=settings.get))
+    vertices, faces, groups = tessellate_groups(part, classes, settings)
+    return (vertices, *drop_degenerate(faces), groups)
+
+
+def stl_header(name, draft=False):
+    """Binary STL header of an exported component."""
+    return DRAFT_STL_HEADER if draft else b'golden-tower ' + name.encode()
+
+
+def output_dirs(out_dir=EXPORT_DIR):
+    """``(stl, step, draft stl)`` directories under ``out_dir``."""
+    return (os.path.join(out_dir, 'stl'), os.path.join(out_dir, 'step'),
+            os.path.join(out_dir, 'draft', 'stl'))
+
+
+def variant_dir(name):
+    """Output directory of variant ``name`` (see :data:`VARIANT_DIR`)."""
+    if not re.fullmatch(r'[A-Za-z0-9][A-Za-z0-9_.-]*', name):
+        raise ValueError(f"variant names take letters, digits, '_', '.', '-': {name!r}")
+    return os.path.join(VARIANT_DIR, name)
+
+
+def _export(write, path):
+    """Run ``write(tmp)`` and move the file into place atomically.
+
+    Concurrent builds never leave a half-written file behind ``path``.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def build_component(name, cache_dir=CACHE_DIR, batched=False, draft=False,
+                    config=None, out_dir=EXPORT_DIR, mesh_settings=None):
+    """Build, export and measure a single component.
+
+    Runs unchanged in the main process or in a pool worker; only plain
+    metrics are returned so results pickle cheaply across processes.
+
+    Args:
+        name: Component name from :data:`COMPONENTS`.
+        cache_dir: BREP cache directory, or None to always rebuild.
+        batched: Use one multi-operand boolean per phase (components/booleans.py).
+        draft: Skip fine features and write only a coarse, draft-marked STL
+            to ``draft/stl`` (no STEP).
+        config: :class:`~tower_config.TowerConfig` to build, or None for
+            the module constants.
+        out_dir: Root of the ``stl``/``step``/``draft/stl`` directories.
+        mesh_settings: Per-class tessellation overrides (:func:`stl_mesh`).
+
+    Returns:
+        dict: volume (mm³), bbox (min/max tuples), build and export times (s)
+        whether the Part came from the build cache, the per-feature
+        (name, recomputed/reused, seconds) log, the B-rep check report
+        (components/brep_check.py; None for a cache hit, which passed it
+        when built) and the per-class ``mesh_groups`` tessellation report
+        (None for a draft).
+
+    Raises:
+        BRepCheckError: the built Part fails the B-rep check; raised
+            before anything is exported.
+    """
+    # build123d (OCP) is only imported by builds, not by mesh validation
+    from build123d import export_step
+    from mesh_arrays import write_stl
+    from components import feature_tree
+    from components.booleans import PHASE_TIMES
+
+    _, _, module_name, builder_name = next(c for c in COMPONENTS if c[0] == name)
+    cache = BuildCache(cache_dir or CACHE_DIR, enabled=cache_dir is not None)
+    store = None if cache_dir is None else os.path.join(cache_dir, 'features')
+
     t0 = time.time()
-    from components.top_cap import build_top_cap
-    top_cap = build_top_cap()
-    dt = time.time() - t0
-    export_stl(top_cap, os.path.join(STL_DIR, 'top_cap.stl'))
-    export_step(top_cap, os.path.join(STEP_DIR, 'top_cap.step'))
-    bb = top_cap.bounding_box()
-    print(f"  Volume: {top_cap.volume:.1f} mm³")
-    print(f"  Bbox: {bb.min} to {bb.max}")
-    print(f"  Build time: {dt:.1f}s")
-    results['top_cap'] = top_cap
-
-    # ── Bottom Segment ──
-    print("\nBuilding bottom segment...")
+    config = config or TowerConfig()
+    with feature_tree.feature_store(store):
+        part, cache_hit = cache.get_or_build(name, module_name, builder_name,
+                                             config=config, batched=batched,
+                                             draft=draft)
+    build_time = time.time() - t0
+    features = [] if cache_hit else [
+        (feature, status, PHASE_TIMES[name][feature])
+        for feature, status in feature_tree.FEATURE_LOG.get(name, [])
+    ]
+
     t0 = time.time()
-    from components.bottom_segment import build_bottom_segment
-    bottom = build_bottom_segment()
-    dt = time.time() - t0
-    export_stl(bottom, os.path.join(STL_DIR, 'bottom_segment.stl'))
-    export_step(bottom, os.path.join(STEP_DIR, 'bottom_segment.step'))
-    bb = bottom.bounding_box()
-    print(f"  Volume: {bottom.volume:.1f} mm³")
-    print(f"  Bbox: {bb.min} to {bb.max}")
-    print(f"  Build time: {dt:.1f}s")
-    results['bottom_segment'] = bottom
+    stl_dir, step_dir, draft_stl_dir = output_dirs(out_dir)
+    vertices, faces, _, groups = stl_mesh(part, name, draft, config, mesh_settings)
+    stl_dir = draft_stl_dir if draft else stl_dir
+    os.makedirs(stl_dir, exist_ok=True)
+    _export(lambda path: write_stl(path, vertices, faces, stl_header(name, draft)),
+            os.path.join(stl_dir, f'{name}.stl'))
+    if not draft:
+        os.makedirs(step_dir, exist_ok=True)
+        _export(lambda path: export_step(part, path),
+                os.path.join(step_dir, f'{name}.step'))
+    export_time = time.time() - t0
+
+    bb = part.bounding_box()
+    return {
+        'name': name,
+        'volume': part.volume,
+        'bbox': (tuple(bb.min), tuple(bb.max)),
+        'build_time': build_time,
+        'export_time': export_time,
+        'cache_hit': cache_hit,
+        'features': features,
+        'brep': None if cache_hit else feature_tree.BREP_LOG.get(name),
+        'mesh_groups': groups,
+        'pid': os.getpid(),
+    }
+
+
+def _print_component(metrics):
+    bb_min, bb_max = metrics['bbox']
+    print(f"  Volume: {metrics['volume']:.1f} mm³")
+    print(f"  Bbox: ({bb_min[0]:.2f}, {bb_min[1]:.2f}, {bb_min[2]:.2f}) to "
+          f"({bb_max[0]:.2f}, {bb_max[1]:.2f}, {bb_max[2]:.2f})")
+    source = "cache" if metrics['cache_hit'] else "built"
+    print(f"  Build time: {metrics['build_time']:.1f}s [{source}] "
+          f"(export {metrics['export_time']:.1f}s)")
+    for feature, status, dt in metrics['features']:
+        timing = f" {dt:.2f}s" if status == 'recomputed' else ""
+        print(f"    {feature:<20} {status}{timing}")
+    brep = metrics.get('brep')
+    if brep:
+        print(f"  B-rep: valid, {brep['solids']} solid, exact volume "
+              f"{brep['volume']:.1f} mm³, shortest edge {brep['min_edge']:.3f} mm, "
+              f"narrowest face {brep['min_width']:.3f} mm")
+    groups = metrics.get('mesh_groups')
+    if groups:
+        print(f"  Mesh: {sum(g['triangles'] for g in groups.values())} triangles")
+        for label, group in groups.items():
+            print(f"    {label:<10} {group['faces']:>3} faces {group['triangles']:>6} "
+                  f"triangles at {group['linear']:g} mm/{group['angular']:g} rad, "
+                  f"max deviation {group['max_deviation']:.3f} mm")
+
+
+def build_and_export_all(jobs=1, cache_dir=CACHE_DIR, batched=False, draft=False,
+                         config=None, out_dir=EXPORT_DIR, mesh_settings=None):
+    """Build all tower components and export STL/STEP files.
+
+    Args:
+        jobs: Number of worker processes. With ``jobs > 1`` each component
+            is built and exported in its own process, so wall-clock time
+            approaches that of the slowest component instead of the sum.
+        cache_dir: BREP cache directory (see build_cache.py), or None to
+            rebuild every component from scratch.
+        batched: Apply each boolean phase as a single multi-operand
+            operation with OCC's parallel mode on.
+        draft: Build the gross shape only and write coarse STLs to
+            ``draft/stl`` (see :func:`build_component`).
+        config: :class:`~tower_config.TowerConfig` to build, or None for
+            the module constants.
+        out_dir: Output root; :func:`variant_dir` for a variant.
+        mesh_settings: Per-class tessellation overrides (:func:`stl_mesh`).
+
+    Returns:
+        dict: Component name -> metrics dict from :func:`build_component`.
+    """
+    results = {}
+    t_start = time.time()
+
+    if jobs > 1:
+        workers = min(jobs, len(COMPONENTS))
+        print(f"Building {len(COMPONENTS)} components in {workers} processes...")
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(build_component, name, cache_dir,
+                                         batched, draft, config, out_dir,
+                                         mesh_settings)
+                       for name, *_ in COMPONENTS}
+            # Report in the fixed component order so logs stay diffable
+            for name, label, *_ in COMPONENTS:
+                results[name] = futures[name].result()
+                print(f"\nBuilt {label} (pid {results[name]['pid']}):")
+                _print_component(results[name])
+    else:
+        for i, (name, label, *_) in enumerate(COMPONENTS):
+            if i:
+                print()
+            print(f"Building {label}...")
+            results[name] = build_component(name, cache_dir, batched, draft,
+                                            config, out_dir, mesh_settings)
+            _print_component(results[name])
+
+    wall = time.time() - t_start
 
     # ── Summary ──
     print("\n" + "=" * 60)
-    print("BUILD COMPLETE")
+    print("DRAFT BUILD COMPLETE" if draft else "BUILD COMPLETE")
     print("=" * 60)
-    stl_files = [f for f in os.listdir(STL_DIR) if f.endswith('.stl')]
-    step_files = [f for f in os.listdir(STEP_DIR) if f.endswith('.step')]
-    print(f"STL files: {len(stl_files)} in {STL_DIR}")
+    cpu = sum(m['build_time'] + m['export_time'] for m in results.values())
+    print(f"Wall time: {wall:.1f}s (sum of component times {cpu:.1f}s, "
+          f"jobs={jobs})")
+    if cache_dir is not None:
+        hits = [n for n, m in results.items() if m['cache_hit']]
+        misses = [n for n, m in results.items() if not m['cache_hit']]
+        print(f"Build cache: {len(hits)} hit(s), {len(misses)} miss(es) "
+              f"in {cache_dir}")
+        for n in hits:
+            print(f"  hit:  {n}")
+        for n in misses:
+            print(f"  miss: {n}")
+    stl_dir, step_dir, draft_stl_dir = output_dirs(out_dir)
+    if draft:
+        stl_dir = draft_stl_dir
+    stl_files = [f for f in os.listdir(stl_dir) if f.endswith('.stl')]
+    print(f"STL files: {len(stl_files)} in {stl_dir}")
     for f in sorted(stl_files):
-        size = os.path.getsize(os.path.join(STL_DIR, f))
+        size = os.path.getsize(os.path.join(stl_dir, f))
         print(f"  {f} ({size / 1024:.1f} KB)")
-    print(f"STEP files: {len(step_files)} in {STEP_DIR}")
+    if draft:
+        return results
+    step_files = [f for f in os.listdir(step_dir) if f.endswith('.step')]
+    print(f"STEP files: {len(step_files)} in {step_dir}")
     for f in sorted(step_files):
-        size = os.path.getsize(os.path.join(STEP_DIR, f))
+        size = os.path.getsize(os.path.join(step_dir, f))
         print(f"  {f} ({size / 1024:.1f} KB)")
 
     return results
 
 
-def validate_meshes():
-    """Run basic mesh validation on all exported STLs.
+def check_meshes(stl_dir=STL_DIR, names=None):
+    """Check every exported STL in ``stl_dir`` with NumPy (mesh_repair.py).
 
-    Applies automatic repair for common OCC tessellation defects
-    (degenerate triangles at sphere poles, etc.) before checking.
+    ``names`` limits the check to those components.
+
+    Welds the triangles, repairs common OCC tessellation defects
+    (degenerate triangles at sphere poles, slivers, inverted winding) and
+    checks the result. Exported files are never rewritten: a repaired
+    copy and a JSON report go to ``repaired/`` beside ``stl_dir``.
+
+    Returns:
+        list[dict]: Per file ``file``, ``draft``, ``watertight``, ``volume``
+        (mm³), ``extents`` (mm) of the repaired mesh, the number of
+        ``repaired`` faces and the ``repaired_file`` (None if the export
+        needed no repair).
     """
-    import trimesh
-    import numpy as np
+    from mesh_repair import repair_file, repaired_dir
+
+    stl_files = [f for f in os.listdir(stl_dir) if f.endswith('.stl')
+                 and (names is None or f[:-len('.stl')] in names)]
+    rows = []
+    for f in sorted(stl_files):
+        path = os.path.join(stl_dir, f)
+        report = repair_file(path, repaired_dir(stl_dir))
+        after = report['after']
+        rows.append({
+            'file': f,
+            'draft': is_draft(path),
+            'watertight': after['watertight'],
+            'volume': after['volume'],
+            'extents': after['extents'],
+            'repaired': report['duplicate_index_faces'] + report['zero_area_faces'],
+            'repaired_file': report['repaired_file'],
+        })
+    return rows
+
+
+def print_meshes(rows):
+    """Print :func:`check_meshes` rows; True if every mesh is watertight."""
     print("\n" + "=" * 60)
     print("MESH VALIDATION")
     print("=" * 60)
 
-    stl_files = [f for f in os.listdir(STL_DIR) if f.endswith('.stl')]
-    all_valid = True
-    for f in sorted(stl_files):
-        path = os.path.join(STL_DIR, f)
-        mesh = trimesh.load(path)
-
-        # Auto-repair: remove degenerate faces (OCC sphere-pole bug)
-        degen = [fi for fi, face in enumerate(mesh.faces)
-                 if face[0] == face[1] or face[1] == face[2] or face[0] == face[2]]
-        if degen:
-            mask = np.ones(len(mesh.faces), dtype=bool)
-            for fi in degen:
-                mask[fi] = False
-            mesh.update_faces(mask)
-            mesh.remove_unreferenced_vertices()
-            trimesh.repair.fill_holes(mesh)
-            trimesh.repair.fix_normals(mesh)
-            mesh.export(path)  # overwrite with repaired mesh
-
-        wt = mesh.is_watertight
-        vol = mesh.volume
-        ext = mesh.bounding_box.extents
-        status = "OK" if wt else "FAIL"
-        repaired = f" (repaired {len(degen)} degen faces)" if degen else ""
-        if not wt:
-            all_valid = False
-        print(f"  {f}: watertight={status}, volume={vol:.0f}mm³, "
+    for row in rows:
+        ext = row['extents']
+        status = "OK" if row['watertight'] else "FAIL"
+        repaired = (f" (repaired {row['repaired']} degen faces -> "
+                    f"{os.path.relpath(row['repaired_file'])})"
+                    if row['repaired_file'] else "")
+        print(f"  {row['file']}: watertight={status}, volume={row['volume']:.0f}mm³, "
               f"extents=[{ext[0]:.1f} x {ext[1]:.1f} x {ext[2]:.1f}]{repaired}")
 
-    return all_valid
+    return all(row['watertight'] for row in rows)
+
+
+def validate_meshes(stl_dir=STL_DIR):
+    """Run basic mesh validation on all exported STLs in ``stl_dir``."""
+    return print_meshes(check_meshes(stl_dir))
+
+
+def add_build_arguments(parser):
+    """Add the build options shared with the golden_tower.py CLI."""
+    parser.add_argument('--batched', action='store_true',
+                        help="one multi-operand fuse + one cut per component "
+                             "(OCC parallel boolean mode)")
+    parser.add_argument('--draft', action='store_true',
+                        help="skip fine features (O-ring groove, key slot, barb "
+                             "ridges, drain channels, pocket chamfers) and write "
+                             "coarse STLs to draft/stl")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="stream each component through build, tessellate, "
+                             "STL/STEP export and validation independently, "
+                             "with --jobs build workers (build_pipeline.py)")
+    parser.add_argument('--mesh', metavar='CLASS=LINEAR[,ANGULAR]', action='append',
+                        default=[], dest='mesh',
+                        help="tessellation deflection (mm, rad) of one feature "
+                             f"class: {', '.join(MESH_SETTINGS)} (repeatable)")
+    parser.add_argument('--config', metavar='FILE',
+                        help="TOML variant file of parameter overrides")
+    parser.add_argument('--set', metavar='NAME=VALUE', action='append',
+                        default=[], dest='settings',
+                        help="override one parameter (repeatable; after --config)")
+    parser.add_argument('--name',
+                        help="variant name, i.e. the exports/variants/ "
+                             "subdirectory (default: from --config, else "
+                             "the config hash)")
+
+
+def resolve_variant(config_file=None, settings=(), name=None):
+    """Parameter set and variant name of the :func:`add_build_arguments` options.
+
+    Returns:
+        tuple: ``(config, variant)``; ``variant`` is None for the plain
+        module constants.
+
+    Raises:
+        OSError, TypeError, ValueError: unreadable file or bad override.
+    """
+    file_name, overrides = load_variant(config_file) if config_file else (None, {})
+    overrides.update(parse_setting(spec) for spec in settings)
+    config = TowerConfig(**overrides)
+    variant = name or file_name or (config.key[:12] if overrides else None)
+    if variant is not None:
+        variant_dir(variant)  # validates the name
+    return config, variant
+
+
+def parse_mesh_setting(spec):
+    """``'CLASS=LINEAR[,ANGULAR]'`` -> ``(class, (linear, angular))``.
+
+    The angular deflection defaults to the class's :data:`MESH_SETTINGS`
+    value.
+
+    Raises:
+        ValueError: unknown class or a non-positive deflection.
+    """
+    label, sep, values = spec.partition('=')
+    label = label.strip()
+    if not sep or label not in MESH_SETTINGS:
+        raise ValueError(f"--mesh takes CLASS=LINEAR[,ANGULAR] with CLASS one of "
+                         f"{', '.join(MESH_SETTINGS)}: {spec!r}")
+    numbers = [float(v) for v in values.split(',')]
+    if not 1 <= len(numbers) <= 2 or min(numbers) <= 0:
+        raise ValueError(f"--mesh {label}: one or two positive deflections, got {values!r}")
+    return label, (numbers[0], numbers[1] if len(numbers) == 2 else MESH_SETTINGS[label][1])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="build components in N parallel processes "
+                             "(default: 1, serial)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the BREP build cache and rebuild everything")
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help=f"BREP build cache directory (default: {CACHE_DIR})")
+    add_build_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        args.tower_config, args.variant = resolve_variant(
+            args.config, args.settings, args.name)
+        args.mesh_settings = dict(parse_mesh_setting(spec) for spec in args.mesh)
+    except (OSError, TypeError, ValueError) as exc:
+        parser.error(str(exc))
+    args.out_dir = (EXPORT_DIR if args.variant is None
+                    else variant_dir(args.variant))
+    return args
+
+
+def write_variant_config(config, out_dir):
+    """Record ``config``'s overrides and key as ``out_dir``/config.json."""
+    os.makedirs(out_dir, exist_ok=True)
+    record = {'key': config.key, 'overrides': config.overrides()}
+
+    def write(path):
+        with open(path, 'w') as fh:
+            json.dump(record, fh, indent=2, sort_keys=True)
+    _export(write, os.path.join(out_dir, 'config.json'))
+
+
+def build(config=None, variant=None, out_dir=EXPORT_DIR, jobs=1,
+          cache_dir=CACHE_DIR, batched=False, draft=False, pipeline=False,
+          mesh_settings=None):
+    """Build, export and check every component of one parameter set.
+
+    A named ``variant`` gets its constraint violations printed as
+    warnings and its config recorded in ``out_dir``. With ``pipeline``
+    the components stream through build_pipeline.py's stages instead of
+    building, exporting and validating phase by phase. ``mesh_settings``
+    overrides the per-class tessellation (:func:`stl_mesh`).
+
+    Returns:
+        tuple: ``(results, meshes, stages)`` -- :func:`build_and_export_all`
+        metrics, :func:`check_meshes` rows and, for a pipelined build,
+        the per-stage report of :func:`build_pipeline.run_pipeline`
+        (else None).
+    """
+    config = config or TowerConfig()
+    if variant is not None:
+        from components.constraints import violations
+        print(f"Variant {variant}: {config}")
+        for failed in violations(config):
+            print(f"  WARNING: {failed}")
+        write_variant_config(config, out_dir)
+    if pipeline:
+        from build_pipeline import print_stages, run_pipeline
+        print(f"Streaming {len(COMPONENTS)} components through the build pipeline...")
+        results, stages = run_pipeline(None, config, out_dir, jobs, cache_dir,
+                                       batched, draft, mesh_settings=mesh_settings)
+        for name, label, *_ in COMPONENTS:
+            print(f"\nBuilt {label}:")
+            _print_component(results[name])
+        print_stages(stages)
+        meshes = [results[name]['mesh'] for name, *_ in COMPONENTS]
+        print_meshes(meshes)
+        return results, meshes, stages
+    results = build_and_export_all(
+        jobs=jobs, cache_dir=cache_dir, batched=batched, draft=draft,
+        config=config, out_dir=out_dir, mesh_settings=mesh_settings)
+    stl_dir, _, draft_stl_dir = output_dirs(out_dir)
+    meshes = check_meshes(draft_stl_dir if draft else stl_dir)
+    print_meshes(meshes)
+    return results, meshes, None
 
 
 if __name__ == "__main__":
-    results = build_and_export_all()
-    valid = validate_meshes()
-    if not valid:
+    args = parse_args()
+    _, meshes, _ = build(args.tower_config, args.variant, args.out_dir, args.jobs,
+                         None if args.no_cache else args.cache_dir, args.batched,
+                         args.draft, args.pipeline, args.mesh_settings)
+    if not all(row['watertight'] for row in meshes):
         print("\nWARNING: Some meshes are not watertight!")
         sys.exit(1)
     else:
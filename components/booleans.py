@@ -0,0 +1,60 @@
+"""
+Boolean Helpers -- Golden Tower
+===============================
+Shared boolean drivers for the build123d component builders.
+
+Tool solids for a feature (see feature_tree.py) are applied either
+
+- sequentially, one fuse/cut per tool against the growing solid (the
+  classic ``BuildPart`` behaviour), or
+- batched, as ONE multi-argument fuse or cut of all the tools of a
+  phase (every consecutive fuse feature, then every consecutive cut
+  feature). OCC intersects all operands in a single General Fuse pass
+  instead of re-intersecting an ever larger solid, and runs it with its
+  parallel mode enabled for the duration of the chain.
+
+Wall-clock time of each feature (sequential) or phase (batched) is
+recorded in :data:`PHASE_TIMES`.
+"""
+
+from contextlib import contextmanager
+
+from OCP.BOPAlgo import BOPAlgo_Options
+
+# component name -> {feature/phase name: seconds} for the most recent build
+PHASE_TIMES = {}
+
+
+@contextmanager
+def parallel_booleans(enabled=True):
+    """Run the booleans inside the block with OCC's parallel mode on.
+
+    The mode is process-wide, so the previous setting is restored on the
+    way out, also when a boolean raises. ``enabled=False`` leaves it alone.
+    """
+    previous = BOPAlgo_Options.GetParallelMode_s()
+    if enabled:
+        BOPAlgo_Options.SetParallelMode_s(True)
+    try:
+        yield
+    finally:
+        BOPAlgo_Options.SetParallelMode_s(previous)
+
+
+def fuse_all(tools, batched=False):
+    """Fuse a list of solids into one Part."""
+    base, rest = tools[0], tools[1:]
+    if batched:
+        return base.fuse(*rest) if rest else base
+    for tool in rest:
+        base = base.fuse(tool)
+    return base
+
+
+def cut_all(base, tools, batched=False):
+    """Subtract a list of solids from ``base``."""
+    if batched:
+        return base.cut(*tools) if tools else base
+    for tool in tools:
+        base = base.cut(tool)
+    return base
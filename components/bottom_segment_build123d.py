@@ -19,6 +19,10 @@ Iteration 3 changes (mirrored from segment.py):
 - Pocket bottom chamfer for printable overhang
 
 Boolean strategy: ALL additive geometry first, then ALL subtractive.
+The body is the shared feature chain from segment_body_build123d.py; the
+reservoir fittings are then fused onto it. Because the fittings fill
+the floor at z = 0..1, the tube bore and drain holes are cut again
+together with the barb bore.
 """
 
 import os
@@ -26,327 +30,125 @@ import sys
 import math
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
-from tower_params import *
 from build123d import *
+from components.feature_tree import Feature, build_features
+from components.segment_body_build123d import (
+    BODY_FEATURES, drain_holes, tube_bore,
+)
+from tower_config import TowerConfig
 
 
-# ---------------------------------------------------------------------------
-# Derived constants (must match segment.py pocket placement exactly)
-# ---------------------------------------------------------------------------
-POCKET_Z_OFFSET = (
-    INTERLOCK_HEIGHT
-    + POCKET_DEPTH / 2 * math.cos(math.radians(POCKET_TILT_ANGLE))
-    + 2.0
-)
+def _align_bot():
+    """Shorthand: align MIN on Z so the bottom face sits at the location z."""
+    return (Align.CENTER, Align.CENTER, Align.MIN)
 
-# Extended pocket solid length for proper boolean overlap with outer shell
-POCKET_SOLID_LENGTH = POCKET_DEPTH + 50.0
 
-# Interlock ring radii
-MALE_INTERLOCK_RADIUS = MALE_RING_OR  # 29.0 mm
-FEMALE_INTERLOCK_RADIUS = MALE_INTERLOCK_RADIUS + INTERLOCK_CLEARANCE  # 29.3 mm
+def _reservoir_fittings(cfg: TowerConfig):
+    """Tool solids fused onto the body: QD barb and its reducer flange,
+    reservoir lid ring and bayonet lugs."""
+    tools = []
+
+    # 1. QD FITTING BARB (shaft, extends downward from z=0)
+    barb_or = cfg.QD_FITTING_BARB_OD / 2   # 6.35 mm
+    tools.append(Pos(0, 0, -cfg.QD_BARB_LENGTH) * Cylinder(
+        radius=barb_or,
+        height=cfg.QD_BARB_LENGTH + 1.0,
+        align=_align_bot(),
+    ))
+
+    # 1b. REDUCER FLANGE: closes the supply tube bottom around the barb,
+    # which is narrower than the tube bore, so the barb hangs from the
+    # tube wall. Overlaps the wall 1mm for volumetric overlap.
+    tools.append(Pos(0, 0, -cfg.WALL_THICKNESS) * Cylinder(
+        radius=cfg.TUBE_OR,
+        height=cfg.WALL_THICKNESS + 1.0,
+        align=_align_bot(),
+    ))
+
+    # 2. RESERVOIR LID RING  (extends downward from z=0)
+    # An annulus, so its hollow centre never cuts the barb or the
+    # lowest pocket
+    tools.append(extrude(
+        Plane.XY.offset(-cfg.LID_RING_HEIGHT) * (
+            Circle(cfg.LID_RING_OD / 2) - Circle(cfg.LID_RING_ID / 2)),
+        amount=cfg.LID_RING_HEIGHT + 1.0,
+    ))
+
+    # 3. BAYONET LUGS
+    for k in range(cfg.LID_BAYONET_LUGS):
+        lug_angle_deg = k * (360.0 / cfg.LID_BAYONET_LUGS)
+        lug_angle_rad = math.radians(lug_angle_deg)
+        lug_r = cfg.LID_RING_OD / 2 - cfg.LUG_DEPTH / 2
+        lug_x = lug_r * math.cos(lug_angle_rad)
+        lug_y = lug_r * math.sin(lug_angle_rad)
+        tools.append(Pos(lug_x, lug_y, -cfg.LUG_HEIGHT) * Rot(0, 0, lug_angle_deg) * Box(
+            cfg.LUG_DEPTH,
+            cfg.LUG_WIDTH,
+            cfg.LUG_HEIGHT + 1.0,
+            align=_align_bot(),
+        ))
 
-# Body inner radius
-BODY_INNER_RADIUS = SEGMENT_OUTER_RADIUS - WALL_THICKNESS  # 78.0 mm
+    return tools
 
-# Tube radii
-TUBE_OR = SUPPLY_TUBE_OD / 2  # 16.0 mm
-TUBE_IR = SUPPLY_TUBE_ID / 2  # 13.6 mm
 
-# Male ring chamfer
-CHAMFER_H = MALE_RING_CHAMFER_H  # 10.0 mm
-CHAMFER_Z_START = SEGMENT_HEIGHT - CHAMFER_H  # 190.0 mm
+def _barb_ridges(cfg: TowerConfig):
+    """Barb ridges on the QD fitting shaft."""
+    barb_or = cfg.QD_FITTING_BARB_OD / 2
+    tools = []
+    for j in range(cfg.QD_BARB_RIDGE_COUNT):
+        ridge_z = -cfg.QD_BARB_LENGTH + 4.0 + j * cfg.QD_BARB_RIDGE_SPACING
+        tools.append(Pos(0, 0, ridge_z) * Cone(
+            bottom_radius=barb_or + cfg.QD_BARB_RIDGE_HEIGHT,
+            top_radius=barb_or,
+            height=2.0,
+            align=_align_bot(),
+        ))
+    return tools
 
-# QD barb geometry
-QD_BARB_LENGTH = 20.0           # mm, extends downward from z=0
-QD_BARB_RIDGE_COUNT = 3         # number of barb ridges
-QD_BARB_RIDGE_HEIGHT = 0.8      # mm, radial protrusion of each ridge
-QD_BARB_RIDGE_SPACING = 6.0     # mm, center-to-center along barb axis
 
-# Bayonet lug geometry
-LUG_WIDTH = 15.0                # mm, tangential (arc-wise) extent
-LUG_DEPTH = 5.0                 # mm, radial extent
-LUG_HEIGHT = 8.0                # mm, extends downward from z=0
+def _fitting_bores(cfg: TowerConfig):
+    """Barb bore, plus the body's tube bore and drain holes, which the
+    reducer flange and lid ring otherwise plug at z = 0..1."""
+    tools = []
 
-# Reservoir lid ring
-LID_RING_HEIGHT = 10.0          # mm, extends downward from z=0
-LID_RING_OD = RESERVOIR_LID_OD  # 160 mm
-LID_RING_ID = SEGMENT_OUTER_DIAMETER - 2 * WALL_THICKNESS  # 156 mm
+    # 4. SUPPLY TUBE BORE (re-cut through the lid ring)
+    tools.append(tube_bore(cfg))
 
+    # 5. QD BARB BORE (from bottom of barb up through segment floor)
+    barb_ir = cfg.QD_FITTING_ID / 2         # 4.7625 mm
+    tools.append(Pos(0, 0, -cfg.QD_BARB_LENGTH) * Cylinder(
+        radius=barb_ir,
+        height=cfg.QD_BARB_LENGTH + cfg.DRIP_TRAY_DEPTH + 1.0,
+        align=_align_bot(),
+    ))
 
-def _align_bot():
-    """Shorthand: align MIN on Z so the bottom face sits at the location z."""
-    return (Align.CENTER, Align.CENTER, Align.MIN)
+    # 6. Drain through-holes (re-cut through the lid ring)
+    tools.extend(drain_holes(cfg))
 
+    return tools
 
-def build_bottom_segment() -> Part:
-    """Build the bottom segment with QD fitting barb, bayonet lugs,
-    reservoir lid ring, and standard pockets + male interlock.
 
-    Two-phase boolean (add all, then subtract all) for watertight STL.
-    """
+BOTTOM_SEGMENT_FEATURES = BODY_FEATURES + [
+    Feature('reservoir_fittings', 'fuse', _reservoir_fittings, mesh_class='barb'),
+    Feature('barb_ridges', 'fuse', _barb_ridges, fine=True, mesh_class='barb'),
+    Feature('fitting_bores', 'cut', _fitting_bores, mesh_class='barb'),
+]
 
-    with BuildPart() as bottom:
-        # ==================================================================
-        # PHASE 1: ALL ADDITIVE GEOMETRY
-        # ==================================================================
 
-        # 1. OUTER SHELL  (z = 0 .. SEGMENT_HEIGHT)
-        Cylinder(
-            radius=SEGMENT_OUTER_RADIUS,
-            height=SEGMENT_HEIGHT,
-            align=_align_bot(),
-        )
+def build_bottom_segment(config: TowerConfig = None, batched: bool = False,
+                         draft: bool = False) -> Part:
+    """Build the bottom segment with QD fitting barb, bayonet lugs,
+    reservoir lid ring, and standard pockets + male interlock.
 
-        # 2. INTEGRATED SUPPLY TUBE (solid wall, z=0 through male interlock)
-        tube_top = SEGMENT_HEIGHT + INTERLOCK_HEIGHT  # 210 mm
-        Cylinder(
-            radius=TUBE_OR,
-            height=tube_top,
-            align=_align_bot(),
-        )
-
-        # 3. MALE INTERLOCK RING  (z = SEGMENT_HEIGHT .. + INTERLOCK_HEIGHT)
-        with Locations([Pos(0, 0, SEGMENT_HEIGHT)]):
-            Cylinder(
-                radius=MALE_INTERLOCK_RADIUS,
-                height=INTERLOCK_HEIGHT,
-                align=_align_bot(),
-            )
-
-        # 4. Alignment key tab on the male ring
-        key_x = MALE_INTERLOCK_RADIUS + INTERLOCK_KEY_DEPTH / 2 - 0.5
-        key_z = SEGMENT_HEIGHT + INTERLOCK_HEIGHT / 2
-        with Locations([Pos(key_x, 0, key_z)]):
-            Box(
-                INTERLOCK_KEY_DEPTH + 1.0,
-                INTERLOCK_KEY_WIDTH,
-                INTERLOCK_HEIGHT,
-                align=(Align.CENTER, Align.CENTER, Align.CENTER),
-            )
-
-        # 5. Support cone for male ring — printable transition
-        with Locations([Pos(0, 0, CHAMFER_Z_START)]):
-            Cone(
-                bottom_radius=TUBE_OR,
-                top_radius=MALE_INTERLOCK_RADIUS,
-                height=CHAMFER_H + 1.0,
-                align=_align_bot(),
-            )
-
-        # 6. PLANTING POCKETS (3 pockets at golden-angle spiral positions)
-        pocket_locs = []
-        lip_locs = []
-        for i in range(NODES_PER_SEGMENT):
-            angle_deg = i * GOLDEN_ANGLE_DEG
-            angle_rad = math.radians(angle_deg)
-            z_center = POCKET_Z_OFFSET + i * NODE_VERTICAL_PITCH
-
-            px = POCKET_RADIAL_OFFSET * math.cos(angle_rad)
-            py = POCKET_RADIAL_OFFSET * math.sin(angle_rad)
-
-            pocket_loc = Pos(px, py, z_center) * Rot(0, POCKET_TILT_ANGLE, angle_deg)
-            pocket_locs.append(pocket_loc)
-
-            # Solid pocket body — WATER_WALL_THICKNESS
-            with Locations([pocket_loc]):
-                Cylinder(
-                    radius=POCKET_RADIUS + WATER_WALL_THICKNESS,
-                    height=POCKET_SOLID_LENGTH,
-                    align=(Align.CENTER, Align.CENTER, Align.CENTER),
-                )
-
-            # Flare cone at pocket-body junction
-            flare_loc = pocket_loc * Pos(0, 0, -5.0)
-            with Locations([flare_loc]):
-                Cone(
-                    bottom_radius=POCKET_RADIUS + WATER_WALL_THICKNESS + 5.0,
-                    top_radius=POCKET_RADIUS + WATER_WALL_THICKNESS,
-                    height=12.0,
-                    align=(Align.CENTER, Align.CENTER, Align.CENTER),
-                )
-
-            # Lip support flange at the outer end of the pocket
-            lip_z_local = POCKET_DEPTH / 2 - NET_CUP_LIP_HEIGHT / 2
-            lip_loc = pocket_loc * Pos(0, 0, lip_z_local)
-            lip_locs.append(lip_loc)
-            with Locations([lip_loc]):
-                Cylinder(
-                    radius=NET_CUP_LIP_OD / 2 + WATER_WALL_THICKNESS,
-                    height=NET_CUP_LIP_HEIGHT,
-                    align=(Align.CENTER, Align.CENTER, Align.CENTER),
-                )
-
-        # 7. QD FITTING BARB (shaft + ridges, extends downward from z=0)
-        barb_or = QD_FITTING_BARB_OD / 2   # 6.35 mm
-        with Locations([Pos(0, 0, -QD_BARB_LENGTH)]):
-            Cylinder(
-                radius=barb_or,
-                height=QD_BARB_LENGTH + 1.0,
-                align=_align_bot(),
-            )
-        # Barb ridges
-        for j in range(QD_BARB_RIDGE_COUNT):
-            ridge_z = -QD_BARB_LENGTH + 4.0 + j * QD_BARB_RIDGE_SPACING
-            with Locations([Pos(0, 0, ridge_z)]):
-                Cone(
-                    bottom_radius=barb_or + QD_BARB_RIDGE_HEIGHT,
-                    top_radius=barb_or,
-                    height=2.0,
-                    align=_align_bot(),
-                )
-
-        # 8. RESERVOIR LID RING  (extends downward from z=0)
-        with Locations([Pos(0, 0, -LID_RING_HEIGHT)]):
-            Cylinder(
-                radius=LID_RING_OD / 2,
-                height=LID_RING_HEIGHT + 1.0,
-                align=_align_bot(),
-            )
-
-        # 9. BAYONET LUGS
-        for k in range(LID_BAYONET_LUGS):
-            lug_angle_deg = k * (360.0 / LID_BAYONET_LUGS)
-            lug_angle_rad = math.radians(lug_angle_deg)
-            lug_r = LID_RING_OD / 2 - LUG_DEPTH / 2
-            lug_x = lug_r * math.cos(lug_angle_rad)
-            lug_y = lug_r * math.sin(lug_angle_rad)
-            with Locations([Pos(lug_x, lug_y, -LUG_HEIGHT) * Rot(0, 0, lug_angle_deg)]):
-                Box(
-                    LUG_DEPTH,
-                    LUG_WIDTH,
-                    LUG_HEIGHT + 1.0,
-                    align=_align_bot(),
-                )
-
-        # ==================================================================
-        # PHASE 2: ALL SUBTRACTIVE GEOMETRY
-        # ==================================================================
-
-        # 10. HOLLOW INTERIOR — annular cut preserving tube wall
-        #     Lower zone: r=tube_OD/2 to body_inner, z=DTD to chamfer start
-        with BuildSketch(Plane.XY.offset(DRIP_TRAY_DEPTH)):
-            Circle(radius=BODY_INNER_RADIUS)
-            Circle(radius=TUBE_OR, mode=Mode.SUBTRACT)
-        extrude(amount=CHAMFER_Z_START - DRIP_TRAY_DEPTH, mode=Mode.SUBTRACT)
-
-        #     Upper zone: r=male_ring_OR to body_inner, z=chamfer start to top
-        with BuildSketch(Plane.XY.offset(CHAMFER_Z_START)):
-            Circle(radius=BODY_INNER_RADIUS)
-            Circle(radius=MALE_INTERLOCK_RADIUS, mode=Mode.SUBTRACT)
-        extrude(amount=CHAMFER_H, mode=Mode.SUBTRACT)
-
-        # 11. SUPPLY TUBE BORE (hollow)
-        Cylinder(
-            radius=TUBE_IR,
-            height=tube_top,
-            align=_align_bot(),
-            mode=Mode.SUBTRACT,
-        )
-
-        # 12. QD BARB BORE (from bottom of barb up through segment floor)
-        barb_ir = QD_FITTING_ID / 2         # 4.7625 mm
-        with Locations([Pos(0, 0, -QD_BARB_LENGTH)]):
-            Cylinder(
-                radius=barb_ir,
-                height=QD_BARB_LENGTH + DRIP_TRAY_DEPTH + 1.0,
-                align=_align_bot(),
-                mode=Mode.SUBTRACT,
-            )
-
-        # 13. LID RING BORE (hollow center)
-        with Locations([Pos(0, 0, -LID_RING_HEIGHT)]):
-            Cylinder(
-                radius=LID_RING_ID / 2,
-                height=LID_RING_HEIGHT,
-                align=_align_bot(),
-                mode=Mode.SUBTRACT,
-            )
-
-        # 14. O-ring groove on male ring exterior
-        oring_z = SEGMENT_HEIGHT + INTERLOCK_HEIGHT / 2
-        oring_groove_or = MALE_INTERLOCK_RADIUS + 0.1
-        oring_groove_ir = MALE_INTERLOCK_RADIUS - ORING_GROOVE_DEPTH
-        with BuildSketch(Plane.XY.offset(oring_z - ORING_GROOVE_WIDTH / 2)):
-            Circle(radius=oring_groove_or)
-            Circle(radius=oring_groove_ir, mode=Mode.SUBTRACT)
-        extrude(amount=ORING_GROOVE_WIDTH, mode=Mode.SUBTRACT)
-
-        # 15. POCKET BORES, lip counterbores, and bottom chamfers
-        for i in range(NODES_PER_SEGMENT):
-            pocket_loc = pocket_locs[i]
-            lip_loc = lip_locs[i]
-
-            # Pocket bore
-            bore_loc = pocket_loc * Pos(0, 0, WATER_WALL_THICKNESS / 2)
-            with Locations([bore_loc]):
-                Cylinder(
-                    radius=POCKET_RADIUS,
-                    height=POCKET_DEPTH - WATER_WALL_THICKNESS,
-                    align=(Align.CENTER, Align.CENTER, Align.CENTER),
-                    mode=Mode.SUBTRACT,
-                )
-
-            # Net cup lip counterbore
-            with Locations([lip_loc]):
-                Cylinder(
-                    radius=NET_CUP_LIP_OD / 2,
-                    height=NET_CUP_LIP_HEIGHT,
-                    align=(Align.CENTER, Align.CENTER, Align.CENTER),
-                    mode=Mode.SUBTRACT,
-                )
-
-            # Pocket bottom chamfer
-            chamfer_r = POCKET_RADIUS * 0.85
-            chamfer_len = POCKET_RADIUS * 0.5
-            bottom_loc = pocket_loc * Pos(0, 0, -(POCKET_DEPTH / 2 - WATER_WALL_THICKNESS / 2))
-            with Locations([bottom_loc]):
-                Cone(
-                    bottom_radius=0.1,
-                    top_radius=chamfer_r,
-                    height=chamfer_len,
-                    align=(Align.CENTER, Align.CENTER, Align.MIN),
-                    mode=Mode.SUBTRACT,
-                )
-
-        # 16. Drip tray drain channels (3 radial grooves toward center)
-        ch_r_inner = TUBE_OR + 2.0
-        ch_r_outer = BODY_INNER_RADIUS - 2.0
-        ch_r_mid = (ch_r_inner + ch_r_outer) / 2
-        ch_length = ch_r_outer - ch_r_inner
-        ch_avg_depth = (DRIP_TRAY_DEPTH - 2.5 + DRIP_TRAY_DEPTH - 1.0) / 2
-
-        for k in range(3):
-            ch_angle_deg = k * 120.0
-            ch_angle_rad = math.radians(ch_angle_deg)
-            ch_x = ch_r_mid * math.cos(ch_angle_rad)
-            ch_y = ch_r_mid * math.sin(ch_angle_rad)
-
-            with Locations([Pos(ch_x, ch_y, DRIP_TRAY_DEPTH - ch_avg_depth / 2) * Rot(0, 0, ch_angle_deg)]):
-                Box(
-                    ch_length,
-                    DRIP_TRAY_DRAIN_WIDTH,
-                    ch_avg_depth,
-                    align=(Align.CENTER, Align.CENTER, Align.CENTER),
-                    mode=Mode.SUBTRACT,
-                )
-
-        # 17. Drain through-holes
-        for k in range(3):
-            dh_angle_deg = k * 120.0
-            dh_angle_rad = math.radians(dh_angle_deg)
-            dh_x = DRAIN_HOLE_RADIAL_POS * math.cos(dh_angle_rad)
-            dh_y = DRAIN_HOLE_RADIAL_POS * math.sin(dh_angle_rad)
-
-            with Locations([Pos(dh_x, dh_y, 0)]):
-                Cylinder(
-                    radius=DRAIN_HOLE_DIAMETER / 2,
-                    height=DRIP_TRAY_DEPTH + 1.0,
-                    align=(Align.CENTER, Align.CENTER, Align.MIN),
-                    mode=Mode.SUBTRACT,
-                )
-
-    return bottom.part
+    Feature chain: the shared body core, then the reservoir fittings
+    fused on and their bores cut, for ``config`` (default: the tower_params
+    constants). With ``batched=True`` each run of fuse or cut features is
+    one multi-operand OCC boolean: body fuse, body cut, fittings fuse,
+    bores cut. ``draft=True`` skips the barb ridges and the body's fine
+    features.
+    """
+    return build_features('bottom_segment', BOTTOM_SEGMENT_FEATURES, config,
+                          batched, draft)
 
 
 if __name__ == "__main__":
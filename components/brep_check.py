@@ -0,0 +1,106 @@
+"""
+B-rep Check -- Golden Tower
+===========================
+OCC shape analysis of a built Part, run by feature_tree.build_features
+before anything is tessellated or exported:
+
+- kernel validity (``BRepCheck_Analyzer``),
+- exactly one solid (a second solid is a floating, unprinted fragment),
+- closed shells,
+- edges shorter than :data:`SMALL_EDGE` and faces narrower than
+  :data:`SLIVER_WIDTH` (boolean artifacts far below print resolution
+  that break meshing), and
+- the exact B-rep volume, which must be positive.
+
+A failing part raises :class:`BRepCheckError` naming the boolean step
+(feature) that broke it; see :func:`first_failure`.
+"""
+
+from OCP.BRep import BRep_Tool
+from OCP.BRepCheck import BRepCheck_Analyzer
+
+# Edges shorter than this (mm) are boolean artifacts
+SMALL_EDGE = 1e-3
+
+# Faces whose mean width, 2 * area / perimeter (mm), is below this are
+# slivers
+SLIVER_WIDTH = 1e-3
+
+
+class BRepCheckError(ValueError):
+    """A feature chain produced a Part that fails :func:`check_part`.
+
+    Attributes:
+        component: Component name.
+        feature: Name of the first feature whose result fails, or None if
+            no intermediate result fails on its own.
+        report: :func:`check_part` report of the final Part.
+    """
+
+    def __init__(self, component, feature, report):
+        self.component = component
+        self.feature = feature
+        self.report = report
+        step = (f"boolean step {feature!r}" if feature
+                else "the final part (no single step fails)")
+        super().__init__(f"{component}: B-rep check failed at {step}: "
+                         f"{'; '.join(report['problems'])}")
+
+
+def check_part(part, small_edge=SMALL_EDGE, sliver_width=SLIVER_WIDTH):
+    """Analyze ``part`` with OCC.
+
+    Returns:
+        dict: ``valid``, ``solids``, ``open_shells``, ``small_edges``,
+        ``sliver_faces``, ``min_edge`` and ``min_width`` (mm), exact
+        ``volume`` (mm³) and ``problems``, a list of messages that is
+        empty for a good part.
+    """
+    valid = BRepCheck_Analyzer(part.wrapped).IsValid()
+    solids = len(part.solids())
+    open_shells = sum(not BRep_Tool.IsClosed_s(shell.wrapped)
+                      for shell in part.shells())
+    edges = [edge.length for edge in part.edges()]
+    widths = []
+    for face in part.faces():
+        perimeter = sum(edge.length for edge in face.edges())
+        widths.append(2.0 * face.area / perimeter if perimeter else 0.0)
+    small_edges = sum(length < small_edge for length in edges)
+    sliver_faces = sum(width < sliver_width for width in widths)
+    volume = part.volume
+
+    problems = []
+    if not valid:
+        problems.append("invalid B-rep (BRepCheck_Analyzer)")
+    if solids != 1:
+        problems.append(f"{solids} solids, expected 1")
+    if open_shells:
+        problems.append(f"{open_shells} open shell(s)")
+    if small_edges:
+        problems.append(f"{small_edges} edge(s) shorter than {small_edge} mm")
+    if sliver_faces:
+        problems.append(f"{sliver_faces} sliver face(s) narrower than {sliver_width} mm")
+    if volume <= 0:
+        problems.append(f"non-positive volume {volume:.3f} mm³")
+    return {
+        'valid': valid,
+        'solids': solids,
+        'open_shells': open_shells,
+        'small_edges': small_edges,
+        'sliver_faces': sliver_faces,
+        'min_edge': min(edges, default=0.0),
+        'min_width': min(widths, default=0.0),
+        'volume': volume,
+        'problems': problems,
+    }
+
+
+def first_failure(steps):
+    """Name of the first ``(name, part)`` step whose part fails the check.
+
+    Steps whose part is None (not available) are skipped.
+    """
+    for name, part in steps:
+        if part is not None and check_part(part)['problems']:
+            return name
+    return None
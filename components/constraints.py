@@ -0,0 +1,133 @@
+"""
+Design Constraints -- Golden Tower
+==================================
+Every design rule of the tower in one place: build volume fit, wall
+perimeters and the pocket/tube/segment clearances checked by
+tests/test_printability.py, plus the asserts in tower_params.py. The
+tests are thin wrappers around this module.
+
+Rules are written with NumPy broadcasting, so one call evaluates them
+over whole arrays of parameter values. Mapping the feasible region of a
+million-point grid takes well under a second:
+
+    from components.constraints import evaluate, grid
+    result = evaluate(grid({'SEGMENT_OUTER_DIAMETER': np.linspace(120, 240, 1000),
+                            'POCKET_RADIAL_OFFSET': np.linspace(30, 80, 1000)}))
+    result['feasible']          # (1000, 1000) bool
+    result['margins']['pocket_clears_tube']
+
+For a single parameter set (overrides or a TowerConfig):
+
+    from components.constraints import violations
+    violations({'POCKET_RADIAL_OFFSET': 60.0})
+    # ['pocket_fits_in_segment: margin -6.00 (pocket stays inside ...)']
+
+Every rule returns its margin in millimetres (the H:W rule in ratio
+units); a variant passes when all margins are >= 0.
+"""
+
+import numpy as np
+
+from tower_config import TowerConfig
+
+# (name, description, margin) for every rule; margin(p) >= 0 passes
+CONSTRAINTS = [
+    # Build volume
+    ('segment_fits_xy', "segment OD fits the build plate",
+     lambda p: np.minimum(p.BUILD_VOLUME_X, p.BUILD_VOLUME_Y) - p.SEGMENT_OUTER_DIAMETER),
+    ('segment_fits_z', "segment plus interlock fits the build height",
+     lambda p: p.BUILD_VOLUME_Z - (p.SEGMENT_HEIGHT + p.INTERLOCK_HEIGHT)),
+    ('cap_fits_xy', "top cap with overhang fits the build plate",
+     lambda p: np.minimum(p.BUILD_VOLUME_X, p.BUILD_VOLUME_Y)
+     - (p.SEGMENT_OUTER_DIAMETER + 2 * p.CAP_OVERHANG)),
+    # Wall thickness
+    ('min_wall_thickness', "walls take MIN_PERIMETERS on each side",
+     lambda p: p.WALL_THICKNESS - p.MIN_PERIMETERS * p.NOZZLE_DIAMETER * 2),
+    ('water_wall_thickness', "water walls take WATER_PERIMETERS on each side",
+     lambda p: p.WATER_WALL_THICKNESS
+     - (p.WATER_PERIMETERS * p.NOZZLE_DIAMETER * 2 - 0.001)),
+    ('central_tube_wall', "supply tube wall is at least WALL_THICKNESS",
+     lambda p: p.SUPPLY_TUBE_WALL - p.WALL_THICKNESS),
+    # Parametric consistency
+    ('pocket_fits_in_segment', "pocket stays inside the segment radius",
+     lambda p: p.SEGMENT_OUTER_RADIUS - (p.POCKET_RADIAL_OFFSET + p.POCKET_RADIUS)),
+    ('pocket_clears_tube', "pocket inner edge clears the supply tube",
+     lambda p: (p.POCKET_RADIAL_OFFSET - p.POCKET_RADIUS)
+     - (p.SUPPLY_TUBE_OD / 2 + p.WALL_THICKNESS)),
+    ('net_cup_fits_pocket', "net cup fits the pocket",
+     lambda p: p.POCKET_DIAMETER - p.NET_CUP_OD),
+    # tower_params.py asserts
+    ('segment_hw_ratio', "segment H:W ratio is at least 1.0",
+     lambda p: p.SEGMENT_HW_RATIO - 1.0),
+]
+
+DESCRIPTIONS = {name: description for name, description, _ in CONSTRAINTS}
+
+
+class ArrayConfig(TowerConfig):
+    """A :class:`~tower_config.TowerConfig` whose values may be NumPy arrays.
+
+    The derived formulas run on NumPy (``math`` functions and ``min``/``max``
+    become ufuncs), so derived values broadcast over the primary arrays.
+    """
+
+    __slots__ = ()
+    _formula_globals = {'math': np, 'min': np.minimum, 'max': np.maximum}
+
+
+def grid(ranges) -> dict:
+    """Open grid over ``{name: values}`` for :func:`evaluate`.
+
+    Each axis becomes an array shaped to broadcast along its own
+    dimension (like ``np.ix_``), so results have shape
+    ``(len(values_0), len(values_1), ...)`` without materialising every
+    input at full size.
+    """
+    axes = np.ix_(*(np.asarray(values) for values in ranges.values()))
+    return dict(zip(ranges, axes))
+
+
+def evaluate(params=None) -> dict:
+    """Evaluate every rule over arrays of parameter values at once.
+
+    Args:
+        params: tower_params overrides whose values may be NumPy arrays
+            (broadcast against each other, see :func:`grid`), or a
+            :class:`~tower_config.TowerConfig` / :class:`ArrayConfig`.
+
+    Returns:
+        dict: ``margins`` and ``passed`` (rule name -> float / bool array)
+        and ``feasible``, the bool array of points passing every rule.
+        All arrays share the broadcast shape of the inputs.
+    """
+    cfg = (params if isinstance(params, TowerConfig)
+           else ArrayConfig(**dict(params or {})))
+    found = {name: np.asarray(margin(cfg), dtype=float)
+             for name, _, margin in CONSTRAINTS}
+    # Inputs no rule reads still shape the result
+    shape = np.broadcast_shapes(*(np.shape(v) for v in cfg.primary().values()
+                                  if isinstance(v, np.ndarray)),
+                                *(m.shape for m in found.values()))
+    found = {name: np.broadcast_to(m, shape) for name, m in found.items()}
+    passed = {name: m >= 0 for name, m in found.items()}
+    return {
+        'margins': found,
+        'passed': passed,
+        'feasible': np.logical_and.reduce(list(passed.values())),
+    }
+
+
+def margins(params=None) -> dict:
+    """Margin of every rule for one parameter set, as floats."""
+    return {name: float(m) for name, m in evaluate(params)['margins'].items()}
+
+
+def describe(found) -> list:
+    """Human-readable description of every negative margin in ``found``."""
+    return [f"{name}: margin {float(found[name]):.2f} ({DESCRIPTIONS[name]})"
+            for name, _, _ in CONSTRAINTS if found[name] < 0]
+
+
+def violations(params=None) -> list:
+    """Failed rules of one parameter set (empty if it is valid)."""
+    return describe(margins(params))
@@ -0,0 +1,90 @@
+"""
+Derived Dimensions -- Golden Tower
+==================================
+Dimensions derived from tower_params that more than one geometry engine
+needs: the build123d B-rep builders and the mesh preview engine. Pure
+Python (no CAD kernel), so importing it is instant.
+
+Keep formulas here rather than in a builder so the engines cannot drift.
+The build cache only counts a constant's params for builders that use
+the constant, so sharing this module does not widen cache invalidation.
+"""
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from tower_params import *
+
+# ─── Segment body ────────────────────────────────────────────────────
+# Interlock ring radii (use MALE_RING_OR from tower_params)
+MALE_INTERLOCK_RADIUS = MALE_RING_OR  # 29.0 mm
+FEMALE_INTERLOCK_RADIUS = MALE_INTERLOCK_RADIUS + INTERLOCK_CLEARANCE  # 29.3 mm
+
+# Body inner radius (after wall thickness)
+BODY_INNER_RADIUS = SEGMENT_OUTER_RADIUS - WALL_THICKNESS  # 78.0 mm
+
+# Tube radii
+TUBE_OR = SUPPLY_TUBE_OD / 2  # 16.0 mm
+TUBE_IR = SUPPLY_TUBE_ID / 2  # 13.6 mm
+TUBE_HEIGHT = SEGMENT_HEIGHT + INTERLOCK_HEIGHT  # 210 mm, through male interlock
+
+# Male ring chamfer: the cone that supports the male ring during printing
+CHAMFER_H = MALE_RING_CHAMFER_H  # 10.0 mm
+CHAMFER_Z_START = SEGMENT_HEIGHT - CHAMFER_H  # 190.0 mm
+
+# Drip tray slope: channels deepen toward center (3° effective slope)
+SLOPE_DROP = (BODY_INNER_RADIUS - TUBE_OR) * math.tan(math.radians(DRIP_TRAY_SLOPE))
+# ~3.25mm over 62mm radial distance
+
+# ─── Planting pockets ────────────────────────────────────────────────
+POCKET_Z_OFFSET = (
+    INTERLOCK_HEIGHT
+    + POCKET_DEPTH / 2 * math.cos(math.radians(POCKET_TILT_ANGLE))
+    + 2.0
+)
+
+# Extended pocket solid length for clean boolean overlap with outer shell
+POCKET_SOLID_LENGTH = POCKET_DEPTH + 50.0
+
+# Lip flange / counterbore centre along the pocket axis (mouth end)
+LIP_Z_LOCAL = POCKET_DEPTH / 2 - NET_CUP_LIP_HEIGHT / 2
+
+# ─── Bottom segment ──────────────────────────────────────────────────
+# QD barb geometry
+QD_BARB_LENGTH = 20.0           # mm, extends downward from z=0
+QD_BARB_RIDGE_COUNT = 3         # number of barb ridges
+QD_BARB_RIDGE_HEIGHT = 0.8      # mm, radial protrusion of each ridge
+QD_BARB_RIDGE_SPACING = 6.0     # mm, center-to-center along barb axis
+
+# Bayonet lug geometry
+LUG_WIDTH = 15.0                # mm, tangential (arc-wise) extent
+LUG_DEPTH = 5.0                 # mm, radial extent
+LUG_HEIGHT = 8.0                # mm, extends downward from z=0
+
+# Reservoir lid ring
+LID_RING_HEIGHT = 10.0          # mm, extends downward from z=0
+LID_RING_OD = RESERVOIR_LID_OD  # 160 mm
+LID_RING_ID = SEGMENT_OUTER_DIAMETER - 2 * WALL_THICKNESS  # 156 mm
+
+# ─── Top cap ─────────────────────────────────────────────────────────
+CAP_OUTER_R = SEGMENT_OUTER_RADIUS + CAP_OVERHANG            # 90 mm
+TUBE_HOLE_R = SUPPLY_TUBE_ID / 2                              # 14 mm
+SOCKET_INNER_R = SUPPLY_TUBE_OD / 2                           # 16 mm
+SOCKET_OUTER_R = 29.3                                         # receives male ring @ 29.0
+FINIAL_BASE_R = 5.0                                           # cone apex radius
+FINIAL_DOME_R = 8.0                                           # hemisphere radius
+LIP_HEIGHT = 5.0                                              # outer rim height
+CONE_BASE_R = SEGMENT_OUTER_RADIUS                            # 80 mm
+CONE_TOP_R = FINIAL_BASE_R                                    # 5 mm
+CONE_H = CAP_HEIGHT - WALL_THICKNESS                          # 38 mm
+INNER_CONE_BASE_R = CONE_BASE_R - WATER_WALL_THICKNESS        # 77.6 mm
+INNER_CONE_TOP_R = max(CONE_TOP_R - WATER_WALL_THICKNESS, 0.5)  # 2.6 mm
+N_CHANNELS = 6
+# Channel inner edge starts 2mm outside tube bore to avoid coincident faces
+CH_INNER_R = TUBE_HOLE_R + 2.0                               # 16 mm
+CH_OUTER_R = CAP_OUTER_R - WALL_THICKNESS                    # 88 mm
+CHANNEL_LENGTH = CH_OUTER_R - CH_INNER_R                     # 72 mm
+CHANNEL_CENTER_R = (CH_INNER_R + CH_OUTER_R) / 2             # 52 mm
+
@@ -0,0 +1,504 @@
+"""
+Analytic Estimator -- Golden Tower
+==================================
+Approximate volume, surface area, filament mass and fill ratio of each
+component straight from a TowerConfig -- no CAD kernel, no mesh. A
+parameter set takes ~15 ms for all three components (the top cap alone
+is closed form, microseconds), so sweeps can screen thousands of
+variants in well under a minute before anything is built:
+
+    from components.estimator import estimate
+    estimate('segment', {'POCKET_TILT_ANGLE': 25.0})['mass']
+
+The rotationally symmetric body (blank, hollow, tube, interlocks, drip
+tray) is summed from closed-form cylinder, annulus, cone and box volumes
+and areas. The tilted pockets are the only non-symmetric solids: each is
+a stack of coaxial frusta (protrusion, flare, flange; bore, counterbore,
+chamfer), integrated in its own cylindrical frame along rays from the
+pocket axis. Where a ray enters a body cylinder is a quadratic, so the
+pocket/body overlap along every ray is exact and only the axial and
+azimuthal sums are discretised (``AXIAL_STEP``, ``AZIMUTH_STEPS``).
+Pocket cover on the body faces is the derivative of an overlap volume
+with respect to the face position.
+
+Accuracy against the exported B-rep STLs: volume and surface area within
+0.5% at the default resolution (small features such as the alignment key
+and slot are approximated, see the comments in each estimator).
+
+Mass follows the print model in reports/print_feasibility.md: walls are
+solid perimeters down to ``PERIMETER_DEPTH`` below every surface, the
+rest is printed at ``INFILL_DENSITY``.
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from tower_config import TowerConfig
+
+# PETG, g/mm³ (reports/print_feasibility.md)
+FILAMENT_DENSITY = 1.27e-3
+
+# Solid perimeter/skin depth under every surface (2 mm walls print solid)
+PERIMETER_DEPTH = 1.0
+
+# Infill fraction of material deeper than PERIMETER_DEPTH
+INFILL_DENSITY = 0.15
+
+# Pocket quadrature: station spacing along the axis (mm) and rays per turn
+AXIAL_STEP = 2.0
+AZIMUTH_STEPS = 24
+
+# Step of the finite differences giving pocket cover on body faces (mm)
+_DELTA = 0.25
+
+def _config(params):
+    """``params`` as a :class:`~tower_config.TowerConfig`: overrides of the
+    tower_params values, a config, or None for the defaults."""
+    return params if isinstance(params, TowerConfig) else TowerConfig(**(params or {}))
+
+
+# ---------------------------------------------------------------------------
+# Closed-form pieces
+# ---------------------------------------------------------------------------
+def _disk(r):
+    return math.pi * r * r
+
+
+def _annulus(r_outer, r_inner):
+    return math.pi * (r_outer * r_outer - r_inner * r_inner)
+
+
+def _frustum(r0, r1, h):
+    """Volume and lateral area of a cone frustum."""
+    return (math.pi * h / 3 * (r0 * r0 + r0 * r1 + r1 * r1),
+            math.pi * (r0 + r1) * math.hypot(r1 - r0, h))
+
+
+def _strip_circle(r, half_width):
+    """Area of a circle of radius ``r`` inside a centred strip."""
+    h = min(half_width, r)
+    return 2 * (h * math.sqrt(r * r - h * h) + r * r * math.asin(h / r))
+
+
+# ---------------------------------------------------------------------------
+# Pocket quadrature
+# ---------------------------------------------------------------------------
+def _pocket_frusta(p, draft):
+    """Coaxial ``(s0, s1, r0, r1)`` frusta of the pocket's additive and
+    subtractive tools along the pocket axis (see pocket_build123d.py)."""
+    wall = p.WATER_WALL_THICKNESS
+    outer_r = p.POCKET_RADIUS + wall
+    half = p.POCKET_SOLID_LENGTH / 2
+    lip_r = p.NET_CUP_LIP_OD / 2
+    lip0 = p.LIP_Z_LOCAL - p.NET_CUP_LIP_HEIGHT / 2
+    lip1 = p.LIP_Z_LOCAL + p.NET_CUP_LIP_HEIGHT / 2
+    bore0 = wall / 2 - (p.POCKET_DEPTH - wall) / 2
+    additive = [
+        (-half, half, outer_r, outer_r),                   # protrusion
+        (-11.0, 1.0, outer_r + 5.0, outer_r),              # flare
+        (lip0, lip1, lip_r + wall, lip_r + wall),          # lip flange
+    ]
+    subtractive = [
+        (bore0, bore0 + p.POCKET_DEPTH - wall, p.POCKET_RADIUS, p.POCKET_RADIUS),
+        (lip0, lip1, lip_r, lip_r),                        # counterbore
+    ]
+    if not draft:
+        chamfer0 = -(p.POCKET_DEPTH / 2 - wall / 2)
+        subtractive.append((chamfer0, chamfer0 + p.POCKET_RADIUS * 0.5,
+                            0.1, p.POCKET_RADIUS * 0.85))
+    return additive, subtractive
+
+
+def _radius(frusta, s):
+    """Radius of a union of coaxial frusta at axial positions ``s``."""
+    r = np.zeros_like(s)
+    for s0, s1, r0, r1 in frusta:
+        inside = (s >= s0) & (s <= s1)
+        r = np.where(inside, np.maximum(r, r0 + (r1 - r0) * (s - s0) / (s1 - s0)), r)
+    return r
+
+
+def _stations(breaks):
+    """Midpoints and widths of axial cells no longer than AXIAL_STEP."""
+    mids, widths = [], []
+    for b0, b1 in zip(breaks[:-1], breaks[1:]):
+        n = max(1, math.ceil((b1 - b0) / AXIAL_STEP))
+        w = (b1 - b0) / n
+        mids.append(b0 + w * (np.arange(n) + 0.5))
+        widths.append(np.full(n, w))
+    return np.concatenate(mids), np.concatenate(widths)
+
+
+class _Rays:
+    """Rays from the axes of all pockets of a segment, one per (pocket,
+    axial position ``s``, azimuth); ``P`` are the ray origins, ``U`` unit
+    directions, both ``(n, 3)`` in world coordinates."""
+
+    def __init__(self, p, s):
+        n_psi = AZIMUTH_STEPS
+        psi = 2 * math.pi * (np.arange(n_psi) + 0.5) / n_psi
+        tilt = math.radians(p.POCKET_TILT_ANGLE)
+        ct, st = math.cos(tilt), math.sin(tilt)
+        # Every node is tilted about the global Y axis (pocket_matrix), so
+        # the ray directions do not depend on the node angle
+        u = np.stack([ct * np.cos(psi), np.sin(psi), -st * np.cos(psi)], axis=1)
+        axis = np.array([st, 0.0, ct])
+        centres = []
+        for i in range(p.NODES_PER_SEGMENT):
+            a = math.radians(i * p.GOLDEN_ANGLE_DEG)
+            centres.append((p.POCKET_RADIAL_OFFSET * math.cos(a),
+                            p.POCKET_RADIAL_OFFSET * math.sin(a),
+                            p.POCKET_Z_OFFSET + i * p.NODE_VERTICAL_PITCH))
+        origins = np.asarray(centres)[:, None, :] + s[None, :, None] * axis
+        shape = (len(centres), len(s), n_psi, 3)
+        self.P = np.broadcast_to(origins[:, :, None, :], shape).reshape(-1, 3)
+        self.U = np.broadcast_to(u, shape).reshape(-1, 3)
+        self.n_s = len(s)
+        self.dpsi = 2 * math.pi / n_psi
+        # Per-ray terms of the ray/cylinder quadratic a*rho^2 + 2b*rho + c
+        P, U = self.P, self.U
+        self._a = U[:, 0] ** 2 + U[:, 1] ** 2
+        self._b = P[:, 0] * U[:, 0] + P[:, 1] * U[:, 1]
+        self._r2 = P[:, 0] ** 2 + P[:, 1] ** 2
+        # Horizontal rays (no tilt): a tiny slope keeps the slab test finite
+        uz = np.where(np.abs(U[:, 2]) < 1e-12, 1e-12, U[:, 2])
+        self._inv_uz = 1.0 / uz
+
+    def per_station(self, values):
+        """Broadcast per-station ``values`` to every ray."""
+        return np.broadcast_to(np.asarray(values)[None, :, None],
+                               (len(self.P) // (self.n_s * AZIMUTH_STEPS),
+                                self.n_s, AZIMUTH_STEPS)).reshape(-1)
+
+    def overlap(self, rho0, rho1, cells):
+        """``∫ rho d(rho)`` over ``[rho0, rho1]`` inside each cylinder cell.
+
+        Args:
+            cells: ``(k, 3)`` rows of ``(radius, z0, z1)``, Z-axis cylinders.
+
+        Returns:
+            ``(k, n)`` array; times ``ds * dpsi`` it is a volume.
+        """
+        R, z0, z1 = (np.asarray(cells, float).T)[:, :, None]
+        a, b = self._a, self._b
+        root = np.sqrt(np.maximum(b * b - a * (self._r2 - R * R), 0.0))
+        lo, hi = (-b - root) / a, (-b + root) / a   # equal when missed
+        t0 = (z0 - self.P[:, 2]) * self._inv_uz
+        t1 = (z1 - self.P[:, 2]) * self._inv_uz
+        lo = np.maximum(np.maximum(lo, np.minimum(t0, t1)), rho0)
+        hi = np.minimum(np.minimum(hi, np.maximum(t0, t1)), rho1)
+        return np.maximum(hi - lo, 0.0) * (hi + lo) / 2
+
+    def contains(self, rho, R, z0, z1):
+        """Whether the point at ``rho`` along each ray is in the cylinder."""
+        X = self.P + rho[:, None] * self.U
+        return ((X[:, 0] ** 2 + X[:, 1] ** 2 <= R * R)
+                & (X[:, 2] >= z0) & (X[:, 2] <= z1))
+
+
+def _annular(cells, overlap):
+    """Sum an overlap over annular cells ``(r_outer, r_inner, z0, z1)``,
+    as outer cylinder minus inner cylinder."""
+    cyl = [(ro, z0, z1) for ro, ri, z0, z1 in cells]
+    cyl += [(ri, z0, z1) for ro, ri, z0, z1 in cells if ri > 0]
+    m = overlap(cyl)
+    n = len(cells)
+    return m[:n].sum(axis=0) - m[n:].sum(axis=0)
+
+
+def _in_cells(rays, rho, cells):
+    """Whether the point at ``rho`` along each ray is in an annular cell."""
+    inside = np.zeros(len(rho), bool)
+    for ro, ri, z0, z1 in cells:
+        cell = rays.contains(rho, ro, z0, z1)
+        if ri > 0:
+            cell &= ~rays.contains(rho, ri, z0, z1)
+        inside |= cell
+    return inside
+
+
+def _pocket_terms(p, draft, solids, voids, covers):
+    """Volume and area the pockets add to a segment body.
+
+    Args:
+        solids: Disjoint ``(r_outer, r_inner, z0, z1)`` cells of the body
+            BEFORE its cuts. Pocket material inside them adds nothing.
+        voids: Disjoint body cells cut away (hollow, bores), each inside a
+            solid cell. The pocket bore gives back its overlap with them.
+        covers: ``(tool, cell, key, sign)`` body faces covered or cut by
+            the pocket tools: face area = ``sign * d overlap / d key`` of
+            the ``'add'``/``'sub'`` tool with the cylinder ``cell``, where
+            ``key`` indexes ``(radius, z0, z1)``.
+
+    Returns:
+        tuple: ``(volume, area, area_removed)``
+    """
+    add, sub = _pocket_frusta(p, draft)
+    breaks = np.unique([s for s0, s1, _, _ in add + sub for s in (s0, s1)])
+    s, ds = _stations(breaks)
+    rays = _Rays(p, s)
+    r_add, r_sub = _radius(add, s), _radius(sub, s)
+    rho_add, rho_sub = rays.per_station(r_add), rays.per_station(r_sub)
+    w = rays.per_station(ds) * rays.dpsi
+    zero = np.zeros_like(rho_add)
+
+    def overlap(rho, cells):
+        return rays.overlap(zero, rho, cells)
+
+    # Volume: tool outside the body, minus bore, plus bore inside voids
+    volume = (w * (rho_add ** 2 - rho_sub ** 2) / 2).sum()
+    volume -= (w * _annular(solids, lambda c: overlap(rho_add, c))).sum()
+    volume += (w * _annular(voids, lambda c: overlap(rho_sub, c))).sum()
+
+    # Lateral faces, with the slant of the frusta
+    def slant(frusta):
+        h = ds / 4
+        return np.sqrt(1 + ((_radius(frusta, s + h) - _radius(frusta, s - h)) / (2 * h)) ** 2)
+
+    exposed_add = ~_in_cells(rays, rho_add, solids)
+    area = (w * rho_add * rays.per_station(slant(add)) * exposed_add).sum()
+    exposed_sub = (rho_sub > 0) & ~_in_cells(rays, rho_sub, voids)
+    area += (w * rho_sub * rays.per_station(slant(sub)) * exposed_sub).sum()
+
+    # Steps and ends of the frusta stacks: annuli at the breakpoints,
+    # exposed outside the solids (protrusions) or voids (bores)
+    steps = _Rays(p, breaks)
+    for frusta, cells in ((add, solids), (sub, voids)):
+        lo = steps.per_station(_radius(frusta, breaks - 1e-9))
+        hi = steps.per_station(_radius(frusta, breaks + 1e-9))
+        lo, hi = np.minimum(lo, hi), np.maximum(lo, hi)
+        inside = _annular(cells, lambda c: steps.overlap(lo, hi, c))
+        area += steps.dpsi * ((hi * hi - lo * lo) / 2 - inside).sum()
+
+    # Body faces covered by the protrusions or cut by the bores
+    removed = 0.0
+    for tool, rho in (('add', rho_add), ('sub', rho_sub)):
+        cells, signs = [], []
+        for t, cell, key, sign in covers:
+            if t == tool:
+                for step in (_DELTA, -_DELTA):
+                    shifted = list(cell)
+                    shifted[key] += step
+                    cells.append(shifted)
+                signs.append(sign)
+        if cells:
+            m = (w * overlap(rho, cells)).sum(axis=1)
+            removed += np.dot(signs, m[0::2] - m[1::2]) / (2 * _DELTA)
+    return volume, area, removed
+
+
+# ---------------------------------------------------------------------------
+# Components (mirror the *_build123d.py feature chains)
+# ---------------------------------------------------------------------------
+def _body(p, draft):
+    """Closed-form volume and area of the symmetric segment body core,
+    plus its pocket cells (see :func:`_pocket_terms`)."""
+    R, H, IH = p.SEGMENT_OUTER_RADIUS, p.SEGMENT_HEIGHT, p.INTERLOCK_HEIGHT
+    R_in, DTD, CZS = p.BODY_INNER_RADIUS, p.DRIP_TRAY_DEPTH, p.CHAMFER_Z_START
+    TOR, TIR, MR = p.TUBE_OR, p.TUBE_IR, p.MALE_INTERLOCK_RADIUS
+    KD, KW = p.INTERLOCK_KEY_DEPTH, p.INTERLOCK_KEY_WIDTH
+    rd = p.DRAIN_HOLE_DIAMETER / 2
+
+    # Blank + ring + key outside the ring, minus hollow, tube bore, drains.
+    # The support cone lies inside the blank, which the hollow's upper zone
+    # (r >= MR) leaves solid.
+    volume = (_disk(R) * H + _disk(MR) * IH + KD * KW * IH
+              - _annulus(R_in, TOR) * (CZS - DTD) - _annulus(R_in, MR) * (H - CZS)
+              - _disk(TIR) * (H + IH) - 3 * _disk(rd) * DTD)
+    area = (2 * math.pi * R * H + _annulus(R, R_in)          # shell, top rim
+            + 2 * math.pi * R_in * (H - DTD) + _annulus(R_in, TOR)  # hollow
+            + 2 * math.pi * TOR * (CZS - DTD) + _annulus(MR, TOR)  # tube, ceiling
+            + 2 * math.pi * MR * (H - CZS)                    # core under ring
+            + 2 * math.pi * MR * IH + _annulus(MR, TIR)       # male ring
+            + 2 * KD * IH + 2 * KD * KW                       # key
+            + 2 * math.pi * TIR * (H + IH)                    # tube bore
+            + 3 * (2 * math.pi * rd * DTD - 2 * _disk(rd)))   # drain holes
+    if not draft:
+        # Drain channels, less their overlap with the drain holes
+        depth = ((DTD - 2.5) + (DTD - 1.0)) / 2
+        length = (R_in - 2.0) - (TOR + 2.0)
+        width = p.DRIP_TRAY_DRAIN_WIDTH
+        volume -= 3 * depth * (length * width - _strip_circle(rd, width / 2))
+        area += 3 * (2 * length + 2 * width) * depth
+        # O-ring groove
+        GD, GW = p.ORING_GROOVE_DEPTH, p.ORING_GROOVE_WIDTH
+        volume -= _annulus(MR, MR - GD) * GW
+        area += 2 * math.pi * (MR - GD - MR) * GW + 2 * _annulus(MR, MR - GD)
+
+    solids = [(R, 0.0, 0.0, H)]
+    voids = [(R_in, TOR, DTD, CZS), (R_in, MR, CZS, H), (TIR, 0.0, 0.0, H)]
+    covers = [
+        ('add', (R, 0.0, H), 0, 1.0),                    # outer shell
+        ('add', (R, 0.0, H), 2, 1.0),                    # top rim annulus
+        ('add', (R_in, 0.0, H), 2, -1.0),
+        ('add', (R_in, 0.0, H), 2, -1.0),                # protrusions cut
+        ('add', (MR, 0.0, H), 2, 1.0),                   # flush with the
+        ('sub', (R_in, 0.0, H), 2, 1.0),                 # open hollow top
+        ('sub', (MR, 0.0, H), 2, -1.0),
+        ('sub', (R_in, DTD, H), 0, 1.0),                 # hollow wall
+        ('sub', (TOR, DTD, CZS), 0, 1.0),                # tube wall
+        ('sub', (R_in, DTD, CZS), 1, -1.0),              # drip tray floor
+        ('sub', (TOR, DTD, CZS), 1, 1.0),
+    ]
+    return volume, area, solids, voids, covers
+
+
+def _segment(p, draft):
+    volume, area, solids, voids, covers = _body(p, draft)
+    R, DTD = p.SEGMENT_OUTER_RADIUS, p.DRIP_TRAY_DEPTH
+    TOR, TIR, FIR = p.TUBE_OR, p.TUBE_IR, p.FEMALE_INTERLOCK_RADIUS
+    rd = p.DRAIN_HOLE_DIAMETER / 2
+
+    # Female bore: removes the floor between tube and FIR (the hollow takes
+    # over above the drip tray)
+    volume -= _annulus(FIR, TOR) * DTD
+    area += (_disk(R) - _annulus(FIR, TOR) - _disk(TIR)   # bottom face
+             - _annulus(FIR, TOR)                         # floor top lost
+             + 2 * math.pi * (FIR + TOR) * DTD)           # bore walls
+    voids.append((FIR, TOR, 0.0, DTD))
+    covers.append(('add', (R, 0.0, p.SEGMENT_HEIGHT), 1, -1.0))  # bottom face
+    if not draft:
+        depth = ((DTD - 2.5) + (DTD - 1.0)) / 2
+        width = p.DRIP_TRAY_DRAIN_WIDTH
+        # Drain channels already open the floor inside the female bore
+        volume += 3 * (FIR - (TOR + 2.0)) * width * depth
+        # Key slot beyond the bore, up to the hollow (in line with channel 0)
+        slot_depth = p.INTERLOCK_KEY_DEPTH + p.INTERLOCK_CLEARANCE * 2
+        slot_width = p.INTERLOCK_KEY_WIDTH + p.INTERLOCK_CLEARANCE * 2
+        reach = p.MALE_INTERLOCK_RADIUS + p.INTERLOCK_KEY_DEPTH / 2 + slot_depth / 2 - FIR
+        volume -= reach * (slot_width * DTD - width * depth)
+        area += (2 * reach + slot_width) * DTD
+    return volume, area, solids, voids, covers
+
+
+def _bottom_segment(p, draft):
+    volume, area, solids, voids, covers = _body(p, draft)
+    TOR, TIR, W, LRH = p.TUBE_OR, p.TUBE_IR, p.WALL_THICKNESS, p.LID_RING_HEIGHT
+    lid_or, lid_ir = p.LID_RING_OD / 2, p.LID_RING_ID / 2
+    barb_or, barb_ir = p.QD_FITTING_BARB_OD / 2, p.QD_FITTING_ID / 2
+
+    # Lid ring wall, open inside; the bayonet lugs sit inside the wall
+    # and add nothing
+    volume += _annulus(lid_or, lid_ir) * LRH
+    area += (_disk(lid_ir) - _disk(TOR)                   # floor underside
+             + 2 * math.pi * (lid_or + lid_ir) * LRH + _annulus(lid_or, lid_ir))
+    solids.append((lid_or, lid_ir, -LRH, 0.0))
+
+    # Reducer flange under the tube, pierced by the barb bore
+    volume += _annulus(TOR, barb_ir) * W
+    area += (_annulus(TOR, barb_or) + 2 * math.pi * TOR * W   # underside, rim
+             + _annulus(TIR, barb_ir) + 2 * math.pi * barb_ir * W)  # tube floor, bore
+    solids.append((TOR, barb_ir, -W, 0.0))
+
+    # QD barb below the flange
+    barb = p.QD_BARB_LENGTH - W
+    volume += _annulus(barb_or, barb_ir) * barb
+    area += 2 * math.pi * (barb_or + barb_ir) * barb + _annulus(barb_or, barb_ir)
+    if not draft:
+        for j in range(p.QD_BARB_RIDGE_COUNT):
+            ridge_z = -p.QD_BARB_LENGTH + 4.0 + j * p.QD_BARB_RIDGE_SPACING
+            if ridge_z + 2.0 <= -W:
+                v, a = _frustum(barb_or + p.QD_BARB_RIDGE_HEIGHT, barb_or, 2.0)
+                volume += v - _disk(barb_or) * 2.0
+                area += (a + _annulus(barb_or + p.QD_BARB_RIDGE_HEIGHT, barb_or)
+                         - 2 * math.pi * barb_or * 2.0)
+    return volume, area, solids, voids, covers
+
+
+def _top_cap(p, draft):
+    W, IH, cap_h = p.WALL_THICKNESS, p.INTERLOCK_HEIGHT, p.CAP_HEIGHT
+    cap_r, hole_r, dome_r = p.CAP_OUTER_R, p.TUBE_HOLE_R, p.FINIAL_DOME_R
+
+    def cone_r(z):
+        """Outer deflector cone radius, z = W - 1 .. CAP_HEIGHT."""
+        return p.CONE_BASE_R + (p.CONE_TOP_R - p.CONE_BASE_R) * (z - (W - 1.0)) / (p.CONE_H + 1.0)
+
+    dome_z = cap_h - 1.0
+    cone_v, _ = _frustum(cone_r(W), p.CONE_TOP_R, cap_h - W)
+    tip_v, _ = _frustum(cone_r(dome_z), p.CONE_TOP_R, 1.0)
+    _, slant_a = _frustum(cone_r(W), cone_r(dome_z), dome_z - W)
+    hollow_v, hollow_a = _frustum(p.INNER_CONE_BASE_R, p.INNER_CONE_TOP_R, p.CONE_H)
+    sockets = _annulus(p.SOCKET_OUTER_R + W, p.SOCKET_OUTER_R) + _annulus(p.SOCKET_INNER_R, hole_r)
+    ch_depth = min(p.CHANNEL_DEPTH, W - 0.5)
+
+    volume = (_disk(cap_r) * W + cone_v
+              + _annulus(cap_r, cap_r - W) * (p.LIP_HEIGHT - W)
+              + 2 / 3 * math.pi * dome_r ** 3 - tip_v      # dome beyond the cone
+              + sockets * IH
+              - hollow_v - _disk(hole_r) * W
+              - p.N_CHANNELS * p.CHANNEL_LENGTH * p.CHANNEL_WIDTH * ch_depth)
+    area = (_disk(cap_r) - _disk(hole_r) - sockets         # base plate underside
+            + 2 * math.pi * (hole_r + p.SOCKET_INNER_R + p.SOCKET_OUTER_R
+                             + p.SOCKET_OUTER_R + W) * IH + sockets
+            + 2 * math.pi * hole_r * W                     # tube bore
+            + 2 * math.pi * cap_r * p.LIP_HEIGHT           # rim outside
+            + 2 * math.pi * (cap_r - W) * (p.LIP_HEIGHT - W) + _annulus(cap_r, cap_r - W)
+            + _annulus(cap_r - W, cone_r(W)) + slant_a     # plate top, cone
+            + 2 * math.pi * dome_r ** 2 + _disk(dome_r) - _disk(cone_r(dome_z))
+            + _disk(p.INNER_CONE_BASE_R) - _disk(hole_r)   # hollow floor
+            + hollow_a + _disk(p.INNER_CONE_TOP_R)
+            + p.N_CHANNELS * 2 * (p.CHANNEL_LENGTH + p.CHANNEL_WIDTH) * ch_depth)
+    return volume, area, [], [], []
+
+
+ESTIMATORS = {
+    'segment': _segment,
+    'bottom_segment': _bottom_segment,
+    'top_cap': _top_cap,
+}
+
+
+def estimate(name, params=None, draft=False) -> dict:
+    """Estimate one component without building it.
+
+    Args:
+        name: ``'segment'``, ``'bottom_segment'`` or ``'top_cap'``.
+        params: :class:`~tower_config.TowerConfig` to estimate, or
+            tower_params overrides for one (default: the module constants).
+        draft: Leave out the fine features, like a draft build.
+
+    Returns:
+        dict: ``volume`` (mm³), ``area`` (mm²), ``mass`` (g of filament),
+        ``print_fill`` (printed fraction of the solid volume) and
+        ``fill_ratio`` (volume over the segment envelope cylinder, as in
+        validate_visual.py's analysis).
+
+    Raises:
+        TypeError: an override names no primary parameter.
+    """
+    p = _config(params)
+    volume, area, solids, voids, covers = ESTIMATORS[name](p, draft)
+    if solids:
+        v, a, removed = _pocket_terms(p, draft, solids, voids, covers)
+        volume, area = volume + v, area + a - removed
+    shell = min(area * PERIMETER_DEPTH, volume)
+    print_fill = (shell + INFILL_DENSITY * (volume - shell)) / volume
+    envelope = _disk(p.SEGMENT_OUTER_RADIUS) * p.SEGMENT_HEIGHT
+    return {
+        'volume': float(volume),
+        'area': float(area),
+        'mass': float(volume * print_fill * FILAMENT_DENSITY),
+        'print_fill': float(print_fill),
+        'fill_ratio': float(volume / envelope),
+    }
+
+
+def estimate_all(params=None, draft=False) -> dict:
+    """:func:`estimate` every component for one parameter set."""
+    p = _config(params)
+    return {name: estimate(name, p, draft) for name in ESTIMATORS}
+
+
+if __name__ == "__main__":
+    import time
+    t0 = time.perf_counter()
+    results = estimate_all()
+    dt = time.perf_counter() - t0
+    for name, e in results.items():
+        print(f"{name:<16} volume={e['volume']:.0f} mm³  area={e['area']:.0f} mm²  "
+              f"mass={e['mass']:.0f} g  fill={e['fill_ratio']:.1%}")
+    print(f"{dt * 1000:.1f} ms for all components")
@@ -0,0 +1,376 @@
+"""
+Feature Tree -- Golden Tower
+============================
+Named, memoized feature chains for the build123d component builders.
+
+A component is an ordered list of :class:`Feature` nodes (body blank, tube,
+male ring, pockets, hollow, bores, grooves, drains, ...). Each node fuses
+or cuts its tool solids into the result of the node before it. Every
+node's result is memoized under a key that hashes
+
+- the upstream node's key,
+- the node's name and boolean op,
+- a fingerprint of the code that builds its tools: the source of the
+  tool function and of every project function it calls, plus the values
+  of the :class:`~tower_config.TowerConfig` parameters and module-level
+  constants those functions read, and
+- the CAD kernel version.
+
+Editing a late feature (e.g. ``ORING_GROOVE_DEPTH``) therefore reuses
+every upstream intermediate solid and only redoes the downstream cuts.
+Tool functions take the config as their only argument, so chains for
+different configs coexist in one process and share every node whose
+inputs agree.
+Results are kept in memory for the life of the process and, unless
+:data:`STORE_DIR` is None, written as BREP files so later runs reuse them.
+Builds that want another store (a per-run cache directory, or none)
+select it with :func:`feature_store`, which restores the previous one.
+Chains that share a prefix (segment and bottom segment share the body
+core) share its memo entries.
+
+Features flagged ``fine`` (O-ring groove, key slot, barb ridges, drain
+channels, pocket chamfers) are dropped from draft builds. Since the chain
+keys only depend on what is upstream, a draft shares every memoized node
+before its first skipped feature with the full build.
+
+Per-feature status goes to :data:`FEATURE_LOG`, timings to
+``booleans.PHASE_TIMES``. Batched builds apply each phase (the run of
+consecutive fuse features, then of cut features) as one boolean, so
+they are memoized, logged and timed per phase.
+
+Every finished chain is checked with OCC shape analysis
+(components/brep_check.py) before it is returned. A failing part raises
+``BRepCheckError`` naming the first feature whose result fails, so a bad
+boolean stops the build before any tessellation or export. The report
+goes to :data:`BREP_LOG`.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import sys
+import textwrap
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from build123d import Compound, Part, export_brep, import_brep
+from build_cache import CACHE_DIR, is_project_source, kernel_version
+from components.booleans import PHASE_TIMES, cut_all, fuse_all, parallel_booleans
+from components.brep_check import BRepCheckError, check_part, first_failure
+from tower_config import PARAMETER_NAMES, TowerConfig
+
+# Where intermediate feature solids are persisted; None = memory only
+FEATURE_CACHE_DIR = os.path.join(CACHE_DIR, 'features')
+STORE_DIR = FEATURE_CACHE_DIR
+
+# component name -> [(feature name, 'recomputed' | 'reused' | 'reused (disk)')]
+FEATURE_LOG = {}
+
+# Check every finished chain with brep_check.check_part
+CHECK_BREP = True
+
+# component name -> brep_check.check_part report of its latest build
+BREP_LOG = {}
+
+# Tessellation classes of feature faces, finest first: interlock rings /
+# key / O-ring groove, barb fittings, planting pockets and net cup seats,
+# the gross body
+MESH_CLASSES = ('interlock', 'barb', 'pockets', 'body')
+
+_MEMO = {}
+_REPORTS = {}  # chain key -> check_part report, checked once per process
+_PLAIN = (int, float, str, bool, tuple, type(None))
+
+
+class Feature:
+    """One named node of a feature chain.
+
+    Args:
+        name: Feature name shown in the build log.
+        op: ``'fuse'`` or ``'cut'`` against the upstream result.
+        tools: Function of a :class:`~tower_config.TowerConfig` returning
+            the list of tool solids.
+        fine: Small detail that draft builds skip.
+        mesh_class: Tessellation class of the faces the feature leaves
+            (:data:`MESH_CLASSES`, see :func:`face_classes`).
+    """
+
+    __slots__ = ('name', 'op', 'tools', 'fine', 'mesh_class')
+
+    def __init__(self, name, op, tools, fine=False, mesh_class='body'):
+        if op not in ('fuse', 'cut'):
+            raise ValueError(f"Feature {name!r}: op must be 'fuse' or 'cut', got {op!r}")
+        if mesh_class not in MESH_CLASSES:
+            raise ValueError(f"Feature {name!r}: mesh_class must be one of "
+                             f"{MESH_CLASSES}, got {mesh_class!r}")
+        self.name = name
+        self.op = op
+        self.tools = tools
+        self.fine = fine
+        self.mesh_class = mesh_class
+
+    def __repr__(self):
+        fine = ", fine=True" if self.fine else ""
+        mesh = f", mesh_class={self.mesh_class!r}" if self.mesh_class != 'body' else ""
+        return f"Feature({self.name!r}, {self.op!r}, {self.tools.__name__}{fine}{mesh})"
+
+
+def _is_project_function(obj):
+    obj = inspect.unwrap(obj) if callable(obj) else obj
+    if not inspect.isfunction(obj):
+        return False
+    path = inspect.getsourcefile(obj)
+    return bool(path) and is_project_source(path)
+
+
+def fingerprint(fn, config):
+    """Collect the source and parameter values a tool function depends on.
+
+    Follows calls into other project functions (``pocket_tools`` etc.) so
+    their sources, the ``config`` parameters they read (``cfg.NAME``) and
+    module constants are part of the fingerprint too.
+
+    Returns:
+        dict: ``{'source': [...], 'values': {qualified name: value}}``.
+    """
+    sources, values, seen = [], {}, set()
+    pending = [fn]
+    while pending:
+        func = inspect.unwrap(pending.pop())
+        if func in seen:
+            continue
+        seen.add(func)
+        src = textwrap.dedent(inspect.getsource(func))
+        sources.append(src)
+        names = set()
+        for node in ast.walk(ast.parse(src)):
+            if isinstance(node, ast.Name):
+                names.add(node.id)
+            elif isinstance(node, ast.Attribute) and node.attr in PARAMETER_NAMES:
+                values[f"config.{node.attr}"] = getattr(config, node.attr)
+        for name in sorted(names):
+            if name not in func.__globals__:
+                continue
+            value = func.__globals__[name]
+            if _is_project_function(value):
+                pending.append(value)
+            elif isinstance(value, _PLAIN):
+                values[f"{func.__module__}.{name}"] = value
+    return {'source': sources, 'values': values}
+
+
+def feature_key(upstream_key, feature, batched, config=None):
+    """Memo key of ``feature`` applied on top of ``upstream_key``.
+
+    ``config`` defaults to ``TowerConfig()``, the module constants.
+    """
+    config = config or TowerConfig()
+    payload = json.dumps({
+        'upstream': upstream_key,
+        'name': feature.name,
+        'op': feature.op,
+        'batched': batched,
+        'kernel': kernel_version(),
+        'code': fingerprint(feature.tools, config),
+    }, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@contextmanager
+def feature_store(directory):
+    """Persist feature results under ``directory`` (None: memory only)
+    inside the block, restoring the previous :data:`STORE_DIR` on exit."""
+    global STORE_DIR
+    previous, STORE_DIR = STORE_DIR, directory
+    try:
+        yield
+    finally:
+        STORE_DIR = previous
+
+
+def _store_path(name, key):
+    return os.path.join(STORE_DIR, f"{name}-{key[:20]}.brep")
+
+
+def _lookup(name, key):
+    """Return ``(part, status)`` for a memoized result, or ``(None, None)``."""
+    if key in _MEMO:
+        return _MEMO[key], 'reused'
+    if STORE_DIR is not None:
+        path = _store_path(name, key)
+        if os.path.exists(path):
+            try:
+                part = Part(import_brep(path).wrapped)
+            except Exception:  # unreadable entry — recompute
+                return None, None
+            _MEMO[key] = part
+            return part, 'reused (disk)'
+    return None, None
+
+
+def _remember(name, key, part):
+    _MEMO[key] = part
+    if STORE_DIR is not None:
+        os.makedirs(STORE_DIR, exist_ok=True)
+        path = _store_path(name, key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        export_brep(part, tmp)
+        os.replace(tmp, path)
+
+
+def _as_part(shape):
+    if isinstance(shape, Compound):
+        return Part(shape.wrapped)
+    return Part([shape])
+
+
+def _steps(features, keys, batched):
+    """Split a chain into ``(name, op, features, key)`` boolean steps.
+
+    Sequential chains take one step per feature. Batched chains take one
+    per phase, a run of consecutive features with the same op: the body
+    core is one ``'additive'`` fuse and one ``'subtractive'`` cut, and the
+    bottom segment's fittings add a second pair. A phase is keyed by the
+    key of its last feature.
+    """
+    if not batched:
+        return [(f.name, f.op, [f], key) for f, key in zip(features, keys)]
+    steps, counts = [], {}
+    for feature, key in zip(features, keys):
+        if steps and steps[-1][1] == feature.op:
+            name, op, members, _ = steps[-1]
+            steps[-1] = (name, op, members + [feature], key)
+            continue
+        label = 'additive' if feature.op == 'fuse' else 'subtractive'
+        counts[label] = counts.get(label, 0) + 1
+        name = label if counts[label] == 1 else f"{label} {counts[label]}"
+        steps.append((name, feature.op, [feature], key))
+    return steps
+
+
+def build_features(component, features, config=None, batched=False, draft=False):
+    """Evaluate a feature chain, reusing every memoized prefix.
+
+    Args:
+        component: Name used for FEATURE_LOG and PHASE_TIMES entries.
+        features: Ordered :class:`Feature` list; the first must be a fuse.
+        config: :class:`~tower_config.TowerConfig` passed to every tool
+            function (default: the module constants).
+        batched: Apply each phase (run of consecutive fuse or cut
+            features) as one multi-operand boolean with OCC's parallel
+            mode on. Results are then memoized, logged and timed per
+            phase instead of per feature (see :func:`_steps`).
+        draft: Skip the features flagged ``fine``.
+
+    Returns:
+        Part: Result of the last feature.
+    """
+    config = config or TowerConfig()
+    if draft:
+        features = [f for f in features if not f.fine]
+
+    keys, key = [], ''
+    for feature in features:
+        key = feature_key(key, feature, batched, config)
+        keys.append(key)
+    steps = _steps(features, keys, batched)
+
+    # Start from the deepest step whose result is already available
+    part, start, status = None, 0, None
+    for i in range(len(steps) - 1, -1, -1):
+        part, status = _lookup(steps[i][0], steps[i][3])
+        if part is not None:
+            start = i + 1
+            break
+
+    log = FEATURE_LOG[component] = []
+    times = PHASE_TIMES[component] = {}
+    for name, *_ in steps[:start]:
+        log.append((name, status))
+        times[name] = 0.0
+
+    with parallel_booleans(batched):
+        for name, op, members, key in steps[start:]:
+            t0 = time.perf_counter()
+            tools = [tool for feature in members for tool in feature.tools(config)]
+            if part is None:
+                part = fuse_all(tools, batched)
+            elif op == 'fuse':
+                part = fuse_all([part] + tools, batched)
+            else:
+                part = cut_all(part, tools, batched)
+            part = _as_part(part)
+            _remember(name, key, part)
+            times[name] = time.perf_counter() - t0
+            log.append((name, 'recomputed'))
+
+    if CHECK_BREP:
+        _check(component, steps, part)
+    return part
+
+
+def _check(component, steps, part):
+    """Gate ``part``; on failure find the feature (or phase) that broke the chain."""
+    key = steps[-1][3]
+    report = _REPORTS.get(key) or check_part(part)
+    _REPORTS[key] = report
+    BREP_LOG[component] = report
+    if report['problems']:
+        results = [(name, _lookup(name, key)[0]) for name, _, _, key in steps]
+        raise BRepCheckError(component, first_failure(results), report)
+
+
+def face_classes(part, features, config=None, precedence=MESH_CLASSES):
+    """Tessellation class of every face of ``part``, in ``part.faces()`` order.
+
+    A face belongs to the features whose tool solids it lies on: a point
+    inside the face is classified against each tool (OCC's ON state), so
+    faces split or trimmed by later booleans keep their feature. A face
+    on several tools (a pocket wall flush with the body) takes the first
+    of their classes in ``precedence``; a face on none is ``'body'``.
+
+    Args:
+        features: The :class:`Feature` chain that built ``part``.
+        config: :class:`~tower_config.TowerConfig` it was built with.
+        precedence: Class labels, the one that wins ties first.
+    """
+    from OCP.BOPTools import BOPTools_AlgoTools3D
+    from OCP.BRepClass3d import BRepClass3d_SolidClassifier
+    from OCP.IntTools import IntTools_Context
+    from OCP.TopAbs import TopAbs_ON
+    from OCP.gp import gp_Pnt, gp_Pnt2d
+
+    config = config or TowerConfig()
+    rank = {label: i for i, label in enumerate(precedence)}
+    tools = []
+    for feature in features:
+        for tool in feature.tools(config):
+            for solid in tool.solids():
+                bb = solid.bounding_box()
+                tools.append((feature.mesh_class, solid.wrapped,
+                              tuple(bb.min), tuple(bb.max)))
+    context = IntTools_Context()
+    classes = []
+    for face in part.faces():
+        point, uv = gp_Pnt(), gp_Pnt2d()
+        BOPTools_AlgoTools3D.PointInFace_s(face.wrapped, point, uv, context)
+        xyz = point.Coord()
+        best = None
+        for label, solid, low, high in tools:
+            if best is not None and rank[label] >= rank[best]:
+                continue
+            if not all(lo - 1e-3 <= c <= hi + 1e-3 for c, lo, hi in zip(xyz, low, high)):
+                continue
+            if BRepClass3d_SolidClassifier(solid, point, 1e-4).State() == TopAbs_ON:
+                best = label
+        classes.append(best or 'body')
+    return classes
+
+
+def clear_memo():
+    """Drop every in-memory feature result (disk entries are kept)."""
+    _MEMO.clear()
+    _REPORTS.clear()
@@ -0,0 +1,354 @@
+"""
+Mesh Preview Engine -- Golden Tower
+===================================
+Builds the segment, bottom segment and top cap as triangle meshes with
+robust mesh booleans (manifold3d) instead of OCC B-rep booleans, for
+interactive parameter exploration and large sweeps.
+
+The geometry mirrors the build123d builders feature for feature (same
+:class:`~tower_config.TowerConfig` input, same add-then-cut order, same
+fine features skipped by ``draft=True``) and returns ``trimesh.Trimesh``
+objects directly. Curved surfaces are polygonised with ``segments``
+facets per full circle, which is the only source of deviation from the
+B-rep:
+
+    |mesh volume - B-rep volume| <= VOLUME_TOLERANCE * B-rep volume
+
+at the default 96 segments (typically ~0.1%). manifold3d is an optional
+dependency, imported on first use:
+
+    pip install manifold3d
+
+Usage:
+    from components.mesh_preview import build_segment_mesh
+    mesh = build_segment_mesh()
+    print(mesh.volume, mesh.is_watertight)
+    wide = build_segment_mesh(TowerConfig(SEGMENT_OUTER_DIAMETER=180.0))
+"""
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from tower_config import TowerConfig
+
+# Facets per full circle for every cylinder, cone and sphere
+CIRCULAR_SEGMENTS = 96
+
+# Documented max relative volume deviation from the B-rep at
+# CIRCULAR_SEGMENTS (inscribed polygons under-fill circles by ~0.07%)
+VOLUME_TOLERANCE = 0.005
+
+
+def _manifold():
+    try:
+        import manifold3d
+    except ImportError as exc:  # optional dependency
+        raise ImportError(
+            "the mesh preview engine needs manifold3d (pip install manifold3d)"
+        ) from exc
+    return manifold3d
+
+
+# ---------------------------------------------------------------------------
+# Primitives (build123d alignment conventions)
+# ---------------------------------------------------------------------------
+def _cylinder(r, h, z=0.0, n=CIRCULAR_SEGMENTS, center=False):
+    """Cylinder on the Z axis, base at ``z`` (or centred on ``z``)."""
+    M = _manifold().Manifold
+    return M.cylinder(h, r, r, n, center).translate((0, 0, z))
+
+
+def _cone(r_bottom, r_top, h, z=0.0, n=CIRCULAR_SEGMENTS, center=False):
+    """Truncated cone on the Z axis, base at ``z`` (or centred on ``z``)."""
+    M = _manifold().Manifold
+    return M.cylinder(h, r_bottom, r_top, n, center).translate((0, 0, z))
+
+
+def _annulus(r_outer, r_inner, h, z=0.0, n=CIRCULAR_SEGMENTS):
+    """Extruded ring from ``z`` to ``z + h``."""
+    return _cylinder(r_outer, h, z, n) - _cylinder(r_inner, h + 2.0, z - 1.0, n)
+
+
+def _box(dx, dy, dz, center=(0.0, 0.0, 0.0), angle_deg=0.0, z_min=False):
+    """Box centred at ``center`` (or with its bottom face at center[2]),
+    rotated ``angle_deg`` about its own vertical axis."""
+    M = _manifold().Manifold
+    box = M.cube((dx, dy, dz), True)
+    if z_min:
+        box = box.translate((0, 0, dz / 2))
+    return box.rotate((0, 0, angle_deg)).translate(center)
+
+
+def _union(parts):
+    mf = _manifold()
+    return mf.Manifold.batch_boolean(parts, mf.OpType.Add)
+
+
+def _cut(base, tools):
+    mf = _manifold()
+    return mf.Manifold.batch_boolean([base] + list(tools), mf.OpType.Subtract)
+
+
+def pocket_matrix(cfg: TowerConfig, i: int) -> list:
+    """Affine 3x4 placement of node ``i``'s pocket, as nested lists.
+
+    Matches ``pocket_build123d.pocket_location(cfg, i)``, i.e. build123d's
+    ``Pos(px, py, z) * Rot(0, POCKET_TILT_ANGLE, angle)``: a rotation by the
+    golden angle about Z followed by the tilt about the global Y axis.
+    """
+    angle_rad = math.radians(i * cfg.GOLDEN_ANGLE_DEG)
+    ca, sa = math.cos(angle_rad), math.sin(angle_rad)
+    tilt = math.radians(cfg.POCKET_TILT_ANGLE)
+    ct, st = math.cos(tilt), math.sin(tilt)
+    # Ry(tilt) @ Rz(angle) | translation
+    r = cfg.POCKET_RADIAL_OFFSET
+    return [
+        [ct * ca, -ct * sa, st, r * ca],
+        [sa, ca, 0.0, r * sa],
+        [-st * ca, st * sa, ct, cfg.POCKET_Z_OFFSET + i * cfg.NODE_VERTICAL_PITCH],
+    ]
+
+
+def _place_pocket(cfg, part, i):
+    return part.transform(pocket_matrix(cfg, i))
+
+
+def to_trimesh(manifold):
+    """Convert a manifold3d ``Manifold`` to a ``trimesh.Trimesh``."""
+    import numpy as np
+    import trimesh
+    mesh = manifold.to_mesh()
+    vertices = np.asarray(mesh.vert_properties, dtype=np.float64)[:, :3]
+    faces = np.asarray(mesh.tri_verts, dtype=np.int64)
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+
+# ---------------------------------------------------------------------------
+# Segment body (mirrors segment_body_build123d.BODY_FEATURES)
+# ---------------------------------------------------------------------------
+def _pocket_tools(cfg, n):
+    """Additive, subtractive and chamfer pocket tools at every node."""
+    outer_r = cfg.POCKET_RADIUS + cfg.WATER_WALL_THICKNESS
+    add = _union([
+        _cylinder(outer_r, cfg.POCKET_SOLID_LENGTH, n=n, center=True),
+        _cone(outer_r + 5.0, outer_r, 12.0, z=-5.0, n=n, center=True),
+        _cylinder(cfg.NET_CUP_LIP_OD / 2 + cfg.WATER_WALL_THICKNESS,
+                  cfg.NET_CUP_LIP_HEIGHT, z=cfg.LIP_Z_LOCAL, n=n, center=True),
+    ])
+    sub = _union([
+        _cylinder(cfg.POCKET_RADIUS, cfg.POCKET_DEPTH - cfg.WATER_WALL_THICKNESS,
+                  z=cfg.WATER_WALL_THICKNESS / 2, n=n, center=True),
+        _cylinder(cfg.NET_CUP_LIP_OD / 2, cfg.NET_CUP_LIP_HEIGHT, z=cfg.LIP_Z_LOCAL,
+                  n=n, center=True),
+    ])
+    chamfer = _cone(0.1, cfg.POCKET_RADIUS * 0.85, cfg.POCKET_RADIUS * 0.5,
+                    z=-(cfg.POCKET_DEPTH / 2 - cfg.WATER_WALL_THICKNESS / 2), n=n)
+    nodes = range(cfg.NODES_PER_SEGMENT)
+    return ([_place_pocket(cfg, add, i) for i in nodes],
+            [_place_pocket(cfg, sub, i) for i in nodes],
+            [_place_pocket(cfg, chamfer, i) for i in nodes])
+
+
+def _drain_holes(cfg, n):
+    holes = []
+    for k in range(3):
+        a = math.radians(k * 120.0)
+        holes.append(_cylinder(cfg.DRAIN_HOLE_DIAMETER / 2, cfg.DRIP_TRAY_DEPTH + 1.0, n=n)
+                     .translate((cfg.DRAIN_HOLE_RADIAL_POS * math.cos(a),
+                                 cfg.DRAIN_HOLE_RADIAL_POS * math.sin(a), 0)))
+    return holes
+
+
+def _tube_bore(cfg, n):
+    return _cylinder(cfg.TUBE_IR, cfg.TUBE_HEIGHT, n=n)
+
+
+def _body_tools(cfg, draft, n):
+    """Return ``(additive, subtractive)`` tool lists of the body core."""
+    pocket_add, pocket_sub, pocket_chamfer = _pocket_tools(cfg, n)
+    male_r, height = cfg.MALE_INTERLOCK_RADIUS, cfg.SEGMENT_HEIGHT
+
+    add = [
+        _cylinder(cfg.SEGMENT_OUTER_RADIUS, height, n=n),
+        _cylinder(cfg.TUBE_OR, cfg.TUBE_HEIGHT, n=n),
+        _cylinder(male_r, cfg.INTERLOCK_HEIGHT, z=height, n=n),
+        _box(cfg.INTERLOCK_KEY_DEPTH + 1.0, cfg.INTERLOCK_KEY_WIDTH, cfg.INTERLOCK_HEIGHT,
+             center=(male_r + cfg.INTERLOCK_KEY_DEPTH / 2 - 0.5, 0,
+                     height + cfg.INTERLOCK_HEIGHT / 2)),
+        _cone(cfg.TUBE_OR, male_r, cfg.CHAMFER_H + 1.0, z=cfg.CHAMFER_Z_START, n=n),
+    ] + pocket_add
+
+    sub = [
+        _annulus(cfg.BODY_INNER_RADIUS, cfg.TUBE_OR,
+                 cfg.CHAMFER_Z_START - cfg.DRIP_TRAY_DEPTH, z=cfg.DRIP_TRAY_DEPTH, n=n),
+        _annulus(cfg.BODY_INNER_RADIUS, male_r, cfg.CHAMFER_H,
+                 z=cfg.CHAMFER_Z_START, n=n),
+        _tube_bore(cfg, n),
+    ] + pocket_sub + _drain_holes(cfg, n)
+
+    if not draft:
+        sub += pocket_chamfer
+        # O-ring groove
+        oring_z = height + cfg.INTERLOCK_HEIGHT / 2
+        sub.append(_annulus(male_r + 0.1, male_r - cfg.ORING_GROOVE_DEPTH,
+                            cfg.ORING_GROOVE_WIDTH,
+                            z=oring_z - cfg.ORING_GROOVE_WIDTH / 2, n=n))
+        # Drip tray drain channels
+        ch_r_inner = cfg.TUBE_OR + 2.0
+        ch_r_outer = cfg.BODY_INNER_RADIUS - 2.0
+        ch_r_mid = (ch_r_inner + ch_r_outer) / 2
+        ch_avg_depth = ((cfg.DRIP_TRAY_DEPTH - 2.5) + (cfg.DRIP_TRAY_DEPTH - 1.0)) / 2
+        for k in range(3):
+            a = math.radians(k * 120.0)
+            sub.append(_box(ch_r_outer - ch_r_inner, cfg.DRIP_TRAY_DRAIN_WIDTH, ch_avg_depth,
+                            center=(ch_r_mid * math.cos(a), ch_r_mid * math.sin(a),
+                                    cfg.DRIP_TRAY_DEPTH - ch_avg_depth / 2),
+                            angle_deg=k * 120.0))
+    return add, sub
+
+
+# ---------------------------------------------------------------------------
+# Components
+# ---------------------------------------------------------------------------
+def build_segment_mesh(config: TowerConfig = None, draft: bool = False,
+                       segments: int = CIRCULAR_SEGMENTS):
+    """Mesh counterpart of ``segment_build123d.build_segment``.
+
+    Args:
+        config: Parameter set to build (default: the tower_params
+            constants).
+        draft: Skip the fine features (key slot, O-ring groove, drain
+            channels, pocket chamfers).
+        segments: Facets per full circle.
+
+    Returns:
+        trimesh.Trimesh: Watertight segment mesh.
+    """
+    cfg = config or TowerConfig()
+    add, sub = _body_tools(cfg, draft, segments)
+    sub.append(_annulus(cfg.FEMALE_INTERLOCK_RADIUS, cfg.TUBE_OR, cfg.INTERLOCK_HEIGHT,
+                        n=segments))
+    if not draft:
+        sub.append(_box(
+            cfg.INTERLOCK_KEY_DEPTH + cfg.INTERLOCK_CLEARANCE * 2,
+            cfg.INTERLOCK_KEY_WIDTH + cfg.INTERLOCK_CLEARANCE * 2,
+            cfg.INTERLOCK_HEIGHT,
+            center=(cfg.MALE_INTERLOCK_RADIUS + cfg.INTERLOCK_KEY_DEPTH / 2, 0,
+                    cfg.INTERLOCK_HEIGHT / 2)))
+    return to_trimesh(_cut(_union(add), sub))
+
+
+def build_bottom_segment_mesh(config: TowerConfig = None, draft: bool = False,
+                              segments: int = CIRCULAR_SEGMENTS):
+    """Mesh counterpart of ``bottom_segment_build123d.build_bottom_segment``.
+
+    Args:
+        config: Parameter set to build (default: the tower_params
+            constants).
+        draft: Skip the barb ridges and the body's fine features.
+        segments: Facets per full circle.
+
+    Returns:
+        trimesh.Trimesh: Watertight bottom segment mesh.
+    """
+    cfg = config or TowerConfig()
+    n = segments
+    add, sub = _body_tools(cfg, draft, n)
+    body = _cut(_union(add), sub)
+
+    barb_or = cfg.QD_FITTING_BARB_OD / 2
+    barb_length, ring_h = cfg.QD_BARB_LENGTH, cfg.LID_RING_HEIGHT
+    fittings = [
+        body,
+        _cylinder(barb_or, barb_length + 1.0, z=-barb_length, n=n),
+        _cylinder(cfg.TUBE_OR, cfg.WALL_THICKNESS + 1.0, z=-cfg.WALL_THICKNESS, n=n),
+        _cut(_cylinder(cfg.LID_RING_OD / 2, ring_h + 1.0, z=-ring_h, n=n),
+             [_cylinder(cfg.LID_RING_ID / 2, ring_h + 3.0, z=-ring_h - 1.0, n=n)]),
+    ]
+    for k in range(cfg.LID_BAYONET_LUGS):
+        angle_deg = k * (360.0 / cfg.LID_BAYONET_LUGS)
+        lug_r = cfg.LID_RING_OD / 2 - cfg.LUG_DEPTH / 2
+        a = math.radians(angle_deg)
+        fittings.append(_box(cfg.LUG_DEPTH, cfg.LUG_WIDTH, cfg.LUG_HEIGHT + 1.0,
+                             center=(lug_r * math.cos(a), lug_r * math.sin(a),
+                                     -cfg.LUG_HEIGHT),
+                             angle_deg=angle_deg, z_min=True))
+    if not draft:
+        for j in range(cfg.QD_BARB_RIDGE_COUNT):
+            ridge_z = -barb_length + 4.0 + j * cfg.QD_BARB_RIDGE_SPACING
+            fittings.append(_cone(barb_or + cfg.QD_BARB_RIDGE_HEIGHT, barb_or, 2.0,
+                                  z=ridge_z, n=n))
+
+    bores = [
+        _tube_bore(cfg, n),
+        _cylinder(cfg.QD_FITTING_ID / 2, barb_length + cfg.DRIP_TRAY_DEPTH + 1.0,
+                  z=-barb_length, n=n),
+    ] + _drain_holes(cfg, n)
+    return to_trimesh(_cut(_union(fittings), bores))
+
+
+def build_top_cap_mesh(config: TowerConfig = None, draft: bool = False,
+                       segments: int = CIRCULAR_SEGMENTS):
+    """Mesh counterpart of ``top_cap_build123d.build_top_cap``.
+
+    Args:
+        config: Parameter set to build (default: the tower_params
+            constants).
+        draft: Accepted for a uniform signature; the cap has no fine features.
+        segments: Facets per full circle.
+
+    Returns:
+        trimesh.Trimesh: Watertight top cap mesh.
+    """
+    cfg = config or TowerConfig()
+    n = segments
+    M = _manifold().Manifold
+    wall, dome_r = cfg.WALL_THICKNESS, cfg.FINIAL_DOME_R
+    cap_r, interlock_h = cfg.CAP_OUTER_R, cfg.INTERLOCK_HEIGHT
+    dome = (M.sphere(dome_r, n)
+            ^ M.cube((2 * dome_r + 2, 2 * dome_r + 2, dome_r + 1))
+            .translate((-dome_r - 1, -dome_r - 1, 0)))
+    add = [
+        _cylinder(cap_r, wall, n=n),
+        _cone(cfg.CONE_BASE_R, cfg.CONE_TOP_R, cfg.CONE_H + 1.0, z=wall - 1.0, n=n),
+        _annulus(cap_r, cap_r - wall, cfg.LIP_HEIGHT, n=n),
+        dome.translate((0, 0, cfg.CAP_HEIGHT - 1.0)),
+        _annulus(cfg.SOCKET_OUTER_R + wall, cfg.SOCKET_OUTER_R,
+                 interlock_h + 1.0, z=-interlock_h, n=n),
+        _annulus(cfg.SOCKET_INNER_R, cfg.TUBE_HOLE_R, interlock_h + 1.0,
+                 z=-interlock_h, n=n),
+    ]
+    sub = [
+        _cone(cfg.INNER_CONE_BASE_R, cfg.INNER_CONE_TOP_R, cfg.CONE_H, z=wall, n=n),
+        _cylinder(cfg.TUBE_HOLE_R, interlock_h + wall + 1, z=-interlock_h, n=n),
+    ]
+    ch_depth = min(cfg.CHANNEL_DEPTH, wall - 0.5)
+    for i in range(cfg.N_CHANNELS):
+        angle_deg = i * (360.0 / cfg.N_CHANNELS)
+        a = math.radians(angle_deg)
+        sub.append(_box(cfg.CHANNEL_LENGTH, cfg.CHANNEL_WIDTH, ch_depth,
+                        center=(cfg.CHANNEL_CENTER_R * math.cos(a),
+                                cfg.CHANNEL_CENTER_R * math.sin(a),
+                                wall - ch_depth),
+                        angle_deg=angle_deg, z_min=True))
+    return to_trimesh(_cut(_union(add), sub))
+
+
+# name -> mesh builder, keyed like build_tower_build123d.COMPONENTS
+MESH_BUILDERS = {
+    'segment': build_segment_mesh,
+    'top_cap': build_top_cap_mesh,
+    'bottom_segment': build_bottom_segment_mesh,
+}
+
+
+if __name__ == "__main__":
+    import time
+    for name, builder in MESH_BUILDERS.items():
+        t0 = time.perf_counter()
+        mesh = builder()
+        dt = time.perf_counter() - t0
+        print(f"{name:<16} {dt * 1000:7.1f} ms  volume={mesh.volume:.1f} mm³  "
+              f"faces={len(mesh.faces)}  watertight={mesh.is_watertight}")
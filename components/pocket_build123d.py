@@ -0,0 +1,126 @@
+"""
+Planting Pocket Feature -- Golden Tower
+=======================================
+Reusable pocket tool solids shared by the segment and bottom segment.
+
+A pocket is the same geometry at every node; only its placement differs.
+The additive tool (cup protrusion + flare cone + lip flange) and the
+subtractive tool (bore + lip counterbore) are each built ONCE per
+parameter set at the origin, fused into a single solid, and then placed at every node's golden-angle ``Location`` with ``moved()``,
+which shares the underlying B-rep instead of rebuilding primitives.
+The bottom chamfer cone is a separate template so draft builds can skip it.
+
+Pocket local frame: +Z is the pocket axis pointing out of the mouth,
+origin at the pocket centre. Every function takes the
+:class:`~tower_config.TowerConfig` to build for.
+"""
+
+import math
+import os
+import sys
+from functools import lru_cache
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from build123d import *
+from tower_config import TowerConfig
+
+
+def pocket_location(cfg: TowerConfig, i: int) -> Location:
+    """Golden-angle, upward-spiralling placement of node ``i``'s pocket."""
+    angle_deg = i * cfg.GOLDEN_ANGLE_DEG
+    angle_rad = math.radians(angle_deg)
+    z_center = cfg.POCKET_Z_OFFSET + i * cfg.NODE_VERTICAL_PITCH
+
+    px = cfg.POCKET_RADIAL_OFFSET * math.cos(angle_rad)
+    py = cfg.POCKET_RADIAL_OFFSET * math.sin(angle_rad)
+
+    return Pos(px, py, z_center) * Rot(0, cfg.POCKET_TILT_ANGLE, angle_deg)
+
+
+@lru_cache(maxsize=8)
+def _pocket_template(pocket_r, wall, solid_len, depth, lip_od, lip_h, lip_z):
+    """Build the (additive, subtractive) pocket tools at the origin.
+
+    Cached on the parameter values so each parameter set pays for the
+    primitives and the two small template fuses exactly once per process.
+    """
+    outer_r = pocket_r + wall
+
+    # Solid pocket protrusion (cup exterior) -- uses WATER_WALL_THICKNESS
+    protrusion = Cylinder(
+        radius=outer_r,
+        height=solid_len,
+        align=(Align.CENTER, Align.CENTER, Align.CENTER),
+    )
+    # Flare cone at pocket-body junction for organic transition
+    flare = Pos(0, 0, -5.0) * Cone(
+        bottom_radius=outer_r + 5.0,
+        top_radius=outer_r,
+        height=12.0,
+        align=(Align.CENTER, Align.CENTER, Align.CENTER),
+    )
+    # Lip support flange at the outer (mouth) end of the pocket
+    flange = Pos(0, 0, lip_z) * Cylinder(
+        radius=lip_od / 2 + wall,
+        height=lip_h,
+        align=(Align.CENTER, Align.CENTER, Align.CENTER),
+    )
+
+    # Pocket bore (cup interior) -- shifted outward for thick inner wall
+    bore = Pos(0, 0, wall / 2) * Cylinder(
+        radius=pocket_r,
+        height=depth - wall,
+        align=(Align.CENTER, Align.CENTER, Align.CENTER),
+    )
+    # Net cup lip counterbore
+    counterbore = Pos(0, 0, lip_z) * Cylinder(
+        radius=lip_od / 2,
+        height=lip_h,
+        align=(Align.CENTER, Align.CENTER, Align.CENTER),
+    )
+
+    return protrusion.fuse(flare, flange), bore.fuse(counterbore)
+
+
+@lru_cache(maxsize=8)
+def _chamfer_template(pocket_r, wall, depth):
+    """Pocket bottom chamfer — replaces flat bottom with printable cone.
+
+    The pocket is tilted, so the bottom face has a steep overhang; a
+    conical chamfer at the inner end brings it within 55° of vertical.
+    """
+    return Pos(0, 0, -(depth / 2 - wall / 2)) * Cone(
+        bottom_radius=0.1,
+        top_radius=pocket_r * 0.85,   # tapers inward
+        height=pocket_r * 0.5,        # chamfer depth along axis
+        align=(Align.CENTER, Align.CENTER, Align.MIN),
+    )
+
+
+def pocket_template(cfg: TowerConfig):
+    """Return the cached (additive, subtractive) pocket tools at the origin."""
+    return _pocket_template(
+        cfg.POCKET_RADIUS, cfg.WATER_WALL_THICKNESS, cfg.POCKET_SOLID_LENGTH,
+        cfg.POCKET_DEPTH, cfg.NET_CUP_LIP_OD, cfg.NET_CUP_LIP_HEIGHT,
+        cfg.LIP_Z_LOCAL,
+    )
+
+
+def pocket_tools(cfg: TowerConfig, n_nodes: int = None):
+    """Place the pocket template at every node (default NODES_PER_SEGMENT).
+
+    Returns:
+        tuple: ``(additive, subtractive)`` lists with one solid per node.
+    """
+    add, sub = pocket_template(cfg)
+    n_nodes = cfg.NODES_PER_SEGMENT if n_nodes is None else n_nodes
+    locs = [pocket_location(cfg, i) for i in range(n_nodes)]
+    return [add.moved(loc) for loc in locs], [sub.moved(loc) for loc in locs]
+
+
+def pocket_chamfer_tools(cfg: TowerConfig, n_nodes: int = None) -> list:
+    """Place the bottom chamfer cone at every node (one solid per node)."""
+    chamfer = _chamfer_template(cfg.POCKET_RADIUS, cfg.WATER_WALL_THICKNESS,
+                                cfg.POCKET_DEPTH)
+    n_nodes = cfg.NODES_PER_SEGMENT if n_nodes is None else n_nodes
+    return [chamfer.moved(pocket_location(cfg, i)) for i in range(n_nodes)]
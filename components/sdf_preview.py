@@ -0,0 +1,544 @@
+"""
+SDF Preview Engine -- Golden Tower
+==================================
+The tower components as signed distance fields composed with NumPy,
+meshed with marching cubes at a chosen voxel size. No CAD kernel.
+
+A field is a function ``f(points) -> distances`` over an ``(N, 3)`` array
+of points in mm: negative inside, positive outside. Primitives are exact
+distances (capped cylinder, capped cone, box, hemisphere); unions are
+``min``, cuts ``max(a, -b)``, which keeps the sign exact and the
+magnitude a lower bound of the true distance -- enough for marching
+cubes and for batched inside/outside and clearance queries:
+
+    from components.sdf_preview import segment_sdf
+    inside = segment_sdf(points) < 0
+
+The geometry mirrors the build123d builders (same dimensions.py inputs,
+same add-then-cut order, ``draft=True`` drops the fine features).
+Meshing uses scikit-image's marching cubes, an optional dependency
+imported on first use (``pip install scikit-image``). Walls are 2-2.4 mm
+thick, so use ``voxel <= 1.0`` for volumes and larger voxels only for
+look-and-feel previews of a whole tower (:func:`build_tower_sdf`). At
+1 mm the segments are within 0.1% of the B-rep volume; the top cap's
+cone shell is only ~1.1 mm thick normal to its surface and loses ~14%
+(~3% at 0.5 mm) -- see :data:`VOLUME_TOLERANCE`.
+"""
+
+import math
+import os
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from tower_params import *
+from components.dimensions import *
+from components.mesh_preview import pocket_matrix
+from tower_config import TowerConfig
+
+# Points evaluated per field call while sampling a grid (bounds memory)
+CHUNK_POINTS = 1 << 20
+
+# Fraction of a voxel the meshing grid is shifted by (any non-round value)
+GRID_OFFSET = 0.3183
+
+# Coarse-to-fine ratio of the narrow-band sampling in sample_band()
+BAND_STEP = 4
+
+# Culling margin while meshing, in voxels. Must exceed the widest band any
+# pass relies on: the 4-voxel bounds pass keeps |f| < 4*sqrt(3) voxels.
+CULL_MARGIN = 8.0
+
+
+# ---------------------------------------------------------------------------
+# Primitives: exact signed distances, vectorized over (N, 3) points
+# ---------------------------------------------------------------------------
+def _extrusion(d_2d, z, z0, z1):
+    """Combine a 2D section distance with the slab ``z0 <= z <= z1``."""
+    d_z = np.abs(z - (z0 + z1) / 2) - (z1 - z0) / 2
+    return (np.minimum(np.maximum(d_2d, d_z), 0.0)
+            + np.hypot(np.maximum(d_2d, 0.0), np.maximum(d_z, 0.0)))
+
+
+def sd_cylinder(p, r, z0, z1):
+    """Cylinder of radius ``r`` on the Z axis from ``z0`` to ``z1``."""
+    return _extrusion(np.hypot(p[:, 0], p[:, 1]) - r, p[:, 2], z0, z1)
+
+
+def sd_annulus(p, r_outer, r_inner, z0, z1):
+    """Ring ``r_inner <= r <= r_outer`` from ``z0`` to ``z1``."""
+    rho = np.hypot(p[:, 0], p[:, 1])
+    return _extrusion(np.maximum(rho - r_outer, r_inner - rho), p[:, 2], z0, z1)
+
+
+def sd_cone(p, r_bottom, r_top, z0, z1):
+    """Capped cone on the Z axis, ``r_bottom`` at ``z0`` to ``r_top`` at ``z1``."""
+    h = (z1 - z0) / 2
+    qx = np.hypot(p[:, 0], p[:, 1])
+    qy = p[:, 2] - (z0 + z1) / 2
+    # Distance to the flat caps
+    ca_x = qx - np.minimum(qx, np.where(qy < 0, r_bottom, r_top))
+    ca_y = np.abs(qy) - h
+    # Distance to the slanted side
+    k2x, k2y = r_top - r_bottom, 2 * h
+    t = np.clip(((r_top - qx) * k2x + (h - qy) * k2y) / (k2x * k2x + k2y * k2y), 0.0, 1.0)
+    cb_x = qx - r_top + k2x * t
+    cb_y = qy - h + k2y * t
+    sign = np.where((cb_x < 0) & (ca_y < 0), -1.0, 1.0)
+    return sign * np.sqrt(np.minimum(ca_x * ca_x + ca_y * ca_y, cb_x * cb_x + cb_y * cb_y))
+
+
+def sd_box(p, size, center=(0.0, 0.0, 0.0), angle_deg=0.0):
+    """Box of ``size`` centred at ``center``, rotated about its vertical axis."""
+    q = p - np.asarray(center)
+    if angle_deg:
+        c, s = math.cos(math.radians(angle_deg)), math.sin(math.radians(angle_deg))
+        q = np.column_stack([c * q[:, 0] + s * q[:, 1], -s * q[:, 0] + c * q[:, 1], q[:, 2]])
+    q = np.abs(q) - np.asarray(size) / 2
+    return (np.linalg.norm(np.maximum(q, 0.0), axis=1)
+            + np.minimum(q.max(axis=1), 0.0))
+
+
+def sd_hemisphere(p, r, z0):
+    """Upper half of a sphere of radius ``r`` whose flat face sits at ``z0``."""
+    ball = np.sqrt(p[:, 0] ** 2 + p[:, 1] ** 2 + (p[:, 2] - z0) ** 2) - r
+    return np.maximum(ball, z0 - p[:, 2])
+
+
+def union(*fields):
+    return np.minimum.reduce(fields)
+
+
+def cut(base, *tools):
+    return np.maximum(base, -union(*tools)) if tools else base
+
+
+@contextmanager
+def culling(margin):
+    """Within the block, groups of primitives are only evaluated exactly
+    within ``margin`` mm of their bounding box; further away the distance
+    to the box stands in (a lower bound with the right sign). Outside the
+    block every field call is exact.
+    """
+    global _cull_margin
+    previous, _cull_margin = _cull_margin, margin
+    try:
+        yield
+    finally:
+        _cull_margin = previous
+
+
+_cull_margin = math.inf
+
+
+def _culled(p, lo, hi, group):
+    """Evaluate ``group(points)`` only near the box ``lo``..``hi``."""
+    if _cull_margin == math.inf:
+        return group(p)
+    d = np.linalg.norm(np.maximum(np.maximum(np.subtract(lo, p), p - hi), 0.0), axis=1)
+    near = d < _cull_margin
+    if near.all():
+        return group(p)
+    if near.any():
+        d[near] = group(p[near])
+    return d
+
+
+# ---------------------------------------------------------------------------
+# Segment body (mirrors segment_body_build123d.BODY_FEATURES)
+# ---------------------------------------------------------------------------
+def _pocket_local(p, i):
+    """Points expressed in node ``i``'s pocket frame (axis = local +Z)."""
+    # The SDF engine reads the module constants, i.e. the default config
+    m = np.asarray(pocket_matrix(TowerConfig(), i))
+    return (p - m[:, 3]) @ m[:, :3]
+
+
+def _pocket_fields(p, draft):
+    """Union of the pocket additive tools and of the subtractive tools."""
+    outer_r = POCKET_RADIUS + WATER_WALL_THICKNESS
+    lip_r = NET_CUP_LIP_OD / 2
+    lip0, lip1 = LIP_Z_LOCAL - NET_CUP_LIP_HEIGHT / 2, LIP_Z_LOCAL + NET_CUP_LIP_HEIGHT / 2
+    bore0 = WATER_WALL_THICKNESS / 2 - (POCKET_DEPTH - WATER_WALL_THICKNESS) / 2
+    bore1 = bore0 + POCKET_DEPTH - WATER_WALL_THICKNESS
+    chamfer0 = -(POCKET_DEPTH / 2 - WATER_WALL_THICKNESS / 2)
+    half = POCKET_SOLID_LENGTH / 2
+    add_r = max(outer_r + 5.0, lip_r + WATER_WALL_THICKNESS)
+
+    def additive(q):
+        return union(
+            sd_cylinder(q, outer_r, -half, half),
+            sd_cone(q, outer_r + 5.0, outer_r, -11.0, 1.0),
+            sd_cylinder(q, lip_r + WATER_WALL_THICKNESS, lip0, lip1),
+        )
+
+    def subtractive(q):
+        subs = [sd_cylinder(q, POCKET_RADIUS, bore0, bore1),
+                sd_cylinder(q, lip_r, lip0, lip1)]
+        if not draft:
+            subs.append(sd_cone(q, 0.1, POCKET_RADIUS * 0.85,
+                                chamfer0, chamfer0 + POCKET_RADIUS * 0.5))
+        return union(*subs)
+
+    adds, subs = [], []
+    for i in range(NODES_PER_SEGMENT):
+        q = _pocket_local(p, i)
+        adds.append(_culled(q, (-add_r, -add_r, -half), (add_r, add_r, half), additive))
+        subs.append(_culled(q, (-lip_r, -lip_r, min(bore0, chamfer0)),
+                            (lip_r, lip_r, max(bore1, lip1)), subtractive))
+    return union(*adds), union(*subs)
+
+
+def _drain_holes(p):
+    def holes(q):
+        d = []
+        for k in range(3):
+            a = math.radians(k * 120.0)
+            c = (DRAIN_HOLE_RADIAL_POS * math.cos(a), DRAIN_HOLE_RADIAL_POS * math.sin(a), 0.0)
+            d.append(sd_cylinder(q - c, DRAIN_HOLE_DIAMETER / 2, 0.0, DRIP_TRAY_DEPTH + 1.0))
+        return union(*d)
+
+    r = DRAIN_HOLE_RADIAL_POS + DRAIN_HOLE_DIAMETER / 2
+    return _culled(p, (-r, -r, 0.0), (r, r, DRIP_TRAY_DEPTH + 1.0), holes)
+
+
+def _male_ring(q):
+    """Male interlock ring, alignment key and support cone."""
+    ring0 = SEGMENT_HEIGHT
+    return union(
+        sd_cylinder(q, MALE_INTERLOCK_RADIUS, ring0, ring0 + INTERLOCK_HEIGHT),
+        sd_box(q, (INTERLOCK_KEY_DEPTH + 1.0, INTERLOCK_KEY_WIDTH, INTERLOCK_HEIGHT),
+               (MALE_INTERLOCK_RADIUS + INTERLOCK_KEY_DEPTH / 2 - 0.5, 0.0,
+                ring0 + INTERLOCK_HEIGHT / 2)),
+        sd_cone(q, TUBE_OR, MALE_INTERLOCK_RADIUS, CHAMFER_Z_START,
+                CHAMFER_Z_START + CHAMFER_H + 1.0),
+    )
+
+
+def _oring_groove(q):
+    oring_z = SEGMENT_HEIGHT + INTERLOCK_HEIGHT / 2
+    return sd_annulus(q, MALE_INTERLOCK_RADIUS + 0.1,
+                      MALE_INTERLOCK_RADIUS - ORING_GROOVE_DEPTH,
+                      oring_z - ORING_GROOVE_WIDTH / 2,
+                      oring_z + ORING_GROOVE_WIDTH / 2)
+
+
+def _drain_channels(q):
+    """Drip tray drain channels (3 radial grooves toward center)."""
+    ch_r_inner = TUBE_OR + 2.0
+    ch_r_outer = BODY_INNER_RADIUS - 2.0
+    ch_r_mid = (ch_r_inner + ch_r_outer) / 2
+    ch_avg_depth = ((DRIP_TRAY_DEPTH - 2.5) + (DRIP_TRAY_DEPTH - 1.0)) / 2
+    channels = []
+    for k in range(3):
+        a = math.radians(k * 120.0)
+        channels.append(sd_box(
+            q, (ch_r_outer - ch_r_inner, DRIP_TRAY_DRAIN_WIDTH, ch_avg_depth),
+            (ch_r_mid * math.cos(a), ch_r_mid * math.sin(a),
+             DRIP_TRAY_DEPTH - ch_avg_depth / 2),
+            k * 120.0))
+    return union(*channels)
+
+
+def _body_fields(p, draft):
+    """Return ``(additive, subtractive)`` fields of the body core."""
+    pockets_add, pockets_sub = _pocket_fields(p, draft)
+    ring_r = MALE_INTERLOCK_RADIUS + INTERLOCK_KEY_DEPTH + 1.0
+    add = union(
+        sd_cylinder(p, SEGMENT_OUTER_RADIUS, 0.0, SEGMENT_HEIGHT),
+        sd_cylinder(p, TUBE_OR, 0.0, TUBE_HEIGHT),
+        _culled(p, (-ring_r, -ring_r, CHAMFER_Z_START), (ring_r, ring_r, TUBE_HEIGHT),
+                _male_ring),
+        pockets_add,
+    )
+    subs = [
+        sd_annulus(p, BODY_INNER_RADIUS, TUBE_OR, DRIP_TRAY_DEPTH, CHAMFER_Z_START),
+        sd_annulus(p, BODY_INNER_RADIUS, MALE_INTERLOCK_RADIUS,
+                   CHAMFER_Z_START, CHAMFER_Z_START + CHAMFER_H),
+        sd_cylinder(p, TUBE_IR, 0.0, TUBE_HEIGHT),
+        pockets_sub,
+        _drain_holes(p),
+    ]
+    if not draft:
+        r = MALE_INTERLOCK_RADIUS + 0.1
+        subs.append(_culled(p, (-r, -r, SEGMENT_HEIGHT), (r, r, TUBE_HEIGHT),
+                            _oring_groove))
+        r = BODY_INNER_RADIUS
+        subs.append(_culled(p, (-r, -r, 0.0), (r, r, DRIP_TRAY_DEPTH),
+                            _drain_channels))
+    return add, union(*subs)
+
+
+# ---------------------------------------------------------------------------
+# Component fields
+# ---------------------------------------------------------------------------
+def segment_sdf(p, draft=False):
+    """Signed distance to the standard segment (see segment_build123d)."""
+    add, sub = _body_fields(p, draft)
+    subs = [sub, sd_annulus(p, FEMALE_INTERLOCK_RADIUS, TUBE_OR, 0.0, INTERLOCK_HEIGHT)]
+    if not draft:
+        subs.append(sd_box(
+            p, (INTERLOCK_KEY_DEPTH + INTERLOCK_CLEARANCE * 2,
+                INTERLOCK_KEY_WIDTH + INTERLOCK_CLEARANCE * 2, INTERLOCK_HEIGHT),
+            (MALE_INTERLOCK_RADIUS + INTERLOCK_KEY_DEPTH / 2, 0.0, INTERLOCK_HEIGHT / 2)))
+    return cut(add, *subs)
+
+
+def bottom_segment_sdf(p, draft=False):
+    """Signed distance to the bottom segment (see bottom_segment_build123d)."""
+    add, sub = _body_fields(p, draft)
+    barb_or = QD_FITTING_BARB_OD / 2
+    fittings = [
+        cut(add, sub),
+        sd_cylinder(p, barb_or, -QD_BARB_LENGTH, 1.0),
+        sd_cylinder(p, TUBE_OR, -WALL_THICKNESS, 1.0),
+        cut(sd_cylinder(p, LID_RING_OD / 2, -LID_RING_HEIGHT, 1.0),
+            sd_cylinder(p, LID_RING_ID / 2, -LID_RING_HEIGHT - 1.0, 2.0)),
+    ]
+    lug_r = LID_RING_OD / 2 - LUG_DEPTH / 2
+    for k in range(LID_BAYONET_LUGS):
+        angle_deg = k * (360.0 / LID_BAYONET_LUGS)
+        a = math.radians(angle_deg)
+        fittings.append(sd_box(
+            p, (LUG_DEPTH, LUG_WIDTH, LUG_HEIGHT + 1.0),
+            (lug_r * math.cos(a), lug_r * math.sin(a), -LUG_HEIGHT + (LUG_HEIGHT + 1.0) / 2),
+            angle_deg))
+    if not draft:
+        for j in range(QD_BARB_RIDGE_COUNT):
+            ridge_z = -QD_BARB_LENGTH + 4.0 + j * QD_BARB_RIDGE_SPACING
+            fittings.append(sd_cone(p, barb_or + QD_BARB_RIDGE_HEIGHT, barb_or,
+                                    ridge_z, ridge_z + 2.0))
+    return cut(
+        union(*fittings),
+        sd_cylinder(p, TUBE_IR, 0.0, TUBE_HEIGHT),
+        sd_cylinder(p, QD_FITTING_ID / 2, -QD_BARB_LENGTH, DRIP_TRAY_DEPTH + 1.0),
+        _drain_holes(p),
+    )
+
+
+def top_cap_sdf(p, draft=False):
+    """Signed distance to the top cap (see top_cap_build123d).
+
+    ``draft`` is accepted for a uniform signature; the cap has no fine
+    features.
+    """
+    socket0 = -INTERLOCK_HEIGHT
+    add = union(
+        sd_cylinder(p, CAP_OUTER_R, 0.0, WALL_THICKNESS),
+        sd_cone(p, CONE_BASE_R, CONE_TOP_R, WALL_THICKNESS - 1.0, CAP_HEIGHT),
+        sd_annulus(p, CAP_OUTER_R, CAP_OUTER_R - WALL_THICKNESS, 0.0, LIP_HEIGHT),
+        sd_hemisphere(p, FINIAL_DOME_R, CAP_HEIGHT - 1.0),
+        sd_annulus(p, SOCKET_OUTER_R + WALL_THICKNESS, SOCKET_OUTER_R, socket0, 1.0),
+        sd_annulus(p, SOCKET_INNER_R, TUBE_HOLE_R, socket0, 1.0),
+    )
+    ch_depth = min(CHANNEL_DEPTH, WALL_THICKNESS - 0.5)
+    subs = [
+        sd_cone(p, INNER_CONE_BASE_R, INNER_CONE_TOP_R, WALL_THICKNESS,
+                WALL_THICKNESS + CONE_H),
+        sd_cylinder(p, TUBE_HOLE_R, socket0, WALL_THICKNESS + 1.0),
+    ]
+    for i in range(N_CHANNELS):
+        angle_deg = i * (360.0 / N_CHANNELS)
+        a = math.radians(angle_deg)
+        subs.append(sd_box(
+            p, (CHANNEL_LENGTH, CHANNEL_WIDTH, ch_depth),
+            (CHANNEL_CENTER_R * math.cos(a), CHANNEL_CENTER_R * math.sin(a),
+             WALL_THICKNESS - ch_depth / 2),
+            angle_deg))
+    return cut(add, *subs)
+
+
+def _rotated_z(p, angle_deg, dz):
+    """Points in the frame of a part rotated ``angle_deg`` and raised ``dz``."""
+    c, s = math.cos(math.radians(angle_deg)), math.sin(math.radians(angle_deg))
+    return np.column_stack([c * p[:, 0] + s * p[:, 1],
+                            -s * p[:, 0] + c * p[:, 1],
+                            p[:, 2] - dz])
+
+
+def tower_sdf(p, n_segments=TARGET_SEGMENT_COUNT, draft=True):
+    """Signed distance to a stacked tower: bottom segment, ``n_segments - 1``
+    standard segments (each turned INTERLOCK_ROTATION_DEG from the one
+    below) and the top cap.
+
+    Each point is only evaluated against the parts whose z-range (with
+    the male ring and fittings) can reach it, so the cost grows with the
+    number of points, not with ``n_segments``.
+    """
+    reach = POCKET_SOLID_LENGTH  # generous: pockets, barb and ring overhangs
+    d = np.full(len(p), np.inf)
+    z = p[:, 2]
+    parts = [(bottom_segment_sdf, 0)]
+    parts += [(segment_sdf, k) for k in range(1, n_segments)]
+    for field, k in parts:
+        z0 = k * SEGMENT_HEIGHT
+        near = (z > z0 - reach) & (z < z0 + SEGMENT_HEIGHT + reach)
+        if near.any():
+            q = _rotated_z(p[near], k * INTERLOCK_ROTATION_DEG, z0)
+            d[near] = np.minimum(d[near], field(q, draft))
+    cap_z = n_segments * SEGMENT_HEIGHT + INTERLOCK_HEIGHT
+    near = z > cap_z - INTERLOCK_HEIGHT - 5.0
+    if near.any():
+        d[near] = np.minimum(d[near], top_cap_sdf(_rotated_z(p[near], 0.0, cap_z)))
+    return d
+
+
+# ---------------------------------------------------------------------------
+# Sampling and meshing
+# ---------------------------------------------------------------------------
+def _sample(field, lo, voxel, shape):
+    """Evaluate ``field`` on the ``shape`` grid starting at ``lo``."""
+    nx, ny, nz = shape
+    xs, ys, zs = (lo[i] + np.arange(shape[i]) * voxel for i in range(3))
+    xy = np.stack(np.meshgrid(xs, ys, indexing='ij'), axis=-1).reshape(-1, 2)
+    values = np.empty(shape)
+    per_chunk = max(1, CHUNK_POINTS // len(xy))
+    for k0 in range(0, nz, per_chunk):
+        zk = zs[k0:k0 + per_chunk]
+        pts = np.column_stack([np.tile(xy, (len(zk), 1)), np.repeat(zk, len(xy))])
+        values[:, :, k0:k0 + len(zk)] = field(pts).reshape(len(zk), nx, ny).transpose(1, 2, 0)
+    return values
+
+
+def sample_grid(field, lo, hi, voxel):
+    """Evaluate ``field`` on a regular grid covering ``lo``..``hi``.
+
+    Returns:
+        tuple: ``(values, origin)`` -- an ``(nx, ny, nz)`` float array and
+        the coordinates of grid point ``[0, 0, 0]``.
+    """
+    lo, hi = np.asarray(lo, float), np.asarray(hi, float)
+    shape = tuple(int(n) + 1 for n in np.ceil((hi - lo) / voxel))
+    return _sample(field, lo, voxel, shape), lo
+
+
+def sample_band(field, lo, hi, voxel):
+    """Like :func:`sample_grid`, but only exact near the surface.
+
+    The field is first sampled every BAND_STEP voxels. Fields are
+    1-Lipschitz (exact primitives combined with min/max), so a fine node
+    whose nearest coarse value is far from zero keeps that value's sign
+    and only gets a bound. Every cell the surface passes through has all
+    its corners evaluated exactly, which is all marching cubes reads, so
+    the mesh is the same as from a full grid at a fraction of the cost.
+    """
+    step = BAND_STEP
+    lo, hi = np.asarray(lo, float), np.asarray(hi, float)
+    cells = np.ceil((hi - lo) / voxel).astype(int)
+    cells += -cells % step
+    shape = tuple(int(n) + 1 for n in cells)
+    coarse = _sample(field, lo, step * voxel,
+                     tuple(int(n) // step + 1 for n in cells))
+
+    reach = step / 2 * math.sqrt(3) * voxel  # fine node -> nearest coarse node
+    need = math.sqrt(3) * voxel               # corners of a surface cell
+    nearest = coarse[np.ix_(*[(np.arange(n) + step // 2) // step for n in shape])]
+    band = np.abs(nearest) <= reach + need
+    values = np.sign(nearest) * (np.abs(nearest) - reach)
+
+    idx = np.nonzero(band)
+    pts = lo + np.column_stack(idx) * voxel
+    exact = np.empty(len(pts))
+    for i in range(0, len(pts), CHUNK_POINTS):
+        exact[i:i + CHUNK_POINTS] = field(pts[i:i + CHUNK_POINTS])
+    values[idx] = exact
+    return values, lo
+
+
+def field_bounds(field, lo, hi, voxel):
+    """Tight bounds of the solid, found with a coarse pass at ``4 * voxel``.
+
+    Field magnitudes never exceed the true distance, so every grid point
+    within one coarse cell diagonal of the surface is kept.
+    """
+    coarse = 4 * voxel
+    values, origin = sample_grid(field, lo, hi, coarse)
+    idx = np.argwhere(values < coarse * math.sqrt(3))
+    if not len(idx):
+        raise ValueError("field is empty inside the search box")
+    pad = coarse + 2 * voxel
+    return (origin + idx.min(axis=0) * coarse - pad,
+            origin + idx.max(axis=0) * coarse + pad)
+
+
+def mesh_field(field, lo, hi, voxel=1.0):
+    """Marching-cubes mesh of the zero level set of ``field``.
+
+    Args:
+        field: ``f(points) -> distances``.
+        lo, hi: Search box corners (mm); trimmed by :func:`field_bounds`.
+        voxel: Grid spacing (mm).
+
+    Returns:
+        trimesh.Trimesh: Closed, outward-facing mesh.
+    """
+    try:
+        from skimage.measure import marching_cubes
+    except ImportError as exc:  # optional dependency
+        raise ImportError(
+            "SDF meshing needs scikit-image (pip install scikit-image)") from exc
+    import trimesh
+
+    with culling(CULL_MARGIN * voxel):
+        lo, hi = field_bounds(field, lo, hi, voxel)
+        # Keep grid planes off the round-number faces (z = 0, z = WALL_THICKNESS,
+        # ...), where exact zeros at grid nodes would open holes in the mesh
+        lo = lo - GRID_OFFSET * voxel
+        values, origin = sample_band(field, lo, hi, voxel)
+    verts, faces, _, _ = marching_cubes(values, 0.0, spacing=(voxel,) * 3,
+                                      allow_degenerate=False)
+    mesh = trimesh.Trimesh(vertices=verts + origin, faces=faces)
+    if mesh.volume < 0:
+        mesh.invert()
+    return mesh
+
+
+# Conservative search boxes (mm) per component; trimmed before meshing
+_REACH = SEGMENT_OUTER_RADIUS + POCKET_SOLID_LENGTH
+SEARCH_BOXES = {
+    'segment': ((-_REACH, -_REACH, -POCKET_SOLID_LENGTH),
+                (_REACH, _REACH, TUBE_HEIGHT + POCKET_SOLID_LENGTH)),
+    'bottom_segment': ((-_REACH, -_REACH, -POCKET_SOLID_LENGTH - QD_BARB_LENGTH),
+                       (_REACH, _REACH, TUBE_HEIGHT + POCKET_SOLID_LENGTH)),
+    'top_cap': ((-CAP_OUTER_R - 5, -CAP_OUTER_R - 5, -INTERLOCK_HEIGHT - 5),
+                (CAP_OUTER_R + 5, CAP_OUTER_R + 5, CAP_HEIGHT + FINIAL_DOME_R + 5)),
+}
+
+# Relative volume error vs the B-rep at voxel=1.0 (bench_preview.py)
+VOLUME_TOLERANCE = {'segment': 0.002, 'bottom_segment': 0.002, 'top_cap': 0.15}
+
+SDF_FIELDS = {
+    'segment': segment_sdf,
+    'top_cap': top_cap_sdf,
+    'bottom_segment': bottom_segment_sdf,
+}
+
+
+def build_sdf(name, voxel=1.0, draft=False):
+    """Mesh one component (``'segment'``, ``'top_cap'``, ``'bottom_segment'``)."""
+    field = SDF_FIELDS[name]
+    return mesh_field(lambda p: field(p, draft), *SEARCH_BOXES[name], voxel)
+
+
+def build_tower_sdf(n_segments=TARGET_SEGMENT_COUNT, voxel=4.0, draft=True):
+    """Low-res preview mesh of a whole stacked tower (see :func:`tower_sdf`)."""
+    top = n_segments * SEGMENT_HEIGHT + INTERLOCK_HEIGHT + CAP_HEIGHT + FINIAL_DOME_R + 5
+    lo = (-_REACH, -_REACH, -POCKET_SOLID_LENGTH - QD_BARB_LENGTH)
+    hi = (_REACH, _REACH, top)
+    return mesh_field(lambda p: tower_sdf(p, n_segments, draft), lo, hi, voxel)
+
+
+if __name__ == "__main__":
+    import time
+    for name in SDF_FIELDS:
+        t0 = time.perf_counter()
+        mesh = build_sdf(name)
+        dt = time.perf_counter() - t0
+        print(f"{name:<16} {dt:6.2f} s  volume={mesh.volume:.1f} mm³  "
+              f"faces={len(mesh.faces)}  watertight={mesh.is_watertight}")
+    t0 = time.perf_counter()
+    tower = build_tower_sdf()
+    print(f"{'tower':<16} {time.perf_counter() - t0:6.2f} s  "
+          f"faces={len(tower.faces)}  extents={tower.extents.round(1)}")
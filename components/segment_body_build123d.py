@@ -0,0 +1,251 @@
+"""
+Segment Body Core -- Golden Tower
+=================================
+The geometry shared by the standard segment and the bottom segment:
+
+- Outer shell, integrated supply tube and tube bore
+- Male interlock ring, alignment key and printable support cone
+- Planting pockets (see pocket_build123d.py)
+- Annular hollow, O-ring groove, drip tray drain channels and holes
+
+The body is the feature chain :data:`BODY_FEATURES` (additive features
+first, then subtractive). Each variant appends its own features to it:
+
+- segment_build123d.py        female bore + key slot
+- bottom_segment_build123d.py QD barb, lid ring and bayonet lugs
+
+Because feature results are memoized by upstream key (feature_tree.py),
+both variants share the body's intermediate solids, so a full build pays
+for the expensive pocket and hollow booleans once instead of twice. The
+fine features (pocket chamfers, O-ring groove, drain channels) come last
+and are skipped by draft builds.
+
+Every tool function takes the :class:`~tower_config.TowerConfig` being
+built; derived values (``TUBE_OR``, ``CHAMFER_Z_START``, ...) come from
+its dimensions.py formulas, shared with the preview engines.
+"""
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from build123d import *
+from components.feature_tree import Feature, build_features
+from components.pocket_build123d import pocket_chamfer_tools, pocket_tools
+from tower_config import TowerConfig
+
+# ---------------------------------------------------------------------------
+# Additive features
+# ---------------------------------------------------------------------------
+def _blank(cfg: TowerConfig) -> list:
+    """1. Solid outer cylinder (full body blank)."""
+    return [Cylinder(
+        radius=cfg.SEGMENT_OUTER_RADIUS,
+        height=cfg.SEGMENT_HEIGHT,
+        align=(Align.CENTER, Align.CENTER, Align.MIN),
+    )]
+
+
+def _tube(cfg: TowerConfig) -> list:
+    """2. Supply tube solid (OD), extends INTERLOCK_HEIGHT above body."""
+    return [Cylinder(
+        radius=cfg.TUBE_OR,
+        height=cfg.TUBE_HEIGHT,
+        align=(Align.CENTER, Align.CENTER, Align.MIN),
+    )]
+
+
+def _male_ring(cfg: TowerConfig) -> list:
+    """3-5. Male interlock ring, alignment key and support cone."""
+    tools = []
+
+    # 3. Male interlock ring at top (around tube extension)
+    tools.append(Pos(0, 0, cfg.SEGMENT_HEIGHT) * Cylinder(
+        radius=cfg.MALE_INTERLOCK_RADIUS,
+        height=cfg.INTERLOCK_HEIGHT,
+        align=(Align.CENTER, Align.CENTER, Align.MIN),
+    ))
+
+    # 4. Alignment key tab on the male ring (at angle = 0)
+    #    Extended 1mm inward to guarantee volumetric overlap with ring
+    key_radial = cfg.MALE_INTERLOCK_RADIUS + cfg.INTERLOCK_KEY_DEPTH / 2 - 0.5
+    tools.append(Pos(key_radial, 0, cfg.SEGMENT_HEIGHT + cfg.INTERLOCK_HEIGHT / 2) * Box(
+        cfg.INTERLOCK_KEY_DEPTH + 1.0,
+        cfg.INTERLOCK_KEY_WIDTH,
+        cfg.INTERLOCK_HEIGHT,
+        align=(Align.CENTER, Align.CENTER, Align.CENTER),
+    ))
+
+    # 5. Support cone for male ring — printable transition (≤55° overhang)
+    #    Fills the space from tube OD (r=16) to male ring OR (r=29)
+    #    over CHAMFER_H (10mm), giving 52.4° angle from vertical.
+    #    Placed at top of body, overlaps 1mm into male ring zone.
+    tools.append(Pos(0, 0, cfg.CHAMFER_Z_START) * Cone(
+        bottom_radius=cfg.TUBE_OR,
+        top_radius=cfg.MALE_INTERLOCK_RADIUS,
+        height=cfg.CHAMFER_H + 1.0,
+        align=(Align.CENTER, Align.CENTER, Align.MIN),
+    ))
+
+    return tools
+
+
+def _pockets(cfg: TowerConfig) -> list:
+    """6. Planting pocket protrusions + lip flanges.
+
+    One template solid (protrusion + flare + lip flange) per node, placed
+    by transform -- see components/pocket_build123d.py
+    """
+    return pocket_tools(cfg)[0]
+
+
+# ---------------------------------------------------------------------------
+# Subtractive features
+# ---------------------------------------------------------------------------
+def _hollow(cfg: TowerConfig) -> list:
+    """7. Hollow out interior — ANNULAR cut preserving tube wall."""
+    return [
+        #  Lower zone: r=tube_OD/2 to body_inner, z=DTD to chamfer start
+        extrude(
+            Plane.XY.offset(cfg.DRIP_TRAY_DEPTH) * (
+                Circle(radius=cfg.BODY_INNER_RADIUS) - Circle(radius=cfg.TUBE_OR)),
+            amount=cfg.CHAMFER_Z_START - cfg.DRIP_TRAY_DEPTH,
+        ),
+        #  Upper zone: r=male_ring_OR to body_inner, z=chamfer start to top
+        #  (narrower inner radius so support cone is preserved)
+        extrude(
+            Plane.XY.offset(cfg.CHAMFER_Z_START) * (
+                Circle(radius=cfg.BODY_INNER_RADIUS) - Circle(radius=cfg.MALE_INTERLOCK_RADIUS)),
+            amount=cfg.CHAMFER_H,
+        ),
+    ]
+
+
+def tube_bore(cfg: TowerConfig) -> Part:
+    """Supply tube ID bore, full length (z = 0 .. TUBE_HEIGHT)."""
+    return Cylinder(
+        radius=cfg.TUBE_IR,
+        height=cfg.TUBE_HEIGHT,
+        align=(Align.CENTER, Align.CENTER, Align.MIN),
+    )
+
+
+def _bores(cfg: TowerConfig) -> list:
+    """8. Supply tube bore, plus pocket bores and lip counterbores (one
+    template solid per node)."""
+    return [tube_bore(cfg)] + pocket_tools(cfg)[1]
+
+
+def drain_holes(cfg: TowerConfig) -> list:
+    """Drain through-holes — connect drip tray to segment below.
+
+    3 vertical holes through the drip tray floor at r=DRAIN_HOLE_RADIAL_POS
+    aligned with drain channels. Water exits bottom face and falls into
+    the hollow interior of the segment below.
+    """
+    holes = []
+    for k in range(3):
+        dh_angle_deg = k * 120.0
+        dh_angle_rad = math.radians(dh_angle_deg)
+        dh_x = cfg.DRAIN_HOLE_RADIAL_POS * math.cos(dh_angle_rad)
+        dh_y = cfg.DRAIN_HOLE_RADIAL_POS * math.sin(dh_angle_rad)
+
+        holes.append(Pos(dh_x, dh_y, 0) * Cylinder(
+            radius=cfg.DRAIN_HOLE_DIAMETER / 2,
+            height=cfg.DRIP_TRAY_DEPTH + 1.0,
+            align=(Align.CENTER, Align.CENTER, Align.MIN),
+        ))
+    return holes
+
+
+def _drains(cfg: TowerConfig) -> list:
+    """9. Drain through-holes."""
+    return drain_holes(cfg)
+
+
+def _chamfers(cfg: TowerConfig) -> list:
+    """10. Pocket bottom chamfers for a printable overhang (≤55°)."""
+    return pocket_chamfer_tools(cfg)
+
+
+def _grooves(cfg: TowerConfig) -> list:
+    """11. O-ring groove on the male ring exterior, at mid-height."""
+    oring_z = cfg.SEGMENT_HEIGHT + cfg.INTERLOCK_HEIGHT / 2
+    oring_groove_or = cfg.MALE_INTERLOCK_RADIUS + 0.1  # slight overlap for clean cut
+    oring_groove_ir = cfg.MALE_INTERLOCK_RADIUS - cfg.ORING_GROOVE_DEPTH
+    return [extrude(
+        Plane.XY.offset(oring_z - cfg.ORING_GROOVE_WIDTH / 2) * (
+            Circle(radius=oring_groove_or) - Circle(radius=oring_groove_ir)),
+        amount=cfg.ORING_GROOVE_WIDTH,
+    )]
+
+
+def _drain_channels(cfg: TowerConfig) -> list:
+    """12. Drip tray drain channels (3 radial grooves toward center)."""
+    tools = []
+
+    # Channels slope toward center: deeper at inner end (effective 3° slope)
+    ch_r_inner = cfg.TUBE_OR + 2.0    # 18mm
+    ch_r_outer = cfg.BODY_INNER_RADIUS - 2.0  # 76mm
+    ch_r_mid = (ch_r_inner + ch_r_outer) / 2
+    ch_length = ch_r_outer - ch_r_inner
+    # Channel depth increases toward center for slope
+    ch_depth_outer = cfg.DRIP_TRAY_DEPTH - 2.5  # 2.5mm at outer edge
+    ch_depth_center = cfg.DRIP_TRAY_DEPTH - 1.0  # 4.0mm at center (deeper)
+
+    for k in range(3):
+        ch_angle_deg = k * 120.0
+        ch_angle_rad = math.radians(ch_angle_deg)
+        ch_x = ch_r_mid * math.cos(ch_angle_rad)
+        ch_y = ch_r_mid * math.sin(ch_angle_rad)
+
+        # Main channel body (average depth)
+        ch_avg_depth = (ch_depth_outer + ch_depth_center) / 2
+        ch_loc = Pos(ch_x, ch_y, cfg.DRIP_TRAY_DEPTH - ch_avg_depth / 2) * Rot(0, 0, ch_angle_deg)
+        tools.append(ch_loc * Box(
+            ch_length,
+            cfg.DRIP_TRAY_DRAIN_WIDTH,
+            ch_avg_depth,
+            align=(Align.CENTER, Align.CENTER, Align.CENTER),
+        ))
+
+    return tools
+
+
+# Additive features first, then subtractive, so pocket solids fuse with
+# the still-solid outer body before anything is hollowed out. Fine details
+# come after the gross cuts so draft builds share the longest prefix.
+BODY_FEATURES = [
+    Feature('blank', 'fuse', _blank),
+    Feature('tube', 'fuse', _tube),
+    Feature('male_ring', 'fuse', _male_ring, mesh_class='interlock'),
+    Feature('pockets', 'fuse', _pockets, mesh_class='pockets'),
+    Feature('hollow', 'cut', _hollow),
+    Feature('bores', 'cut', _bores, mesh_class='pockets'),
+    Feature('drains', 'cut', _drains),
+    Feature('chamfers', 'cut', _chamfers, fine=True, mesh_class='pockets'),
+    Feature('grooves', 'cut', _grooves, fine=True, mesh_class='interlock'),
+    Feature('drain_channels', 'cut', _drain_channels, fine=True),
+]
+
+
+def build_segment_body(config: TowerConfig = None, batched: bool = False,
+                       draft: bool = False) -> Part:
+    """Build the body core shared by both segment variants.
+
+    Callers must treat the returned Part as immutable; build123d booleans
+    always return new shapes, so finishing it with fuse/cut is safe.
+
+    Args:
+        config: Parameter set to build (default: the tower_params constants).
+        batched: One multi-operand OCC boolean for all the fuse features,
+            then one for all the cut features.
+        draft: Skip the fine features (chamfers, O-ring groove, drain
+            channels).
+
+    Returns:
+        Part: Body with pockets, hollow, O-ring groove and drains but no
+        bottom interface (female bore or reservoir fittings).
+    """
+    return build_features('segment_body', BODY_FEATURES, config, batched, draft)
@@ -14,134 +14,150 @@ Geometry (z = 0 is base-plate bottom):
 import os, sys, math
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
-from tower_params import *
 from build123d import *
+from components.feature_tree import Feature, build_features
+from tower_config import TowerConfig
 
 
-def build_top_cap() -> Part:
-    """Build the top cap / water deflector.
-
-    Returns:
-        Part: watertight solid of the complete top cap
-    """
-    # ── Derived dimensions ──────────────────────────────────────────
-    cap_outer_r = SEGMENT_OUTER_RADIUS + CAP_OVERHANG            # 90 mm
-    tube_hole_r = SUPPLY_TUBE_ID / 2                              # 14 mm
-    socket_inner_r = SUPPLY_TUBE_OD / 2                           # 16 mm
-    socket_outer_r = 29.3                                         # receives male ring @ 29.0
-    finial_base_r = 5.0                                           # cone apex radius
-    finial_dome_r = 8.0                                           # hemisphere radius
-    lip_height = 5.0                                              # outer rim height
-    cone_base_r = SEGMENT_OUTER_RADIUS                            # 80 mm
-    cone_top_r = finial_base_r                                    # 5 mm
-    cone_h = CAP_HEIGHT - WALL_THICKNESS                          # 38 mm
-    inner_cone_base_r = cone_base_r - WATER_WALL_THICKNESS        # 77.6 mm
-    inner_cone_top_r = max(cone_top_r - WATER_WALL_THICKNESS, 0.5)  # 2.6 mm
-    n_channels = 6
-    # Channel inner edge starts 2mm outside tube bore to avoid coincident faces
-    ch_inner_r = tube_hole_r + 2.0                               # 16 mm
-    ch_outer_r = cap_outer_r - WALL_THICKNESS                    # 88 mm
-    channel_length = ch_outer_r - ch_inner_r                     # 72 mm
-    channel_center_r = (ch_inner_r + ch_outer_r) / 2             # 52 mm
-
-    with BuildPart() as cap:
+# ── ADDITIONS ────────────────────────────────────────────────────────
+def _deflector(cfg: TowerConfig) -> list:
+    """1-4. Base plate, deflector cone, outer rim and finial dome."""
+    return [
         # ── 1. Base plate ────────────────────────────────────────────
-        # Solid disc from r=0 to cap_outer_r, z=0 to WALL_THICKNESS
+        # Solid disc from r=0 to CAP_OUTER_R, z=0 to WALL_THICKNESS
         Cylinder(
-            cap_outer_r,
-            WALL_THICKNESS,
+            cfg.CAP_OUTER_R,
+            cfg.WALL_THICKNESS,
             align=(Align.CENTER, Align.CENTER, Align.MIN),
-        )
+        ),
 
         # ── 2. Deflector cone (solid outer) ──────────────────────────
         # Base at z=WALL_THICKNESS (r=80), apex at z=CAP_HEIGHT (r=5)
         # Extended 1mm into base plate for volumetric overlap
-        with Locations([Pos(0, 0, WALL_THICKNESS - 1.0)]):
-            Cone(
-                cone_base_r,
-                cone_top_r,
-                cone_h + 1.0,
-                align=(Align.CENTER, Align.CENTER, Align.MIN),
-            )
+        Pos(0, 0, cfg.WALL_THICKNESS - 1.0) * Cone(
+            cfg.CONE_BASE_R,
+            cfg.CONE_TOP_R,
+            cfg.CONE_H + 1.0,
+            align=(Align.CENTER, Align.CENTER, Align.MIN),
+        ),
 
         # ── 3. Outer lip / rim ──────────────────────────────────────
         # Raised ring at outer edge of base plate to contain water
-        with BuildSketch(Plane.XY):
-            Circle(cap_outer_r)
-            Circle(cap_outer_r - WALL_THICKNESS, mode=Mode.SUBTRACT)
-        extrude(amount=lip_height)
+        extrude(
+            Circle(cfg.CAP_OUTER_R) - Circle(cfg.CAP_OUTER_R - cfg.WALL_THICKNESS),
+            amount=cfg.LIP_HEIGHT,
+        ),
 
         # ── 4. Finial dome ───────────────────────────────────────────
         # Hemisphere sitting on the cone apex for aesthetics
         # Shifted 1mm into cone for volumetric overlap
-        with Locations([Pos(0, 0, CAP_HEIGHT - 1.0)]):
-            Sphere(
-                finial_dome_r,
-                arc_size1=0,
-                arc_size2=90,
-                align=(Align.CENTER, Align.CENTER, Align.MIN),
-            )
-
-        # ── 5. Female interlock socket ───────────────────────────────
-        # Below the base plate: two concentric ring walls with an
-        # annular groove between them for the male interlock ring.
-        # Extended 1mm above z=0 for volumetric overlap with base plate.
-
-        #   Outer socket wall ring (r = socket_outer_r … +WALL_THICKNESS)
-        with BuildSketch(Plane.XY.offset(-INTERLOCK_HEIGHT)):
-            Circle(socket_outer_r + WALL_THICKNESS)
-            Circle(socket_outer_r, mode=Mode.SUBTRACT)
-        extrude(amount=INTERLOCK_HEIGHT + 1.0)
-
-        #   Inner tube wall ring (r = tube_hole_r … socket_inner_r)
-        with BuildSketch(Plane.XY.offset(-INTERLOCK_HEIGHT)):
-            Circle(socket_inner_r)
-            Circle(tube_hole_r, mode=Mode.SUBTRACT)
-        extrude(amount=INTERLOCK_HEIGHT + 1.0)
-
-        # ── SUBTRACTIONS ─────────────────────────────────────────────
-
-        # ── 6. Hollow out the cone ───────────────────────────────────
-        with Locations([Pos(0, 0, WALL_THICKNESS)]):
-            Cone(
-                inner_cone_base_r,
-                inner_cone_top_r,
-                cone_h,
-                align=(Align.CENTER, Align.CENTER, Align.MIN),
-                mode=Mode.SUBTRACT,
-            )
-
-        # ── 7. Central tube bore ─────────────────────────────────────
-        # Cut through base plate so water can enter the cone interior.
-        # Extends from bottom of socket to just above base plate.
-        with Locations([Pos(0, 0, -INTERLOCK_HEIGHT)]):
-            Cylinder(
-                tube_hole_r,
-                INTERLOCK_HEIGHT + WALL_THICKNESS + 1,
-                align=(Align.CENTER, Align.CENTER, Align.MIN),
-                mode=Mode.SUBTRACT,
-            )
-
-        # ── 8. Water channels (6 radial grooves) ────────────────────
-        # Cut from base plate, avoiding coincident faces at plate-cone boundary.
-        # Channels are as deep as the plate minus 0.5mm to keep a thin floor.
-        ch_depth = min(CHANNEL_DEPTH, WALL_THICKNESS - 0.5)
-        for i in range(n_channels):
-            angle_deg = i * (360.0 / n_channels)
-            angle_rad = math.radians(angle_deg)
-            cx = channel_center_r * math.cos(angle_rad)
-            cy = channel_center_r * math.sin(angle_rad)
-            with Locations([Pos(cx, cy, WALL_THICKNESS - ch_depth)]):
-                Box(
-                    channel_length,
-                    CHANNEL_WIDTH,
-                    ch_depth,
-                    rotation=(0, 0, angle_deg),
-                    align=(Align.CENTER, Align.CENTER, Align.MIN),
-                    mode=Mode.SUBTRACT,
-                )
-
-    return cap.part
+        Pos(0, 0, cfg.CAP_HEIGHT - 1.0) * Sphere(
+            cfg.FINIAL_DOME_R,
+            arc_size1=0,
+            arc_size2=90,
+            align=(Align.CENTER, Align.CENTER, Align.MIN),
+        ),
+    ]
+
+
+def _socket(cfg: TowerConfig) -> list:
+    """5. Female interlock socket.
+
+    Below the base plate: two concentric ring walls with an annular groove
+    between them for the male interlock ring. Extended 1mm above z=0 for
+    volumetric overlap with base plate.
+    """
+    return [
+        #   Outer socket wall ring (r = SOCKET_OUTER_R … +WALL_THICKNESS)
+        extrude(
+            Plane.XY.offset(-cfg.INTERLOCK_HEIGHT) * (
+                Circle(cfg.SOCKET_OUTER_R + cfg.WALL_THICKNESS) - Circle(cfg.SOCKET_OUTER_R)),
+            amount=cfg.INTERLOCK_HEIGHT + 1.0,
+        ),
+
+        #   Inner tube wall ring (r = TUBE_HOLE_R … SOCKET_INNER_R)
+        extrude(
+            Plane.XY.offset(-cfg.INTERLOCK_HEIGHT) * (
+                Circle(cfg.SOCKET_INNER_R) - Circle(cfg.TUBE_HOLE_R)),
+            amount=cfg.INTERLOCK_HEIGHT + 1.0,
+        ),
+    ]
+
+
+# ── SUBTRACTIONS ─────────────────────────────────────────────────────
+def _hollow(cfg: TowerConfig) -> list:
+    """6. Hollow out the cone."""
+    return [Pos(0, 0, cfg.WALL_THICKNESS) * Cone(
+        cfg.INNER_CONE_BASE_R,
+        cfg.INNER_CONE_TOP_R,
+        cfg.CONE_H,
+        align=(Align.CENTER, Align.CENTER, Align.MIN),
+    )]
+
+
+def _tube_bore(cfg: TowerConfig) -> list:
+    """7. Central tube bore.
+
+    Cut through base plate so water can enter the cone interior.
+    Extends from bottom of socket to just above base plate.
+    """
+    return [Pos(0, 0, -cfg.INTERLOCK_HEIGHT) * Cylinder(
+        cfg.TUBE_HOLE_R,
+        cfg.INTERLOCK_HEIGHT + cfg.WALL_THICKNESS + 1,
+        align=(Align.CENTER, Align.CENTER, Align.MIN),
+    )]
+
+
+def _channels(cfg: TowerConfig) -> list:
+    """8. Water channels (6 radial grooves).
+
+    Cut from base plate, avoiding coincident faces at plate-cone boundary.
+    Channels are as deep as the plate minus 0.5mm to keep a thin floor.
+    In batched mode they are removed by the single multi-operand cut of
+    every subtractive tool.
+    """
+    tools = []
+    ch_depth = min(cfg.CHANNEL_DEPTH, cfg.WALL_THICKNESS - 0.5)
+    for i in range(cfg.N_CHANNELS):
+        angle_deg = i * (360.0 / cfg.N_CHANNELS)
+        angle_rad = math.radians(angle_deg)
+        cx = cfg.CHANNEL_CENTER_R * math.cos(angle_rad)
+        cy = cfg.CHANNEL_CENTER_R * math.sin(angle_rad)
+        tools.append(Pos(cx, cy, cfg.WALL_THICKNESS - ch_depth) * Box(
+            cfg.CHANNEL_LENGTH,
+            cfg.CHANNEL_WIDTH,
+            ch_depth,
+            rotation=(0, 0, angle_deg),
+            align=(Align.CENTER, Align.CENTER, Align.MIN),
+        ))
+    return tools
+
+
+TOP_CAP_FEATURES = [
+    Feature('deflector', 'fuse', _deflector),
+    Feature('socket', 'fuse', _socket, mesh_class='interlock'),
+    Feature('hollow', 'cut', _hollow),
+    Feature('tube_bore', 'cut', _tube_bore),
+    Feature('channels', 'cut', _channels),
+]
+
+
+def build_top_cap(config: TowerConfig = None, batched: bool = False,
+                  draft: bool = False) -> Part:
+    """Build the top cap / water deflector.
+
+    Args:
+        config: Parameter set to build (default: the tower_params constants).
+        batched: Fuse all additive tools in one multi-operand boolean,
+            then cut all subtractive ones (hollow, bore, six channels) in
+            another (see components/booleans.py).
+        draft: Accepted for a uniform builder signature; the cap has no
+            fine features, its water channels set the flow.
+
+    Returns:
+        Part: watertight solid of the complete top cap
+    """
+    return build_features('top_cap', TOP_CAP_FEATURES, config, batched, draft)
 
 
 if __name__ == "__main__":
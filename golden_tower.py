@@ -0,0 +1,399 @@
+"""
+Golden Tower CLI
+================
+One entry point for the tower tools, as subcommands:
+
+    build     build123d build, STL/STEP export and mesh check
+              (build_tower_build123d.py)
+    validate  watertightness, volume and extents of exported STLs
+    analyze   face counts, file sizes and mesh metrics (reports/mesh_*.py)
+    render    Blender multi-view renders and cross-sections
+              (validate_visual.py; needs blender on PATH or --blender)
+    sweep     parameter sweep with analytic pre-screening (sweep.py)
+    bench     preview engine benchmark (bench_preview.py), or with
+              --startup the entry point import times (bench_startup.py),
+              or with --stl the STL write/read throughput (bench_stl.py)
+    daemon    serve, query or stop the warm-kernel build daemon
+              (build_daemon.py); build --daemon queues a build in it
+    assemble  instanced tower assembly (3MF, glTF, STEP) of the exported
+              parts, optionally a flattened STL (assembly.py)
+
+Every subcommand takes the same options:
+
+    --jobs N      worker processes (default: the subcommand's own)
+    --out DIR     exports root: build writes and validate/analyze/render
+                  read <DIR>/stl, render writes <DIR>/renders, sweep writes
+                  <DIR>/sweeps, assemble reads <DIR>/stl, <DIR>/step and
+                  <DIR>/config.json and writes <DIR>/assembly (default:
+                  exports/, or the variant's directory for a build with
+                  overrides or an assemble --variant)
+    --cache DIR   BREP build cache (default: exports/cache/); --no-cache
+                  rebuilds everything
+    --json        print the result as JSON on stdout; progress goes to stderr
+
+Subcommands import what they need when they run, so validate and analyze
+never load build123d, OCP or bpy and start well under a second.
+
+Usage:
+    python golden_tower.py build --jobs 3 --set NODES_PER_SEGMENT=4
+    python golden_tower.py validate --json
+    python golden_tower.py analyze --basic
+    python golden_tower.py render --jobs 3
+    python golden_tower.py sweep --param POCKET_TILT_ANGLE=15:25:3
+    python golden_tower.py bench --engines mesh sdf --json
+    python golden_tower.py daemon serve --draft
+    python golden_tower.py build --daemon --set CAP_OVERHANG=12
+    python golden_tower.py assemble --segments 20 --formats 3mf glb
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PROJECT_ROOT)
+
+EXPORT_DIR = os.path.join(PROJECT_ROOT, 'exports')
+VALIDATE_VISUAL = os.path.join(PROJECT_ROOT, 'validate_visual.py')
+SOCKET_PATH = os.path.join(EXPORT_DIR, 'build-daemon.sock')
+
+
+def _cache_dir(args):
+    if args.no_cache:
+        return None
+    from build_cache import CACHE_DIR
+    return args.cache or CACHE_DIR
+
+
+def _stl_dir(args):
+    out = args.out or EXPORT_DIR
+    return os.path.join(out, 'draft', 'stl') if args.draft else os.path.join(out, 'stl')
+
+
+def _stl_files(stl_dir):
+    return sorted(f for f in os.listdir(stl_dir) if f.endswith('.stl'))
+
+
+def cmd_build(args):
+    """Build, export and check every component."""
+    from build_tower_build123d import (
+        build, parse_mesh_setting, resolve_variant, variant_dir,
+    )
+    try:
+        config, variant = resolve_variant(args.config, args.settings, args.name)
+        mesh_settings = dict(parse_mesh_setting(spec) for spec in args.mesh)
+    except (OSError, TypeError, ValueError) as exc:
+        args.error(str(exc))
+    out = args.out or (EXPORT_DIR if variant is None else variant_dir(variant))
+    if args.daemon:
+        if mesh_settings:
+            args.error("--mesh is not supported with --daemon; the daemon "
+                       "tessellates at the default settings")
+        return _build_in_daemon(args, config, out)
+    results, meshes, stages = build(config, variant, out, args.jobs or 1,
+                                    _cache_dir(args), args.batched, args.draft,
+                                    args.pipeline, mesh_settings)
+    ok = all(row['watertight'] for row in meshes)
+    print("\nAll meshes valid." if ok
+          else "\nWARNING: Some meshes are not watertight!")
+    return {'out': out, 'variant': variant, 'overrides': config.overrides(),
+            'components': results, 'meshes': meshes, 'stages': stages}, ok
+
+
+def _build_in_daemon(args, config, out):
+    from build_daemon import request, summarize
+    payload = {'cmd': 'build', 'overrides': config.overrides(), 'out': out,
+               'draft': args.draft, 'batched': args.batched}
+    try:
+        response = request(payload, args.socket)
+    except OSError as exc:
+        args.error(f"no build daemon on {args.socket} ({exc}); "
+                   f"start one with: golden_tower.py daemon serve")
+    print(summarize(response))
+    return response, bool(response.get('ok'))
+
+
+def cmd_validate(args):
+    """Check the exported STLs; repaired copies go to repaired/ (NumPy only)."""
+    from build_tower_build123d import check_meshes, print_meshes
+    stl_dir = _stl_dir(args)
+    meshes = check_meshes(stl_dir)
+    ok = print_meshes(meshes) and bool(meshes)
+    if not meshes:
+        print(f"No STL files in {stl_dir}")
+    return {'stl_dir': stl_dir, 'meshes': meshes}, ok
+
+
+def _analyze_file(path, basic):
+    from reports.mesh_analysis import mesh_stats
+    from reports.mesh_basic import header_stats
+    row = {'file': os.path.basename(path), **header_stats(path)}
+    if not basic:
+        row.update(mesh_stats(path))
+    return row
+
+
+def cmd_analyze(args):
+    """Per-STL header and mesh metrics."""
+    stl_dir = _stl_dir(args)
+    paths = [os.path.join(stl_dir, f) for f in _stl_files(stl_dir)]
+    if (args.jobs or 1) > 1 and len(paths) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            rows = list(pool.map(_analyze_file, paths, [args.basic] * len(paths)))
+    else:
+        rows = [_analyze_file(path, args.basic) for path in paths]
+    for row in rows:
+        print(f"{row['file']}: faces={row['faces']}, size={row['size']}B, "
+              f"size_match={row['size_match']}")
+        if not args.basic:
+            from reports.mesh_analysis import format_stats
+            print('\n'.join(format_stats(row['file'], row)[1:]))
+    return {'stl_dir': stl_dir, 'meshes': rows}, all(r['size_match'] for r in rows)
+
+
+def cmd_render(args):
+    """Render every STL with validate_visual.py in Blender, --jobs at a time."""
+    import shutil
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+    blender = shutil.which(args.blender)
+    if blender is None:
+        args.error(f"Blender not found: {args.blender} (set --blender or $BLENDER)")
+    stl_dir = _stl_dir(args)
+    render_dir = os.path.join(args.out or EXPORT_DIR, 'renders')
+    files = args.stl or _stl_files(stl_dir)
+
+    def render(name):
+        t0 = time.time()
+        proc = subprocess.run(
+            [blender, '--background', '--python', VALIDATE_VISUAL, '--',
+             '--render-dir', render_dir, os.path.join(stl_dir, name)],
+            capture_output=True, text=True)
+        return {'file': name, 'returncode': proc.returncode,
+                'seconds': time.time() - t0, 'log': proc.stdout + proc.stderr}
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs or 1)) as pool:
+        rows = list(pool.map(render, files))
+    for row in rows:
+        status = "OK" if row['returncode'] == 0 else f"FAIL ({row['returncode']})"
+        print(f"  {row['file']}: {status} in {row['seconds']:.1f}s")
+        if row['returncode']:
+            print(row['log'])
+    print(f"Renders in {render_dir}")
+    return ({'render_dir': render_dir, 'renders': rows},
+            all(row['returncode'] == 0 for row in rows))
+
+
+def cmd_sweep(args):
+    """Screen and build a parameter sweep; CSV to <out>/sweeps/."""
+    from sweep import expand, parse_range, print_table, run_sweep
+    try:
+        ranges = dict(parse_range(spec) for spec in args.param)
+        expand(ranges)  # unknown names, fractional integers
+    except (KeyError, ValueError) as exc:
+        args.error(str(exc))
+    out = os.path.join(args.out or EXPORT_DIR, 'sweeps',
+                       time.strftime('sweep-%Y%m%d-%H%M%S.csv'))
+    rows, rejected = run_sweep(ranges, args.components,
+                               args.jobs or os.cpu_count() or 1,
+                               _cache_dir(args), args.draft, args.screen_only, out)
+    print_table(rows, rejected, list(ranges))
+    print(f"\n{len(rows)} row(s) -> {out}")
+    return {'csv': out, 'rows': rows, 'rejected': rejected}, True
+
+
+def cmd_bench(args):
+    """Time the geometry engines (serial and uncached, so timings compare)."""
+    if args.startup:
+        import bench_startup
+        rows = bench_startup.run_benchmark()
+        bench_startup.print_rows(rows)
+        return {'startup': rows}, all(row['status'] == 0 for row in rows)
+    if args.stl:
+        import bench_stl
+        segments = args.tower or bench_stl.TARGET_SEGMENT_COUNT
+        rows = bench_stl.run_benchmark(_stl_dir(args), segments)
+        bench_stl.print_rows(rows)
+        return {'stl': rows}, True
+    from bench_preview import bench_tower, print_rows, run_benchmark
+    rows = run_benchmark(args.components, args.engines, args.draft, args.voxel)
+    print_rows(rows)
+    result = {'rows': rows}
+    if args.tower:
+        result['tower'] = bench_tower(args.tower, draft=args.draft)
+        print(f"SDF tower of {args.tower} segments: "
+              f"{result['tower']['seconds']:.2f}s")
+    return result, True
+
+
+def cmd_daemon(args):
+    """Serve the warm-kernel build daemon, or query or stop a running one."""
+    import build_daemon
+    if args.action == 'serve':
+        build_daemon.BuildDaemon(args.out or EXPORT_DIR, _cache_dir(args),
+                                 args.jobs or 1, args.draft,
+                                 not args.no_watch).serve(args.socket)
+        return {}, True
+    try:
+        response = build_daemon.request({'cmd': args.action}, args.socket)
+    except OSError as exc:
+        args.error(f"no build daemon on {args.socket} ({exc})")
+    if args.action == 'status':
+        print(f"pid {response['pid']}, up {response['uptime']:.0f}s, "
+              f"{response['queued']} queued, "
+              f"{'building' if response['busy'] else 'idle'}")
+        for name, entry in sorted(response['published'].items()):
+            print(f"  {name}: volume={entry['metrics']['volume']:.1f}mm³")
+    return response, bool(response.get('ok'))
+
+
+def cmd_assemble(args):
+    """Export the tower assembly, each unique part stored once (assembly.py)."""
+    from assembly import export_assembly, print_rows, read_config
+    from build_tower_build123d import variant_dir
+    try:
+        out = args.out or (EXPORT_DIR if args.variant is None
+                           else variant_dir(args.variant))
+        if args.variant is not None and not os.path.exists(
+                os.path.join(out, 'config.json')):
+            raise FileNotFoundError(f"{out}/config.json missing; build the "
+                                    f"variant {args.variant!r} first")
+        # Stack the parts with the parameters they were built with
+        config = read_config(out)
+        rows = export_assembly(args.segments, args.formats, args.flat,
+                               os.path.join(out, 'stl'), os.path.join(out, 'step'),
+                               os.path.join(out, 'assembly'), config)
+    except (OSError, TypeError, ValueError) as exc:
+        args.error(str(exc))
+    print_rows(rows)
+    return {'assembly': rows, 'overrides': config.overrides()}, True
+
+
+def _jsonable(value):
+    """JSON fallback for NumPy scalars/arrays and other odd values."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    options = common.add_argument_group('common options')
+    options.add_argument('-j', '--jobs', type=int,
+                         help="worker processes (default: per subcommand)")
+    options.add_argument('--out', metavar='DIR',
+                         help="exports root (default: exports/)")
+    options.add_argument('--cache', metavar='DIR',
+                         help="BREP build cache directory (default: exports/cache/)")
+    options.add_argument('--no-cache', action='store_true',
+                         help="ignore the BREP build cache")
+    options.add_argument('--json', action='store_true',
+                         help="print the result as JSON; progress goes to stderr")
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    commands = parser.add_subparsers(dest='command', required=True,
+                                     metavar='COMMAND')
+
+    def command(name, handler):
+        sub = commands.add_parser(name, parents=[common],
+                                  help=handler.__doc__.splitlines()[0],
+                                  description=handler.__doc__)
+        sub.set_defaults(handler=handler, error=sub.error)
+        return sub
+
+    from assembly import FORMATS
+    from bench_preview import COMPONENTS, ENGINES
+    from build_tower_build123d import add_build_arguments
+
+    sub = command('build', cmd_build)
+    add_build_arguments(sub)
+    sub.add_argument('--daemon', action='store_true',
+                     help="queue the build in the running build daemon")
+    sub.add_argument('--socket', default=SOCKET_PATH,
+                     help="build daemon socket (default: exports/build-daemon.sock)")
+
+    for name, handler in (('validate', cmd_validate), ('analyze', cmd_analyze)):
+        sub = command(name, handler)
+        sub.add_argument('--draft', action='store_true',
+                         help="use the draft STLs (<out>/draft/stl)")
+    sub.add_argument('--basic', action='store_true',
+                     help="binary STL header only (no trimesh)")
+
+    sub = command('render', cmd_render)
+    sub.add_argument('stl', nargs='*', help="STL file names (default: all)")
+    sub.add_argument('--draft', action='store_true',
+                     help="render the draft STLs (<out>/draft/stl)")
+    sub.add_argument('--blender', default=os.environ.get('BLENDER', 'blender'),
+                     help="Blender executable (default: $BLENDER or blender)")
+
+    sub = command('sweep', cmd_sweep)
+    sub.add_argument('--param', action='append', required=True,
+                     metavar='NAME=RANGE',
+                     help="start:stop:count or v1,v2,... (repeatable)")
+    sub.add_argument('--components', nargs='+', choices=COMPONENTS,
+                     default=['segment'])
+    sub.add_argument('--draft', action='store_true',
+                     help="build the gross shape only")
+    sub.add_argument('--screen-only', action='store_true',
+                     help="stop after the analytic screen")
+
+    sub = command('bench', cmd_bench)
+    sub.add_argument('--engines', nargs='+', choices=sorted(ENGINES),
+                     help="engines to run (default: all installed)")
+    sub.add_argument('--components', nargs='+', choices=COMPONENTS,
+                     default=list(COMPONENTS))
+    sub.add_argument('--draft', action='store_true',
+                     help="skip fine features in every engine")
+    sub.add_argument('--voxel', type=float, default=1.0,
+                     help="SDF voxel size in mm (default: 1.0)")
+    sub.add_argument('--tower', type=int, metavar='N',
+                     help="also mesh an N-segment tower with the SDF engine")
+    sub.add_argument('--startup', action='store_true',
+                     help="time the entry point startup instead (bench_startup.py)")
+    sub.add_argument('--stl', action='store_true',
+                     help="time STL write/read of the exported parts stacked into "
+                          "a tower (of --tower N segments) instead (bench_stl.py)")
+
+    sub = command('daemon', cmd_daemon)
+    sub.add_argument('action', choices=['serve', 'status', 'stop'])
+    sub.add_argument('--socket', default=SOCKET_PATH,
+                     help="Unix socket path (default: exports/build-daemon.sock)")
+    sub.add_argument('--draft', action='store_true',
+                     help="build drafts when a source file changes")
+    sub.add_argument('--no-watch', action='store_true',
+                     help="only build on request")
+
+    sub = command('assemble', cmd_assemble)
+    sub.add_argument('--segments', type=int,
+                     help="segments in the tower, the bottom one included "
+                          "(default: the config's TARGET_SEGMENT_COUNT)")
+    sub.add_argument('--variant', metavar='NAME',
+                     help="assemble exports/variants/NAME, stacked with "
+                          "its config.json (with --out: DIR/config.json, "
+                          "if present)")
+    sub.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS),
+                     help="instancing formats to write (default: all)")
+    sub.add_argument('--flat', action='store_true',
+                     help="also write the flattened mesh as tower.stl")
+    return parser
+
+
+def main(argv=None):
+    """Run one subcommand; returns the process exit status."""
+    args = build_parser().parse_args(argv)
+    if args.json:
+        with contextlib.redirect_stdout(sys.stderr):
+            result, ok = args.handler(args)
+        json.dump(result, sys.stdout, indent=2, default=_jsonable)
+        print()
+    else:
+        result, ok = args.handler(args)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
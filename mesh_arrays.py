@@ -0,0 +1,321 @@
+"""
+Mesh Arrays — Golden Tower
+==========================
+Tessellates a build123d Part once into NumPy ``(vertices, faces)`` arrays
+and works on those arrays directly. The binary STL writer and the mesh
+checks (watertight, winding, volume, extents) both take the same arrays,
+so the build pipeline validates exactly the triangles it exports without
+reading the STL back. The writer fills one structured record buffer
+(:data:`STL_DTYPE`) and writes it as is; :func:`map_stl` memory-maps an
+exported file into the same records without copying it, and
+:func:`read_stl` hands its triangles to mesh_repair.py.
+
+OCC meshes the B-rep faces in parallel, with one deflection for the
+whole part (:func:`tessellate`) or one per group of faces
+(:func:`tessellate_groups`; the groups come from
+feature_tree.face_classes). Vertices are rounded to the float32 an STL
+stores and merged by exact position, as trimesh does when it loads the
+file, so the checks see the same connectivity a reload would.
+"""
+
+import os
+
+import numpy as np
+
+# One binary STL facet record (50 bytes)
+STL_DTYPE = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)),
+                      ('attributes', '<u2')])
+
+
+def tessellate(part, tolerance, angular_tolerance):
+    """Mesh ``part`` with OCC and return its triangles as arrays.
+
+    Args:
+        part: build123d Shape.
+        tolerance: Linear deflection, relative to each edge's size.
+        angular_tolerance: Angular deflection (rad).
+
+    Returns:
+        tuple: ``(vertices, faces)`` -- float64 ``(n, 3)`` positions
+        (float32-exact) and int64 ``(m, 3)`` indices wound outward,
+        degenerate triangles included (see :func:`drop_degenerate`).
+    """
+    from OCP.BRepMesh import BRepMesh_IncrementalMesh
+
+    BRepMesh_IncrementalMesh(part.wrapped, tolerance, True, angular_tolerance,
+                             True).Perform()
+    return _merged([_face_mesh(face) for face in part.faces()])
+
+
+def tessellate_groups(part, groups, settings):
+    """Mesh each group of faces with its own deflection.
+
+    Groups are meshed finest first, in OCC's parallel mode. Each pass
+    meshes the new group together with the finer, already meshed faces:
+    OCC keeps their triangulations and reuses the discretization of the
+    edges they share with the new group, so the seams stay watertight.
+
+    Args:
+        part: build123d Shape.
+        groups: Group label of every face, in ``part.faces()`` order.
+        settings: ``{label: (linear mm, angular rad)}`` absolute
+            deflections.
+
+    Returns:
+        tuple: ``(vertices, faces, report)`` -- as :func:`tessellate`,
+        plus per label the B-rep ``faces``, ``triangles``, the ``linear``
+        and ``angular`` settings and ``max_deviation``, the largest
+        distance (mm) between the mesh and the surface (see
+        :func:`chordal_deviation`).
+    """
+    from OCP.BRep import BRep_Builder
+    from OCP.BRepMesh import BRepMesh_IncrementalMesh
+    from OCP.BRepTools import BRepTools
+    from OCP.TopoDS import TopoDS_Compound
+
+    faces = part.faces()
+    BRepTools.Clean_s(part.wrapped)
+    labels = sorted(set(groups), key=lambda label: settings[label])
+    compound, builder = TopoDS_Compound(), BRep_Builder()
+    builder.MakeCompound(compound)
+    for label in labels:
+        for face, group in zip(faces, groups):
+            if group == label:
+                builder.Add(compound, face.wrapped)
+        linear, angular = settings[label]
+        BRepMesh_IncrementalMesh(compound, linear, False, angular, True).Perform()
+
+    meshes = [_face_mesh(face) for face in faces]
+    report = {label: {'faces': 0, 'triangles': 0, 'linear': settings[label][0],
+                      'angular': settings[label][1], 'max_deviation': 0.0}
+              for label in labels}
+    for face, group, mesh in zip(faces, groups, meshes):
+        row = report[group]
+        row['faces'] += 1
+        if mesh is not None:
+            row['triangles'] += len(mesh[1])
+            row['max_deviation'] = max(row['max_deviation'],
+                                       chordal_deviation(face, *mesh))
+    return (*_merged(meshes), report)
+
+
+def chordal_deviation(face, nodes, triangles):
+    """Largest distance (mm) between a face's triangles and its surface.
+
+    The centroid and edge midpoints of every triangle are projected onto
+    the surface. Planes are exact.
+    """
+    from OCP.BRep import BRep_Tool
+    from OCP.BRepAdaptor import BRepAdaptor_Surface
+    from OCP.GeomAbs import GeomAbs_Plane
+    from OCP.ShapeAnalysis import ShapeAnalysis_Surface
+    from OCP.gp import gp_Pnt
+
+    if BRepAdaptor_Surface(face.wrapped).GetType() == GeomAbs_Plane or not len(triangles):
+        return 0.0
+    a, b, c = triangles.T
+    points = np.concatenate([(nodes[a] + nodes[b] + nodes[c]) / 3, (nodes[a] + nodes[b]) / 2,
+                             (nodes[b] + nodes[c]) / 2, (nodes[c] + nodes[a]) / 2])
+    # Projection, not UV interpolation: a pole or apex has no single UV
+    surface = ShapeAnalysis_Surface(BRep_Tool.Surface_s(face.wrapped))
+    deviation = 0.0
+    for point in points:
+        surface.ValueOfUV(gp_Pnt(*point), 1e-7)
+        deviation = max(deviation, surface.Gap())
+    return deviation
+
+
+def _face_mesh(face):
+    """``(nodes, triangles)`` of a meshed face, or None if it has none.
+
+    Nodes are in global coordinates; triangles are zero-based and wound
+    outward.
+    """
+    from OCP.BRep import BRep_Tool
+    from OCP.TopAbs import TopAbs_Orientation
+    from OCP.TopLoc import TopLoc_Location
+
+    location = TopLoc_Location()
+    poly = BRep_Tool.Triangulation_s(face.wrapped, location)
+    if poly is None:
+        return None
+    count = poly.NbNodes()
+    nodes = np.array([poly.Node(i).Coord() for i in range(1, count + 1)])
+    if not location.IsIdentity():
+        trsf = location.Transformation()
+        matrix = np.array([[trsf.Value(r, c) for c in range(1, 5)]
+                           for r in range(1, 4)])
+        nodes = nodes @ matrix[:, :3].T + matrix[:, 3]
+    tris = np.array([poly.Triangle(i).Get()
+                     for i in range(1, poly.NbTriangles() + 1)]).reshape(-1, 3) - 1
+    if face.wrapped.Orientation() == TopAbs_Orientation.TopAbs_REVERSED:
+        tris = tris[:, [0, 2, 1]]
+    return nodes, tris
+
+
+def _merged(meshes):
+    """Concatenate per-face meshes and merge their shared vertices."""
+    points, triangles, offset = [], [], 0
+    for mesh in meshes:
+        if mesh is None:
+            continue
+        nodes, tris = mesh
+        points.append(nodes)
+        triangles.append(tris + offset)
+        offset += len(nodes)
+    if not points:
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+    return merge_vertices(np.concatenate(points), np.concatenate(triangles))
+
+
+def merge_vertices(vertices, faces):
+    """Round to float32 and merge coincident vertices; faces re-indexed."""
+    exact = vertices.astype(np.float32)
+    unique, inverse = np.unique(exact, axis=0, return_inverse=True)
+    return unique.astype(np.float64), inverse.reshape(-1)[faces].astype(np.int64)
+
+
+def drop_degenerate(faces):
+    """Remove triangles with a repeated vertex (OCC sphere-pole artifact).
+
+    Returns:
+        tuple: ``(faces, removed count)``.
+    """
+    keep = ((faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2])
+            & (faces[:, 0] != faces[:, 2]))
+    return faces[keep], int(len(faces) - keep.sum())
+
+
+def face_normals(vertices, faces):
+    """Unit normals per face; zero for zero-area faces."""
+    (ax, bx, cx), (ay, by, cy), (az, bz, cz) = corner_coords(vertices, faces)
+    ux, uy, uz, wx, wy, wz = bx - ax, by - ay, bz - az, cx - ax, cy - ay, cz - az
+    nx, ny, nz = uy * wz - uz * wy, uz * wx - ux * wz, ux * wy - uy * wx
+    length = np.sqrt(nx * nx + ny * ny + nz * nz)
+    scale = np.divide(1.0, length, out=np.zeros_like(length), where=length > 0)
+    return np.stack([nx * scale, ny * scale, nz * scale], axis=1)
+
+
+def write_stl(path, vertices, faces, header=b''):
+    """Write a binary STL of the arrays from one record buffer.
+
+    The facets are filled column by column into a :data:`STL_DTYPE`
+    array and written straight from its memory, with no per-triangle
+    Python and no intermediate ``bytes`` copy.
+    """
+    records = np.zeros(len(faces), dtype=STL_DTYPE)
+    records['normal'] = face_normals(vertices, faces)
+    records['vertices'] = np.take(vertices, faces, axis=0)
+    with open(path, 'wb') as fh:
+        fh.write(header.ljust(80, b' ')[:80])
+        fh.write(np.uint32(len(faces)).tobytes())
+        fh.write(records.data)
+
+
+def map_stl(path):
+    """Memory-map the facets of a binary STL without reading or copying them.
+
+    Returns:
+        numpy.memmap: read-only :data:`STL_DTYPE` records; ``['vertices']``
+        and ``['normal']`` are views into the file. Pages are read only
+        when touched.
+
+    Raises:
+        ValueError: not a binary STL (short, or size and facet count
+            disagree, as for ASCII files).
+    """
+    size = os.path.getsize(path)
+    if size < 84:
+        raise ValueError(f"{path}: not a binary STL ({size} bytes)")
+    count = int(np.fromfile(path, dtype='<u4', count=1, offset=80)[0])
+    if size != 84 + count * STL_DTYPE.itemsize:
+        raise ValueError(f"{path}: not a binary STL ({count} facets in {size} bytes)")
+    if not count:
+        return np.zeros(0, dtype=STL_DTYPE)
+    return np.memmap(path, dtype=STL_DTYPE, mode='r', offset=84, shape=(count,))
+
+
+def read_stl(path):
+    """Triangles of a binary or ASCII STL.
+
+    Binary files are memory-mapped (:func:`map_stl`), so the result is a
+    view into the file rather than a copy.
+
+    Returns:
+        ndarray: float32 ``(m, 3, 3)`` corner positions, unindexed (see
+        :func:`merge_vertices`).
+
+    Raises:
+        ValueError: not an STL file.
+    """
+    try:
+        return map_stl(path)['vertices']
+    except ValueError:
+        pass
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    if data.lstrip().startswith(b'solid'):
+        import re
+        corners = re.findall(rb'vertex\s+(\S+)\s+(\S+)\s+(\S+)', data)
+        return np.array(corners, dtype=np.float32).reshape(-1, 3, 3)
+    raise ValueError(f"{path}: not a binary or ASCII STL")
+
+
+def corner_coords(vertices, faces):
+    """Coordinates of every triangle corner, ``(3 axes, 3 corners, m)``.
+
+    Each ``[axis, corner]`` row is contiguous, so the per-face arithmetic
+    of large meshes runs on flat arrays (``np.take`` is several times
+    faster than fancy-indexing ``vertices[faces]``).
+    """
+    return np.take(np.ascontiguousarray(vertices.T), np.ascontiguousarray(faces.T),
+                   axis=1)
+
+
+def signed_volume(coords):
+    """Signed volume (mm³) enclosed by the triangles of :func:`corner_coords`."""
+    (ax, bx, cx), (ay, by, cy), (az, bz, cz) = coords
+    return float((ax * (by * cz - bz * cy) + ay * (bz * cx - bx * cz)
+                  + az * (bx * cy - by * cx)).sum() / 6.0)
+
+
+def check_arrays(vertices, faces, coords=None):
+    """Watertightness, winding, volume and extents of an indexed mesh.
+
+    ``coords`` reuses the :func:`corner_coords` of the mesh if the caller
+    already has them.
+
+    Returns:
+        dict: ``watertight`` (every edge shared by exactly two faces),
+        ``winding_consistent`` (no directed edge used twice), ``outward``
+        (positive signed volume), ``volume`` (mm³) and ``extents`` (mm),
+        the fields of ``build_tower_build123d.check_meshes`` rows.
+    """
+    if not len(faces):
+        return {'watertight': False, 'winding_consistent': False,
+                'outward': False, 'volume': 0.0, 'extents': [0.0, 0.0, 0.0]}
+    count = len(vertices)
+    start = faces.T.ravel()
+    end = faces[:, [1, 2, 0]].T.ravel()
+    # One int64 key per directed edge: the undirected edge, then its
+    # direction in the low bit. Equal keys are a directed edge used twice;
+    # keys equal after the shift are the faces sharing an edge.
+    keys = np.minimum(start, end)
+    keys *= count
+    keys += np.maximum(start, end)
+    keys <<= 1
+    keys += start > end
+    keys.sort()
+    edges = keys >> 1
+    runs = np.diff(np.flatnonzero(np.r_[True, edges[1:] != edges[:-1], True]))
+    if coords is None:
+        coords = corner_coords(vertices, faces)
+    volume = signed_volume(coords)
+    flat = coords.reshape(3, -1)
+    return {
+        'watertight': bool(np.all(runs == 2)),
+        'winding_consistent': bool(np.all(keys[1:] != keys[:-1])),
+        'outward': volume > 0,
+        'volume': volume,
+        'extents': [float(e) for e in flat.max(axis=1) - flat.min(axis=1)],
+    }
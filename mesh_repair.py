@@ -0,0 +1,277 @@
+"""
+Mesh Repair — Golden Tower
+==========================
+Vectorized validation and repair of triangle meshes: exported STLs and
+million-triangle assembly meshes. Every step is a NumPy array operation
+with no per-face Python loop, so a mesh of a million triangles is read,
+checked and repaired in well under a second.
+
+:func:`repair_mesh` runs, in order:
+
+1. weld vertices closer than ``merge_tolerance`` (grid snapping),
+2. collapse the short edge of sliver faces (shorter than ``sliver_edge``),
+3. drop faces with a repeated vertex index and zero-area faces,
+4. flip every face if the signed volume is negative,
+
+and reports what each step found, plus the watertightness, winding and
+volume before and after (mesh_arrays.check_arrays). The input file is
+never touched. A repaired mesh goes to a separate file with a JSON
+report next to it (:func:`repair_file`).
+
+Usage:
+    python mesh_repair.py exports/stl/*.stl
+    python mesh_repair.py assembly.stl --out exports/repaired --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PROJECT_ROOT)
+
+from mesh_arrays import check_arrays, corner_coords, read_stl, write_stl
+
+# Vertices closer than this (mm) are welded; see weld() for large meshes
+MERGE_TOLERANCE = 1e-4
+
+# Faces with an edge shorter than this (mm) are slivers; the edge collapses
+SLIVER_EDGE = 1e-3
+
+# Faces with less area than this (mm²) are zero-area
+ZERO_AREA = 1e-10
+
+# Grid cells per axis that fit the 63-bit weld key
+_GRID = 1 << 21
+
+
+def repaired_dir(stl_dir):
+    """Where repairs of the STLs in ``stl_dir`` go: ``repaired/`` beside it."""
+    return os.path.join(os.path.dirname(os.path.abspath(stl_dir)), 'repaired')
+
+
+def weld(corners, tolerance=MERGE_TOLERANCE):
+    """Index loose triangle corners, merging points within ``tolerance``.
+
+    Points are snapped to a grid of ``tolerance`` cells and packed into
+    one int64 key per point, so the merge is a single integer sort. The
+    grid holds at most 2**21 cells per axis; for a mesh larger than
+    ``2**21 * tolerance`` the cell grows to fit, and the effective
+    tolerance is returned.
+
+    Args:
+        corners: ``(k, 3)`` points, e.g. ``read_stl(path).reshape(-1, 3)``.
+
+    Returns:
+        tuple: ``(vertices, index, tolerance)`` -- float64 ``(n, 3)``
+        positions (the first point of each cell), the vertex index of
+        every corner and the tolerance used.
+    """
+    points = np.ascontiguousarray(np.asarray(corners).reshape(-1, 3).T, dtype=np.float64)
+    if not points.shape[1]:
+        return np.zeros((0, 3)), np.zeros(0, dtype=np.int64), tolerance
+    low = points.min(axis=1)
+    tolerance = max(tolerance, float((points.max(axis=1) - low).max()) / (_GRID - 1))
+    keys = np.zeros(points.shape[1], dtype=np.int64)
+    for axis, origin in zip(points, low):
+        cell = axis - origin
+        cell *= 1.0 / tolerance
+        cell += 0.5
+        keys <<= 21
+        keys |= cell.astype(np.int64)
+    order = np.argsort(keys)
+    keys = np.take(keys, order)
+    first = np.empty(len(keys), dtype=bool)
+    first[0] = True
+    np.not_equal(keys[1:], keys[:-1], out=first[1:])
+    index = np.empty(len(keys), dtype=np.int64)
+    index[order] = np.cumsum(first) - 1
+    return np.take(points, order[first], axis=1).T.copy(), index, tolerance
+
+
+def _edge_lengths(coords):
+    """Lengths of edges 01, 12 and 20 of every face, ``(3, m)``."""
+    lengths = np.zeros(coords.shape[1:])
+    for axis in coords:
+        for edge, (a, b) in enumerate(((0, 1), (1, 2), (2, 0))):
+            lengths[edge] += np.square(axis[b] - axis[a])
+    return np.sqrt(lengths, out=lengths)
+
+
+def face_areas(coords):
+    """Area (mm²) of every face of :func:`~mesh_arrays.corner_coords`."""
+    (ax, bx, cx), (ay, by, cy), (az, bz, cz) = coords
+    ux, uy, uz, wx, wy, wz = bx - ax, by - ay, bz - az, cx - ax, cy - ay, cz - az
+    return 0.5 * np.sqrt(np.square(uy * wz - uz * wy) + np.square(uz * wx - ux * wz)
+                         + np.square(ux * wy - uy * wx))
+
+
+def _repeated(faces):
+    """Faces that use a vertex index twice."""
+    a, b, c = faces.T
+    return (a == b) | (b == c) | (a == c)
+
+
+def collapse_slivers(vertices, faces, length=SLIVER_EDGE, rounds=4):
+    """Collapse the shortest edge of every face with an edge below ``length``.
+
+    Each short edge maps its higher vertex index onto the lower one, so
+    chained collapses cannot form cycles; the map is resolved by pointer
+    jumping. The faces that become degenerate are left to
+    :func:`repair_mesh`.
+
+    Returns:
+        tuple: ``(faces, collapsed edge count)``.
+    """
+    collapsed = 0
+    for _ in range(rounds):
+        lengths = _edge_lengths(corner_coords(vertices, faces))
+        short = (lengths.min(axis=0) < length) & ~_repeated(faces)
+        if not short.any():
+            break
+        rows = np.flatnonzero(short)
+        edge = lengths[:, rows].argmin(axis=0)
+        a = faces[rows, edge]
+        b = faces[rows, (edge + 1) % 3]
+        remap = np.arange(len(vertices))
+        remap[np.maximum(a, b)] = np.minimum(a, b)
+        while True:
+            jumped = remap[remap]
+            if np.array_equal(jumped, remap):
+                break
+            remap = jumped
+        faces = remap[faces]
+        collapsed += len(rows)
+    return faces, collapsed
+
+
+def repair_mesh(corners, merge_tolerance=MERGE_TOLERANCE, sliver_edge=SLIVER_EDGE,
+                zero_area=ZERO_AREA):
+    """Weld, clean and check a triangle soup.
+
+    Args:
+        corners: ``(m, 3, 3)`` triangle corners (:func:`mesh_arrays.read_stl`).
+
+    Returns:
+        tuple: ``(vertices, faces, report)``. The repaired indexed mesh,
+        unreferenced vertices dropped, and a JSON-ready report: the
+        ``triangles`` read, repaired ``vertices``, ``merge_tolerance``
+        used, ``sliver_edges`` collapsed, ``duplicate_index_faces`` and
+        ``zero_area_faces`` dropped, ``flipped``, ``changed`` (anything
+        repaired) and the :func:`~mesh_arrays.check_arrays` results
+        ``before`` (welded, not yet cleaned) and ``after``.
+    """
+    corners = np.asarray(corners).reshape(-1, 3, 3)
+    vertices, index, tolerance = weld(corners, merge_tolerance)
+    faces = index.reshape(-1, 3)
+    coords = corner_coords(vertices, faces)
+    before = after = check_arrays(vertices, faces, coords)
+
+    # Detect on the welded mesh; a clean mesh skips every repair pass
+    slivers = 0
+    if _edge_lengths(coords).min(axis=0).min(initial=np.inf) < sliver_edge:
+        faces, slivers = collapse_slivers(vertices, faces, sliver_edge)
+        coords = corner_coords(vertices, faces)
+    # Repeated-index faces have zero area too; each is counted once
+    repeated = _repeated(faces)
+    flat = (face_areas(coords) < zero_area) & ~repeated
+    drop = repeated | flat
+    if drop.any():
+        faces = faces[~drop]
+        used = np.bincount(faces.ravel(), minlength=len(vertices)) > 0
+        faces = (np.cumsum(used) - 1)[faces]
+        vertices = vertices[used]
+        after = check_arrays(vertices, faces)
+    flipped = after['volume'] < 0
+    if flipped:
+        faces = faces[:, [0, 2, 1]]
+        after = check_arrays(vertices, faces)
+
+    report = {
+        'triangles': len(corners),
+        'vertices': len(vertices),
+        'merge_tolerance': tolerance,
+        'sliver_edges': slivers,
+        'duplicate_index_faces': int(repeated.sum()),
+        'zero_area_faces': int(flat.sum()),
+        'flipped': bool(flipped),
+        'before': before,
+        'after': after,
+    }
+    report['changed'] = bool(slivers or report['duplicate_index_faces']
+                             or report['zero_area_faces'] or flipped)
+    return vertices, faces, report
+
+
+def repair_file(path, out_dir, header=None):
+    """Check ``path`` and, if anything needed repair, write the fix to ``out_dir``.
+
+    The input file is never modified. ``out_dir``/<name>.json always
+    receives the report; ``out_dir``/<name>.stl only when the mesh changed.
+
+    Args:
+        header: 80-byte header for the repaired STL (default: the input's).
+
+    Returns:
+        dict: :func:`repair_mesh` report plus ``file``, ``repaired_file``
+        (None if unchanged), ``report_file`` and ``seconds``.
+    """
+    t0 = time.perf_counter()
+    vertices, faces, report = repair_mesh(read_stl(path))
+    name = os.path.basename(path)
+    os.makedirs(out_dir, exist_ok=True)
+    report['file'] = os.path.abspath(path)
+    report['repaired_file'] = None
+    repaired = os.path.join(out_dir, name)
+    if not report['changed'] and os.path.exists(repaired):
+        os.remove(repaired)  # stale repair of an earlier export
+    if report['changed']:
+        if header is None:
+            with open(path, 'rb') as fh:
+                header = fh.read(80)
+        tmp = f"{repaired}.{os.getpid()}.tmp"
+        write_stl(tmp, vertices, faces, header)
+        os.replace(tmp, repaired)
+        report['repaired_file'] = repaired
+    report['report_file'] = os.path.join(out_dir, os.path.splitext(name)[0] + '.json')
+    report['seconds'] = time.perf_counter() - t0
+    tmp = f"{report['report_file']}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    os.replace(tmp, report['report_file'])
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('stl', nargs='+', help="STL files to check")
+    parser.add_argument('--out', help="directory for repaired files and reports "
+                                      "(default: repaired/ next to each file's directory)")
+    parser.add_argument('--json', action='store_true', help="print the reports as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    reports = []
+    for path in args.stl:
+        reports.append(repair_file(path, args.out or repaired_dir(os.path.dirname(path))))
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for r in reports:
+            after = r['after']
+            fixes = (f"{r['sliver_edges']} sliver edges, {r['duplicate_index_faces']} "
+                     f"repeated-index and {r['zero_area_faces']} zero-area faces"
+                     + (", flipped" if r['flipped'] else ""))
+            print(f"{os.path.basename(r['file'])}: {r['triangles']} triangles in "
+                  f"{r['seconds']:.2f}s; watertight {r['before']['watertight']} -> "
+                  f"{after['watertight']}, volume {after['volume']:.0f} mm³; "
+                  f"{fixes if r['changed'] else 'no repair needed'}")
+            if r['repaired_file']:
+                print(f"  repaired -> {r['repaired_file']}")
+    sys.exit(0 if all(r['after']['watertight'] for r in reports) else 1)
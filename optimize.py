@@ -0,0 +1,340 @@
+"""
+Design Optimizer — Golden Tower
+===============================
+Surrogate-assisted multi-objective search over the tower parameters for the
+segment, trading off
+
+- filament mass (g, minimise; analytic estimator),
+- overhang area steeper than MAX_OVERHANG_ANGLE (mm², minimise; needs a
+  CAD build and mesh, see sweep.py),
+- pockets per segment (maximise; NODES_PER_SEGMENT), and
+- drip tray capacity (mL, maximise; catch basin above the floor).
+
+Only the overhang needs the OCC kernel, so only it is modelled. A fixed
+pool of feasible candidates (Latin hypercube inside the bounds, filtered
+by components/constraints.py) is scored on the cheap objectives up
+front. A space-filling first batch is built; after every batch a
+Gaussian-process surrogate is fitted to the measured overhang, and the
+next batch is drawn from the candidates that are Pareto-optimal under an
+optimistic overhang prediction (mean minus ``KAPPA`` standard
+deviations), spread out in parameter space. Batches build in parallel
+workers through sweep.build_all.
+
+The result is the Pareto front of the built designs, with the parameter
+sets that produced it; every build is written as CSV to exports/sweeps/.
+
+Usage:
+    python optimize.py --param POCKET_TILT_ANGLE=10:30 \\
+                       --param POCKET_RADIAL_OFFSET=45:54 \\
+                       --param NODES_PER_SEGMENT=2:4 --jobs 4
+    python optimize.py --param SEGMENT_HEIGHT=170:240 --rounds 6 --batch 2 --draft
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PROJECT_ROOT)
+
+from build_cache import CACHE_DIR
+from components.constraints import evaluate
+from components.estimator import estimate
+from sweep import SWEEP_DIR, build_all, write_csv
+from tower_config import PRIMARY_NAMES, TowerConfig
+
+# (objective, sense); 'max' objectives are negated for the Pareto ranking
+OBJECTIVES = (
+    ('mass', 'min'),
+    ('overhang_area', 'min'),
+    ('pockets', 'max'),
+    ('tray_capacity', 'max'),
+)
+
+# Objectives measured on builds, and so predicted by the surrogate
+BUILT_OBJECTIVES = ('overhang_area',)
+
+# Optimism of the acquisition: predicted mean minus KAPPA std deviations
+KAPPA = 1.0
+
+
+def parse_bounds(spec):
+    """Parse ``NAME=low:high`` into ``(name, (low, high))``.
+
+    Raises:
+        ValueError: malformed spec or empty interval.
+    """
+    name, sep, values = spec.partition('=')
+    parts = values.split(':')
+    if not sep or not name.strip() or len(parts) != 2:
+        raise ValueError(f"expected NAME=low:high: {spec!r}")
+    low, high = float(parts[0]), float(parts[1])
+    if not low < high:
+        raise ValueError(f"low must be below high: {spec!r}")
+    return name.strip(), (low, high)
+
+
+def sample_candidates(bounds, count, seed=0):
+    """Latin hypercube of ``count`` points in ``bounds``, feasible ones only.
+
+    Integer parameters (by their default value) are rounded, and
+    duplicates that rounding creates are dropped.
+
+    Returns:
+        tuple: ``(variants, X)`` -- override dicts and their coordinates
+        scaled to the unit cube, shape ``(n, len(bounds))``.
+
+    Raises:
+        KeyError: a name is not a primary parameter.
+    """
+    unknown = sorted(set(bounds) - set(PRIMARY_NAMES))
+    if unknown:
+        raise KeyError(f"not primary parameter(s): {', '.join(unknown)}")
+    defaults = TowerConfig().primary()
+    rng = np.random.default_rng(seed)
+    names = list(bounds)
+    strata = np.argsort(rng.random((len(names), count)), axis=1).T
+    u = (strata + rng.random(strata.shape)) / count
+    low, high = np.array([bounds[n] for n in names]).T
+    values = low + u * (high - low)
+    integer = np.array([isinstance(defaults[n], int) for n in names])
+    values[:, integer] = np.round(values[:, integer])
+    values = np.unique(values, axis=0)
+
+    feasible = evaluate(dict(zip(names, values.T)))['feasible']
+    values = values[feasible]
+    variants = [{n: int(v) if integer[j] else float(v) for j, (n, v) in
+                 enumerate(zip(names, row))} for row in values]
+    return variants, (values - low) / (high - low)
+
+
+def cheap_objectives(variants, draft=False):
+    """Objectives that need no build, as ``{name: array}``."""
+    mass, pockets, tray = [], [], []
+    for overrides in variants:
+        p = TowerConfig(**overrides)
+        mass.append(estimate('segment', p, draft)['mass'])
+        pockets.append(p.NODES_PER_SEGMENT)
+        basin = math.pi * (p.BODY_INNER_RADIUS ** 2 - p.TUBE_OR ** 2)
+        tray.append(basin * p.DRIP_TRAY_DEPTH / 1000.0)
+    return {'mass': np.array(mass), 'pockets': np.array(pockets, float),
+            'tray_capacity': np.array(tray)}
+
+
+def pareto_mask(F):
+    """True for the rows of ``F`` (n, k) that no other row dominates.
+
+    Every column is minimised.
+    """
+    F = np.asarray(F, float)
+    no_worse = np.all(F[:, None, :] >= F[None, :, :], axis=2)
+    better = np.any(F[:, None, :] > F[None, :, :], axis=2)
+    return ~np.any(no_worse & better, axis=1)
+
+
+class Surrogate:
+    """Gaussian-process regression with an RBF kernel on unit-cube inputs.
+
+    The length scale is picked from :attr:`LENGTH_SCALES` by marginal
+    likelihood; targets are standardised.
+    """
+
+    LENGTH_SCALES = (0.1, 0.2, 0.4, 0.8, 1.6)
+    NOISE = 1e-4
+
+    @staticmethod
+    def _kernel(A, B, length):
+        d2 = ((A[:, None, :] - B[None, :, :]) ** 2).sum(axis=2)
+        return np.exp(-0.5 * d2 / length ** 2)
+
+    def fit(self, X, y):
+        y = np.asarray(y, float)
+        self.X, self.mean, self.scale = X, y.mean(), y.std() or 1.0
+        t = (y - self.mean) / self.scale
+        best = -np.inf
+        for length in self.LENGTH_SCALES:
+            K = self._kernel(X, X, length) + self.NOISE * np.eye(len(X))
+            L = np.linalg.cholesky(K)
+            alpha = np.linalg.solve(L.T, np.linalg.solve(L, t))
+            likelihood = -0.5 * t @ alpha - np.log(np.diag(L)).sum()
+            if likelihood > best:
+                best, self.length, self.L, self.alpha = likelihood, length, L, alpha
+        return self
+
+    def predict(self, X):
+        """Mean and standard deviation at the rows of ``X``."""
+        Ks = self._kernel(X, self.X, self.length)
+        v = np.linalg.solve(self.L, Ks.T)
+        var = np.clip(1.0 - (v ** 2).sum(axis=0), 0.0, None)
+        return self.mean + self.scale * Ks @ self.alpha, self.scale * np.sqrt(var)
+
+
+def spread(X, taken, pool, count):
+    """Greedy maximin: pick ``count`` of ``pool`` far from ``taken`` and
+    from each other. Starts at the pool point nearest the centre when
+    nothing is taken yet.
+    """
+    taken, pool, picked = list(taken), list(pool), []
+    while pool and len(picked) < count:
+        if taken:
+            d = ((X[pool][:, None, :] - X[taken][None, :, :]) ** 2).sum(axis=2)
+            best = int(np.argmax(d.min(axis=1)))
+        else:
+            best = int(np.argmin(((X[pool] - 0.5) ** 2).sum(axis=1)))
+        picked.append(pool.pop(best))
+        taken.append(picked[-1])
+    return picked
+
+
+def minimised(values):
+    """Stack ``{objective: array}`` as an (n, k) matrix to minimise."""
+    return np.column_stack([values[name] if sense == 'min' else -values[name]
+                            for name, sense in OBJECTIVES])
+
+
+def next_batch(X, cheap, measured, surrogates, count, kappa=KAPPA):
+    """Indices of the next ``count`` candidates to build.
+
+    Args:
+        X: Unit-cube coordinates of every candidate.
+        cheap: :func:`cheap_objectives` of every candidate.
+        measured: ``{index: {objective: value}}`` of finished builds
+            (failed builds included, as None values, so they are not
+            proposed again).
+        surrogates: ``{objective: Surrogate}`` for BUILT_OBJECTIVES.
+        count: Batch size.
+        kappa: Optimism of the overhang prediction.
+
+    Returns:
+        list[int]: Unbuilt candidates from the optimistic Pareto front,
+        then from the following fronts, spread by :func:`spread`.
+    """
+    values = dict(cheap)
+    for name in BUILT_OBJECTIVES:
+        mean, std = surrogates[name].predict(X)
+        values[name] = mean - kappa * std
+        for i, row in measured.items():
+            values[name][i] = np.inf if row[name] is None else row[name]
+    F = minimised(values)
+    remaining = np.array([i not in measured for i in range(len(X))])
+    ranked = np.ones(len(X), bool)
+    picked = []
+    while len(picked) < count and (remaining & ranked).any():
+        front = np.zeros(len(X), bool)
+        front[ranked] = pareto_mask(F[ranked])
+        ranked &= ~front
+        pool = np.flatnonzero(front & remaining)
+        picked += spread(X, [*measured, *picked], pool, count - len(picked))
+    return picked
+
+
+def optimize(bounds, rounds=4, batch=4, initial=8, candidates=256, jobs=1,
+             cache_dir=CACHE_DIR, draft=False, kappa=KAPPA, seed=0):
+    """Search ``bounds`` for the segment's mass/overhang/pockets/tray front.
+
+    Builds ``initial + rounds * batch`` variants in total.
+
+    Args:
+        bounds: ``{parameter name: (low, high)}``.
+        rounds: Surrogate-guided batches after the initial design.
+        batch: Variants per guided batch (built in parallel).
+        initial: Space-filling variants built first.
+        candidates: Size of the Latin hypercube candidate pool.
+        jobs: Worker processes.
+        cache_dir: BREP cache directory, or None to always rebuild.
+        draft: Build the gross shape only.
+        kappa: Optimism of the overhang prediction.
+        seed: Candidate sampling seed.
+
+    Returns:
+        list[dict]: One row per build with its params, objectives, build
+        metrics, ``round`` and ``pareto`` (on the front of the built set).
+    """
+    variants, X = sample_candidates(bounds, candidates, seed)
+    if not variants:
+        raise ValueError("no feasible candidate inside the bounds")
+    cheap = cheap_objectives(variants, draft)
+    measured, rows = {}, []
+    picked = spread(X, [], range(len(variants)), initial)
+    for round_ in range(rounds + 1):
+        print(f"Round {round_}: building {len(picked)} variant(s)...")
+        for i, (built,) in zip(picked, build_all([variants[i] for i in picked],
+                                                 ('segment',), jobs, cache_dir,
+                                                 draft)):
+            measured[i] = {name: built.get(name) for name in BUILT_OBJECTIVES}
+            rows.append({**variants[i], **{n: cheap[n][i].item() for n in cheap},
+                         **built, 'round': round_, 'index': i})
+        ok = [i for i, m in measured.items() if None not in m.values()]
+        if round_ == rounds or not ok or len(measured) == len(variants):
+            break
+        surrogates = {name: Surrogate().fit(X[ok], [measured[i][name] for i in ok])
+                      for name in BUILT_OBJECTIVES}
+        picked = next_batch(X, cheap, measured, surrogates, batch, kappa)
+
+    valid = [row for row in rows if not row.get('error')]
+    front = pareto_mask(minimised({name: np.array([row[name] for row in valid])
+                                   for name, _ in OBJECTIVES})) if valid else []
+    for row, on_front in zip(valid, front):
+        row['pareto'] = bool(on_front)
+    return rows
+
+
+COLUMNS = ('mass', 'overhang_area', 'pockets', 'tray_capacity', 'volume',
+           'build_time', 'watertight', 'round', 'pareto', 'error')
+
+
+def print_front(rows, names):
+    front = sorted((r for r in rows if r.get('pareto')), key=lambda r: r['mass'])
+    print(f"\nPareto front: {len(front)} of {len(rows)} build(s)")
+    header = [*names, 'mass g', 'overhang mm²', 'pockets', 'tray mL']
+    widths = [max(10, len(h)) for h in header]
+    print('  '.join(f"{h:>{w}}" for h, w in zip(header, widths)))
+    for row in front:
+        cells = [row[n] for n in names] + [row['mass'], row['overhang_area'],
+                                           row['pockets'], row['tray_capacity']]
+        print('  '.join(f"{c:>{w}.4g}" for c, w in zip(cells, widths)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--param', action='append', required=True,
+                        metavar='NAME=LOW:HIGH', type=parse_bounds,
+                        help="bounds of a primary parameter (repeatable)")
+    parser.add_argument('--rounds', type=int, default=4,
+                        help="surrogate-guided batches (default: 4)")
+    parser.add_argument('--batch', type=int, default=4,
+                        help="variants per guided batch (default: 4)")
+    parser.add_argument('--initial', type=int, default=8,
+                        help="space-filling variants built first (default: 8)")
+    parser.add_argument('--candidates', type=int, default=256,
+                        help="candidate pool size (default: 256)")
+    parser.add_argument('--kappa', type=float, default=KAPPA,
+                        help=f"optimism of the overhang prediction (default: {KAPPA})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore and do not fill exports/cache/")
+    parser.add_argument('--draft', action='store_true',
+                        help="build the gross shape only")
+    parser.add_argument('--out', help="CSV path (default: exports/sweeps/"
+                                      "optimize-<timestamp>.csv)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    bounds = dict(args.param)
+    t0 = time.time()
+    rows = optimize(bounds, args.rounds, args.batch, args.initial, args.candidates,
+                    args.jobs, None if args.no_cache else CACHE_DIR, args.draft,
+                    args.kappa, args.seed)
+    print_front(rows, list(bounds))
+    out = args.out or os.path.join(
+        SWEEP_DIR, time.strftime('optimize-%Y%m%d-%H%M%S.csv'))
+    write_csv(rows, out, list(bounds), COLUMNS)
+    print(f"\n{len(rows)} build(s) in {time.time() - t0:.1f}s -> {out}")
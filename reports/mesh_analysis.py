@@ -1,17 +1,44 @@
 #!/usr/bin/env python3
 """Analyze STL mesh metrics using trimesh."""
-import trimesh
 import os
+import sys
 
-stl_dir = '/home/tmr/src/learn/golden-tower/exports/stl'
-for f in sorted(os.listdir(stl_dir)):
-    if f.endswith('.stl'):
-        m = trimesh.load(os.path.join(stl_dir, f))
-        ext = m.bounding_box.extents
-        print(f"{f}:")
-        print(f"  watertight={m.is_watertight}")
-        print(f"  volume={m.volume:.0f} mm3")
-        print(f"  extents=({ext[0]:.1f}, {ext[1]:.1f}, {ext[2]:.1f}) mm")
-        print(f"  faces={len(m.faces)}")
-        print(f"  vertices={len(m.vertices)}")
-        print()
+STL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'exports', 'stl')
+
+
+def mesh_stats(path):
+    """Watertightness, volume (mm³), extents (mm) and size of one STL."""
+    import trimesh
+    m = trimesh.load(path)
+    return {
+        'watertight': bool(m.is_watertight),
+        'winding_consistent': bool(m.is_winding_consistent),
+        'volume': float(m.volume),
+        'extents': [float(e) for e in m.bounding_box.extents],
+        'faces': len(m.faces),
+        'vertices': len(m.vertices),
+    }
+
+
+def format_stats(name, s):
+    """Report lines of one :func:`mesh_stats` result."""
+    ext = s['extents']
+    return [
+        f"{name}:",
+        f"  watertight={s['watertight']}",
+        f"  volume={s['volume']:.0f} mm3",
+        f"  extents=({ext[0]:.1f}, {ext[1]:.1f}, {ext[2]:.1f}) mm",
+        f"  faces={s['faces']}",
+        f"  vertices={s['vertices']}",
+    ]
+
+
+def main(stl_dir=STL_DIR):
+    for f in sorted(os.listdir(stl_dir)):
+        if f.endswith('.stl'):
+            print('\n'.join(format_stats(f, mesh_stats(os.path.join(stl_dir, f)))))
+            print()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
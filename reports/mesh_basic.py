@@ -1,16 +1,29 @@
 #!/usr/bin/env python3
 """Minimal STL mesh analysis."""
-import struct, os
+import struct, os, sys
 
-stl_dir = '/home/tmr/src/learn/golden-tower/exports/stl'
-for f in sorted(os.listdir(stl_dir)):
-    if not f.endswith('.stl'):
-        continue
-    path = os.path.join(stl_dir, f)
+STL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'exports', 'stl')
+
+
+def header_stats(path):
+    """Face count and size check of a binary STL, from its header alone."""
     size = os.path.getsize(path)
     with open(path, 'rb') as fh:
         header = fh.read(80)
         n_faces = struct.unpack('<I', fh.read(4))[0]
-    n_verts = n_faces * 3
     expected_size = 84 + 50 * n_faces
-    print(f"{f}: faces={n_faces}, vertices~={n_verts}, size={size}B, expected={expected_size}B, match={size==expected_size}")
+    return {'faces': n_faces, 'vertices': n_faces * 3, 'size': size,
+            'expected_size': expected_size, 'size_match': size == expected_size}
+
+
+def main(stl_dir=STL_DIR):
+    for f in sorted(os.listdir(stl_dir)):
+        if not f.endswith('.stl'):
+            continue
+        s = header_stats(os.path.join(stl_dir, f))
+        print(f"{f}: faces={s['faces']}, vertices~={s['vertices']}, size={s['size']}B, "
+              f"expected={s['expected_size']}B, match={s['size_match']}")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
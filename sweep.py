@@ -0,0 +1,437 @@
+"""
+Parameter Sweep — Golden Tower
+==============================
+Builds every combination of a set of parameter ranges and tabulates
+the results. Combinations are screened before any CAD runs:
+
+1. every rule in components/constraints.py (the printability tests and
+   the tower_params asserts) must hold, and
+2. the analytic estimator (components/estimator.py) supplies volume and
+   mass for each survivor, milliseconds per variant.
+
+Survivors are built in a process pool, each from its own
+:class:`~tower_config.TowerConfig`. Finished Parts go to the BREP cache
+(build_cache.py), which keys them by parameter values: re-running an
+interrupted sweep only builds what is missing. Rows reach the CSV as
+each variant finishes, and a variant whose worker dies (an OCC crash,
+the OOM killer) gets an error row while the rest of the sweep goes on.
+
+Per variant and component the table records volume, build time,
+watertightness of the tessellated mesh and overhang area (downward faces
+steeper than MAX_OVERHANG_ANGLE from vertical, excluding the build plate
+contact), next to the analytic estimates. It is printed and written as
+CSV to exports/sweeps/.
+
+Usage:
+    python sweep.py --param POCKET_TILT_ANGLE=15:25:3 --jobs 4
+    python sweep.py --param SEGMENT_OUTER_DIAMETER=150,160,170 \\
+                    --param NODES_PER_SEGMENT=3,4 --screen-only
+    python sweep.py --param POCKET_RADIAL_OFFSET=45:55:5 --components segment top_cap
+"""
+
+import argparse
+import csv
+import itertools
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PROJECT_ROOT)
+
+from build_cache import CACHE_DIR
+from components.constraints import describe, evaluate
+from components.estimator import estimate
+from mesh_arrays import check_arrays, corner_coords, drop_degenerate, tessellate
+from tower_config import PRIMARY_NAMES, TowerConfig
+
+SWEEP_DIR = os.path.join(PROJECT_ROOT, 'exports', 'sweeps')
+
+# (module, function) of each B-rep builder; imported in the worker only
+BUILDERS = {
+    'segment': ('components.segment_build123d', 'build_segment'),
+    'bottom_segment': ('components.bottom_segment_build123d', 'build_bottom_segment'),
+    'top_cap': ('components.top_cap_build123d', 'build_top_cap'),
+}
+
+# Tessellation for the mesh checks (mesh_arrays.tessellate): linear
+# deflection relative to each edge's size, not mm, and angular (rad)
+MESH_TOLERANCE = 0.1
+MESH_ANGULAR_TOLERANCE = 0.3
+
+# Faces within this height of the lowest point rest on the build plate
+BED_TOLERANCE = 1e-3
+
+
+def parse_range(spec):
+    """Parse ``NAME=start:stop:count`` or ``NAME=v1,v2,...``.
+
+    ``start:stop:count`` gives ``count`` evenly spaced values including
+    both ends.
+
+    Returns:
+        tuple: ``(name, values)`` with float values.
+
+    Raises:
+        ValueError: malformed spec.
+    """
+    name, sep, values = spec.partition('=')
+    name = name.strip()
+    if not sep or not name or not values:
+        raise ValueError(f"expected NAME=start:stop:count or NAME=v1,v2: {spec!r}")
+    if ':' not in values:
+        return name, [float(v) for v in values.split(',')]
+    start, stop, count = values.split(':')
+    start, stop, count = float(start), float(stop), int(count)
+    if count < 1:
+        raise ValueError(f"count must be >= 1: {spec!r}")
+    step = (stop - start) / (count - 1) if count > 1 else 0.0
+    return name, [start + i * step for i in range(count)]
+
+
+def expand(ranges):
+    """Cartesian product of ``{name: values}`` as a list of override dicts.
+
+    Values take the type of the parameter's default, so the BREP cache
+    keys of a swept default match those of a normal build.
+
+    Raises:
+        KeyError: a name is not a primary parameter. Derived values
+            (``BODY_INNER_RADIUS``, ...) follow from their inputs.
+        ValueError: a non-integral value for an integer parameter.
+    """
+    unknown = sorted(set(ranges) - set(PRIMARY_NAMES))
+    if unknown:
+        raise KeyError(f"not primary parameter(s): {', '.join(unknown)}")
+    defaults = TowerConfig().primary()
+    typed = {}
+    for name, values in ranges.items():
+        if isinstance(defaults[name], int):
+            if any(v != round(v) for v in values):
+                raise ValueError(f"{name} takes integers: {values}")
+            typed[name] = [int(round(v)) for v in values]
+        else:
+            typed[name] = [float(v) for v in values]
+    return [dict(zip(typed, combo)) for combo in itertools.product(*typed.values())]
+
+
+def screen(variants, components=('segment',), draft=False):
+    """Split ``variants`` into buildable and rejected ones, no CAD involved.
+
+    The constraints are evaluated for all variants in one vectorized call;
+    only survivors are estimated.
+
+    Returns:
+        tuple: ``(survivors, rejected)``. Each survivor is
+        ``{'params': overrides, 'estimates': {component: estimate dict}}``,
+        each rejected entry ``{'params': overrides, 'violations': [str]}``.
+    """
+    if not variants:
+        return [], []
+    columns = {name: np.array([v[name] for v in variants]) for name in variants[0]}
+    result = evaluate(columns)
+    survivors, rejected = [], []
+    for i, overrides in enumerate(variants):
+        if result['feasible'][i]:
+            p = TowerConfig(**overrides)
+            survivors.append({'params': overrides, 'estimates': {
+                name: estimate(name, p, draft) for name in components}})
+        else:
+            failed = describe({n: m[i] for n, m in result['margins'].items()})
+            rejected.append({'params': overrides, 'violations': failed})
+    return survivors, rejected
+
+
+def overhang_metrics(vertices, faces, max_angle):
+    """Area of downward faces steeper than ``max_angle`` from vertical.
+
+    Faces on the lowest plane of the mesh sit on the build plate and do
+    not count.
+
+    Args:
+        vertices, faces: Indexed triangle mesh (mesh_arrays.py).
+
+    Returns:
+        dict: ``overhang_area`` (mm²) and ``overhang_fraction`` of the
+        total surface area.
+    """
+    (ax, bx, cx), (ay, by, cy), (az, bz, cz) = corner_coords(vertices, faces)
+    # Face normals scaled by twice the face area
+    nx = (by - ay) * (cz - az) - (bz - az) * (cy - ay)
+    ny = (bz - az) * (cx - ax) - (bx - ax) * (cz - az)
+    nz = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    double_area = np.sqrt(nx * nx + ny * ny + nz * nz)
+    bed = min(az.min(), bz.min(), cz.min())
+    on_bed = np.maximum(np.maximum(az, bz), cz) - bed < BED_TOLERANCE
+    steep = -nz > math.sin(math.radians(max_angle)) * double_area
+    area = float(double_area[steep & ~on_bed].sum()) / 2
+    total = float(double_area.sum()) / 2
+    return {'overhang_area': area, 'overhang_fraction': area / total}
+
+
+def build_variant(overrides, components=('segment',), cache_dir=CACHE_DIR,
+                  draft=False):
+    """Build and measure one variant.
+
+    A failing build is reported in the row's ``error`` field instead of
+    raising, so one bad variant does not end an overnight sweep.
+
+    Returns:
+        list[dict]: One row per component with ``volume``, ``build_time``,
+        ``cache_hit``, ``watertight``, ``overhang_area`` and
+        ``overhang_fraction``.
+    """
+    from build_cache import BuildCache
+    from components import feature_tree
+
+    config = TowerConfig(**overrides)
+
+    cache = BuildCache(cache_dir or CACHE_DIR, enabled=cache_dir is not None)
+    rows = []
+    # Intermediate features of a one-off variant are not worth persisting
+    with feature_tree.feature_store(None):
+        for name in components:
+            row = {'component': name}
+            t0 = time.time()
+            try:
+                part, row['cache_hit'] = cache.get_or_build(
+                    name, *BUILDERS[name], config=config, batched=False,
+                    draft=draft)
+                row['build_time'] = time.time() - t0
+                vertices, faces = tessellate(part, MESH_TOLERANCE,
+                                             MESH_ANGULAR_TOLERANCE)
+                # Drop the collapsed triangles OCC leaves at sphere poles, as
+                # build_tower_build123d.stl_mesh does for the exports
+                faces, _ = drop_degenerate(faces)
+                row['volume'] = part.volume
+                row['watertight'] = check_arrays(vertices, faces)['watertight']
+                row.update(overhang_metrics(vertices, faces, config.MAX_OVERHANG_ANGLE))
+            except Exception as exc:
+                row['build_time'] = time.time() - t0
+                row['error'] = f"{type(exc).__name__}: {exc}"
+            rows.append(row)
+    return rows
+
+
+def _error_rows(components, message):
+    return [{'component': name, 'error': message} for name in components]
+
+
+_STARTED = None  # worker side: queue of the variant indices taken up
+
+
+def _init_worker(started):
+    global _STARTED
+    _STARTED = started
+
+
+def _build_indexed(index, build, *args):
+    _STARTED.put(index)
+    return build(*args)
+
+
+def _pool_round(indices, workers, variants, build, args, finish):
+    """Build ``indices`` in one pool; return ``(lost, started)``.
+
+    ``lost`` are the variants whose results went down with a broken pool,
+    ``started`` the indices a worker had taken up.
+    """
+    context = multiprocessing.get_context('spawn')
+    started = context.SimpleQueue()
+    lost = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(started,)) as pool:
+        futures = {pool.submit(_build_indexed, i, build, variants[i], *args): i
+                   for i in indices}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                rows = future.result()
+            except BrokenProcessPool:
+                lost.append(i)
+                continue
+            except Exception as exc:  # e.g. unpicklable result
+                rows = _error_rows(args[0], f"{type(exc).__name__}: {exc}")
+            finish(i, rows)
+    taken = set()
+    while not started.empty():
+        taken.add(started.get())
+    return lost, taken
+
+
+def build_all(variants, components=('segment',), jobs=1, cache_dir=CACHE_DIR,
+              draft=False, on_result=None, build=build_variant):
+    """:func:`build_variant` every override dict in a process pool.
+
+    A worker that dies takes the pool down with it. The variants that
+    had not started are built in a fresh pool; those that were running
+    are retried alone, one fresh single-worker pool each, and a variant
+    that kills that worker too gets an error row for every component.
+
+    Args:
+        on_result: Called as ``on_result(index, rows)`` as each variant
+            finishes, in completion order.
+        build: Picklable function run per variant with the arguments of
+            :func:`build_variant`.
+
+    Returns:
+        list[list[dict]]: The rows of each variant, in input order.
+    """
+    results = [None] * len(variants)
+
+    def finish(i, rows):
+        results[i] = rows
+        if on_result is not None:
+            on_result(i, rows)
+
+    args = (components, cache_dir, draft)
+    pending, suspects = list(range(len(variants))), []
+    while pending or suspects:
+        alone = not pending
+        batch = [suspects.pop(0)] if alone else pending
+        lost, started = _pool_round(batch, 1 if alone else max(1, jobs),
+                                    variants, build, args, finish)
+        if alone:
+            for i in lost:
+                finish(i, _error_rows(components, "BrokenProcessPool: the "
+                                      "worker building this variant died"))
+            continue
+        # A pool that broke before any variant started isolates them all
+        crashed = [i for i in lost if i in started] or lost
+        suspects += crashed
+        pending = [i for i in lost if i not in crashed]
+    return results
+
+
+def run_sweep(ranges, components=('segment',), jobs=1, cache_dir=CACHE_DIR,
+              draft=False, screen_only=False, csv_path=None):
+    """Screen every combination of ``ranges`` and build the survivors.
+
+    Args:
+        ranges: ``{parameter name: [values]}``.
+        components: Components to estimate and build per variant.
+        jobs: Worker processes.
+        cache_dir: BREP cache directory, or None to always rebuild.
+        draft: Build the gross shape only (see build_tower_build123d.py).
+        screen_only: Stop after the analytic screen.
+        csv_path: CSV file that each variant's rows are appended to as
+            it finishes, so an interrupted sweep keeps what it built;
+            rewritten in variant order at the end.
+
+    Returns:
+        tuple: ``(rows, rejected)``. One row per (variant, component) with
+        the variant's params, ``est_volume``/``est_mass`` and, unless
+        ``screen_only``, the metrics of :func:`build_variant`.
+    """
+    survivors, rejected = screen(expand(ranges), components, draft)
+
+    def table_rows(variant, variant_rows):
+        return [{**variant['params'], **row,
+                 'est_volume': variant['estimates'][row['component']]['volume'],
+                 'est_mass': variant['estimates'][row['component']]['mass']}
+                for row in variant_rows]
+
+    if screen_only:
+        built = [[{'component': name} for name in components] for _ in survivors]
+    else:
+        if csv_path is not None:
+            write_csv([], csv_path, list(ranges))
+
+        def on_result(i, variant_rows):
+            if csv_path is not None:
+                append_csv(table_rows(survivors[i], variant_rows), csv_path,
+                           list(ranges))
+        built = build_all([v['params'] for v in survivors], components, jobs,
+                          cache_dir, draft, on_result)
+
+    rows = [row for variant, variant_rows in zip(survivors, built)
+            for row in table_rows(variant, variant_rows)]
+    if csv_path is not None:
+        write_csv(rows, csv_path, list(ranges))
+    return rows, rejected
+
+
+COLUMNS = ('component', 'volume', 'est_volume', 'est_mass', 'build_time',
+           'cache_hit', 'watertight', 'overhang_area', 'overhang_fraction', 'error')
+
+
+def write_csv(rows, path, names, columns=COLUMNS):
+    """Write ``columns`` of ``rows`` with the swept ``names`` leading."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', newline='') as fh:
+        writer = csv.DictWriter(fh, fieldnames=[*names, *columns],
+                                extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def append_csv(rows, path, names, columns=COLUMNS):
+    """Append ``rows`` to a CSV that :func:`write_csv` started."""
+    with open(path, 'a', newline='') as fh:
+        writer = csv.DictWriter(fh, fieldnames=[*names, *columns],
+                                extrasaction='ignore')
+        writer.writerows(rows)
+
+
+def _cell(value):
+    if isinstance(value, float):
+        return f"{value:.4g}" if abs(value) < 1 else f"{value:.1f}"
+    return '' if value is None else str(value)
+
+
+def print_table(rows, rejected, names):
+    columns = [*names, *COLUMNS[:-1]]
+    table = [[_cell(row.get(c)) for c in columns] for row in rows]
+    widths = [max([len(c), *(len(r[i]) for r in table)])
+              for i, c in enumerate(columns)]
+    print('  '.join(c.rjust(w) for c, w in zip(columns, widths)))
+    for row, cells in zip(rows, table):
+        line = '  '.join(s.rjust(w) for s, w in zip(cells, widths))
+        print(line + (f"  ERROR {row['error']}" if row.get('error') else ''))
+    if rejected:
+        print(f"\nRejected {len(rejected)} variant(s) before building:")
+        for entry in rejected:
+            params = ', '.join(f"{k}={v}" for k, v in entry['params'].items())
+            print(f"  {params}")
+            for reason in entry['violations']:
+                print(f"    {reason}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--param', action='append', required=True,
+                        metavar='NAME=RANGE', type=parse_range,
+                        help="start:stop:count or v1,v2,... (repeatable)")
+    parser.add_argument('--components', nargs='+', choices=sorted(BUILDERS),
+                        default=['segment'])
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore and do not fill exports/cache/")
+    parser.add_argument('--draft', action='store_true',
+                        help="build the gross shape only")
+    parser.add_argument('--screen-only', action='store_true',
+                        help="stop after the analytic screen")
+    parser.add_argument('--out', help="CSV path (default: exports/sweeps/"
+                                      "sweep-<timestamp>.csv)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    ranges = dict(args.param)
+    t0 = time.time()
+    out = args.out or os.path.join(
+        SWEEP_DIR, time.strftime('sweep-%Y%m%d-%H%M%S.csv'))
+    rows, rejected = run_sweep(ranges, args.components, args.jobs,
+                               None if args.no_cache else CACHE_DIR,
+                               args.draft, args.screen_only, out)
+    print_table(rows, rejected, list(ranges))
+    print(f"\n{len(rows)} row(s) in {time.time() - t0:.1f}s -> {out}")
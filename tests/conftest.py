@@ -1,5 +1,27 @@
-"""Ensure project root is on sys.path so tests can import tower_params."""
+"""Ensure project root is on sys.path so tests can import tower_params.
+
+Tests that need build123d carry the ``cad`` marker and import it only
+when they run, so ``pytest -m "not cad"`` never loads OCC.
+"""
+import importlib.util
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'cad: needs build123d/OCP; deselect with -m "not cad"')
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip ``cad`` tests when build123d is not installed."""
+    if importlib.util.find_spec('build123d') is not None:
+        return
+    skip = pytest.mark.skip(reason="build123d not installed")
+    for item in items:
+        if 'cad' in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,145 @@
+"""Tests for the instanced tower assembly export."""
+
+import json
+import struct
+import xml.etree.ElementTree as ET
+import zipfile
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+from assembly import (
+    PARTS, export_assembly, flatten, load_meshes, placements, read_config, write_3mf,
+    write_glb,
+)
+from mesh_arrays import check_arrays, write_stl
+from test_mesh_arrays import cube
+from tower_config import TowerConfig
+from tower_params import INTERLOCK_HEIGHT, INTERLOCK_ROTATION_DEG, SEGMENT_HEIGHT
+
+NS = {'m': 'http://schemas.microsoft.com/3dmanufacturing/core/2015/02'}
+
+
+@pytest.fixture
+def stl_dir(tmp_path):
+    """Exported STLs of the three parts, each a 10 mm cube."""
+    stl_dir = tmp_path / 'stl'
+    stl_dir.mkdir()
+    for name in PARTS:
+        write_stl(stl_dir / f'{name}.stl', *cube())
+    return stl_dir
+
+
+def _glb_document(path):
+    data = path.read_bytes()
+    magic, version, length = struct.unpack_from('<4sII', data)
+    assert (magic, version, length) == (b'glTF', 2, len(data))
+    size, kind = struct.unpack_from('<I4s', data, 12)
+    assert kind == b'JSON' and size % 4 == 0
+    return json.loads(data[20:20 + size])
+
+
+class TestPlacements:
+
+    def test_stack(self):
+        rows = placements(8)
+        assert [part for _, part, _, _ in rows] == (
+            ['bottom_segment'] + ['segment'] * 7 + ['top_cap'])
+        _, _, angle, z = rows[3]
+        assert (angle, z) == pytest.approx((3 * INTERLOCK_ROTATION_DEG, 3 * SEGMENT_HEIGHT))
+        assert rows[-1][3] == pytest.approx(8 * SEGMENT_HEIGHT + INTERLOCK_HEIGHT)
+        with pytest.raises(ValueError, match='at least 1 segment'):
+            placements(0)
+
+    def test_config_sets_the_stack(self):
+        cfg = TowerConfig(SEGMENT_HEIGHT=150.0, NODES_PER_SEGMENT=5,
+                          TARGET_SEGMENT_COUNT=6)
+        rows = placements(config=cfg)
+        assert len(rows) == 7
+        _, _, angle, z = rows[2]
+        assert (angle, z) == pytest.approx((2 * cfg.INTERLOCK_ROTATION_DEG, 300.0))
+        assert angle != pytest.approx(2 * INTERLOCK_ROTATION_DEG)
+
+    def test_config_read_from_the_exports(self, tmp_path):
+        from build_tower_build123d import write_variant_config
+        assert read_config(str(tmp_path)) == TowerConfig()
+        cfg = TowerConfig(SEGMENT_HEIGHT=150.0, TARGET_SEGMENT_COUNT=6)
+        write_variant_config(cfg, str(tmp_path))
+        assert read_config(str(tmp_path)) == cfg
+
+    def test_flatten_places_every_copy(self, stl_dir):
+        vertices, faces = flatten(load_meshes(stl_dir), placements(4))
+        assert len(faces) == 5 * 12
+        assert vertices[:, 2].max() == pytest.approx(
+            4 * SEGMENT_HEIGHT + INTERLOCK_HEIGHT + 10.0)
+        row = check_arrays(vertices, faces)
+        assert row['watertight'] and row['volume'] == pytest.approx(5 * 1000.0)
+
+
+class TestInstancing:
+    """Each part is stored once, so files barely grow with the segment count."""
+
+    def test_3mf_components(self, stl_dir, tmp_path):
+        meshes = load_meshes(stl_dir)
+        sizes = []
+        for n in (8, 24):
+            path = tmp_path / f'tower{n}.3mf'
+            write_3mf(path, meshes, placements(n))
+            sizes.append(path.stat().st_size)
+        with zipfile.ZipFile(path) as package:
+            model = ET.fromstring(package.read('3D/3dmodel.model'))
+        objects = model.findall('m:resources/m:object', NS)
+        assert [o.get('name') for o in objects] == [*PARTS, 'tower']
+        assert len(objects[-1].findall('m:components/m:component', NS)) == 25
+        assert all(len(o.findall('m:mesh/m:triangles/m:triangle', NS)) == 12
+                   for o in objects[:-1])
+        assert sizes[1] - sizes[0] < 16 * 100
+
+    def test_glb_nodes(self, stl_dir, tmp_path):
+        meshes = load_meshes(stl_dir)
+        sizes = []
+        for n in (8, 24):
+            path = tmp_path / f'tower{n}.glb'
+            write_glb(path, meshes, placements(n))
+            sizes.append(path.stat().st_size)
+        document = _glb_document(path)
+        assert len(document['meshes']) == 3 and len(document['nodes']) == 26
+        assert document['nodes'][0]['children'] == list(range(1, 26))
+        matrix = np.array(document['nodes'][-1]['matrix']).reshape(4, 4).T
+        assert matrix[2, 3] == pytest.approx(24 * SEGMENT_HEIGHT + INTERLOCK_HEIGHT)
+        assert sizes[1] - sizes[0] < 16 * 300
+
+    def test_glb_matches_flattened(self, stl_dir, tmp_path):
+        trimesh = pytest.importorskip('trimesh')
+        rows = export_assembly(6, ['glb'], flat=True, stl_dir=stl_dir,
+                               out_dir=tmp_path / 'assembly')
+        assert [row['format'] for row in rows] == ['glb', 'stl']
+        assert rows[0]['triangles'] == 3 * 12 and rows[1]['triangles'] == 7 * 12
+        scene = trimesh.load(rows[0]['file'])
+        flat = trimesh.load(rows[1]['file'])
+        assert scene.to_geometry().volume * 1e9 == pytest.approx(flat.volume)
+
+    def test_flat_only_on_request(self, stl_dir, tmp_path):
+        out = tmp_path / 'assembly'
+        export_assembly(4, ['3mf'], stl_dir=stl_dir, out_dir=out)
+        assert sorted(p.name for p in out.iterdir()) == ['tower.3mf']
+
+
+@pytest.mark.cad
+def test_step_assembly_references_parts(tmp_path):
+    from build123d import Box, export_step, import_step
+    from assembly import write_step
+    step_dir = tmp_path / 'step'
+    step_dir.mkdir()
+    for name in PARTS:
+        export_step(Box(10, 10, 10), str(step_dir / f'{name}.step'))
+    sizes = []
+    for n in (4, 16):
+        path = tmp_path / f'tower{n}.step'
+        write_step(str(path), placements(n), str(step_dir))
+        sizes.append(path.stat().st_size)
+    assert sizes[1] - sizes[0] < 12 * 1500
+    tower = import_step(str(path))
+    assert len(tower.solids()) == 17
+    assert tower.volume == pytest.approx(17 * 1000.0)
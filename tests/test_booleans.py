@@ -0,0 +1,72 @@
+"""Tests for the boolean drivers (requires build123d)."""
+
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+pytestmark = pytest.mark.cad
+
+
+@pytest.fixture(autouse=True)
+def memory_only_memo(monkeypatch):
+    """Keep feature results out of exports/cache and start each test cold."""
+    from components import feature_tree
+    monkeypatch.setattr(feature_tree, 'STORE_DIR', None)
+    feature_tree.clear_memo()
+
+
+@pytest.fixture(scope="module")
+def top_cap():
+    from components import top_cap_build123d
+    return top_cap_build123d
+
+
+class TestBatchedBooleans:
+    """Batched and sequential boolean modes must build the same solid."""
+
+    def test_batched_matches_sequential(self, top_cap):
+        """One multi-operand fuse/cut gives the same volume as the chain."""
+        sequential = top_cap.build_top_cap(batched=False)
+        batched = top_cap.build_top_cap(batched=True)
+        assert batched.is_valid
+        assert abs(batched.volume - sequential.volume) < 1e-3 * sequential.volume
+
+    def test_feature_times_recorded(self, top_cap):
+        """Every feature reports a wall-clock duration."""
+        from components.booleans import PHASE_TIMES
+        top_cap.build_top_cap(batched=False)
+        assert set(PHASE_TIMES['top_cap']) == {f.name for f in top_cap.TOP_CAP_FEATURES}
+        assert all(dt >= 0 for dt in PHASE_TIMES['top_cap'].values())
+
+    def test_batched_runs_one_boolean_per_phase(self, top_cap):
+        """Batched: one fuse of all additive tools, one cut of the rest."""
+        from components.booleans import PHASE_TIMES
+        from components.feature_tree import FEATURE_LOG
+        top_cap.build_top_cap(batched=True)
+        assert set(PHASE_TIMES['top_cap']) == {'additive', 'subtractive'}
+        assert FEATURE_LOG['top_cap'] == [('additive', 'recomputed'),
+                                          ('subtractive', 'recomputed')]
+        top_cap.build_top_cap(batched=True)
+        assert FEATURE_LOG['top_cap'] == [('additive', 'reused'),
+                                          ('subtractive', 'reused')]
+
+    def test_bottom_segment_phases(self):
+        """Fuse, cut, fuse, cut chains batch into four phases."""
+        from components.bottom_segment_build123d import BOTTOM_SEGMENT_FEATURES
+        from components.feature_tree import _steps
+        steps = _steps(BOTTOM_SEGMENT_FEATURES,
+                       [str(i) for i in range(len(BOTTOM_SEGMENT_FEATURES))], True)
+        assert [name for name, *_ in steps] == [
+            'additive', 'subtractive', 'additive 2', 'subtractive 2']
+        assert steps[-1][3] == str(len(BOTTOM_SEGMENT_FEATURES) - 1)
+
+    def test_parallel_mode_restored(self, top_cap):
+        """OCC's process-wide parallel flag is only on during the chain."""
+        from OCP.BOPAlgo import BOPAlgo_Options
+        before = BOPAlgo_Options.GetParallelMode_s()
+        BOPAlgo_Options.SetParallelMode_s(False)
+        try:
+            top_cap.build_top_cap(batched=True)
+            assert BOPAlgo_Options.GetParallelMode_s() is False
+        finally:
+            BOPAlgo_Options.SetParallelMode_s(before)
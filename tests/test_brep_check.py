@@ -0,0 +1,82 @@
+"""Tests for the B-rep validity gate (requires build123d)."""
+
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+pytestmark = pytest.mark.cad
+
+
+@pytest.fixture
+def feature_tree(monkeypatch):
+    from components import feature_tree
+    monkeypatch.setattr(feature_tree, 'STORE_DIR', None)
+    feature_tree.clear_memo()
+    return feature_tree
+
+
+def _block(cfg):
+    from build123d import Box
+    return [Box(20, 10, 10)]
+
+
+def _notch(cfg):
+    from build123d import Box, Pos
+    return [Pos(0, 0, 5) * Box(2, 20, 4)]
+
+
+def _split(cfg):
+    from build123d import Box
+    return [Box(2, 20, 20)]
+
+
+class TestCheckPart:
+
+    def test_good_part(self):
+        from build123d import Box
+        from components.brep_check import check_part
+        report = check_part(Box(10, 10, 10))
+        assert report['problems'] == [] and report['valid']
+        assert report['solids'] == 1 and report['open_shells'] == 0
+        assert report['volume'] == pytest.approx(1000.0)
+        assert report['min_edge'] == pytest.approx(10.0)
+
+    def test_fragments_and_slivers(self):
+        from build123d import Box, Part, Pos
+        from components.brep_check import check_part
+        apart = Part([Box(1, 1, 1).solid(), (Pos(5, 0, 0) * Box(1, 1, 1)).solid()])
+        assert check_part(apart)['problems'] == ["2 solids, expected 1"]
+        thin = check_part(Box(10, 10, 0.5), sliver_width=1.0)
+        assert thin['sliver_faces'] == 4 and thin['min_width'] == pytest.approx(0.5 * 20 / 21)
+
+
+class TestGate:
+
+    def test_names_the_breaking_step(self, feature_tree):
+        from components.brep_check import BRepCheckError
+        Feature = feature_tree.Feature
+        features = [Feature('block', 'fuse', _block), Feature('notch', 'cut', _notch),
+                    Feature('split', 'cut', _split)]
+        with pytest.raises(BRepCheckError, match="'split'.*2 solids") as exc:
+            feature_tree.build_features('demo', features)
+        assert exc.value.component == 'demo' and exc.value.feature == 'split'
+        assert feature_tree.BREP_LOG['demo']['solids'] == 2
+
+    def test_gate_can_be_disabled(self, feature_tree, monkeypatch):
+        monkeypatch.setattr(feature_tree, 'CHECK_BREP', False)
+        part = feature_tree.build_features(
+            'demo', [feature_tree.Feature('block', 'fuse', _block),
+                     feature_tree.Feature('split', 'cut', _split)])
+        assert len(part.solids()) == 2
+
+    @pytest.mark.parametrize("builder", [
+        'components.segment_build123d.build_segment',
+        'components.top_cap_build123d.build_top_cap',
+        'components.bottom_segment_build123d.build_bottom_segment',
+    ])
+    def test_components_pass(self, feature_tree, builder):
+        import importlib
+        module, name = builder.rsplit('.', 1)
+        getattr(importlib.import_module(module), name)(draft=True)
+        component = name[len('build_'):]
+        assert feature_tree.BREP_LOG[component]['problems'] == []
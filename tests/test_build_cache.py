@@ -0,0 +1,44 @@
+"""Tests for build cache key derivation (no CAD kernel required)."""
+
+import sys
+sys.path.insert(0, '..')
+import tower_params
+from build_cache import cache_key, params_read, source_files
+
+BUILDERS = {
+    'segment': ('components.segment_build123d', 'build_segment'),
+    'top_cap': ('components.top_cap_build123d', 'build_top_cap'),
+    'bottom_segment': ('components.bottom_segment_build123d', 'build_bottom_segment'),
+}
+
+
+def _keys():
+    return {name: cache_key(*spec) for name, spec in BUILDERS.items()}
+
+
+class TestCacheKey:
+    """Verify that cache keys track exactly the inputs a builder reads."""
+
+    def test_keys_are_stable(self):
+        """Recomputing a key without changes must give the same digest."""
+        assert _keys() == _keys()
+
+    def test_keys_unique_per_builder(self):
+        """Every component gets its own cache entry."""
+        assert len(set(_keys().values())) == len(BUILDERS)
+
+    def test_cap_overhang_only_invalidates_top_cap(self, monkeypatch):
+        """Changing CAP_OVERHANG must only change the top cap key."""
+        before = _keys()
+        monkeypatch.setattr(tower_params, 'CAP_OVERHANG',
+                            tower_params.CAP_OVERHANG + 1.0)
+        after = _keys()
+        assert after['top_cap'] != before['top_cap']
+        assert after['segment'] == before['segment']
+        assert after['bottom_segment'] == before['bottom_segment']
+
+    def test_segment_reads_pocket_params(self):
+        """Params referenced by the segment builder are part of its key."""
+        used = params_read(source_files(BUILDERS['segment'][0]))
+        assert 'POCKET_TILT_ANGLE' in used
+        assert 'CAP_OVERHANG' not in used
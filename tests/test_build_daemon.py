@@ -0,0 +1,180 @@
+"""Tests for the warm-kernel build daemon."""
+
+import multiprocessing
+import os
+import threading
+import time
+import pytest
+import sys
+sys.path.insert(0, '..')
+import build_daemon
+from build_daemon import BuildDaemon, in_child, plan, request, snapshot, watched_files
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+# Held by a thread of the test process, like a lock in a handler thread
+_HELD = threading.Lock()
+
+
+def _take_held():
+    return _HELD.acquire(timeout=2)
+
+
+def _warm_box():
+    """Volume of a box built with whatever build123d the child inherited."""
+    from build123d import Box
+    return {'volume': Box(1, 2, 3).volume,
+            'kept': 'OCP' in sys.modules and 'build123d' in sys.modules}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """A daemon serving on a temporary socket; yields (daemon, socket path)."""
+    def start(warm=False, **kwargs):
+        if not warm:
+            monkeypatch.setattr(build_daemon, 'WARM_MODULES', ())
+        daemon = BuildDaemon(out_dir=str(tmp_path / 'out'),
+                             cache_dir=str(tmp_path / 'cache'), watch=False,
+                             **kwargs)
+        path = str(tmp_path / 'daemon.sock')
+        thread = threading.Thread(target=daemon.serve, args=(path,), daemon=True)
+        thread.start()
+        for _ in range(600):
+            if os.path.exists(path):
+                break
+            time.sleep(0.1)
+        started.append((daemon, thread))
+        return daemon, path
+
+    started = []
+    yield start
+    for daemon, thread in started:
+        daemon.stopping.set()
+        thread.join(timeout=10)
+
+
+class TestWatch:
+
+    def test_watches_params_and_builder_sources(self):
+        names = {os.path.relpath(p, build_daemon.PROJECT_ROOT) for p in watched_files()}
+        assert {'tower_params.py', 'tower_config.py',
+                os.path.join('components', 'dimensions.py'),
+                os.path.join('components', 'segment_build123d.py'),
+                os.path.join('components', 'top_cap_build123d.py')} <= names
+
+    def test_snapshot_sees_edits_and_deletions(self, tmp_path):
+        path = tmp_path / 'params.py'
+        path.write_text('A = 1\n')
+        before = snapshot([str(path)])
+        os.utime(path, ns=(0, before[str(path)] + 1_000_000))
+        assert snapshot([str(path)]) != before
+        path.unlink()
+        assert snapshot([str(path)]) == {str(path): None}
+
+
+@pytest.mark.cad
+class TestForget:
+    """Forked children re-import project modules but keep the warm kernel."""
+
+    @pytest.fixture
+    def nested_venv(self, monkeypatch):
+        """Project root one level above the interpreter prefix, as with
+        the README's ``venv/`` inside the checkout."""
+        import build_cache
+        pytest.importorskip('build123d')   # warm, as in the fork server
+        root = os.path.dirname(os.path.abspath(sys.prefix))
+        monkeypatch.setattr(build_cache, 'PROJECT_ROOT', root)
+        return root
+
+    def test_kernel_survives_the_purge(self, nested_venv):
+        # Forked from this process, so the child sees the patched root
+        context = multiprocessing.get_context('fork')
+        receiver, sender = context.Pipe(duplex=False)
+        child = context.Process(target=build_daemon._child_main,
+                                args=(sender, _warm_box, ()))
+        child.start()
+        sender.close()
+        result = receiver.recv()
+        child.join()
+        assert 'error' not in result, result
+        assert result['kept'] and result['volume'] == pytest.approx(6.0)
+
+    def test_library_code_is_not_project_code(self, nested_venv):
+        from build123d import export_step
+        from components.feature_tree import _is_project_function
+        assert not _is_project_function(export_step)
+
+
+class TestPlan:
+
+    def test_child_errors_are_returned(self):
+        assert in_child(_fail)['error'] == "ValueError: boom"
+
+    def test_children_do_not_inherit_held_locks(self):
+        """Children come from the single-threaded fork server, not from a
+        process whose other threads hold locks."""
+        release = threading.Event()
+        holder = threading.Thread(target=lambda: (_HELD.acquire(), release.wait(),
+                                                  _HELD.release()))
+        holder.start()
+        try:
+            assert in_child(_take_held) is True
+            assert in_child(os.getppid) != os.getpid()
+        finally:
+            release.set()
+            holder.join()
+
+    def test_only_the_overridden_component_changes_key(self, tmp_path):
+        out = str(tmp_path)
+        base = in_child(plan, ['top_cap', 'segment'], {}, False, False, out)
+        wide = in_child(plan, ['top_cap', 'segment'], {'CAP_OVERHANG': '12'},
+                        False, False, out)
+        assert wide['keys']['top_cap'] != base['keys']['top_cap']
+        assert wide['config'] != base['config'] and wide['out_dir'] == out
+
+    @pytest.mark.parametrize("components, overrides", [
+        (['spire'], {}),
+        (['top_cap'], {'BODY_INNER_RADIUS': '70'}),
+    ])
+    def test_bad_requests(self, tmp_path, components, overrides):
+        result = BuildDaemon(watch=False).run(
+            {'components': components, 'overrides': overrides, 'out': str(tmp_path)})
+        assert not result['ok'] and result['error']
+
+
+class TestServer:
+
+    def test_status_and_stop(self, server):
+        daemon, path = server()
+        status = request({'cmd': 'status'}, path, timeout=10)
+        assert status['ok'] and status['queued'] == 0 and status['busy'] is None
+        assert 'error' in request({'cmd': 'bogus'}, path, timeout=10)
+        assert request({'cmd': 'stop'}, path, timeout=10) == {'ok': True}
+        assert daemon.stopping.wait(5)
+
+    def test_second_server_refused(self, server, tmp_path):
+        _, path = server()
+        with pytest.raises(RuntimeError, match='already running'):
+            build_daemon._claim_socket(path)
+
+    @pytest.mark.cad
+    def test_rebuilds_only_changed_components(self, server, tmp_path):
+        _, path = server(warm=True)
+        build = {'cmd': 'build', 'components': ['top_cap'], 'draft': True}
+        first = request(build, path)
+        assert first['ok'] and list(first['built']) == ['top_cap']
+        assert first['built']['top_cap']['mesh']['watertight']
+        assert os.path.exists(tmp_path / 'out' / 'draft' / 'stl' / 'top_cap.stl')
+        assert os.path.exists(tmp_path / 'out' / 'draft-metrics.json')
+
+        again = request(build, path)
+        assert again['built'] == {} and again['unchanged'] == ['top_cap']
+
+        out = str(tmp_path / 'wide')
+        wide = request({**build, 'overrides': {'CAP_OVERHANG': 12}, 'out': out}, path)
+        assert list(wide['built']) == ['top_cap'] and wide['out_dir'] == out
+        assert (wide['built']['top_cap']['volume']
+                > first['built']['top_cap']['volume'])
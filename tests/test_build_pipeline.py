@@ -0,0 +1,74 @@
+"""Tests for the streaming build pipeline."""
+
+import os
+import pytest
+import sys
+sys.path.insert(0, '..')
+from build_pipeline import STAGES, _StageStats
+from build_tower_build123d import check_meshes, is_draft
+
+
+class TestStageStats:
+
+    def test_queue_depth_and_wait(self):
+        stats = _StageStats(workers=1, t0=0.0)
+        stats.put('a', 0.0)
+        stats.put('b', 1.0)
+        stats.start('a', 2.0)
+        stats.finish('a', 3.0)
+        stats.start('b', 3.0)
+        stats.finish('b', 4.0)
+        row = stats.report(end=4.0, wall=4.0)
+        assert row['max_depth'] == 2 and row['items'] == 2
+        assert row['wait'] == pytest.approx(2.0 + 2.0)
+        assert row['busy'] == pytest.approx(2.0)
+        # depth 1 for 0-1 s, 2 for 1-2 s, 1 for 2-3 s, 0 after
+        assert row['mean_depth'] == pytest.approx(4.0 / 4.0)
+        assert row['utilization'] == pytest.approx(0.5)
+
+    def test_every_successor_is_a_stage(self):
+        names = [stage for stage, *_ in STAGES]
+        assert all(s in names for _, _, after in STAGES for s in after)
+
+
+@pytest.mark.cad
+class TestPipeline:
+
+    def test_draft_streams_to_validation(self, tmp_path):
+        from build_pipeline import run_pipeline
+        results, stages = run_pipeline(['top_cap'], out_dir=str(tmp_path),
+                                       cache_dir=None, draft=True,
+                                       log=lambda line: None)
+        top_cap = results['top_cap']
+        assert top_cap['mesh']['watertight'] and top_cap['triangles'] > 0
+        assert set(top_cap['stages']) == {'build', 'tessellate', 'stl', 'validate'}
+        assert 'step' not in stages and stages['validate']['items'] == 1
+        assert is_draft(os.path.join(tmp_path, 'draft', 'stl', 'top_cap.stl'))
+
+    def test_checks_match_the_exported_stl(self, tmp_path):
+        """The in-memory checks agree with a trimesh reload of the file."""
+        pytest.importorskip('trimesh')
+        from build_pipeline import run_pipeline
+        results, _ = run_pipeline(['top_cap'], out_dir=str(tmp_path),
+                                  cache_dir=None, log=lambda line: None)
+        reloaded, = check_meshes(os.path.join(tmp_path, 'stl'))
+        mesh = results['top_cap']['mesh']
+        assert mesh['watertight'] == reloaded['watertight']
+        assert mesh['volume'] == pytest.approx(reloaded['volume'], rel=1e-9)
+        assert mesh['extents'] == pytest.approx(reloaded['extents'])
+
+    def test_stage_failure_raises(self, tmp_path):
+        from build_pipeline import run_pipeline
+        with pytest.raises(RuntimeError, match='build failed for spire'):
+            run_pipeline(['spire'], out_dir=str(tmp_path), cache_dir=None,
+                         draft=True, log=lambda line: None)
+
+    def test_dead_worker_fails_its_component(self, tmp_path, monkeypatch):
+        """A worker killed outright (no traceback) must not hang the parent."""
+        import build_pipeline
+        crash = ('build', lambda name, part, settings: os._exit(3), ('tessellate',))
+        monkeypatch.setattr(build_pipeline, 'STAGES', [crash, *STAGES[1:]])
+        with pytest.raises(RuntimeError, match=r'build failed for top_cap: .*exit code 3'):
+            build_pipeline.run_pipeline(['top_cap'], out_dir=str(tmp_path),
+                                        cache_dir=None, draft=True,
+                                        log=lambda line: None)
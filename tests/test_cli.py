@@ -0,0 +1,109 @@
+"""Tests for the golden_tower.py command line (no CAD builds)."""
+
+import json
+import pytest
+import sys
+sys.path.insert(0, '..')
+from bench_startup import ENTRY_POINTS, heavy_imports
+from golden_tower import build_parser, main
+
+trimesh = pytest.importorskip("trimesh")
+
+
+@pytest.fixture
+def exports(tmp_path):
+    """Exports root holding a watertight and an open box STL."""
+    stl_dir = tmp_path / 'stl'
+    stl_dir.mkdir()
+    box = trimesh.creation.box((10, 20, 30))
+    box.export(stl_dir / 'box.stl')
+    open_box = box.copy()
+    open_box.update_faces(list(range(1, len(box.faces))))
+    open_box.export(stl_dir / 'open.stl')
+    return tmp_path
+
+
+class TestParser:
+
+    @pytest.mark.parametrize("command", ['build', 'validate', 'analyze',
+                                         'render', 'sweep', 'bench', 'assemble'])
+    def test_common_options(self, command):
+        extra = ['--param', 'POCKET_TILT_ANGLE=20'] if command == 'sweep' else []
+        args = build_parser().parse_args([command, '--jobs', '2', '--out', 'x',
+                                          '--cache', 'c', '--json', *extra])
+        assert (args.jobs, args.out, args.cache, args.json) == (2, 'x', 'c', True)
+
+    def test_bad_override(self):
+        with pytest.raises(SystemExit) as exc:
+            main(['build', '--set', 'BODY_INNER_RADIUS=70'])
+        assert exc.value.code == 2
+
+    @pytest.mark.parametrize("spec", ['spire=0.1', 'body=-0.1', 'body=0.1,0.2,0.3', 'body'])
+    def test_bad_mesh_setting(self, spec):
+        with pytest.raises(SystemExit) as exc:
+            main(['build', '--mesh', spec])
+        assert exc.value.code == 2
+
+    @pytest.mark.parametrize("argv", [['daemon', 'status'], ['build', '--daemon']])
+    def test_no_daemon(self, argv, tmp_path):
+        with pytest.raises(SystemExit) as exc:
+            main([*argv, '--socket', str(tmp_path / 'none.sock')])
+        assert exc.value.code == 2
+
+
+class TestMeshCommands:
+
+    def test_validate_json(self, exports, capsys):
+        assert main(['validate', '--out', str(exports), '--json']) == 1
+        meshes = {m['file']: m for m in json.loads(capsys.readouterr().out)['meshes']}
+        assert meshes['box.stl']['watertight']
+        assert meshes['box.stl']['volume'] == pytest.approx(6000.0)
+        assert not meshes['open.stl']['watertight']
+
+    def test_analyze_basic(self, exports, capsys):
+        assert main(['analyze', '--basic', '--out', str(exports), '--json']) == 0
+        meshes = json.loads(capsys.readouterr().out)['meshes']
+        assert [m['faces'] for m in meshes] == [12, 11]
+        assert all(m['size_match'] for m in meshes)
+
+    def test_bench_stl(self, exports, capsys):
+        box = (exports / 'stl' / 'box.stl').read_bytes()
+        for name in ('bottom_segment', 'segment', 'top_cap'):
+            (exports / 'stl' / f'{name}.stl').write_bytes(box)
+        assert main(['bench', '--stl', '--tower', '3', '--out', str(exports),
+                     '--json']) == 0
+        rows = json.loads(capsys.readouterr().out)['stl']
+        assert rows[0]['operation'] == 'write' and rows[0]['triangles'] == 4 * 12
+
+    def test_assemble_stacks_with_the_build_config(self, exports, capsys):
+        from build_tower_build123d import write_variant_config
+        from tower_config import TowerConfig
+        box = (exports / 'stl' / 'box.stl').read_bytes()
+        for name in ('bottom_segment', 'segment', 'top_cap'):
+            (exports / 'stl' / f'{name}.stl').write_bytes(box)
+        write_variant_config(TowerConfig(SEGMENT_HEIGHT=150.0, TARGET_SEGMENT_COUNT=3),
+                             str(exports))
+        assert main(['assemble', '--formats', 'glb', '--flat',
+                     '--out', str(exports), '--json']) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert result['overrides'] == {'SEGMENT_HEIGHT': 150.0, 'TARGET_SEGMENT_COUNT': 3}
+        tower = trimesh.load(exports / 'assembly' / 'tower.stl')
+        assert len(tower.faces) == 4 * 12
+        assert tower.bounds[1][2] == pytest.approx(3 * 150.0 + 10.0 + 15.0)
+
+    def test_assemble_unbuilt_variant(self, capsys):
+        with pytest.raises(SystemExit) as exc:
+            main(['assemble', '--variant', 'no-such-variant-built'])
+        assert exc.value.code == 2
+        assert 'config.json missing' in capsys.readouterr().err
+
+    def test_validate_does_not_load_cad_kernels(self, exports):
+        assert heavy_imports(['golden_tower.py', 'validate', '--out', str(exports)]) == []
+
+
+@pytest.mark.parametrize("label, args", [
+    entry for entry in ENTRY_POINTS if 'reference' not in entry[0]
+    and 'pytest' not in entry[0]])
+def test_entry_points_skip_occ(label, args):
+    """Parameter modules and mesh commands never import the CAD kernel."""
+    assert heavy_imports(args) == []
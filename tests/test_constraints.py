@@ -0,0 +1,72 @@
+"""Tests for the vectorized design constraints."""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+from tower_params import *
+from components.constraints import CONSTRAINTS, evaluate, grid, margins, violations
+
+
+class TestScalar:
+
+    def test_defaults_are_valid(self):
+        assert violations() == []
+        assert set(margins()) == {name for name, *_ in CONSTRAINTS}
+
+    def test_pocket_outside_segment(self):
+        failed = violations({'POCKET_RADIAL_OFFSET': 60.0})
+        assert len(failed) == 1
+        assert failed[0].startswith('pocket_fits_in_segment')
+
+    def test_margins_follow_derived_values(self):
+        # A wider segment leaves more room around the pocket but less on the plate
+        base, wide = margins(), margins({'SEGMENT_OUTER_DIAMETER': 170.0})
+        assert wide['pocket_fits_in_segment'] == pytest.approx(
+            base['pocket_fits_in_segment'] + 5.0)
+        assert wide['cap_fits_xy'] == pytest.approx(base['cap_fits_xy'] - 10.0)
+
+    def test_config(self):
+        from tower_config import TowerConfig
+        wide = {'SEGMENT_OUTER_DIAMETER': 170.0}
+        assert margins(TowerConfig(**wide)) == pytest.approx(margins(wide))
+
+    def test_hw_ratio_assert(self):
+        assert violations({'SEGMENT_HEIGHT': 150.0})[0].startswith('segment_hw_ratio')
+
+
+class TestVectorized:
+
+    def test_grid_shape(self):
+        result = evaluate(grid({'SEGMENT_OUTER_DIAMETER': np.linspace(120, 240, 7),
+                                'POCKET_RADIAL_OFFSET': np.linspace(30, 80, 11),
+                                'NODES_PER_SEGMENT': [2, 3, 4]}))
+        assert result['feasible'].shape == (7, 11, 3)
+        for name, m in result['margins'].items():
+            assert m.shape == (7, 11, 3), name
+            np.testing.assert_array_equal(result['passed'][name], m >= 0)
+
+    def test_matches_scalar(self):
+        od = np.array([140.0, 160.0, 200.0, 250.0])
+        offset = np.array([40.0, 50.0, 60.0])
+        result = evaluate(grid({'SEGMENT_OUTER_DIAMETER': od,
+                                'POCKET_RADIAL_OFFSET': offset}))
+        for i, j in np.ndindex(len(od), len(offset)):
+            expected = margins({'SEGMENT_OUTER_DIAMETER': od[i],
+                                'POCKET_RADIAL_OFFSET': offset[j]})
+            for name, m in result['margins'].items():
+                assert m[i, j] == pytest.approx(expected[name]), name
+            assert result['feasible'][i, j] == all(v >= 0 for v in expected.values())
+
+    def test_million_points(self):
+        result = evaluate(grid({'SEGMENT_OUTER_DIAMETER': np.linspace(120, 240, 1000),
+                                'POCKET_RADIAL_OFFSET': np.linspace(30, 80, 1000)}))
+        feasible = result['feasible']
+        assert feasible.size == 1_000_000
+        assert 0 < feasible.sum() < feasible.size
+
+    def test_paired_arrays(self):
+        # Same-shape arrays are evaluated point by point, not as a product
+        result = evaluate({'SEGMENT_OUTER_DIAMETER': np.array([160.0, 160.0]),
+                           'POCKET_RADIAL_OFFSET': np.array([50.0, 60.0])})
+        assert result['feasible'].tolist() == [True, False]
@@ -0,0 +1,80 @@
+"""Tests for the analytic volume/mass estimator."""
+
+import pytest
+import os
+import sys
+sys.path.insert(0, '..')
+from tower_params import *
+from components.estimator import ESTIMATORS, estimate, estimate_all
+from tower_config import TowerConfig
+
+STL_DIR = os.path.join(os.path.dirname(__file__), '..', 'exports', 'stl')
+
+# Relative agreement with the exported B-rep meshes
+VOLUME_TOLERANCE = 0.02
+AREA_TOLERANCE = 0.03
+# Exported STL volume vs a fresh B-rep build; a tessellation stays well within
+EXPORT_TOLERANCE = 0.005
+
+
+@pytest.mark.parametrize("name", sorted(ESTIMATORS))
+class TestAgainstExports:
+    """Estimates must match the exported STLs within a few percent."""
+
+    @pytest.fixture
+    def mesh(self, name):
+        path = os.path.join(STL_DIR, f"{name}.stl")
+        if not os.path.exists(path):
+            pytest.skip("No STL files exported yet")
+        import trimesh
+        return trimesh.load(path)
+
+    def test_volume(self, name, mesh):
+        volume = estimate(name)['volume']
+        assert volume == pytest.approx(mesh.volume, rel=VOLUME_TOLERANCE)
+
+    def test_area(self, name, mesh):
+        area = estimate(name)['area']
+        assert area == pytest.approx(mesh.area, rel=AREA_TOLERANCE)
+
+    @pytest.mark.cad
+    def test_export_is_current(self, name, mesh, tmp_path):
+        """The STLs above must come from the current sources: a stale export
+        would let the estimates drift with the geometry unnoticed."""
+        from build_cache import BuildCache
+        from build_tower_build123d import COMPONENTS
+        _, _, module_name, builder_name = next(c for c in COMPONENTS if c[0] == name)
+        part, _ = BuildCache(str(tmp_path)).get_or_build(name, module_name, builder_name)
+        assert mesh.volume == pytest.approx(part.volume, rel=EXPORT_TOLERANCE), (
+            f"exports/stl/{name}.stl is stale: rebuild with build_tower_build123d.py")
+
+
+class TestParams:
+
+    def test_overrides_and_config_agree(self):
+        overrides = {'SEGMENT_OUTER_DIAMETER': 180.0}
+        assert estimate_all(overrides) == estimate_all(TowerConfig(**overrides))
+        assert estimate_all() == estimate_all(TowerConfig())
+
+    def test_unknown_parameter(self):
+        with pytest.raises(TypeError, match='SEGMENT_OUTER_DIAMETR'):
+            estimate('segment', {'SEGMENT_OUTER_DIAMETR': 180.0})
+
+
+class TestEstimates:
+
+    def test_taller_segment_is_heavier(self):
+        base = estimate('segment')
+        tall = estimate('segment', {'SEGMENT_HEIGHT': 220.0})
+        assert tall['volume'] > base['volume']
+        assert tall['mass'] > base['mass']
+
+    def test_draft_keeps_material_of_fine_cuts(self):
+        full, draft = estimate('segment'), estimate('segment', draft=True)
+        assert draft['volume'] > full['volume']
+
+    def test_mass_and_fill_ratio(self):
+        for name, e in estimate_all().items():
+            assert 0 < e['print_fill'] <= 1, name
+            assert 0 < e['fill_ratio'] < 1, name
+            assert e['mass'] > 0, name
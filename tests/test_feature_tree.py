@@ -0,0 +1,137 @@
+"""Tests for per-feature memoization keys (requires build123d)."""
+
+import pytest
+import sys
+sys.path.insert(0, '..')
+from tower_config import TowerConfig
+
+pytestmark = pytest.mark.cad
+
+
+@pytest.fixture(scope="module")
+def feature_tree():
+    from components import feature_tree
+    return feature_tree
+
+
+@pytest.fixture(scope="module")
+def segment_features():
+    from components.segment_build123d import SEGMENT_FEATURES
+    return SEGMENT_FEATURES
+
+
+@pytest.fixture
+def memory_only(monkeypatch, feature_tree):
+    """Keep feature results out of exports/cache and start cold."""
+    monkeypatch.setattr(feature_tree, 'STORE_DIR', None)
+    feature_tree.clear_memo()
+
+
+def _chain_keys(features, config=None):
+    from components.feature_tree import feature_key
+    keys, key = [], ''
+    for feature in features:
+        key = feature_key(key, feature, False, config)
+        keys.append(key)
+    return keys
+
+
+class TestFeatureKeys:
+    """Feature keys must change exactly downstream of an edited input."""
+
+    def test_keys_stable(self, segment_features):
+        assert _chain_keys(segment_features) == _chain_keys(segment_features)
+
+    def test_oring_edit_only_invalidates_downstream(self, segment_features):
+        """ORING_GROOVE_DEPTH feeds 'grooves'; earlier features are reused."""
+        names = [f.name for f in segment_features]
+        before = _chain_keys(segment_features)
+        config = TowerConfig(ORING_GROOVE_DEPTH=2.0)
+        after = _chain_keys(segment_features, config)
+        cut = names.index('grooves')
+        assert before[:cut] == after[:cut]
+        assert all(b != a for b, a in zip(before[cut:], after[cut:]))
+
+    def test_helper_constants_are_fingerprinted(self, feature_tree, segment_features):
+        """Parameters read inside called helpers (pocket_tools) count too."""
+        pockets = next(f for f in segment_features if f.name == 'pockets')
+        before = feature_tree.feature_key('', pockets, False)
+        config = TowerConfig(POCKET_RADIAL_OFFSET=52.0)
+        assert feature_tree.feature_key('', pockets, False, config) != before
+
+    def test_derived_values_are_fingerprinted(self, feature_tree, segment_features):
+        """A primary edit reaches features through the values derived from it."""
+        pockets = next(f for f in segment_features if f.name == 'pockets')
+        before = feature_tree.feature_key('', pockets, False)
+        config = TowerConfig(SEGMENT_HEIGHT=180.0)   # moves NODE_VERTICAL_PITCH
+        assert feature_tree.feature_key('', pockets, False, config) != before
+
+
+class TestMemo:
+    """Rebuilding with unchanged inputs reuses every feature."""
+
+    def test_second_build_reuses_everything(self, feature_tree, memory_only):
+        from components.top_cap_build123d import build_top_cap
+        first = build_top_cap()
+        assert all(s == 'recomputed' for _, s in feature_tree.FEATURE_LOG['top_cap'])
+        second = build_top_cap()
+        assert all(s == 'reused' for _, s in feature_tree.FEATURE_LOG['top_cap'])
+        assert abs(first.volume - second.volume) < 1e-9
+
+    def test_feature_store_is_restored(self, feature_tree, tmp_path):
+        from components.top_cap_build123d import build_top_cap
+        before = feature_tree.STORE_DIR
+        feature_tree.clear_memo()
+        with feature_tree.feature_store(str(tmp_path)):
+            build_top_cap()
+        assert feature_tree.STORE_DIR == before
+        assert len(list(tmp_path.glob('*.brep'))) == len(feature_tree.FEATURE_LOG['top_cap'])
+        with pytest.raises(RuntimeError):
+            with feature_tree.feature_store(None):
+                raise RuntimeError
+        assert feature_tree.STORE_DIR == before
+
+
+class TestDraft:
+    """Draft builds drop the fine features and reuse the full build's prefix."""
+
+    def test_fine_features_skipped(self, feature_tree, segment_features, memory_only):
+        from components.segment_build123d import build_segment
+        part = build_segment(draft=True)
+        built = [name for name, _ in feature_tree.FEATURE_LOG['segment']]
+        assert built == [f.name for f in segment_features if not f.fine]
+        assert {'grooves', 'key_slot', 'chamfers', 'drain_channels'}.isdisjoint(built)
+        assert part.is_valid
+
+    def test_draft_shares_prefix_keys(self, segment_features):
+        """Every feature before the first fine one has the same key."""
+        full = _chain_keys(segment_features)
+        draft = _chain_keys([f for f in segment_features if not f.fine])
+        first_fine = next(i for i, f in enumerate(segment_features) if f.fine)
+        assert draft[:first_fine] == full[:first_fine]
+
+
+class TestMeshClasses:
+    """Faces are classed by the feature that made them and meshed per class."""
+
+    def test_unknown_class_rejected(self, feature_tree):
+        with pytest.raises(ValueError, match='mesh_class'):
+            feature_tree.Feature('ring', 'fuse', _chain_keys, mesh_class='fine')
+
+    def test_grouped_mesh_is_watertight(self, feature_tree, memory_only):
+        from build123d import Part
+        from components.top_cap_build123d import TOP_CAP_FEATURES, build_top_cap
+        from mesh_arrays import check_arrays, drop_degenerate, tessellate_groups
+        part = Part(build_top_cap().wrapped)
+        classes = feature_tree.face_classes(part, TOP_CAP_FEATURES)
+        assert {'interlock', 'body'} <= set(classes)
+        fine = {'interlock': (0.01, 0.1), 'body': (0.01, 0.1)}
+        coarse = {'interlock': (0.01, 0.1), 'body': (0.1, 0.3)}
+        *_, uniform = tessellate_groups(part, classes, fine)
+        vertices, faces, report = tessellate_groups(part, classes, coarse)
+        row = check_arrays(vertices, drop_degenerate(faces)[0])
+        assert row['watertight'] and row['winding_consistent']
+        assert report['interlock']['triangles'] == uniform['interlock']['triangles']
+        assert report['body']['triangles'] < uniform['body']['triangles']
+        for label, (linear, _) in coarse.items():
+            assert report[label]['max_deviation'] <= linear * 1.01
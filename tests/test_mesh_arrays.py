@@ -0,0 +1,89 @@
+"""Tests for the array-based STL writer and mesh checks."""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+from mesh_arrays import (
+    STL_DTYPE, check_arrays, drop_degenerate, map_stl, merge_vertices, read_stl,
+    write_stl,
+)
+
+
+def cube(size=10.0):
+    """Outward-wound indexed cube with one corner at the origin."""
+    vertices = np.array([[x, y, z] for x in (0, size) for y in (0, size)
+                         for z in (0, size)], dtype=float)
+    faces = np.array([
+        [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5],   # x = 0, x = size
+        [0, 4, 5], [0, 5, 1], [2, 3, 7], [2, 7, 6],   # y = 0, y = size
+        [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3],   # z = 0, z = size
+    ])
+    return vertices, faces
+
+
+class TestChecks:
+
+    def test_closed_cube(self):
+        row = check_arrays(*cube())
+        assert row['watertight'] and row['winding_consistent'] and row['outward']
+        assert row['volume'] == pytest.approx(1000.0)
+        assert row['extents'] == [10.0, 10.0, 10.0]
+
+    def test_open_and_flipped(self):
+        vertices, faces = cube()
+        assert not check_arrays(vertices, faces[1:])['watertight']
+        flipped = faces.copy()
+        flipped[0] = flipped[0, [0, 2, 1]]
+        row = check_arrays(vertices, flipped)
+        assert row['watertight'] and not row['winding_consistent']
+        assert not check_arrays(vertices, faces[:, [0, 2, 1]])['outward']
+
+    def test_merge_and_degenerate(self):
+        vertices, faces = cube()
+        # Unshared copies of every triangle's corners, as OCC emits per face
+        split = vertices[faces].reshape(-1, 3)
+        merged, indices = merge_vertices(split, np.arange(len(split)).reshape(-1, 3))
+        assert len(merged) == 8 and check_arrays(merged, indices)['watertight']
+        kept, removed = drop_degenerate(np.vstack([faces, [[0, 0, 1]]]))
+        assert removed == 1 and len(kept) == len(faces)
+
+
+def test_stl_round_trip(tmp_path):
+    vertices, faces = cube()
+    path = tmp_path / 'cube.stl'
+    write_stl(path, vertices, faces, b'cube')
+    data = path.read_bytes()
+    assert data[:4] == b'cube' and len(data) == 84 + 50 * len(faces)
+    records = np.frombuffer(data, dtype=STL_DTYPE, offset=84)
+    assert np.array_equal(records['vertices'], vertices[faces])
+    assert np.allclose(records['normal'][0], [-1, 0, 0])
+
+
+def test_read_binary_and_ascii(tmp_path):
+    vertices, faces = cube()
+    binary = tmp_path / 'cube.stl'
+    write_stl(binary, vertices, faces)
+    assert np.array_equal(read_stl(binary), vertices[faces])
+    ascii_stl = tmp_path / 'ascii.stl'
+    ascii_stl.write_text("solid cube\n" + "".join(
+        "facet normal 0 0 0\nouter loop\n"
+        + "".join(f"vertex {x} {y} {z}\n" for x, y, z in triangle)
+        + "endloop\nendfacet\n" for triangle in vertices[faces]) + "endsolid cube\n")
+    assert np.array_equal(read_stl(ascii_stl), vertices[faces])
+    (tmp_path / 'bad.stl').write_bytes(b'not a mesh')
+    with pytest.raises(ValueError, match='not a binary or ASCII STL'):
+        read_stl(tmp_path / 'bad.stl')
+
+
+def test_map_is_a_read_only_view(tmp_path):
+    vertices, faces = cube()
+    path = tmp_path / 'cube.stl'
+    write_stl(path, vertices, faces)
+    records = map_stl(path)
+    assert isinstance(records, np.memmap) and not records.flags.writeable
+    assert np.array_equal(records['vertices'], vertices[faces])
+    del records
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match='not a binary STL'):
+        map_stl(path)
@@ -0,0 +1,71 @@
+"""Tests for the manifold3d mesh preview engine (requires manifold3d)."""
+
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+pytest.importorskip("manifold3d")
+
+from components.mesh_preview import MESH_BUILDERS, VOLUME_TOLERANCE
+
+
+@pytest.fixture(scope="module")
+def brep_volumes():
+    """Volumes of the B-rep builds, full and draft, keyed by (name, draft)."""
+    from components import feature_tree
+    from components.bottom_segment_build123d import build_bottom_segment
+    from components.segment_build123d import build_segment
+    from components.top_cap_build123d import build_top_cap
+
+    with feature_tree.feature_store(None):
+        builders = {'segment': build_segment, 'top_cap': build_top_cap,
+                    'bottom_segment': build_bottom_segment}
+        return {(name, draft): build(draft=draft).volume
+                for name, build in builders.items() for draft in (False, True)}
+
+
+class TestMeshPreview:
+    """Mesh previews must be printable meshes matching the B-rep geometry."""
+
+    @pytest.mark.parametrize("name", sorted(MESH_BUILDERS))
+    def test_watertight(self, name):
+        mesh = MESH_BUILDERS[name]()
+        assert mesh.is_watertight
+        assert mesh.volume > 0
+
+    @pytest.mark.cad
+    @pytest.mark.parametrize("draft", [False, True], ids=["full", "draft"])
+    @pytest.mark.parametrize("name", sorted(MESH_BUILDERS))
+    def test_volume_matches_brep(self, name, draft, brep_volumes):
+        expected = brep_volumes[(name, draft)]
+        volume = MESH_BUILDERS[name](draft=draft).volume
+        assert abs(volume - expected) <= VOLUME_TOLERANCE * expected
+
+    def test_draft_removes_material_cuts(self):
+        """Draft segment skips cuts (groove, slot, channels), so it is heavier."""
+        full = MESH_BUILDERS['segment']().volume
+        draft = MESH_BUILDERS['segment'](draft=True).volume
+        assert draft > full
+
+
+class TestConfig:
+    """The preview builds the config it is given, not the module constants."""
+
+    WIDE = {'SEGMENT_OUTER_DIAMETER': 180.0, 'NODES_PER_SEGMENT': 4}
+
+    def test_override_changes_volume(self):
+        from tower_config import TowerConfig
+        base = MESH_BUILDERS['segment']().volume
+        wide = MESH_BUILDERS['segment'](TowerConfig(**self.WIDE)).volume
+        assert wide > base * 1.05
+
+    @pytest.mark.cad
+    def test_override_matches_brep(self):
+        from components import feature_tree
+        from components.segment_build123d import build_segment
+        from tower_config import TowerConfig
+        cfg = TowerConfig(**self.WIDE)
+        with feature_tree.feature_store(None):
+            expected = build_segment(cfg, draft=True).volume
+        volume = MESH_BUILDERS['segment'](cfg, draft=True).volume
+        assert abs(volume - expected) <= VOLUME_TOLERANCE * expected
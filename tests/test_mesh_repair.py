@@ -0,0 +1,83 @@
+"""Tests for the vectorized mesh repair and validation."""
+
+import json
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+from mesh_arrays import read_stl, write_stl
+from mesh_repair import repair_file, repair_mesh, repaired_dir, weld
+from test_mesh_arrays import cube
+
+
+def soup(vertices, faces):
+    """Unindexed float32 triangle corners, as read from an STL."""
+    return vertices[faces].astype(np.float32)
+
+
+class TestRepair:
+
+    def test_clean_cube_unchanged(self):
+        vertices, faces, report = repair_mesh(soup(*cube()))
+        assert not report['changed'] and report['vertices'] == 8
+        assert report['before'] == report['after']
+        assert report['after']['watertight'] and report['after']['volume'] == pytest.approx(1000.0)
+
+    def test_weld_within_tolerance(self):
+        corners = soup(*cube()).reshape(-1, 3)
+        corners[0] += 2e-5    # jitter below the default 1e-4 mm tolerance
+        vertices, index, tolerance = weld(corners)
+        assert len(vertices) == 8 and tolerance == pytest.approx(1e-4)
+        assert len(weld(corners, tolerance=1e-6)[0]) == 9
+
+    def test_degenerate_faces_dropped(self):
+        vertices, faces = cube()
+        # A repeated-index face and a zero-area face on the x = 0 edge
+        vertices = np.vstack([vertices, [0, 0, 5]])
+        extra = np.array([[0, 0, 1], [0, 8, 1]])
+        _, repaired, report = repair_mesh(soup(vertices, np.vstack([faces, extra])))
+        assert report['duplicate_index_faces'] == 1 and report['zero_area_faces'] == 1
+        assert not report['before']['watertight'] and report['after']['watertight']
+        assert len(repaired) == 12 and report['changed']
+
+    def test_sliver_collapsed(self):
+        vertices, faces = cube()
+        # Split the x = 0 face with a vertex 1e-4 mm from a corner
+        vertices = np.vstack([vertices, [0, 1e-4, 0]])
+        faces = np.vstack([faces[1:], [[0, 8, 3], [8, 1, 3], [0, 1, 8]]])
+        _, repaired, report = repair_mesh(soup(vertices, faces), merge_tolerance=1e-5)
+        assert report['sliver_edges'] >= 1 and report['after']['watertight']
+        assert report['after']['volume'] == pytest.approx(1000.0)
+
+    def test_inverted_mesh_flipped(self):
+        vertices, faces = cube()
+        _, _, report = repair_mesh(soup(vertices, faces[:, [0, 2, 1]]))
+        assert report['flipped'] and report['after']['outward']
+        assert report['after']['volume'] == pytest.approx(1000.0)
+
+
+class TestFiles:
+
+    def test_repair_writes_copy_and_report(self, tmp_path):
+        stl_dir = tmp_path / 'stl'
+        stl_dir.mkdir()
+        vertices, faces = cube()
+        path = stl_dir / 'cube.stl'
+        write_stl(path, vertices, faces[:, [0, 2, 1]], b'inverted')
+        original = path.read_bytes()
+        report = repair_file(str(path), repaired_dir(stl_dir))
+        assert path.read_bytes() == original
+        assert report['repaired_file'] == str(tmp_path / 'repaired' / 'cube.stl')
+        assert np.array_equal(read_stl(report['repaired_file']), vertices[faces])
+        assert open(report['repaired_file'], 'rb').read(8) == b'inverted'
+        assert json.loads(open(report['report_file']).read())['flipped']
+
+    def test_clean_file_has_no_copy(self, tmp_path):
+        path = tmp_path / 'cube.stl'
+        write_stl(path, *cube())
+        out = tmp_path / 'repaired'
+        out.mkdir()
+        (out / 'cube.stl').write_bytes(b'stale')
+        report = repair_file(str(path), str(out))
+        assert report['repaired_file'] is None and not (out / 'cube.stl').exists()
+        assert (out / 'cube.json').exists()
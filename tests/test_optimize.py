@@ -0,0 +1,81 @@
+"""Tests for the surrogate-assisted design optimizer (no CAD builds)."""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+from tower_params import *
+from components.constraints import violations
+from optimize import (
+    Surrogate, cheap_objectives, next_batch, pareto_mask, parse_bounds,
+    sample_candidates, spread,
+)
+
+BOUNDS = {'POCKET_TILT_ANGLE': (10.0, 30.0),
+          'POCKET_RADIAL_OFFSET': (40.0, 60.0),
+          'NODES_PER_SEGMENT': (2.0, 4.0)}
+
+
+class TestCandidates:
+
+    def test_parse_bounds(self):
+        assert parse_bounds('POCKET_TILT_ANGLE=10:30') == ('POCKET_TILT_ANGLE', (10.0, 30.0))
+        with pytest.raises(ValueError):
+            parse_bounds('POCKET_TILT_ANGLE=30:10')
+
+    def test_sample_within_bounds_and_feasible(self):
+        variants, X = sample_candidates(BOUNDS, 64)
+        assert len(variants) == len(X) > 0
+        assert X.min() >= 0 and X.max() <= 1
+        for v in variants:
+            assert type(v['NODES_PER_SEGMENT']) is int
+            assert 10.0 <= v['POCKET_TILT_ANGLE'] <= 30.0
+            assert violations(v) == []
+        # Offsets above 54 mm push the pocket through the segment wall
+        assert max(v['POCKET_RADIAL_OFFSET'] for v in variants) <= 54.0
+
+    def test_cheap_objectives(self):
+        variants = [{'NODES_PER_SEGMENT': 3}, {'NODES_PER_SEGMENT': 4}]
+        cheap = cheap_objectives(variants)
+        assert cheap['pockets'].tolist() == [3.0, 4.0]
+        assert cheap['mass'][1] > cheap['mass'][0]
+        assert cheap['tray_capacity'][0] == pytest.approx(cheap['tray_capacity'][1])
+
+
+class TestPareto:
+
+    def test_mask(self):
+        F = [[1, 4], [2, 2], [4, 1], [3, 3], [2, 2]]
+        assert pareto_mask(F).tolist() == [True, True, True, False, True]
+
+    def test_spread_is_space_filling(self):
+        X = np.array([[0.5, 0.5], [0.0, 0.0], [0.51, 0.5], [1.0, 1.0]])
+        assert spread(X, [], range(4), 3) == [0, 1, 3]
+
+
+class TestSurrogate:
+
+    def test_interpolates_and_knows_where_it_is_unsure(self):
+        rng = np.random.default_rng(1)
+        X = rng.random((20, 2))
+        f = lambda x: np.sin(3 * x[:, 0]) + x[:, 1] ** 2
+        model = Surrogate().fit(X, f(X))
+        mean, std = model.predict(X)
+        np.testing.assert_allclose(mean, f(X), atol=1e-2)
+        far = np.array([[3.0, 3.0]])
+        assert model.predict(far)[1][0] > 10 * std.max()
+
+    def test_next_batch_follows_the_front(self):
+        # One objective is cheap and flat; overhang rises with x, so the
+        # optimistic front sits at small x
+        X = np.linspace(0, 1, 21)[:, None]
+        cheap = {'mass': np.ones(21), 'pockets': np.ones(21),
+                 'tray_capacity': np.ones(21)}
+        measured = {i: {'overhang_area': 100.0 * X[i, 0]} for i in (4, 10, 20)}
+        model = Surrogate().fit(X[[4, 10, 20]], [m['overhang_area']
+                                                 for m in measured.values()])
+        picked = next_batch(X, cheap, measured, {'overhang_area': model}, 2,
+                            kappa=0.0)
+        assert len(picked) == 2
+        assert not set(picked) & set(measured)
+        assert max(picked) < 4
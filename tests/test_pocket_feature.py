@@ -0,0 +1,48 @@
+"""Tests for the shared pocket feature template (requires build123d)."""
+
+import math
+import pytest
+import sys
+sys.path.insert(0, '..')
+from tower_params import *
+from tower_config import TowerConfig
+
+pytestmark = pytest.mark.cad
+
+CFG = TowerConfig()
+
+
+@pytest.fixture(scope="module")
+def pocket():
+    from components import pocket_build123d
+    return pocket_build123d
+
+
+class TestPocketTemplate:
+    """Pocket tools are built once and placed per node by transform."""
+
+    def test_template_is_cached(self, pocket):
+        """The same parameter set must reuse the same template solids."""
+        assert pocket.pocket_template(CFG) is pocket.pocket_template(TowerConfig())
+
+    @pytest.mark.parametrize("n_nodes", [3, 5, 8])
+    def test_one_tool_per_node(self, pocket, n_nodes):
+        """Each node gets one additive, one subtractive and one chamfer tool."""
+        add, sub = pocket.pocket_tools(CFG, n_nodes)
+        chamfers = pocket.pocket_chamfer_tools(CFG, n_nodes)
+        assert len(add) == len(sub) == len(chamfers) == n_nodes
+
+    def test_placed_copies_keep_volume(self, pocket):
+        """Placement is a rigid transform — volume is unchanged."""
+        template_add, _ = pocket.pocket_template(CFG)
+        add, _ = pocket.pocket_tools(CFG)
+        for tool in add:
+            assert abs(tool.volume - template_add.volume) < 1e-6 * template_add.volume
+
+    def test_nodes_spiral_at_golden_angle(self, pocket):
+        """Node i sits at i × golden angle and i × vertical pitch."""
+        for i in range(NODES_PER_SEGMENT):
+            pos = pocket.pocket_location(CFG, i).position
+            angle = math.degrees(math.atan2(pos.Y, pos.X)) % 360
+            assert abs(angle - (i * GOLDEN_ANGLE_DEG) % 360) < 1e-6
+            assert abs(pos.Z - (CFG.POCKET_Z_OFFSET + i * NODE_VERTICAL_PITCH)) < 1e-6
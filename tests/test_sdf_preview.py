@@ -0,0 +1,84 @@
+"""Tests for the SDF preview engine (meshing requires scikit-image)."""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from tower_params import *
+from components.dimensions import TUBE_OR
+from components.sdf_preview import (
+    SDF_FIELDS, VOLUME_TOLERANCE, build_sdf, build_tower_sdf, culling,
+    sd_box, sd_cone, sd_cylinder, segment_sdf,
+)
+
+
+class TestPrimitives:
+    """Primitives are exact distances, negative inside."""
+
+    def test_cylinder(self):
+        p = np.array([[0, 0, 5], [13, 0, 5], [0, 0, 14], [13, 0, 14]], float)
+        d = sd_cylinder(p, 10.0, 0.0, 10.0)
+        np.testing.assert_allclose(d, [-5.0, 3.0, 4.0, 5.0])
+
+    def test_cone(self):
+        # Apex-up cone r=10 -> 0 over z 0..10: slant face at 45 degrees
+        p = np.array([[0, 0, 5], [10, 0, 10], [0, 0, -2]], float)
+        d = sd_cone(p, 10.0, 0.0, 0.0, 10.0)
+        np.testing.assert_allclose(d, [-5 / np.sqrt(2), 10 / np.sqrt(2), 2.0], atol=1e-9)
+
+    def test_rotated_box(self):
+        p = np.array([[0, 4, 0], [4, 0, 0]], float)
+        d = sd_box(p, (10.0, 2.0, 2.0), angle_deg=90.0)
+        np.testing.assert_allclose(d, [-1.0, 3.0])
+
+
+class TestSegmentField:
+    def test_known_points(self):
+        p = np.array([
+            [0, 0, 100],                                  # tube bore
+            [TUBE_OR - 0.5, 0, 100],                      # tube wall
+            [50, 0, 100],                                 # annular hollow
+            [0, SEGMENT_OUTER_RADIUS - 1.0, 100],         # outer wall
+            [50, 0, 1.0],                                 # drip tray floor
+        ], float)
+        inside = segment_sdf(p) < 0
+        assert inside.tolist() == [False, True, False, True, True]
+
+    def test_culling_keeps_signs(self):
+        rng = np.random.default_rng(0)
+        p = rng.uniform((-130, -130, -10), (130, 130, 220), (20000, 3))
+        exact = segment_sdf(p)
+        with culling(1.0):
+            culled = segment_sdf(p)
+        np.testing.assert_array_equal(np.sign(culled), np.sign(exact))
+        # Exact where marching cubes needs it: near the surface
+        near = np.abs(exact) < 0.5
+        np.testing.assert_allclose(culled[near], exact[near])
+
+
+class TestSdfMeshing:
+    @pytest.fixture(autouse=True)
+    def _skimage(self):
+        pytest.importorskip("skimage")
+
+    @pytest.mark.parametrize("name", sorted(SDF_FIELDS))
+    def test_watertight(self, name):
+        mesh = build_sdf(name, voxel=2.0)
+        assert mesh.is_watertight
+        assert mesh.volume > 0
+
+    @pytest.mark.cad
+    def test_segment_volume_matches_brep(self):
+        from components import feature_tree
+        from components.segment_build123d import build_segment
+        with feature_tree.feature_store(None):
+            expected = build_segment().volume
+        volume = build_sdf('segment', voxel=1.0).volume
+        assert abs(volume - expected) <= VOLUME_TOLERANCE['segment'] * expected
+
+    def test_tower_preview(self):
+        mesh = build_tower_sdf(n_segments=3, voxel=4.0)
+        assert mesh.is_watertight
+        top = 3 * SEGMENT_HEIGHT + INTERLOCK_HEIGHT + CAP_HEIGHT
+        assert mesh.bounds[1][2] > top
@@ -0,0 +1,108 @@
+"""Tests for the parameter sweep screen."""
+
+import csv
+import os
+import pytest
+import sys
+sys.path.insert(0, '..')
+from tower_params import *
+from sweep import (
+    append_csv, build_all, expand, overhang_metrics, parse_range, run_sweep, screen,
+    write_csv,
+)
+
+
+def _dies_on_two(overrides, components, cache_dir, draft):
+    """Stand-in for build_variant whose worker dies on variant 2."""
+    if overrides['N'] == 2:
+        os._exit(1)
+    return [{'component': name, 'volume': float(overrides['N'])} for name in components]
+
+
+class TestRanges:
+
+    def test_linspace(self):
+        assert parse_range('POCKET_TILT_ANGLE=15:25:3') == (
+            'POCKET_TILT_ANGLE', [15.0, 20.0, 25.0])
+
+    def test_list(self):
+        assert parse_range('NODES_PER_SEGMENT=3,4') == ('NODES_PER_SEGMENT', [3.0, 4.0])
+
+    def test_malformed(self):
+        with pytest.raises(ValueError):
+            parse_range('POCKET_TILT_ANGLE')
+
+    def test_expand_types_and_product(self):
+        variants = expand({'NODES_PER_SEGMENT': [3.0, 4.0],
+                           'POCKET_TILT_ANGLE': [15, 20, 25]})
+        assert len(variants) == 6
+        assert type(variants[0]['NODES_PER_SEGMENT']) is int
+        assert type(variants[0]['POCKET_TILT_ANGLE']) is float
+
+    def test_expand_rejects_fractional_int(self):
+        with pytest.raises(ValueError):
+            expand({'NODES_PER_SEGMENT': [3.5]})
+
+    def test_expand_rejects_derived_names(self):
+        # dimensions.py names never reach the builders
+        with pytest.raises(KeyError):
+            expand({'BODY_INNER_RADIUS': [70.0]})
+
+
+class TestScreen:
+
+    def test_split(self):
+        variants = expand({'POCKET_RADIAL_OFFSET': [50.0, 60.0]})
+        survivors, rejected = screen(variants, ('segment', 'top_cap'))
+        assert [v['params'] for v in survivors] == [{'POCKET_RADIAL_OFFSET': 50.0}]
+        assert [v['params'] for v in rejected] == [{'POCKET_RADIAL_OFFSET': 60.0}]
+        assert set(survivors[0]['estimates']) == {'segment', 'top_cap'}
+
+    def test_screen_only_rows(self):
+        rows, rejected = run_sweep({'NODES_PER_SEGMENT': [3, 4]}, screen_only=True)
+        assert not rejected
+        assert [r['NODES_PER_SEGMENT'] for r in rows] == [3, 4]
+        assert rows[1]['est_mass'] > rows[0]['est_mass']
+
+
+class TestBuildAll:
+
+    def test_dead_worker_costs_one_variant(self):
+        done = []
+        results = build_all([{'N': n} for n in range(5)], ('segment',), jobs=2,
+                            cache_dir=None, on_result=lambda i, rows: done.append(i),
+                            build=_dies_on_two)
+        assert sorted(done) == list(range(5))
+        assert 'BrokenProcessPool' in results[2][0]['error']
+        assert [rows[0].get('volume') for rows in results] == [0.0, 1.0, None, 3.0, 4.0]
+
+    def test_csv_grows_as_variants_finish(self, tmp_path):
+        path = str(tmp_path / 'sweep.csv')
+        write_csv([], path, ['N'])
+        append_csv([{'N': 1, 'component': 'segment', 'volume': 2.0}], path, ['N'])
+        append_csv([{'N': 2, 'component': 'segment', 'error': 'boom'}], path, ['N'])
+        with open(path, newline='') as fh:
+            rows = list(csv.DictReader(fh))
+        assert [(r['N'], r['volume'], r['error']) for r in rows] == [
+            ('1', '2.0', ''), ('2', '', 'boom')]
+
+
+class TestOverhang:
+
+    def test_box_on_bed_has_none(self):
+        trimesh = pytest.importorskip("trimesh")
+        box = trimesh.creation.box((10, 10, 10))
+        metrics = overhang_metrics(box.vertices, box.faces, MAX_OVERHANG_ANGLE)
+        assert metrics['overhang_area'] == 0.0
+
+    def test_raised_ceiling(self):
+        # An upside-down step: the lower box rests on the bed, the wider
+        # upper box's underside hangs at 90 degrees from vertical
+        trimesh = pytest.importorskip("trimesh")
+        base = trimesh.creation.box((10, 10, 10))
+        top = trimesh.creation.box((20, 20, 10))
+        top.apply_translation((0, 0, 10))
+        mesh = trimesh.util.concatenate([base, top])
+        metrics = overhang_metrics(mesh.vertices, mesh.faces, MAX_OVERHANG_ANGLE)
+        assert metrics['overhang_area'] == pytest.approx(400.0)
+        assert metrics['overhang_fraction'] == pytest.approx(400.0 / mesh.area)
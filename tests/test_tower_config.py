@@ -0,0 +1,116 @@
+"""Tests for the immutable tower parameter set."""
+
+import os
+import pickle
+import pytest
+import sys
+sys.path.insert(0, '..')
+from tower_params import *
+from components import dimensions
+from tower_config import (
+    DERIVED_NAMES, PRIMARY_NAMES, TowerConfig, coerce, load_variant,
+    parse_setting,
+)
+
+
+class TestValues:
+
+    def test_defaults_match_modules(self):
+        cfg = TowerConfig()
+        for name in PRIMARY_NAMES + DERIVED_NAMES:
+            assert getattr(cfg, name) == getattr(dimensions, name), name
+
+    def test_derived_values_follow_primaries(self):
+        wide = TowerConfig(SEGMENT_OUTER_DIAMETER=180.0)
+        assert wide.BODY_INNER_RADIUS == 90.0 - WALL_THICKNESS
+        assert wide.SEGMENT_HW_RATIO == pytest.approx(SEGMENT_HEIGHT / 180.0)
+        # The default config is unaffected
+        assert TowerConfig().SEGMENT_OUTER_DIAMETER == SEGMENT_OUTER_DIAMETER
+
+    def test_unknown_and_derived_names_rejected(self):
+        with pytest.raises(TypeError):
+            TowerConfig(NOT_A_PARAMETER=1.0)
+        with pytest.raises(TypeError, match='derived'):
+            TowerConfig(BODY_INNER_RADIUS=70.0)
+        with pytest.raises(AttributeError):
+            TowerConfig().NOT_A_PARAMETER
+
+
+class TestIdentity:
+
+    def test_immutable(self):
+        cfg = TowerConfig()
+        with pytest.raises(AttributeError):
+            cfg.SEGMENT_HEIGHT = 150.0
+        changed = cfg.replace(SEGMENT_HEIGHT=150.0)
+        assert cfg.SEGMENT_HEIGHT == SEGMENT_HEIGHT
+        assert changed.NODE_VERTICAL_PITCH == 150.0 / NODES_PER_SEGMENT
+
+    def test_hash_and_equality_by_value(self):
+        a = TowerConfig(POCKET_TILT_ANGLE=25.0)
+        b = TowerConfig().replace(POCKET_TILT_ANGLE=25.0)
+        assert a == b and hash(a) == hash(b) and a.key == b.key
+        assert a != TowerConfig() and a.key != TowerConfig().key
+        assert a.overrides() == {'POCKET_TILT_ANGLE': 25.0}
+
+    def test_pickle_round_trip(self):
+        cfg = TowerConfig(NODES_PER_SEGMENT=4)
+        copy = pickle.loads(pickle.dumps(cfg))
+        assert copy == cfg and copy.key == cfg.key
+
+
+class TestOverrides:
+
+    def test_settings_take_the_default_type(self):
+        assert parse_setting('NODES_PER_SEGMENT=4') == ('NODES_PER_SEGMENT', 4)
+        assert parse_setting('SEGMENT_HEIGHT = 180') == ('SEGMENT_HEIGHT', 180.0)
+        assert coerce('OUTER_BODY_STYLE', 'smooth') == 'smooth'
+
+    @pytest.mark.parametrize("spec, error", [
+        ('SEGMENT_HEIGHT', ValueError),
+        ('NODES_PER_SEGMENT=3.5', ValueError),
+        ('SEGMENT_HEIGHT=tall', ValueError),
+        ('NOT_A_PARAMETER=1', TypeError),
+        ('BODY_INNER_RADIUS=70', TypeError),
+    ])
+    def test_bad_settings(self, spec, error):
+        with pytest.raises(error):
+            parse_setting(spec)
+
+    def test_variant_file(self, tmp_path):
+        path = tmp_path / 'wide.toml'
+        path.write_text('SEGMENT_OUTER_DIAMETER = 180\nNODES_PER_SEGMENT = 4\n')
+        name, overrides = load_variant(str(path))
+        assert name == 'wide'
+        assert overrides == {'SEGMENT_OUTER_DIAMETER': 180.0, 'NODES_PER_SEGMENT': 4}
+        assert TowerConfig(**overrides).BODY_INNER_RADIUS == 90.0 - WALL_THICKNESS
+        path.write_text('name = "w2"\npocket_tilt = 20\n')
+        with pytest.raises(ValueError):
+            load_variant(str(path))
+
+    def test_build_script_arguments(self, tmp_path):
+        from build_tower_build123d import EXPORT_DIR, VARIANT_DIR, parse_args
+        path = tmp_path / 'wide.toml'
+        path.write_text('name = "wide"\nSEGMENT_OUTER_DIAMETER = 180.0\n')
+        args = parse_args(['--config', str(path), '--set', 'SEGMENT_OUTER_DIAMETER=170'])
+        assert args.tower_config.SEGMENT_OUTER_DIAMETER == 170.0
+        assert args.out_dir == os.path.join(VARIANT_DIR, 'wide')
+        unnamed = parse_args(['--set', 'NODES_PER_SEGMENT=4'])
+        assert unnamed.variant == unnamed.tower_config.key[:12]
+        assert parse_args([]).out_dir == EXPORT_DIR
+        with pytest.raises(SystemExit):
+            parse_args(['--set', 'BODY_INNER_RADIUS=70'])
+
+
+class TestBuild:
+
+    @pytest.mark.cad
+    def test_two_configs_in_one_process(self, monkeypatch):
+        """Variants build side by side without touching module state."""
+        from components import feature_tree
+        from components.top_cap_build123d import build_top_cap
+        monkeypatch.setattr(feature_tree, 'STORE_DIR', None)
+        base = build_top_cap(TowerConfig())
+        wide = build_top_cap(TowerConfig(CAP_OVERHANG=CAP_OVERHANG + 5.0))
+        assert wide.volume > base.volume
+        assert build_top_cap().volume == pytest.approx(base.volume)
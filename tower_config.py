@@ -0,0 +1,247 @@
+"""
+Tower Configuration — Golden Tower
+==================================
+:class:`TowerConfig` is one immutable parameter set: every primary value
+of tower_params.py and components/dimensions.py, plus the values derived
+from them (``INTERLOCK_ROTATION_DEG``, ``NODE_VERTICAL_PITCH``,
+``POCKET_Z_OFFSET``, ...), computed on first access from the same
+formulas as in those files. Any number of configs coexist in a process,
+so variants can be built side by side:
+
+    from tower_config import TowerConfig
+    wide = TowerConfig(SEGMENT_OUTER_DIAMETER=180.0)
+    wide.BODY_INNER_RADIUS        # 88.0, derived
+    build_segment(wide)
+
+The builders take a config explicitly; ``TowerConfig()`` holds the
+current module-level constants and is what they use by default. A config
+hashes by value (:attr:`TowerConfig.key`, stable across processes), so it
+can key caches directly.
+
+Overrides given as text -- ``--set NAME=VALUE`` on a command line or a
+TOML variant file -- go through :func:`parse_setting` and
+:func:`load_variant`, which convert each value to the type of the
+parameter's default:
+
+    # wide.toml
+    name = "wide"                   # optional; lower-case keys are not parameters
+    SEGMENT_OUTER_DIAMETER = 180.0
+    NODES_PER_SEGMENT = 4
+"""
+
+import ast
+import hashlib
+import json
+import math
+import os
+from functools import lru_cache
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Modules whose top-level assignments define the parameters, in order
+PARAM_MODULES = ('tower_params', 'components.dimensions')
+
+
+@lru_cache(maxsize=1)
+def param_statements():
+    """Compiled top-level ``NAME = expr`` statements of PARAM_MODULES.
+
+    Returns:
+        list: ``(module, target names, referenced names, expression source,
+        compiled statement)`` in source order.
+    """
+    statements = []
+    for module in PARAM_MODULES:
+        path = os.path.join(PROJECT_ROOT, module.replace('.', os.sep) + '.py')
+        with open(path) as fh:
+            tree = ast.parse(fh.read(), path)
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and all(
+                    isinstance(t, ast.Name) for t in node.targets):
+                names = tuple(t.id for t in node.targets)
+                refs = {n.id for n in ast.walk(node.value) if isinstance(n, ast.Name)}
+                code = compile(ast.Module([node], type_ignores=[]), path, 'exec')
+                statements.append((module, names, refs, node.value, code))
+    return statements
+
+
+@lru_cache(maxsize=1)
+def _parameters():
+    """Split the parameters into primary and derived ones.
+
+    Returns:
+        tuple: ``(primary, derived)`` -- ``{name: module}`` for values that
+        reference no other parameter, and ``{name: compiled expression}``
+        for the rest.
+    """
+    primary, derived, known = {}, {}, set()
+    for module, names, refs, value, _ in param_statements():
+        for name in names:
+            if refs & known:
+                derived[name] = compile(ast.Expression(value), module, 'eval')
+            else:
+                primary[name] = module
+        known.update(names)
+    return primary, derived
+
+
+PRIMARY_NAMES = tuple(_parameters()[0])
+DERIVED_NAMES = tuple(_parameters()[1])
+PARAMETER_NAMES = PRIMARY_NAMES + DERIVED_NAMES
+
+
+class _Scope(dict):
+    """Name lookup of a derived formula: parameters come from the config."""
+
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+
+    def __missing__(self, name):
+        if name in _parameters()[1] or name in PRIMARY_NAMES:
+            return getattr(self.config, name)
+        raise KeyError(name)
+
+
+def _defaults():
+    import importlib
+    return {name: getattr(importlib.import_module(module), name)
+            for name, module in _parameters()[0].items()}
+
+
+class TowerConfig:
+    """An immutable tower parameter set.
+
+    Args:
+        **values: Primary parameters to change; every other primary value
+            comes from the tower_params / dimensions module constants.
+
+    Raises:
+        TypeError: a name is unknown or derived (set its inputs instead).
+    """
+
+    __slots__ = PRIMARY_NAMES + ('_derived', '_key')
+
+    # Globals of the derived formulas
+    _formula_globals = {'math': math}
+
+    def __init__(self, **values):
+        unknown = sorted(set(values) - set(PRIMARY_NAMES))
+        if unknown:
+            derived = [n for n in unknown if n in DERIVED_NAMES]
+            hint = f" ({', '.join(derived)} derived)" if derived else ""
+            raise TypeError(f"unknown parameter(s): {', '.join(unknown)}{hint}")
+        defaults = _defaults()
+        for name in PRIMARY_NAMES:
+            object.__setattr__(self, name, values.get(name, defaults[name]))
+        object.__setattr__(self, '_derived', {})
+        object.__setattr__(self, '_key', None)
+
+    def __getattr__(self, name):
+        # Only reached for names that are not slots: the derived values
+        code = _parameters()[1].get(name)
+        if code is None:
+            raise AttributeError(f"TowerConfig has no parameter {name!r}")
+        derived = object.__getattribute__(self, '_derived')
+        if name not in derived:
+            derived[name] = eval(code, dict(self._formula_globals), _Scope(self))
+        return derived[name]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TowerConfig is immutable; use replace()")
+
+    __delattr__ = __setattr__
+
+    def replace(self, **changes):
+        """Return a copy with ``changes`` applied (derived values redone)."""
+        return TowerConfig(**{**self.primary(), **changes})
+
+    def primary(self):
+        """``{name: value}`` of every primary parameter."""
+        return {name: getattr(self, name) for name in PRIMARY_NAMES}
+
+    def overrides(self):
+        """Primary values that differ from the module constants."""
+        defaults = _defaults()
+        return {name: value for name, value in self.primary().items()
+                if value != defaults[name]}
+
+    @property
+    def key(self):
+        """Stable hex digest of the primary values (the cache identity)."""
+        if self._key is None:
+            payload = json.dumps(self.primary(), sort_keys=True, default=repr)
+            object.__setattr__(self, '_key',
+                               hashlib.sha256(payload.encode()).hexdigest())
+        return self._key
+
+    def __hash__(self):
+        return int(self.key[:16], 16)
+
+    def __eq__(self, other):
+        if not isinstance(other, TowerConfig):
+            return NotImplemented
+        return self.primary() == other.primary()
+
+    def __reduce__(self):
+        return (_restore, (self.primary(),))
+
+    def __repr__(self):
+        changes = ', '.join(f"{k}={v!r}" for k, v in self.overrides().items())
+        return f"TowerConfig({changes})"
+
+
+def _restore(values):
+    return TowerConfig(**values)
+
+
+def coerce(name, value):
+    """Convert ``value`` (text or number) to the type of ``name``'s default.
+
+    Raises:
+        TypeError: ``name`` is not a primary parameter.
+        ValueError: the value does not convert, or is fractional for an
+            integer parameter.
+    """
+    if name not in PRIMARY_NAMES:
+        hint = " (derived; set its inputs instead)" if name in DERIVED_NAMES else ""
+        raise TypeError(f"unknown parameter {name}{hint}")
+    default = _defaults()[name]
+    if isinstance(default, str):
+        return str(value)
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"{name} takes a number, got {value!r}")
+    number = float(value)
+    if isinstance(default, int):
+        if number != round(number):
+            raise ValueError(f"{name} takes integers, got {value!r}")
+        return int(round(number))
+    return number
+
+
+def parse_setting(spec):
+    """Parse ``NAME=VALUE`` into ``(name, value)`` typed by :func:`coerce`."""
+    name, sep, value = spec.partition('=')
+    name, value = name.strip(), value.strip()
+    if not sep or not name or not value:
+        raise ValueError(f"expected NAME=VALUE: {spec!r}")
+    return name, coerce(name, value)
+
+
+def load_variant(path):
+    """Read a TOML variant file.
+
+    Upper-case top-level keys are parameter overrides; an optional
+    ``name`` names the variant (default: the file name without suffix).
+
+    Returns:
+        tuple: ``(name, {parameter: value})``.
+    """
+    import tomllib
+    with open(path, 'rb') as fh:
+        data = tomllib.load(fh)
+    name = data.pop('name', os.path.splitext(os.path.basename(path))[0])
+    unknown = sorted(k for k in data if not k.isupper())
+    if unknown:
+        raise ValueError(f"{path}: unknown key(s) {', '.join(unknown)}")
+    return str(name), {key: coerce(key, value) for key, value in data.items()}
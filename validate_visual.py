@@ -11,6 +11,7 @@ Usage (MUST run via Blender):
     blender --background --python validate_visual.py
     blender --background --python validate_visual.py -- segment.stl
     blender --background --python validate_visual.py -- --all
+    blender --background --python validate_visual.py -- --render-dir DIR segment.stl
 
 Outputs to exports/renders/:
     {name}_front.png         — Front view (XZ)
@@ -41,6 +42,10 @@ from tower_params import *
 
 STL_DIR = os.path.join(SCRIPT_DIR, 'exports', 'stl')
 RENDER_DIR = os.path.join(SCRIPT_DIR, 'exports', 'renders')
+if '--render-dir' in argv:
+    i = argv.index('--render-dir')
+    RENDER_DIR = os.path.abspath(argv[i + 1])
+    del argv[i:i + 2]
 os.makedirs(RENDER_DIR, exist_ok=True)
 
 
@@ -20,7 +20,6 @@ import os
 import sys
 import math
 import argparse
-import numpy as np
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from tower_params import *
@@ -48,6 +47,7 @@ def render_orthographic(mesh, name, output_dir=RENDER_DIR):
     Views: Front (XZ), Right (YZ), Top (XY), Perspective (isometric).
     Uses matplotlib for headless rendering — no GPU needed.
     """
+    import numpy as np
     import matplotlib.pyplot as plt
     from mpl_toolkits.mplot3d import Axes3D
     from mpl_toolkits.mplot3d.art3d import Poly3DCollection